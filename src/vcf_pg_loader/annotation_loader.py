@@ -1,7 +1,13 @@
 """Loader for annotation reference databases."""
+import asyncio
 import logging
+import multiprocessing
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TypedDict
+from uuid import uuid4
 
 import asyncpg
 from cyvcf2 import VCF
@@ -19,6 +25,87 @@ class AnnotationLoadResult(TypedDict):
     table_name: str
 
 
+CONTIG_SEQ_SHIFT = 40
+
+
+def indexed_contigs(vcf_path: Path) -> list[str]:
+    """List contigs available for region queries on an indexed VCF.
+
+    Contigs are ordered longest first when the header records lengths, so
+    the largest chromosomes start first when work is spread over workers.
+
+    Args:
+        vcf_path: Path to a bgzipped VCF/BCF file
+
+    Returns:
+        Contig names, or an empty list if no .tbi/.csi index is present
+    """
+    path = Path(vcf_path)
+    if not any(Path(f"{path}{ext}").exists() for ext in (".tbi", ".csi")):
+        return []
+
+    vcf = VCF(str(path))
+    try:
+        contigs = list(vcf.seqnames)
+        try:
+            lengths = dict(zip(contigs, vcf.seqlens, strict=True))
+        except (AttributeError, ValueError):
+            return contigs
+        return sorted(contigs, key=lambda c: -lengths[c])
+    finally:
+        vcf.close()
+
+
+@dataclass(frozen=True)
+class _ContigTask:
+    """Arguments for staging one contig in a worker process."""
+
+    vcf_path: str
+    contig: str
+    seq_offset: int
+    staging_table: str
+    columns: list[str]
+    field_config: list[AnnotationFieldConfig]
+    human_genome: bool
+    batch_size: int
+    db_url: str
+    ssl: bool | str
+
+
+def _stage_contig(task: _ContigTask) -> int:
+    """Worker process entry point: stage one contig and return its row count."""
+    return asyncio.run(_stage_contig_async(task))
+
+
+async def _stage_contig_async(task: _ContigTask) -> int:
+    loader = AnnotationLoader(human_genome=task.human_genome, batch_size=task.batch_size)
+    vcf = VCF(task.vcf_path)
+    try:
+        variants = vcf(task.contig)
+        first = next(variants, None)
+        if first is None:
+            return 0
+
+        conn = await asyncpg.connect(task.db_url, ssl=task.ssl)
+        try:
+            return await loader._stage_rows(
+                conn,
+                task.staging_table,
+                task.columns,
+                loader._iter_rows(_chain_first(first, variants), task.field_config),
+                seq_offset=task.seq_offset,
+            )
+        finally:
+            await conn.close()
+    finally:
+        vcf.close()
+
+
+def _chain_first(first, rest: Iterator) -> Iterator:
+    yield first
+    yield from rest
+
+
 class AnnotationLoader:
     """Load population databases as annotation reference tables."""
 
@@ -27,10 +114,24 @@ class AnnotationLoader:
         human_genome: bool = True,
         batch_size: int = 10000,
         unlogged: bool = False,
+        assume_unique: bool = False,
+        workers: int = 1,
     ):
+        """Initialize the annotation loader.
+
+        Args:
+            human_genome: Use the human chromosome enum type
+            batch_size: Records per COPY batch into the staging table
+            unlogged: Create annotation tables as UNLOGGED
+            assume_unique: Skip deduplication of (chrom, pos, ref, alt) when
+                merging staged rows; only safe for sources known to be unique
+            workers: Worker processes for per-contig ingestion of indexed VCFs
+        """
         self.human_genome = human_genome
         self.batch_size = batch_size
         self.unlogged = unlogged
+        self.assume_unique = assume_unique
+        self.workers = workers
         self.schema_manager = AnnotationSchemaManager(
             human_genome=human_genome,
             unlogged=unlogged,
@@ -44,9 +145,16 @@ class AnnotationLoader:
         conn: asyncpg.Connection,
         version: str | None = None,
         source_type: str | None = None,
+        db_url: str | None = None,
+        ssl: bool | str = False,
     ) -> AnnotationLoadResult:
         """Load a VCF file as an annotation reference source.
 
+        With ``workers > 1``, an indexed VCF and a ``db_url``, each contig is
+        parsed and copied by a separate worker process on its own connection.
+        Otherwise the file is read sequentially on ``conn``. For new sources
+        the primary key is built once, after all rows are loaded.
+
         Args:
             vcf_path: Path to the VCF file
             source_name: Name for this annotation source
@@ -54,6 +162,8 @@ class AnnotationLoader:
             conn: Database connection
             version: Version string for the source
             source_type: Type of annotation (population, pathogenicity, etc.)
+            db_url: PostgreSQL URL used by parallel workers
+            ssl: SSL parameter passed to asyncpg by parallel workers
 
         Returns:
             AnnotationLoadResult with loading statistics
@@ -61,8 +171,12 @@ class AnnotationLoader:
         await self.schema_manager.create_annotation_registry(conn)
 
         table_name = await self.schema_manager.create_annotation_source_table(
-            conn, source_name, field_config
+            conn, source_name, field_config, primary_key=False
         )
+        has_primary_key = await self.schema_manager.has_primary_key(conn, source_name)
+
+        info = await self.schema_manager.get_source_info(conn, source_name)
+        existing_count = info["variant_count"] if info else 0
 
         await self.schema_manager.register_source(
             conn,
@@ -74,12 +188,23 @@ class AnnotationLoader:
         )
 
         variant_count = await self._load_variants(
-            vcf_path, table_name, field_config, conn
+            vcf_path,
+            table_name,
+            field_config,
+            conn,
+            on_conflict=has_primary_key,
+            db_url=db_url,
+            ssl=ssl,
         )
 
+        await self.schema_manager.create_primary_key(conn, source_name)
         await self.schema_manager.create_variant_lookup_index(conn, source_name)
+        # Autovacuum never analyzes partitioned parents; join planning needs their stats.
+        await conn.execute(f"ANALYZE {table_name}")
 
-        await self.schema_manager.update_variant_count(conn, source_name, variant_count)
+        await self.schema_manager.update_variant_count(
+            conn, source_name, existing_count + variant_count
+        )
 
         logger.info(f"Loaded {variant_count} variants into {table_name}")
 
@@ -95,25 +220,108 @@ class AnnotationLoader:
         table_name: str,
         field_config: list[AnnotationFieldConfig],
         conn: asyncpg.Connection,
+        on_conflict: bool = True,
+        db_url: str | None = None,
+        ssl: bool | str = False,
     ) -> int:
         """Load variants from VCF into the annotation table.
 
+        All records are streamed by COPY into a single unlogged staging
+        table, then merged into the annotation table with one INSERT. This
+        avoids per-batch DDL and lets PostgreSQL deduplicate in one sort.
+
         Args:
             vcf_path: Path to the VCF file
             table_name: Name of the target table
             field_config: Field configuration
             conn: Database connection
+            on_conflict: Skip rows already in the table; requires its primary key
+            db_url: PostgreSQL URL for parallel workers
+            ssl: SSL parameter for parallel worker connections
 
         Returns:
-            Number of variants loaded
+            Number of variants inserted into the annotation table
         """
-        vcf = VCF(str(vcf_path))
-        batch = []
-        total_count = 0
-
         columns = ["chrom", "pos", "ref", "alt"] + [f.alias for f in field_config]
+        staging_table = await self._create_staging_table(conn, table_name)
+
+        try:
+            contigs = indexed_contigs(vcf_path) if self.workers > 1 and db_url else []
+
+            if contigs:
+                await self._stage_parallel(
+                    vcf_path, contigs, staging_table, columns, field_config, db_url, ssl
+                )
+            else:
+                if self.workers > 1:
+                    logger.info("No index or database URL for %s; loading sequentially", vcf_path)
+                vcf = VCF(str(vcf_path))
+                try:
+                    await self._stage_rows(
+                        conn, staging_table, columns, self._iter_rows(vcf, field_config)
+                    )
+                finally:
+                    vcf.close()
+
+            return await self._merge_staging(
+                conn, staging_table, table_name, columns, on_conflict=on_conflict
+            )
+        finally:
+            await conn.execute(f"DROP TABLE IF EXISTS {staging_table}")
+
+    async def _stage_parallel(
+        self,
+        vcf_path: Path,
+        contigs: list[str],
+        staging_table: str,
+        columns: list[str],
+        field_config: list[AnnotationFieldConfig],
+        db_url: str,
+        ssl: bool | str,
+    ) -> int:
+        """Stage each contig of an indexed VCF in a pool of worker processes.
+
+        Returns:
+            Total number of staged rows
+        """
+        tasks = [
+            _ContigTask(
+                vcf_path=str(vcf_path),
+                contig=contig,
+                seq_offset=i << CONTIG_SEQ_SHIFT,
+                staging_table=staging_table,
+                columns=columns,
+                field_config=field_config,
+                human_genome=self.human_genome,
+                batch_size=self.batch_size,
+                db_url=db_url,
+                ssl=ssl,
+            )
+            for i, contig in enumerate(contigs)
+        ]
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [loop.run_in_executor(executor, _stage_contig, task) for task in tasks]
+            try:
+                counts = await asyncio.gather(*futures)
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+        logger.info(f"Staged {sum(counts)} records from {len(contigs)} contigs")
+        return sum(counts)
 
-        for variant in vcf:
+    def _iter_rows(
+        self,
+        variants: Iterable,
+        field_config: list[AnnotationFieldConfig],
+    ) -> Iterator[list]:
+        """Yield one annotation row per ALT allele of each variant."""
+        for variant in variants:
             for alt_idx, alt in enumerate(variant.ALT):
                 if alt is None:
                     continue
@@ -129,47 +337,117 @@ class AnnotationLoader:
                     value = self._extract_field_value(variant, field_cfg, alt_idx)
                     row.append(value)
 
-                batch.append(tuple(row))
+                yield row
+
+    async def _stage_rows(
+        self,
+        conn: asyncpg.Connection,
+        staging_table: str,
+        columns: list[str],
+        rows: Iterable[list],
+        seq_offset: int = 0,
+    ) -> int:
+        """COPY rows into the staging table in batches, numbering them in order.
+
+        Returns:
+            Number of staged rows
+        """
+        batch = []
+        staged_count = 0
 
-                if len(batch) >= self.batch_size:
-                    await self._copy_batch(conn, table_name, columns, batch)
-                    total_count += len(batch)
-                    batch = []
+        for row in rows:
+            staged_count += 1
+            row.append(seq_offset + staged_count)
+            batch.append(tuple(row))
+
+            if len(batch) >= self.batch_size:
+                await self._stage_batch(conn, staging_table, columns, batch)
+                batch = []
 
         if batch:
-            await self._copy_batch(conn, table_name, columns, batch)
-            total_count += len(batch)
+            await self._stage_batch(conn, staging_table, columns, batch)
 
-        vcf.close()
-        return total_count
+        return staged_count
 
-    async def _copy_batch(
+    async def _create_staging_table(
         self,
         conn: asyncpg.Connection,
         table_name: str,
+    ) -> str:
+        """Create the unlogged staging table used for one load.
+
+        The staging table has the annotation columns without constraints or
+        indexes, plus a staging_seq column recording input order so that
+        deduplication keeps the first occurrence of each variant. Its name
+        is unique to the load, so concurrent loads of one source do not
+        share it.
+
+        Returns:
+            Name of the staging table
+        """
+        staging_table = f"staging_{table_name[:42]}_{uuid4().hex[:12]}"
+
+        await conn.execute(f"""
+            CREATE UNLOGGED TABLE {staging_table} (
+                LIKE {table_name} INCLUDING DEFAULTS,
+                staging_seq BIGINT NOT NULL
+            )
+        """)
+
+        return staging_table
+
+    async def _stage_batch(
+        self,
+        conn: asyncpg.Connection,
+        staging_table: str,
         columns: list[str],
         batch: list[tuple],
     ) -> None:
-        """Copy a batch of records using PostgreSQL COPY protocol."""
-        staging_table = f"staging_{table_name}"
-        column_list = ", ".join(columns)
-
-        await conn.execute(f"DROP TABLE IF EXISTS {staging_table}")
-        await conn.execute(f"CREATE TEMP TABLE {staging_table} (LIKE {table_name} INCLUDING DEFAULTS)")
-
+        """Copy a batch of records into the staging table using COPY."""
         await conn.copy_records_to_table(
             staging_table,
             records=batch,
-            columns=columns,
+            columns=columns + ["staging_seq"],
         )
 
-        await conn.execute(f"""
+    async def _merge_staging(
+        self,
+        conn: asyncpg.Connection,
+        staging_table: str,
+        table_name: str,
+        columns: list[str],
+        on_conflict: bool = True,
+    ) -> int:
+        """Merge staged records into the annotation table in one statement.
+
+        Unless ``assume_unique`` is set, duplicate variants are collapsed with
+        DISTINCT ON, keeping the first record seen in the source file. With
+        ``on_conflict``, rows already present in the annotation table are left
+        untouched; new tables have no primary key yet and skip that check.
+
+        Returns:
+            Number of rows inserted
+        """
+        column_list = ", ".join(columns)
+
+        if self.assume_unique:
+            select = f"SELECT {column_list} FROM {staging_table}"
+        else:
+            select = f"""
+                SELECT DISTINCT ON (chrom, pos, ref, alt) {column_list}
+                FROM {staging_table}
+                ORDER BY chrom, pos, ref, alt, staging_seq
+            """
+
+        conflict_clause = "ON CONFLICT (chrom, pos, ref, alt) DO NOTHING" if on_conflict else ""
+
+        status = await conn.execute(f"""
             INSERT INTO {table_name} ({column_list})
-            SELECT {column_list} FROM {staging_table}
-            ON CONFLICT (chrom, pos, ref, alt) DO NOTHING
+            {select}
+            {conflict_clause}
         """)
 
-        await conn.execute(f"DROP TABLE {staging_table}")
+        return int(status.split()[-1])
 
     def _extract_field_value(
         self,
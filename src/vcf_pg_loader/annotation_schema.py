@@ -5,6 +5,7 @@ import re
 import asyncpg
 
 from .annotation_config import AnnotationFieldConfig, config_to_dict
+from .schema import HUMAN_CHROMOSOMES
 
 
 def validate_identifier(name: str, identifier_type: str = "identifier") -> None:
@@ -50,19 +51,31 @@ class AnnotationSchemaManager:
         conn: asyncpg.Connection,
         source_name: str,
         fields: list[AnnotationFieldConfig],
+        primary_key: bool = True,
     ) -> str:
         """Create a table for a specific annotation source.
 
+        The table is list-partitioned by chrom with the same partition bounds
+        as the variants table, so joins against variants can be planned
+        partition-wise and a single-chromosome query touches one partition.
+        Existing tables, including legacy unpartitioned ones, are left as is.
+
         Args:
             conn: Database connection
             source_name: Name of the annotation source (e.g., "gnomad_v3_1_2")
             fields: List of field configurations
+            primary_key: Create the (chrom, pos, ref, alt) primary key now. Bulk
+                loaders pass False and call create_primary_key after loading.
 
         Returns:
             The name of the created table
         """
         validate_identifier(source_name, "source name")
         table_name = f"anno_{source_name}"
+        partitions = self._partition_bounds(table_name)
+
+        if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", table_name):
+            return table_name
 
         if self.human_genome:
             chrom_type = "chromosome_type"
@@ -77,26 +90,97 @@ class AnnotationSchemaManager:
         field_columns = ",\n                ".join(field_defs)
 
         unlogged_clause = "UNLOGGED" if self.unlogged else ""
+        pk_clause = ",\n                PRIMARY KEY (chrom, pos, ref, alt)" if primary_key else ""
 
         await conn.execute(f"""
-            CREATE {unlogged_clause} TABLE IF NOT EXISTS {table_name} (
+            CREATE TABLE IF NOT EXISTS {table_name} (
                 chrom {chrom_type} NOT NULL,
                 pos BIGINT NOT NULL,
                 ref TEXT NOT NULL,
                 alt TEXT NOT NULL,
-                {field_columns},
-                PRIMARY KEY (chrom, pos, ref, alt)
-            )
+                {field_columns}{pk_clause}
+            ) PARTITION BY LIST (chrom)
         """)
 
+        for partition_name, bound in partitions:
+            await conn.execute(f"""
+                CREATE {unlogged_clause} TABLE IF NOT EXISTS {partition_name}
+                PARTITION OF {table_name} {bound}
+            """)
+
         return table_name
 
+    def _partition_bounds(self, table_name: str) -> list[tuple[str, str]]:
+        """Return (partition name, bound clause) pairs matching the variants table."""
+        if not self.human_genome:
+            partitions = [(f"{table_name}_default", "DEFAULT")]
+        else:
+            partitions = [
+                (f"{table_name}_{chrom.replace('chr', '').lower()}", f"FOR VALUES IN ('{chrom}')")
+                for chrom in HUMAN_CHROMOSOMES
+            ]
+            partitions.append((f"{table_name}_other", "DEFAULT"))
+
+        for partition_name, _ in partitions:
+            validate_identifier(partition_name, "partition name")
+
+        return partitions
+
+    async def has_primary_key(
+        self,
+        conn: asyncpg.Connection,
+        source_name: str,
+    ) -> bool:
+        """Check whether an annotation source table has its primary key.
+
+        Args:
+            conn: Database connection
+            source_name: Name of the annotation source
+
+        Returns:
+            True if the table has a primary key constraint
+        """
+        validate_identifier(source_name, "source name")
+        return await conn.fetchval(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conrelid = $1::regclass AND contype = 'p'
+            )
+            """,
+            f"anno_{source_name}",
+        )
+
+    async def create_primary_key(
+        self,
+        conn: asyncpg.Connection,
+        source_name: str,
+    ) -> None:
+        """Add the (chrom, pos, ref, alt) primary key if it is missing.
+
+        Building the key once over a fully loaded table is much cheaper than
+        maintaining it during bulk ingestion.
+
+        Args:
+            conn: Database connection
+            source_name: Name of the annotation source
+        """
+        if await self.has_primary_key(conn, source_name):
+            return
+
+        table_name = f"anno_{source_name}"
+        await conn.execute(f"ALTER TABLE {table_name} ADD PRIMARY KEY (chrom, pos, ref, alt)")
+
     async def create_variant_lookup_index(
         self,
         conn: asyncpg.Connection,
         source_name: str,
     ) -> None:
-        """Create optimized index for variant lookup.
+        """Ensure the (chrom, pos, ref, alt) lookup index exists.
+
+        The primary key serves variant lookups, so this builds it if needed and
+        drops the redundant idx_anno_<name>_lookup btree created by older
+        versions.
 
         Args:
             conn: Database connection
@@ -104,12 +188,9 @@ class AnnotationSchemaManager:
         """
         validate_identifier(source_name, "source name")
         table_name = f"anno_{source_name}"
-        index_name = f"idx_{table_name}_lookup"
 
-        await conn.execute(f"""
-            CREATE INDEX IF NOT EXISTS {index_name}
-            ON {table_name} (chrom, pos, ref, alt)
-        """)
+        await self.create_primary_key(conn, source_name)
+        await conn.execute(f"DROP INDEX IF EXISTS idx_{table_name}_lookup")
 
     async def drop_annotation_source(
         self,
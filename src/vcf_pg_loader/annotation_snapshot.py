@@ -0,0 +1,848 @@
+"""Local snapshots of annotation sources for annotating variants without a join.
+
+Two kinds of snapshot share one lookup interface (``match`` and ``values``):
+
+``AnnotationSnapshot`` is the loader's cache. It holds, per chromosome, the
+positions, allele keys and selected field values of an ``anno_*`` table as
+flat binary arrays on disk, sorted by position. They are opened with
+``numpy.memmap`` so only the pages a batch touches are read, and each parsed
+batch is matched against them before COPY instead of joining after the load.
+Snapshots are cached under ``~/.vcf-pg-loader/annotations`` and rebuilt when
+the source is reloaded (its registry ``loaded_at`` or ``variant_count``
+changes) or a new field is requested.
+
+``AnnotationSnapshotFile`` reads a portable snapshot written by
+``export_annotation_snapshot``, for annotating on machines without database
+access. Each chromosome is stored as zlib-compressed column blocks of a fixed
+number of rows plus a block index of position ranges and byte offsets; only
+the blocks a batch spans are decompressed.
+"""
+
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import asyncpg
+import numpy as np
+
+from .annotation_schema import validate_identifier
+from .models import VariantRecord
+
+logger = logging.getLogger(__name__)
+
+ANNOTATABLE_COLUMNS: dict[str, str] = {
+    "af_gnomad": "float",
+    "af_gnomad_popmax": "float",
+    "af_1kg": "float",
+    "cadd_phred": "float",
+    "clinvar_sig": "str",
+    "clinvar_review": "str",
+}
+
+SNAPSHOT_FETCH_SIZE = 100_000
+
+SNAPSHOT_FILE_FORMAT = "vcf-pg-loader-annotation-snapshot"
+SNAPSHOT_FILE_VERSION = 1
+DEFAULT_BLOCK_ROWS = 65_536
+BLOCK_CACHE_SIZE = 16
+
+_MISSING_CODE = -1
+
+# md5 of "ref>alt" folded to a signed 64-bit integer, computed the same way in
+# SQL while building and in Python while matching.
+_ALLELE_KEY_SQL = "('x' || substr(md5(ref || '>' || alt), 1, 16))::bit(64)::bigint"
+
+
+def _field_spec(is_numeric: bool, config: dict) -> dict:
+    """Snapshot encoding of a field and the value its source uses for missing."""
+    if is_numeric:
+        return {"kind": "float", "missing": config.get("missing_value")}
+    return {"kind": "str", "missing": config.get("missing_string", ".")}
+
+
+def get_default_snapshot_dir() -> Path:
+    """Get the default cache directory for annotation snapshots."""
+    return Path.home() / ".vcf-pg-loader" / "annotations"
+
+
+def allele_key(ref: str, alt: str) -> int:
+    """Return the signed 64-bit allele key used to match snapshot rows."""
+    digest = hashlib.md5(f"{ref}>{alt}".encode(), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@dataclass(frozen=True)
+class AnnotationMapping:
+    """Fill a VariantRecord column from a field of an annotation source.
+
+    Attributes:
+        column: VariantRecord attribute (one of ANNOTATABLE_COLUMNS)
+        source: Annotation source name
+        field: Field alias in the annotation source
+    """
+
+    column: str
+    source: str
+    field: str
+
+    @classmethod
+    def parse(cls, spec: str) -> "AnnotationMapping":
+        """Parse a ``column=source.field`` specification.
+
+        Raises:
+            ValueError: If the specification is malformed or the column is
+                not annotatable
+        """
+        column, sep, target = spec.partition("=")
+        source, dot, field = target.partition(".")
+        if not sep or not dot or not column or not source or not field:
+            raise ValueError(f"Invalid annotation mapping '{spec}'. Expected column=source.field")
+        column = column.strip()
+        if column not in ANNOTATABLE_COLUMNS:
+            raise ValueError(
+                f"Cannot annotate column '{column}'. "
+                f"Choose from: {', '.join(ANNOTATABLE_COLUMNS)}"
+            )
+        validate_identifier(source.strip(), "source name")
+        validate_identifier(field.strip(), "field name")
+        return cls(column, source.strip(), field.strip())
+
+
+async def _source_fields(
+    conn: asyncpg.Connection, source: str, fields: list[str] | None = None
+) -> tuple[asyncpg.Record, dict[str, dict]]:
+    """Registry row of a source and the snapshot encoding of each of its fields.
+
+    Raises:
+        ValueError: If the source is not loaded or a requested field does not exist
+    """
+    validate_identifier(source, "source name")
+    info = await conn.fetchrow(
+        """
+        SELECT source_id, field_config, loaded_at, variant_count
+        FROM annotation_sources WHERE name = $1
+        """,
+        source,
+    )
+    if info is None:
+        raise ValueError(f"Annotation source '{source}' not found")
+
+    config = {item["alias"]: item for item in json.loads(info["field_config"])}
+    column_rows = await conn.fetch(
+        """
+        SELECT a.attname, t.typcategory = 'N' AS is_numeric
+        FROM pg_attribute a
+        JOIN pg_type t ON t.oid = a.atttypid
+        WHERE a.attrelid = $1::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attnum
+        """,
+        f"anno_{source}",
+    )
+    field_specs = {
+        r["attname"]: _field_spec(r["is_numeric"], config[r["attname"]])
+        for r in column_rows
+        if r["attname"] in config
+    }
+    unknown = [f for f in fields or [] if f not in field_specs]
+    if unknown:
+        raise ValueError(f"Unknown field(s) in source '{source}': {', '.join(unknown)}")
+    return info, field_specs
+
+
+async def _iter_source_chunks(
+    conn: asyncpg.Connection, source: str, fields: list[str]
+) -> AsyncIterator[tuple[str, list]]:
+    """Stream a source as (chrom, rows) chunks ordered by chrom, pos, ref, alt.
+
+    Rows are ``(chrom, pos, allele_key, *fields)`` and a chunk never spans
+    two chromosomes. Must be iterated inside a transaction.
+    """
+    select = ", ".join(["chrom::text", "pos", _ALLELE_KEY_SQL, *fields])
+    cursor = await conn.cursor(f"SELECT {select} FROM anno_{source} ORDER BY chrom, pos, ref, alt")
+    while rows := await cursor.fetch(SNAPSHOT_FETCH_SIZE):
+        start = 0
+        while start < len(rows):
+            chrom = rows[start][0]
+            end = start
+            while end < len(rows) and rows[end][0] == chrom:
+                end += 1
+            yield chrom, rows[start:end]
+            start = end
+
+
+def _encode_ints(rows: list, index: int) -> np.ndarray:
+    return np.fromiter((r[index] for r in rows), np.int64, len(rows))
+
+
+def _encode_field(rows: list, index: int, missing, categories: dict[str, int] | None) -> np.ndarray:
+    """Encode one field of a chunk: float64 with NaN, or int32 category codes.
+
+    Values equal to the source's configured missing value count as missing.
+    """
+    if categories is None:
+        return np.fromiter(
+            (np.nan if r[index] is None or r[index] == missing else r[index] for r in rows),
+            np.float64,
+            len(rows),
+        )
+    codes = np.empty(len(rows), dtype=np.int32)
+    for i, r in enumerate(rows):
+        value = r[index]
+        if value is None or value == missing:
+            codes[i] = _MISSING_CODE
+        else:
+            codes[i] = categories.setdefault(value, len(categories))
+    return codes
+
+
+def _field_dtype(spec: dict) -> type:
+    return np.float64 if spec["kind"] == "float" else np.int32
+
+
+def _decode_values(data: np.ndarray, spec: dict) -> list:
+    if spec["kind"] == "float":
+        return [None if np.isnan(v) else float(v) for v in data]
+    categories = spec["categories"]
+    return [None if code == _MISSING_CODE else categories[code] for code in data]
+
+
+def _match_window(
+    window_pos: np.ndarray,
+    window_keys: np.ndarray,
+    offset: int,
+    positions: np.ndarray,
+    keys: np.ndarray,
+) -> np.ndarray:
+    """Match (position, allele key) pairs against a position-sorted window.
+
+    Returns:
+        Row of each pair (window index plus ``offset``), or -1
+    """
+    rows = np.full(len(positions), -1, dtype=np.int64)
+    start = np.searchsorted(window_pos, positions, side="left")
+    end = np.searchsorted(window_pos, positions, side="right")
+    for step in range(int((end - start).max(initial=0))):
+        candidate = start + step
+        valid = (candidate < end) & (rows < 0)
+        hits = valid.copy()
+        hits[valid] = window_keys[candidate[valid]] == keys[valid]
+        rows[hits] = offset + candidate[hits]
+    return rows
+
+
+class AnnotationSnapshot:
+    """Memory-mapped, position-sorted copy of one annotation source."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.manifest = json.loads((path / "manifest.json").read_text())
+        self._arrays: dict[tuple[str, str], np.ndarray] = {}
+
+    @property
+    def source(self) -> str:
+        return self.manifest["source"]
+
+    @property
+    def fields(self) -> dict[str, dict]:
+        return self.manifest["fields"]
+
+    @classmethod
+    async def open(
+        cls,
+        conn: asyncpg.Connection,
+        source: str,
+        fields: list[str],
+        cache_dir: Path | None = None,
+    ) -> "AnnotationSnapshot":
+        """Open the cached snapshot of a source, building it if stale.
+
+        Args:
+            conn: Database connection
+            source: Annotation source name
+            fields: Field aliases the snapshot must contain
+            cache_dir: Snapshot cache directory (default: ~/.vcf-pg-loader/annotations)
+
+        Returns:
+            An AnnotationSnapshot covering ``fields``
+
+        Raises:
+            ValueError: If the source is not loaded or a field does not exist
+        """
+        info, field_specs = await _source_fields(conn, source, fields)
+
+        database = await conn.fetchrow(
+            "SELECT current_database() AS name, inet_server_addr()::text AS addr, "
+            "inet_server_port() AS port"
+        )
+        identity = f"{database['addr']}:{database['port']}/{database['name']}/{source}"
+        cache_dir = cache_dir or get_default_snapshot_dir()
+        path = cache_dir / f"{source}-{hashlib.sha256(identity.encode()).hexdigest()[:12]}"
+        version = {
+            "source_id": info["source_id"],
+            "loaded_at": info["loaded_at"].isoformat() if info["loaded_at"] else None,
+            "variant_count": info["variant_count"],
+        }
+
+        manifest_path = path / "manifest.json"
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+            if manifest.get("version") == version and set(fields) <= set(manifest["fields"]):
+                return cls(path)
+            fields = sorted(set(fields) | (set(manifest["fields"]) & set(field_specs)))
+
+        await cls._build(conn, source, {f: field_specs[f] for f in fields}, version, path)
+        return cls(path)
+
+    @classmethod
+    async def _build(
+        cls,
+        conn: asyncpg.Connection,
+        source: str,
+        fields: dict[str, dict],
+        version: dict,
+        path: Path,
+    ) -> None:
+        """Stream a source into per-chromosome array files and swap them in."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        build_dir = Path(tempfile.mkdtemp(prefix=f".{source}-", dir=path.parent))
+
+        categories: dict[str, dict[str, int]] = {
+            name: {} for name, spec in fields.items() if spec["kind"] == "str"
+        }
+        chroms: dict[str, int] = {}
+        handles: dict[str, object] = {}
+
+        def close_handles() -> None:
+            for handle in handles.values():
+                handle.close()
+            handles.clear()
+
+        try:
+            async with conn.transaction():
+                async for chrom, chunk in _iter_source_chunks(conn, source, list(fields)):
+                    if chrom not in chroms:
+                        close_handles()
+                        chroms[chrom] = 0
+                        handles.update(
+                            (name, open(build_dir / f"{chrom}.{name}.bin", "wb"))
+                            for name in ("pos", "allele_key", *fields)
+                        )
+                    handles["pos"].write(_encode_ints(chunk, 1).tobytes())
+                    handles["allele_key"].write(_encode_ints(chunk, 2).tobytes())
+                    for i, name in enumerate(fields, start=3):
+                        handles[name].write(
+                            _encode_field(
+                                chunk, i, fields[name]["missing"], categories.get(name)
+                            ).tobytes()
+                        )
+                    chroms[chrom] += len(chunk)
+            close_handles()
+
+            for name, mapping in categories.items():
+                fields[name]["categories"] = list(mapping)
+
+            (build_dir / "manifest.json").write_text(
+                json.dumps(
+                    {"source": source, "version": version, "fields": fields, "chroms": chroms}
+                )
+            )
+            if path.exists():
+                shutil.rmtree(path)
+            build_dir.rename(path)
+        except BaseException:
+            close_handles()
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+        logger.info(
+            "Built annotation snapshot of %s: %d variants on %d chromosomes",
+            source,
+            sum(chroms.values()),
+            len(chroms),
+        )
+
+    def _array(self, chrom: str, name: str) -> np.ndarray:
+        key = (chrom, name)
+        if key not in self._arrays:
+            if name in ("pos", "allele_key"):
+                dtype = np.int64
+            else:
+                dtype = _field_dtype(self.fields[name])
+            count = self.manifest["chroms"][chrom]
+            self._arrays[key] = (
+                np.memmap(self.path / f"{chrom}.{name}.bin", dtype=dtype, mode="r", shape=(count,))
+                if count
+                else np.empty(0, dtype=dtype)
+            )
+        return self._arrays[key]
+
+    def match(self, chrom: str, positions: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Find the snapshot row of each (position, allele key), or -1.
+
+        Positions are binary-searched within the window spanned by the batch,
+        so a position-sorted batch only touches the matching stretch of the
+        memory-mapped arrays.
+        """
+        if chrom not in self.manifest["chroms"] or not len(positions):
+            return np.full(len(positions), -1, dtype=np.int64)
+
+        snapshot_pos = self._array(chrom, "pos")
+        lo = int(np.searchsorted(snapshot_pos, positions.min(), side="left"))
+        hi = int(np.searchsorted(snapshot_pos, positions.max(), side="right"))
+        return _match_window(
+            snapshot_pos[lo:hi], self._array(chrom, "allele_key")[lo:hi], lo, positions, keys
+        )
+
+    def values(self, chrom: str, field: str, rows: np.ndarray) -> list:
+        """Field values for matched snapshot rows (None where missing)."""
+        return _decode_values(self._array(chrom, field)[rows], self.fields[field])
+
+
+def _block_index_dtype(n_columns: int) -> np.dtype:
+    return np.dtype(
+        [
+            ("first_pos", "<i8"),
+            ("last_pos", "<i8"),
+            ("rows", "<i8"),
+            ("offsets", "<i8", (n_columns,)),
+            ("lengths", "<i8", (n_columns,)),
+        ]
+    )
+
+
+class _BlockWriter:
+    """Write one chromosome of an exported snapshot as compressed column blocks."""
+
+    def __init__(self, directory: Path, chrom: str, n_columns: int, block_rows: int):
+        self.directory = directory
+        self.chrom = chrom
+        self.n_columns = n_columns
+        self.block_rows = block_rows
+        self.rows = 0
+        self._data = open(directory / f"{chrom}.blocks", "wb")
+        self._index: list[tuple] = []
+        self._pending: list[np.ndarray] | None = None
+
+    @property
+    def blocks(self) -> int:
+        return len(self._index)
+
+    def add(self, columns: list[np.ndarray]) -> None:
+        """Buffer a chunk of columns, writing every full block."""
+        if self._pending is not None:
+            columns = [np.concatenate(pair) for pair in zip(self._pending, columns, strict=True)]
+        while len(columns[0]) >= self.block_rows:
+            self._write_block([c[: self.block_rows] for c in columns])
+            columns = [c[self.block_rows :] for c in columns]
+        self._pending = columns if len(columns[0]) else None
+
+    def close(self) -> None:
+        """Write the final partial block and the block index."""
+        if self._pending is not None:
+            self._write_block(self._pending)
+            self._pending = None
+        self._data.close()
+        index = np.array(self._index, dtype=_block_index_dtype(self.n_columns))
+        np.save(self.directory / f"{self.chrom}.index.npy", index)
+
+    def abort(self) -> None:
+        self._data.close()
+
+    def _write_block(self, columns: list[np.ndarray]) -> None:
+        positions = columns[0]
+        # Positions within a block are stored as offsets from its first position
+        encoded = [(positions - positions[0]).astype(np.uint32), *columns[1:]]
+        offsets, lengths = [], []
+        for column in encoded:
+            payload = zlib.compress(np.ascontiguousarray(column).tobytes())
+            offsets.append(self._data.tell())
+            lengths.append(len(payload))
+            self._data.write(payload)
+        self._index.append((positions[0], positions[-1], len(positions), offsets, lengths))
+        self.rows += len(positions)
+
+
+async def export_annotation_snapshot(
+    conn: asyncpg.Connection,
+    source: str,
+    output: Path,
+    fields: list[str] | None = None,
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+) -> dict:
+    """Export an annotation source to a portable snapshot directory.
+
+    The directory holds ``manifest.json`` and, per chromosome, a
+    ``<chrom>.blocks`` file of zlib-compressed column blocks and a
+    ``<chrom>.index.npy`` block index. Read it with ``AnnotationSnapshotFile``.
+
+    Args:
+        conn: Database connection
+        source: Annotation source name
+        output: Snapshot directory to create (replaced if it exists)
+        fields: Field aliases to export (default: all fields of the source)
+        block_rows: Rows per compressed block
+
+    Returns:
+        Dictionary with the source name, variant count and blocks per chromosome
+
+    Raises:
+        ValueError: If the source is not loaded, a field does not exist or
+            block_rows is not positive
+    """
+    if block_rows < 1:
+        raise ValueError("block_rows must be positive")
+
+    info, field_specs = await _source_fields(conn, source, fields)
+    specs = {name: field_specs[name] for name in fields or field_specs}
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    build_dir = Path(tempfile.mkdtemp(prefix=f".{output.name}-", dir=output.parent))
+    categories: dict[str, dict[str, int]] = {
+        name: {} for name, spec in specs.items() if spec["kind"] == "str"
+    }
+    chroms: dict[str, dict[str, int]] = {}
+    writer: _BlockWriter | None = None
+
+    def finish_chrom() -> None:
+        writer.close()
+        chroms[writer.chrom] = {"rows": writer.rows, "blocks": writer.blocks}
+
+    try:
+        async with conn.transaction():
+            async for chrom, chunk in _iter_source_chunks(conn, source, list(specs)):
+                if writer is None or writer.chrom != chrom:
+                    if writer is not None:
+                        finish_chrom()
+                    writer = _BlockWriter(build_dir, chrom, 2 + len(specs), block_rows)
+                writer.add(
+                    [
+                        _encode_ints(chunk, 1),
+                        _encode_ints(chunk, 2),
+                        *(
+                            _encode_field(chunk, i, spec["missing"], categories.get(name))
+                            for i, (name, spec) in enumerate(specs.items(), start=3)
+                        ),
+                    ]
+                )
+        if writer is not None:
+            finish_chrom()
+            writer = None
+
+        manifest_fields = {name: {"kind": spec["kind"]} for name, spec in specs.items()}
+        for name, mapping in categories.items():
+            manifest_fields[name]["categories"] = list(mapping)
+        manifest = {
+            "format": SNAPSHOT_FILE_FORMAT,
+            "format_version": SNAPSHOT_FILE_VERSION,
+            "source": source,
+            "loaded_at": info["loaded_at"].isoformat() if info["loaded_at"] else None,
+            "variant_count": sum(c["rows"] for c in chroms.values()),
+            "block_rows": block_rows,
+            "compression": "zlib",
+            "fields": manifest_fields,
+            "chroms": chroms,
+        }
+        (build_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        if output.exists():
+            shutil.rmtree(output)
+        build_dir.rename(output)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    logger.info(
+        "Exported annotation snapshot of %s: %d variants on %d chromosomes",
+        source,
+        manifest["variant_count"],
+        len(chroms),
+    )
+    return {
+        "source": source,
+        "variant_count": manifest["variant_count"],
+        "blocks": {chrom: c["blocks"] for chrom, c in chroms.items()},
+    }
+
+
+class AnnotationSnapshotFile:
+    """Reader for a snapshot written by ``export_annotation_snapshot``.
+
+    Block files and indexes are memory-mapped. A lookup selects the blocks
+    whose position range overlaps the batch from the index and decompresses
+    only those; recently used blocks are kept so consecutive position-sorted
+    batches do not decompress the same block twice.
+    """
+
+    def __init__(self, path: Path, cache_blocks: int = BLOCK_CACHE_SIZE):
+        self.path = Path(path)
+        manifest_path = self.path / "manifest.json"
+        manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        if manifest.get("format") != SNAPSHOT_FILE_FORMAT:
+            raise ValueError(f"Not an exported annotation snapshot: {self.path}")
+        if manifest["format_version"] > SNAPSHOT_FILE_VERSION:
+            raise ValueError(
+                f"Snapshot format version {manifest['format_version']} is newer than "
+                f"supported version {SNAPSHOT_FILE_VERSION}"
+            )
+        self.manifest = manifest
+        self.block_rows: int = manifest["block_rows"]
+        self.columns = ["pos", "allele_key", *manifest["fields"]]
+        self.cache_blocks = cache_blocks
+        self._indexes: dict[str, np.ndarray] = {}
+        self._data: dict[str, np.memmap] = {}
+        self._cache: OrderedDict[tuple[str, int, int], np.ndarray] = OrderedDict()
+
+    @property
+    def source(self) -> str:
+        return self.manifest["source"]
+
+    @property
+    def fields(self) -> dict[str, dict]:
+        return self.manifest["fields"]
+
+    def _index(self, chrom: str) -> np.ndarray:
+        if chrom not in self._indexes:
+            self._indexes[chrom] = np.load(self.path / f"{chrom}.index.npy", mmap_mode="r")
+        return self._indexes[chrom]
+
+    def _column(self, chrom: str, block: int, column: int) -> np.ndarray:
+        """Decompress one column of one block, through the block cache."""
+        key = (chrom, block, column)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        if chrom not in self._data:
+            self._data[chrom] = np.memmap(self.path / f"{chrom}.blocks", dtype=np.uint8, mode="r")
+        entry = self._index(chrom)[block]
+        start = int(entry["offsets"][column])
+        payload = zlib.decompress(self._data[chrom][start : start + int(entry["lengths"][column])])
+
+        name = self.columns[column]
+        if name == "pos":
+            values = np.frombuffer(payload, dtype=np.uint32) + np.int64(entry["first_pos"])
+        elif name == "allele_key":
+            values = np.frombuffer(payload, dtype=np.int64)
+        else:
+            values = np.frombuffer(payload, dtype=_field_dtype(self.fields[name]))
+
+        self._cache[key] = values
+        if len(self._cache) > self.cache_blocks * len(self.columns):
+            self._cache.popitem(last=False)
+        return values
+
+    def match(self, chrom: str, positions: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Find the snapshot row of each (position, allele key), or -1.
+
+        Only the blocks overlapping the batch's position range are read.
+        """
+        if chrom not in self.manifest["chroms"] or not len(positions):
+            return np.full(len(positions), -1, dtype=np.int64)
+
+        index = self._index(chrom)
+        first = int(np.searchsorted(index["last_pos"], positions.min(), side="left"))
+        last = int(np.searchsorted(index["first_pos"], positions.max(), side="right"))
+        if first >= last:
+            return np.full(len(positions), -1, dtype=np.int64)
+
+        blocks = range(first, last)
+        return _match_window(
+            np.concatenate([self._column(chrom, b, 0) for b in blocks]),
+            np.concatenate([self._column(chrom, b, 1) for b in blocks]),
+            first * self.block_rows,
+            positions,
+            keys,
+        )
+
+    def values(self, chrom: str, field: str, rows: np.ndarray) -> list:
+        """Field values for matched snapshot rows (None where missing)."""
+        spec = self.fields[field]
+        column = self.columns.index(field)
+        blocks = rows // self.block_rows
+        data = np.empty(len(rows), dtype=_field_dtype(spec))
+        for block in np.unique(blocks):
+            selected = blocks == block
+            block_values = self._column(chrom, int(block), column)
+            data[selected] = block_values[rows[selected] - block * self.block_rows]
+        return _decode_values(data, spec)
+
+
+def _lookup_batch(
+    batch: list[VariantRecord],
+    snapshots: dict[str, "AnnotationSnapshot | AnnotationSnapshotFile"],
+    fields: dict[str, list[str]],
+    normalize_chr_prefix: bool = True,
+) -> tuple[np.ndarray, dict[tuple[str, str], list]]:
+    """Look up snapshot fields for every record of a batch.
+
+    Args:
+        batch: Records to look up
+        snapshots: Snapshot of each source
+        fields: Field aliases to read from each source
+        normalize_chr_prefix: Add a ``chr`` prefix to bare chromosome names
+
+    Returns:
+        Mask of records matched by any source, and the values of each
+        (source, field) aligned with ``batch`` (None where missing)
+    """
+    matched = np.zeros(len(batch), dtype=bool)
+    values = {
+        (source, field): [None] * len(batch) for source, names in fields.items() for field in names
+    }
+
+    by_chrom: dict[str, list[int]] = {}
+    for i, record in enumerate(batch):
+        by_chrom.setdefault(record.chrom, []).append(i)
+
+    for chrom, indices in by_chrom.items():
+        key_chrom = chrom
+        if normalize_chr_prefix and not chrom.startswith("chr"):
+            key_chrom = f"chr{chrom}"
+        records = [batch[i] for i in indices]
+        positions = np.fromiter((r.pos for r in records), np.int64, len(records))
+        keys = np.fromiter((allele_key(r.ref, r.alt) for r in records), np.int64, len(records))
+
+        for source, names in fields.items():
+            snapshot = snapshots[source]
+            rows = snapshot.match(key_chrom, positions, keys)
+            found = rows >= 0
+            if not found.any():
+                continue
+            hit_indices = np.asarray(indices)[found]
+            matched[hit_indices] = True
+            for field in names:
+                column = values[(source, field)]
+                found_values = snapshot.values(key_chrom, field, rows[found])
+                for i, value in zip(hit_indices, found_values, strict=True):
+                    column[i] = value
+
+    return matched, values
+
+
+class LoadAnnotator:
+    """Fill VariantRecord annotation columns from snapshots during load."""
+
+    def __init__(
+        self,
+        mappings: list[AnnotationMapping],
+        snapshots: dict[str, AnnotationSnapshot | AnnotationSnapshotFile],
+        normalize_chr_prefix: bool = True,
+    ):
+        self.mappings = mappings
+        self.snapshots = snapshots
+        self.normalize_chr_prefix = normalize_chr_prefix
+        self.variants_annotated = 0
+        self._fields: dict[str, list[str]] = {}
+        for mapping in mappings:
+            self._fields.setdefault(mapping.source, []).append(mapping.field)
+
+    @classmethod
+    async def create(
+        cls,
+        conn: asyncpg.Connection | None,
+        mappings: list[AnnotationMapping],
+        cache_dir: Path | None = None,
+        snapshot_files: list[Path] | None = None,
+    ) -> "LoadAnnotator":
+        """Open a snapshot for every source the mappings use.
+
+        Sources provided by ``snapshot_files`` (directories written by
+        ``export_annotation_snapshot``) are read from them; the others are
+        opened from, or built into, the local snapshot cache.
+
+        Raises:
+            ValueError: If an exported snapshot lacks a mapped field, or a
+                source has no exported snapshot and no connection is given
+        """
+        exported = {}
+        for path in snapshot_files or []:
+            snapshot = AnnotationSnapshotFile(path)
+            exported[snapshot.source] = snapshot
+
+        fields_by_source: dict[str, list[str]] = {}
+        for mapping in mappings:
+            fields_by_source.setdefault(mapping.source, []).append(mapping.field)
+
+        snapshots: dict[str, AnnotationSnapshot | AnnotationSnapshotFile] = {}
+        for source, fields in fields_by_source.items():
+            if source in exported:
+                missing = [f for f in fields if f not in exported[source].fields]
+                if missing:
+                    raise ValueError(
+                        f"Exported snapshot of '{source}' has no field(s): {', '.join(missing)}"
+                    )
+                snapshots[source] = exported[source]
+            elif conn is None:
+                raise ValueError(f"No exported snapshot for annotation source '{source}'")
+            else:
+                snapshots[source] = await AnnotationSnapshot.open(conn, source, fields, cache_dir)
+        return cls(mappings, snapshots)
+
+    def annotate(self, batch: list[VariantRecord]) -> int:
+        """Annotate a batch in place.
+
+        Snapshot values overwrite the mapped columns wherever the source has
+        a non-missing value for the variant.
+
+        Returns:
+            Number of records that matched at least one source
+        """
+        matched, values = _lookup_batch(
+            batch, self.snapshots, self._fields, self.normalize_chr_prefix
+        )
+        for mapping in self.mappings:
+            for record, value in zip(batch, values[(mapping.source, mapping.field)], strict=True):
+                if value is not None:
+                    setattr(record, mapping.column, value)
+
+        count = int(matched.sum())
+        self.variants_annotated += count
+        return count
+
+
+def annotate_vcf_from_snapshots(
+    vcf_path: Path,
+    snapshots: list[AnnotationSnapshotFile],
+    batch_size: int = 10_000,
+    human_genome: bool = True,
+) -> tuple[list[str], Iterator[list[tuple]]]:
+    """Annotate a VCF from exported snapshots, without a database.
+
+    Args:
+        vcf_path: VCF file to annotate
+        snapshots: Exported snapshots to look variants up in
+        batch_size: Variants parsed and looked up per batch
+        human_genome: Normalize chromosome names to the ``chr`` prefix
+
+    Returns:
+        Column names (chrom, pos, ref, alt, then every snapshot field) and an
+        iterator over row batches
+    """
+    from .vcf_parser import VCFStreamingParser
+
+    by_source = {snapshot.source: snapshot for snapshot in snapshots}
+    fields = {source: list(snapshot.fields) for source, snapshot in by_source.items()}
+    lookups = [(source, field) for source, names in fields.items() for field in names]
+    columns = ["chrom", "pos", "ref", "alt", *(field for _, field in lookups)]
+
+    def batches() -> Iterator[list[tuple]]:
+        with VCFStreamingParser(
+            vcf_path, batch_size=batch_size, human_genome=human_genome
+        ) as parser:
+            for batch in parser.iter_batches():
+                _, values = _lookup_batch(batch, by_source, fields, human_genome)
+                looked_up = [values[key] for key in lookups]
+                yield [
+                    (r.chrom, r.pos, r.ref, r.alt, *(column[i] for column in looked_up))
+                    for i, r in enumerate(batch)
+                ]
+
+    return columns, batches()
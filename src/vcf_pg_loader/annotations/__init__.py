@@ -1,5 +1,6 @@
 """Annotations module for population frequency storage and parsing."""
 
+from .frequency_import import FrequencyImporter, GnomadFieldMap
 from .population_freq import (
     PopulationFreqLoader,
     PopulationFrequency,
@@ -9,6 +10,8 @@ from .population_freq import (
 from .schema import PopulationFreqSchemaManager
 
 __all__ = [
+    "FrequencyImporter",
+    "GnomadFieldMap",
     "PopulationFreqLoader",
     "PopulationFreqSchemaManager",
     "PopulationFrequency",
@@ -0,0 +1,333 @@
+"""Streaming import of population frequencies from gnomAD-annotated VCFs.
+
+The INFO keys holding each population statistic are resolved once from the
+VCF header, so each site reads only those keys instead of probing every
+candidate spelling. Values are split per ALT allele (Number=A fields), sites
+are matched against the stored variants one position-sorted window at a time
+with a merge join (no table-wide lookup dict), and frequencies are COPYed into
+``population_frequencies`` through a staging table.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from ..schema import variant_chrom_labels
+from .population_freq import (
+    GNOMAD_POPULATIONS,
+    PopulationFrequency,
+    _to_float,
+    _to_int,
+    apply_popmax_updates,
+    compute_popmax,
+    gnomad_field_candidates,
+)
+
+logger = logging.getLogger(__name__)
+
+FREQUENCY_STATS: dict[str, str] = {
+    "ac": "AC",
+    "an": "AN",
+    "af": "AF",
+    "hom_count": "nhomalt",
+    "faf_95": "faf95",
+}
+
+_FLOAT_STATS = {"af", "faf_95"}
+
+_FREQUENCY_COLUMNS = [
+    "variant_id",
+    "source",
+    "population",
+    "subset",
+    "ac",
+    "an",
+    "af",
+    "hom_count",
+    "faf_95",
+]
+
+
+@dataclass
+class GnomadFieldMap:
+    """INFO keys of each population statistic present in a VCF header.
+
+    Attributes:
+        keys: Population -> statistic (a PopulationFrequency attribute) -> INFO key
+        per_allele: INFO keys declared Number=A (one value per ALT allele)
+    """
+
+    keys: dict[str, dict[str, str]] = field(default_factory=dict)
+    per_allele: set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_header(cls, vcf, prefix: str = "") -> "GnomadFieldMap":
+        """Resolve statistic keys from the INFO definitions of a cyvcf2 VCF.
+
+        Uses the same candidate spellings, in the same order, as
+        ``parse_gnomad_info``.
+        """
+        numbers = {}
+        for header in vcf.header_iter():
+            info = header.info()
+            if info.get("HeaderType") == "INFO":
+                numbers[info["ID"]] = info.get("Number")
+
+        field_map = cls()
+        for pop in GNOMAD_POPULATIONS:
+            resolved = {}
+            for stat, name in FREQUENCY_STATS.items():
+                key = next(
+                    (k for k in gnomad_field_candidates(name, pop, prefix) if k in numbers), None
+                )
+                if key is not None:
+                    resolved[stat] = key
+                    if numbers[key] == "A":
+                        field_map.per_allele.add(key)
+            if {"ac", "an", "af"} & resolved.keys():
+                field_map.keys[pop] = resolved
+        return field_map
+
+    def __bool__(self) -> bool:
+        return bool(self.keys)
+
+    def extract(self, variant) -> list[dict[str, PopulationFrequency]]:
+        """Population frequencies of each ALT allele of a cyvcf2 variant."""
+        n_alts = len(variant.ALT)
+        values: dict[str, Any] = {}
+        for resolved in self.keys.values():
+            for key in resolved.values():
+                if key not in values:
+                    values[key] = variant.INFO.get(key)
+
+        alleles: list[dict[str, PopulationFrequency]] = [{} for _ in range(n_alts)]
+        for pop, resolved in self.keys.items():
+            for i in range(n_alts):
+                stats = {}
+                for stat, key in resolved.items():
+                    value = self._allele_value(values[key], i, key in self.per_allele)
+                    stats[stat] = _to_float(value) if stat in _FLOAT_STATS else _to_int(value)
+                if stats.get("ac") is None and stats.get("an") is None and stats.get("af") is None:
+                    continue
+                alleles[i][pop] = PopulationFrequency(**stats)
+        return alleles
+
+    @staticmethod
+    def _allele_value(value: Any, index: int, per_allele: bool) -> Any:
+        if isinstance(value, tuple | list):
+            if not per_allele:
+                return value[0] if value else None
+            return value[index] if index < len(value) else None
+        if per_allele and index > 0:
+            return None
+        return value
+
+
+@dataclass
+class _SiteAllele:
+    pos: int
+    ref: str
+    alt: str
+    frequencies: dict[str, PopulationFrequency]
+
+
+class FrequencyImporter:
+    """Stream population frequencies from a VCF into PostgreSQL.
+
+    Sites are buffered per chromosome in windows of ``batch_size`` alleles.
+    Each window is matched against the stored variants in its position range
+    (one indexed range query, merged in (pos, ref, alt) order), and its
+    frequencies and popmax values are written before the next window is read.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        subset: str = "all",
+        prefix: str = "",
+        update_popmax: bool = True,
+        batch_size: int = 10000,
+        normalize_chr_prefix: bool = True,
+    ):
+        self.source = source
+        self.subset = subset
+        self.prefix = prefix
+        self.update_popmax = update_popmax
+        self.batch_size = batch_size
+        self.normalize_chr_prefix = normalize_chr_prefix
+
+    async def import_vcf(self, conn: asyncpg.Connection, vcf_path: Path) -> dict:
+        """Import the population frequencies of every ALT allele in a VCF.
+
+        Args:
+            conn: Database connection
+            vcf_path: gnomAD (or vcfanno-annotated) VCF
+
+        Returns:
+            Dictionary with import statistics
+
+        Raises:
+            ValueError: If the header declares no population frequency fields
+        """
+        import cyvcf2
+
+        stats = {
+            "total_variants": 0,
+            "total_alleles": 0,
+            "matched_variants": 0,
+            "frequencies_inserted": 0,
+            "popmax_updated": 0,
+        }
+        chrom_labels = await variant_chrom_labels(conn)
+
+        vcf = cyvcf2.VCF(str(vcf_path))
+        try:
+            field_map = GnomadFieldMap.from_header(vcf, self.prefix)
+            if not field_map:
+                raise ValueError(
+                    f"No population frequency fields (AC_<pop>, AN_<pop>, AF_<pop>) "
+                    f"found in the header of {vcf_path}"
+                )
+
+            window: list[_SiteAllele] = []
+            window_chrom = None
+            for variant in vcf:
+                stats["total_variants"] += 1
+                chrom = variant.CHROM
+                if self.normalize_chr_prefix and not chrom.startswith("chr"):
+                    chrom = f"chr{chrom}"
+
+                if window and (chrom != window_chrom or len(window) >= self.batch_size):
+                    await self._flush(conn, window_chrom, window, chrom_labels, stats)
+                    window = []
+                window_chrom = chrom
+
+                for alt, frequencies in zip(variant.ALT, field_map.extract(variant), strict=True):
+                    stats["total_alleles"] += 1
+                    if frequencies:
+                        window.append(_SiteAllele(variant.POS, variant.REF, alt, frequencies))
+
+            if window:
+                await self._flush(conn, window_chrom, window, chrom_labels, stats)
+        finally:
+            vcf.close()
+
+        logger.info(
+            "Imported %d %s frequencies for %d of %d alleles",
+            stats["frequencies_inserted"],
+            self.source,
+            stats["matched_variants"],
+            stats["total_alleles"],
+        )
+        return stats
+
+    async def _flush(
+        self,
+        conn: asyncpg.Connection,
+        chrom: str,
+        window: list[_SiteAllele],
+        chrom_labels: set[str] | None,
+        stats: dict,
+    ) -> None:
+        """Match a window of alleles against stored variants and write it."""
+        if chrom_labels is not None and chrom not in chrom_labels:
+            return
+
+        window.sort(key=lambda a: (a.pos, a.ref, a.alt))
+        stored = await conn.fetch(
+            """
+            SELECT variant_id, pos, ref, alt FROM variants
+            WHERE chrom = $1 AND pos_range && int8range($2, $3, '[]') AND pos BETWEEN $2 AND $3
+            ORDER BY pos, ref COLLATE "C", alt COLLATE "C"
+            """,
+            chrom,
+            window[0].pos,
+            window[-1].pos,
+        )
+
+        freq_records = []
+        popmax_updates = []
+        for allele, variant_ids in _merge_join(window, stored):
+            stats["matched_variants"] += 1
+            if self.update_popmax:
+                popmax_af, popmax_pop = compute_popmax(allele.frequencies)
+            for variant_id in variant_ids:
+                freq_records.extend(
+                    (
+                        variant_id,
+                        self.source,
+                        pop,
+                        self.subset,
+                        freq.ac,
+                        freq.an,
+                        freq.af,
+                        freq.hom_count,
+                        freq.faf_95,
+                    )
+                    for pop, freq in allele.frequencies.items()
+                )
+                if self.update_popmax:
+                    popmax_updates.append((variant_id, chrom, popmax_af, popmax_pop))
+
+        if freq_records:
+            stats["frequencies_inserted"] += await _copy_frequencies(conn, freq_records)
+        if popmax_updates:
+            stats["popmax_updated"] += await apply_popmax_updates(conn, popmax_updates)
+
+
+def _merge_join(
+    window: list[_SiteAllele], stored: list[asyncpg.Record]
+) -> list[tuple[_SiteAllele, list[int]]]:
+    """Pair (pos, ref, alt)-sorted alleles with the stored variants they match.
+
+    Both inputs must be sorted by (pos, ref, alt) in code point order, which
+    for ``stored`` means ``COLLATE "C"`` rather than the database collation.
+    A key loaded more than once matches every stored copy.
+    """
+    matches = []
+    j = 0
+    for allele in window:
+        key = (allele.pos, allele.ref, allele.alt)
+        while j < len(stored) and (stored[j]["pos"], stored[j]["ref"], stored[j]["alt"]) < key:
+            j += 1
+        k = j
+        variant_ids = []
+        while k < len(stored) and (stored[k]["pos"], stored[k]["ref"], stored[k]["alt"]) == key:
+            variant_ids.append(stored[k]["variant_id"])
+            k += 1
+        if variant_ids:
+            matches.append((allele, variant_ids))
+    return matches
+
+
+async def _copy_frequencies(conn: asyncpg.Connection, records: list[tuple]) -> int:
+    """COPY frequency rows into a staging table and upsert them.
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    async with conn.transaction():
+        await conn.execute("DROP TABLE IF EXISTS pg_temp.popfreq_staging")
+        await conn.execute(f"""
+            CREATE TEMP TABLE popfreq_staging ON COMMIT DROP AS
+            SELECT {", ".join(_FREQUENCY_COLUMNS)} FROM population_frequencies WITH NO DATA
+        """)
+        await conn.copy_records_to_table(
+            "popfreq_staging", records=records, columns=_FREQUENCY_COLUMNS
+        )
+        status = await conn.execute(f"""
+            INSERT INTO population_frequencies ({", ".join(_FREQUENCY_COLUMNS)})
+            SELECT DISTINCT ON (variant_id, source, population, subset)
+                {", ".join(_FREQUENCY_COLUMNS)}
+            FROM popfreq_staging
+            ON CONFLICT (variant_id, source, population, subset) DO UPDATE SET
+                ac = EXCLUDED.ac,
+                an = EXCLUDED.an,
+                af = EXCLUDED.af,
+                hom_count = EXCLUDED.hom_count,
+                faf_95 = EXCLUDED.faf_95
+        """)
+    return int(status.split()[-1])
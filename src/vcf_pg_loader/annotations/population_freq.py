@@ -79,38 +79,11 @@ def parse_gnomad_info(
     result: dict[str, PopulationFrequency] = {}
 
     for pop in GNOMAD_POPULATIONS:
-        pop_lower = pop.lower()
-
-        ac_keys = [
-            f"{prefix}AC_{pop}",
-            f"{prefix}AC_{pop_lower}",
-            f"AC_{pop}",
-            f"AC_{pop_lower}",
-        ]
-        an_keys = [
-            f"{prefix}AN_{pop}",
-            f"{prefix}AN_{pop_lower}",
-            f"AN_{pop}",
-            f"AN_{pop_lower}",
-        ]
-        af_keys = [
-            f"{prefix}AF_{pop}",
-            f"{prefix}AF_{pop_lower}",
-            f"AF_{pop}",
-            f"AF_{pop_lower}",
-        ]
-        hom_keys = [
-            f"{prefix}nhomalt_{pop}",
-            f"{prefix}nhomalt_{pop_lower}",
-            f"nhomalt_{pop}",
-            f"nhomalt_{pop_lower}",
-        ]
-        faf_keys = [
-            f"{prefix}faf95_{pop}",
-            f"{prefix}faf95_{pop_lower}",
-            f"faf95_{pop}",
-            f"faf95_{pop_lower}",
-        ]
+        ac_keys = gnomad_field_candidates("AC", pop, prefix)
+        an_keys = gnomad_field_candidates("AN", pop, prefix)
+        af_keys = gnomad_field_candidates("AF", pop, prefix)
+        hom_keys = gnomad_field_candidates("nhomalt", pop, prefix)
+        faf_keys = gnomad_field_candidates("faf95", pop, prefix)
 
         ac = _get_first_value(info, ac_keys)
         an = _get_first_value(info, an_keys)
@@ -133,6 +106,26 @@ def parse_gnomad_info(
     return result
 
 
+def gnomad_field_candidates(stat: str, population: str, prefix: str = "") -> list[str]:
+    """INFO keys that may hold a per-population statistic, in lookup order.
+
+    Args:
+        stat: Statistic name as spelled in gnomAD (AC, AN, AF, nhomalt, faf95)
+        population: Population code (e.g. AFR)
+        prefix: Optional prefix for field names (e.g., "gnomad_" for vcfanno output)
+
+    Returns:
+        Candidate keys, prefixed spellings first
+    """
+    pop_lower = population.lower()
+    return [
+        f"{prefix}{stat}_{population}",
+        f"{prefix}{stat}_{pop_lower}",
+        f"{stat}_{population}",
+        f"{stat}_{pop_lower}",
+    ]
+
+
 def _get_first_value(info: dict, keys: list[str]) -> Any:
     """Get first matching value from info dict."""
     for key in keys:
@@ -216,6 +209,65 @@ def compute_popmax(
     return max_af, max_pop
 
 
+async def apply_popmax_updates(
+    conn: asyncpg.Connection,
+    updates: list[tuple[int, str | None, float | None, str | None]],
+) -> int:
+    """Set popmax on variants with one set-based UPDATE per chromosome.
+
+    Updates are COPYed into a staging table whose chrom column has the
+    variants table's type. Rows without a chromosome get it from a single
+    join against variants. Each chromosome is then applied with an
+    ``UPDATE ... FROM`` that joins on (chrom, variant_id), so it touches
+    one partition through its primary key instead of probing every
+    partition once per variant.
+
+    Args:
+        conn: Database connection
+        updates: (variant_id, chrom or None, popmax_af, popmax_pop) tuples
+
+    Returns:
+        Number of variants updated
+    """
+    updated = 0
+    async with conn.transaction():
+        await conn.execute("DROP TABLE IF EXISTS pg_temp.popmax_staging")
+        await conn.execute("""
+            CREATE TEMP TABLE popmax_staging ON COMMIT DROP AS
+            SELECT variant_id, chrom, gnomad_popmax_af, gnomad_popmax_pop
+            FROM variants WITH NO DATA
+        """)
+        await conn.copy_records_to_table(
+            "popmax_staging",
+            records=updates,
+            columns=["variant_id", "chrom", "gnomad_popmax_af", "gnomad_popmax_pop"],
+        )
+        if any(chrom is None for _, chrom, _, _ in updates):
+            await conn.execute("""
+                UPDATE popmax_staging s SET chrom = v.chrom
+                FROM variants v
+                WHERE s.chrom IS NULL AND v.variant_id = s.variant_id
+            """)
+        await conn.execute("ANALYZE popmax_staging")
+
+        chroms = await conn.fetch(
+            "SELECT DISTINCT chrom FROM popmax_staging WHERE chrom IS NOT NULL"
+        )
+        for row in chroms:
+            status = await conn.execute(
+                """
+                UPDATE variants v
+                SET gnomad_popmax_af = s.gnomad_popmax_af,
+                    gnomad_popmax_pop = s.gnomad_popmax_pop
+                FROM popmax_staging s
+                WHERE v.chrom = $1 AND s.chrom = $1 AND v.variant_id = s.variant_id
+                """,
+                row["chrom"],
+            )
+            updated += int(status.split()[-1])
+    return updated
+
+
 class PopulationFreqLoader:
     """Load population frequencies into PostgreSQL."""
 
@@ -300,7 +352,7 @@ class PopulationFreqLoader:
     async def import_batch_frequencies(
         self,
         conn: asyncpg.Connection,
-        batch: list[tuple[int, dict[str, Any]]],
+        batch: list[tuple[int, dict[str, Any]] | tuple[int, dict[str, Any], str]],
         source: str,
         subset: str = "all",
         prefix: str = "",
@@ -310,7 +362,8 @@ class PopulationFreqLoader:
 
         Args:
             conn: Database connection
-            batch: List of (variant_id, info_dict) tuples
+            batch: List of (variant_id, info_dict) or (variant_id, info_dict, chrom)
+                tuples. Passing chrom lets the popmax update skip looking it up.
             source: Frequency source
             subset: Data subset
             prefix: Field name prefix
@@ -322,7 +375,7 @@ class PopulationFreqLoader:
         freq_records = []
         popmax_updates = []
 
-        for variant_id, info in batch:
+        for variant_id, info, *chrom in batch:
             frequencies = parse_gnomad_info(info, prefix)
 
             for pop, freq in frequencies.items():
@@ -342,7 +395,9 @@ class PopulationFreqLoader:
 
             if update_popmax and frequencies:
                 popmax_af, popmax_pop = compute_popmax(frequencies)
-                popmax_updates.append((variant_id, popmax_af, popmax_pop))
+                popmax_updates.append(
+                    (variant_id, chrom[0] if chrom else None, popmax_af, popmax_pop)
+                )
 
         if freq_records:
             await conn.executemany(
@@ -360,18 +415,12 @@ class PopulationFreqLoader:
                 freq_records,
             )
 
+        popmax_updated = 0
         if popmax_updates:
-            await conn.executemany(
-                """
-                UPDATE variants
-                SET gnomad_popmax_af = $2, gnomad_popmax_pop = $3
-                WHERE variant_id = $1
-                """,
-                popmax_updates,
-            )
+            popmax_updated = await apply_popmax_updates(conn, popmax_updates)
 
         return {
             "frequencies_inserted": len(freq_records),
             "variants_processed": len(batch),
-            "popmax_updated": len(popmax_updates),
+            "popmax_updated": popmax_updated,
         }
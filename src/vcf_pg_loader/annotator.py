@@ -1,12 +1,15 @@
 """Variant annotator using SQL JOINs against reference databases."""
+import json
 import logging
-import re
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from typing import Any
 
 import asyncpg
 
 from .annotation_schema import AnnotationSchemaManager, validate_identifier
-from .expression import FilterExpressionParser
+from .export.results import ResultWriter, stream_query_results
+from .expression import FilterConjunct, FilterExpressionParser
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,7 @@ class VariantAnnotator:
         self.schema_manager = AnnotationSchemaManager()
         self.expression_parser = FilterExpressionParser()
         self._field_cache: dict[str, list[str]] = {}
+        self._row_estimates: dict[str, float] = {}
 
     async def annotate_variants(
         self,
@@ -31,6 +35,7 @@ class VariantAnnotator:
         load_batch_id: str | None = None,
         filter_expr: str | None = None,
         limit: int | None = None,
+        chrom: str | None = None,
     ) -> list[dict[str, Any]]:
         """Annotate variants from the variants table with reference data.
 
@@ -39,6 +44,8 @@ class VariantAnnotator:
             load_batch_id: Optional load batch ID to filter variants
             filter_expr: Optional filter expression (echtvar-style)
             limit: Optional limit on number of results
+            chrom: Optional chromosome; only its variants and annotation
+                partitions are scanned
 
         Returns:
             List of annotated variant dictionaries
@@ -51,14 +58,65 @@ class VariantAnnotator:
             filter_expr=filter_expr,
             available_fields=available_fields,
             limit=limit,
+            chrom=chrom,
         )
 
         logger.debug(f"Executing annotation query: {query}")
 
-        rows = await self.conn.fetch(query, *params)
+        rows = await self._fetch_partitionwise(query, *params)
 
         return [dict(row) for row in rows]
 
+    async def write_annotations(
+        self,
+        writer: ResultWriter,
+        sources: list[str],
+        load_batch_id: str | None = None,
+        filter_expr: str | None = None,
+        limit: int | None = None,
+        chrom: str | None = None,
+        chunk_size: int = 10000,
+    ) -> int:
+        """Stream annotated variants to a result writer.
+
+        Takes the same selection arguments as ``annotate_variants``, but reads
+        rows through a server-side cursor and writes them chunk by chunk
+        instead of building a list.
+
+        Args:
+            writer: Destination writer (see ``export.results.open_result_writer``)
+            sources: List of annotation source names to join
+            load_batch_id: Optional load batch ID to filter variants
+            filter_expr: Optional filter expression (echtvar-style)
+            limit: Optional limit on number of results
+            chrom: Optional chromosome to restrict to
+            chunk_size: Rows fetched and written per round trip
+
+        Returns:
+            Number of annotated variants written
+        """
+        available_fields = await self._get_available_fields(sources)
+
+        query, params = await self._build_annotation_query(
+            sources=sources,
+            load_batch_id=load_batch_id,
+            filter_expr=filter_expr,
+            available_fields=available_fields,
+            limit=limit,
+            chrom=chrom,
+        )
+
+        logger.debug(f"Streaming annotation query: {query}")
+
+        return await stream_query_results(
+            self.conn,
+            query,
+            *params,
+            writer=writer,
+            chunk_size=chunk_size,
+            settings={"enable_partitionwise_join": "on"},
+        )
+
     async def annotate_batch(
         self,
         variants: list[tuple[str, int, str, str]],
@@ -78,23 +136,104 @@ class VariantAnnotator:
         if not variants:
             return []
 
+        return [
+            row
+            async for row in self.iter_annotate_batch(variants, sources, filter_expr=filter_expr)
+        ]
+
+    async def iter_annotate_batch(
+        self,
+        variants: Iterable[tuple[str, int, str, str]] | AsyncIterable[tuple[str, int, str, str]],
+        sources: list[str],
+        filter_expr: str | None = None,
+        prefetch: int = 10000,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream annotations for a batch of variants.
+
+        The variants are COPYed into a uniquely named, indexed temp table that
+        is dropped at the end of the enclosing transaction. The join is read
+        back through a server-side cursor, so neither the input nor the
+        results need to fit in memory. Do not issue other queries on the
+        connection while iterating. The transaction ends when the generator
+        is exhausted or closed; when a caller may stop early, close it with
+        ``contextlib.aclosing`` so the connection is usable afterwards.
+
+        Args:
+            variants: (chrom, pos, ref, alt) tuples, from a list or any
+                (async) iterable
+            sources: List of annotation source names
+            filter_expr: Optional filter expression
+            prefetch: Rows fetched from the cursor per round trip
+
+        Yields:
+            Annotated variant dictionaries
+        """
         available_fields = await self._get_available_fields(sources)
 
-        temp_table = await self._create_temp_variant_table(variants)
+        async with self.conn.transaction():
+            temp_table = await self._create_temp_variant_table(variants, sources)
 
-        try:
-            query = await self._build_batch_annotation_query(
+            query, params = await self._build_batch_annotation_query(
                 temp_table=temp_table,
                 sources=sources,
                 filter_expr=filter_expr,
                 available_fields=available_fields,
             )
+            logger.debug(f"Executing batch annotation query: {query}")
+
+            async for row in self.conn.cursor(query, *params, prefetch=prefetch):
+                yield dict(row)
+
+    async def explain(
+        self,
+        sources: list[str],
+        load_batch_id: str | None = None,
+        filter_expr: str | None = None,
+        limit: int | None = None,
+        chrom: str | None = None,
+        analyze: bool = False,
+    ) -> str:
+        """Show the plan ``annotate_variants`` would run.
 
-            rows = await self.conn.fetch(query)
-            return [dict(row) for row in rows]
+        Args:
+            sources: List of annotation source names to join
+            load_batch_id: Optional load batch ID to filter variants
+            filter_expr: Optional filter expression (echtvar-style)
+            limit: Optional limit on number of results
+            chrom: Optional chromosome to restrict to
+            analyze: Execute the query and report actual row counts and timings
 
-        finally:
-            await self.conn.execute(f"DROP TABLE IF EXISTS {temp_table}")
+        Returns:
+            The generated SQL, its parameters and the EXPLAIN output
+        """
+        available_fields = await self._get_available_fields(sources)
+
+        query, params = await self._build_annotation_query(
+            sources=sources,
+            load_batch_id=load_batch_id,
+            filter_expr=filter_expr,
+            available_fields=available_fields,
+            limit=limit,
+            chrom=chrom,
+        )
+
+        options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+        rows = await self._fetch_partitionwise(f"EXPLAIN ({options}) {query}", *params)
+
+        lines = [" ".join(query.split()), f"Parameters: {params}", ""]
+        lines.extend(r[0] for r in rows)
+        return "\n".join(lines)
+
+    async def _fetch_partitionwise(self, query: str, *params) -> list[asyncpg.Record]:
+        """Run a query with partition-wise joins enabled for its transaction.
+
+        Annotation tables share the chromosome partition bounds of the variants
+        table, so joins can run partition by partition instead of across the
+        whole tables.
+        """
+        async with self.conn.transaction():
+            await self.conn.execute("SET LOCAL enable_partitionwise_join = on")
+            return await self.conn.fetch(query, *params)
 
     async def _get_source_fields_cached(self, source: str) -> list[str]:
         """Get fields for a source, using cache to avoid repeated DB queries."""
@@ -121,6 +260,7 @@ class VariantAnnotator:
         filter_expr: str | None,
         available_fields: set[str],
         limit: int | None,
+        chrom: str | None = None,
     ) -> tuple[str, list]:
         """Build the SQL query for annotation lookup."""
         select_parts = [
@@ -134,25 +274,12 @@ class VariantAnnotator:
             "v.impact",
         ]
 
-        join_parts = []
         for i, source in enumerate(sources):
             validate_identifier(source, "source name")
-            table_name = f"anno_{source}"
-            alias = f"a{i}"
-
             fields = await self._get_source_fields_cached(source)
             for field in fields:
                 validate_identifier(field, "field name")
-                select_parts.append(f"{alias}.{field}")
-
-            join = f"""
-                LEFT JOIN {table_name} {alias}
-                ON v.chrom = {alias}.chrom
-                AND v.pos = {alias}.pos
-                AND v.ref = {alias}.ref
-                AND v.alt = {alias}.alt
-            """
-            join_parts.append(join)
+                select_parts.append(f"a{i}.{field}")
 
         where_parts = []
         params: list = []
@@ -160,10 +287,21 @@ class VariantAnnotator:
             params.append(load_batch_id)
             where_parts.append(f"v.load_batch_id = ${len(params)}")
 
-        if filter_expr:
-            sql_filter = self.expression_parser.parse(filter_expr, available_fields)
-            sql_filter = await self._qualify_filter_fields(sql_filter, sources)
-            where_parts.append(f"({sql_filter})")
+        if chrom:
+            if self.normalize_chr_prefix and not chrom.startswith("chr"):
+                chrom = f"chr{chrom}"
+            params.append(chrom)
+            where_parts.append(f"v.chrom = ${len(params)}")
+
+        sql_filter, join_order = await self._plan_filter(
+            filter_expr, sources, available_fields, params
+        )
+        if sql_filter:
+            where_parts.append(sql_filter)
+
+        join_parts = [
+            self._join_clause(sources[i], i, "v.chrom", "v", inner) for i, inner in join_order
+        ]
 
         query = f"""
             SELECT {', '.join(select_parts)}
@@ -186,29 +324,24 @@ class VariantAnnotator:
         sources: list[str],
         filter_expr: str | None,
         available_fields: set[str],
-    ) -> str:
+    ) -> tuple[str, list]:
         """Build the SQL query for batch annotation."""
         select_parts = ["t.chrom", "t.pos", "t.ref", "t.alt"]
 
-        join_parts = []
         for i, source in enumerate(sources):
             validate_identifier(source, "source name")
-            table_name = f"anno_{source}"
-            alias = f"a{i}"
-
             fields = await self._get_source_fields_cached(source)
             for field in fields:
                 validate_identifier(field, "field name")
-                select_parts.append(f"{alias}.{field}")
-
-            join = f"""
-                LEFT JOIN {table_name} {alias}
-                ON t.chrom = {alias}.chrom
-                AND t.pos = {alias}.pos
-                AND t.ref = {alias}.ref
-                AND t.alt = {alias}.alt
-            """
-            join_parts.append(join)
+                select_parts.append(f"a{i}.{field}")
+
+        params: list = []
+        sql_filter, join_order = await self._plan_filter(
+            filter_expr, sources, available_fields, params
+        )
+        join_parts = [
+            self._join_clause(sources[i], i, "t.chrom_key", "t", inner) for i, inner in join_order
+        ]
 
         query = f"""
             SELECT {', '.join(select_parts)}
@@ -216,58 +349,179 @@ class VariantAnnotator:
             {' '.join(join_parts)}
         """
 
-        if filter_expr:
-            sql_filter = self.expression_parser.parse(filter_expr, available_fields)
-            sql_filter = await self._qualify_filter_fields(sql_filter, sources)
+        if sql_filter:
             query += f" WHERE {sql_filter}"
 
-        return query
+        return query, params
 
     async def _create_temp_variant_table(
         self,
-        variants: list[tuple[str, int, str, str]],
+        variants: Iterable[tuple[str, int, str, str]] | AsyncIterable[tuple[str, int, str, str]],
+        sources: list[str],
     ) -> str:
-        """Create a temporary table with variants to annotate."""
-        temp_table = "temp_variants_to_annotate"
+        """COPY variants into a new temp table that is dropped on commit.
+
+        Besides the caller's chromosome, each row stores chrom_key, typed like
+        the annotation tables' chrom column, so the join can use their primary
+        key. Chromosomes outside a chromosome enum get a NULL key and match
+        nothing.
+        """
+        temp_table = f"temp_annotate_{uuid.uuid4().hex}"
+        chrom_type, labels = await self._annotation_chrom_type(sources[0])
 
         await self.conn.execute(f"""
             CREATE TEMP TABLE {temp_table} (
                 chrom TEXT NOT NULL,
                 pos BIGINT NOT NULL,
                 ref TEXT NOT NULL,
-                alt TEXT NOT NULL
-            )
+                alt TEXT NOT NULL,
+                chrom_key {chrom_type}
+            ) ON COMMIT DROP
         """)
 
-        await self.conn.executemany(
-            f"INSERT INTO {temp_table} (chrom, pos, ref, alt) VALUES ($1, $2, $3, $4)",
-            variants,
+        def to_record(variant: tuple[str, int, str, str]) -> tuple:
+            chrom, pos, ref, alt = variant
+            chrom_key = chrom
+            if labels is not None:
+                if self.normalize_chr_prefix and not chrom.startswith("chr"):
+                    chrom_key = f"chr{chrom}"
+                if chrom_key not in labels:
+                    chrom_key = None
+            return (chrom, pos, ref, alt, chrom_key)
+
+        if isinstance(variants, AsyncIterable):
+            records = (to_record(v) async for v in variants)
+        else:
+            records = (to_record(v) for v in variants)
+
+        await self.conn.copy_records_to_table(
+            temp_table,
+            records=records,
+            columns=["chrom", "pos", "ref", "alt", "chrom_key"],
         )
+        await self.conn.execute(f"CREATE INDEX ON {temp_table} (chrom_key, pos, ref, alt)")
+        await self.conn.execute(f"ANALYZE {temp_table}")
 
         return temp_table
 
-    async def _qualify_filter_fields(
+    async def _annotation_chrom_type(self, source: str) -> tuple[str, set[str] | None]:
+        """Return the chrom column type of a source and its labels if it is an enum."""
+        validate_identifier(source, "source name")
+        row = await self.conn.fetchrow(
+            """
+            SELECT format_type(a.atttypid, a.atttypmod) AS chrom_type,
+                   a.atttypid AS type_oid,
+                   t.typtype = 'e' AS is_enum
+            FROM pg_attribute a
+            JOIN pg_type t ON t.oid = a.atttypid
+            WHERE a.attrelid = $1::regclass AND a.attname = 'chrom'
+            """,
+            f"anno_{source}",
+        )
+
+        if not row["is_enum"]:
+            return row["chrom_type"], None
+
+        labels = await self.conn.fetch(
+            "SELECT enumlabel FROM pg_enum WHERE enumtypid = $1", row["type_oid"]
+        )
+        return row["chrom_type"], {r["enumlabel"] for r in labels}
+
+    @staticmethod
+    def _join_clause(
+        source: str, index: int, chrom_column: str, row_alias: str, inner: bool
+    ) -> str:
+        """Join annotation source ``index`` on the variant key."""
+        alias = f"a{index}"
+        return f"""
+            {'JOIN' if inner else 'LEFT JOIN'} anno_{source} {alias}
+            ON {chrom_column} = {alias}.chrom
+            AND {row_alias}.pos = {alias}.pos
+            AND {row_alias}.ref = {alias}.ref
+            AND {row_alias}.alt = {alias}.alt
+        """
+
+    async def _plan_filter(
         self,
-        sql_filter: str,
+        filter_expr: str | None,
         sources: list[str],
-    ) -> str:
-        """Add table aliases to field names in the filter expression."""
-        field_to_alias: dict[str, str] = {}
+        available_fields: set[str],
+        params: list,
+    ) -> tuple[str | None, list[tuple[int, bool]]]:
+        """Compile the filter and choose the order of the annotation joins.
+
+        Filter literals are bound as parameters appended to ``params``. When
+        several sources are joined, each top-level AND term that references a
+        single source is costed with the planner's row estimate; terms and
+        sources are ordered most selective first. Sources whose columns the
+        filter requires to be non-NULL are inner-joined, which is equivalent
+        to the filtered LEFT JOIN and spelled out for the planner.
+
+        Returns:
+            WHERE clause SQL (None without a filter) and
+            (source index, inner join) pairs in join order
+        """
+        join_order = [(i, False) for i in range(len(sources))]
+        if not filter_expr:
+            return None, join_order
+
+        field_to_index: dict[str, int] = {}
         for i, source in enumerate(sources):
-            alias = f"a{i}"
-            fields = await self._get_source_fields_cached(source)
-            for field in fields:
-                if field not in field_to_alias:
-                    field_to_alias[field] = alias
-
-        for field, alias in sorted(field_to_alias.items(), key=lambda x: -len(x[0])):
-            sql_filter = re.sub(
-                rf'\b{re.escape(field)}\b',
-                f"{alias}.{field}",
-                sql_filter
-            )
+            for field in await self._get_source_fields_cached(source):
+                field_to_index.setdefault(field, i)
+        columns = {
+            field: f"a{i}.{field}"
+            for field, i in field_to_index.items()
+            if field in available_fields
+        }
+
+        compiled = self.expression_parser.compile(filter_expr, columns, param_offset=len(params))
+        params.extend(compiled.params)
+
+        selectivity: dict[int, float] = {}
+        source_selectivity = [1.0] * len(sources)
+        inner: set[int] = set()
+        for conjunct in compiled.conjuncts:
+            inner.update(field_to_index[f] for f in conjunct.strict_fields)
+            owners = {field_to_index[f] for f in conjunct.fields}
+            if len(sources) > 1 and len(owners) == 1:
+                index = owners.pop()
+                estimate = await self._estimate_selectivity(sources[index], index, conjunct)
+                selectivity[id(conjunct)] = estimate
+                source_selectivity[index] *= estimate
+
+        conjuncts = sorted(compiled.conjuncts, key=lambda c: selectivity.get(id(c), 1.0))
+        order = sorted(
+            range(len(sources)), key=lambda i: (i not in inner, source_selectivity[i])
+        )
+        return " AND ".join(c.sql for c in conjuncts), [(i, i in inner) for i in order]
+
+    async def _estimate_selectivity(
+        self, source: str, index: int, conjunct: FilterConjunct
+    ) -> float:
+        """Planner-estimated fraction of a source's rows matching a filter term."""
+        table_name = f"anno_{source}"
+        alias = f"a{index}"
+        predicate = self.expression_parser.render(
+            conjunct.node, {f: f"{alias}.{f}" for f in conjunct.fields}
+        )
 
-        return sql_filter
+        total = await self._estimate_rows(f"SELECT 1 FROM {table_name}")
+        if not total:
+            return 1.0
+        matching = await self._estimate_rows(
+            f"SELECT 1 FROM {table_name} {alias} WHERE {predicate}"
+        )
+        return min(matching / total, 1.0)
+
+    async def _estimate_rows(self, query: str) -> float:
+        """Planner row estimate for a query, cached per query text."""
+        if query not in self._row_estimates:
+            plan = await self.conn.fetchval(f"EXPLAIN (FORMAT JSON) {query}")
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            self._row_estimates[query] = plan[0]["Plan"]["Plan Rows"]
+        return self._row_estimates[query]
 
 
 async def annotate_query_vcf(
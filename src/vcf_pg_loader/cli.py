@@ -17,6 +17,7 @@ from . import __version__
 from .annotation_config import load_field_config
 from .annotation_loader import AnnotationLoader
 from .annotation_schema import AnnotationSchemaManager
+from .annotation_snapshot import AnnotationMapping
 from .annotator import VariantAnnotator
 from .config import load_config
 from .expression import FilterExpressionParser
@@ -332,6 +333,14 @@ def load(
     dosage_only: bool = typer.Option(
         False, "--dosage-only", help="Store only dosage values, not hard calls (space saving)"
     ),
+    genotype_storage: Annotated[
+        str,
+        typer.Option(
+            "--genotype-storage",
+            help="Genotype storage mode: rows (one row per variant/sample) or packed "
+            "(2-bit calls and uint8 dosages per variant sample block)",
+        ),
+    ] = "rows",
     parallel_query_workers: Annotated[
         int | None,
         typer.Option(
@@ -340,6 +349,61 @@ def load(
             "Higher values speed up PRS queries across chromosome partitions.",
         ),
     ] = None,
+    annotate_on_load: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--annotate",
+            help="Fill a variant column from a loaded annotation source while loading, "
+            "as column=source.field (e.g. af_gnomad=gnomad_v3.gnomad_af). Repeatable.",
+        ),
+    ] = None,
+    annotation_cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--annotation-cache-dir",
+            help="Directory for local annotation snapshots (default: ~/.vcf-pg-loader/annotations)",
+        ),
+    ] = None,
+    annotation_snapshots: Annotated[
+        list[Path] | None,
+        typer.Option(
+            "--annotation-snapshot",
+            help="Exported annotation snapshot (from export-annotation) to read --annotate "
+            "sources from instead of the database. Repeatable.",
+        ),
+    ] = None,
+    ld_block_population: Annotated[
+        str | None,
+        typer.Option(
+            "--ld-blocks",
+            help="Assign ld_block_id from loaded LD blocks of this population "
+            "(EUR, AFR, EAS, SAS) while loading",
+        ),
+    ] = None,
+    ld_block_build: Annotated[
+        str | None,
+        typer.Option(
+            "--ld-block-build",
+            help="Genome build of the LD blocks (grch37, grch38); "
+            "required when several builds are loaded",
+        ),
+    ] = None,
+    flag_panel: Annotated[
+        str | None,
+        typer.Option(
+            "--flag-panel",
+            help="Flag variants in this loaded reference panel while loading: "
+            "in_hapmap3/hapmap3_rsid for HapMap3 panels (hapmap3_grch38), "
+            "the panel's panel_mask bit for any other panel",
+        ),
+    ] = None,
+    panel_mask_panels: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--panel",
+            help="Set this loaded reference panel's bit in panel_mask while loading. Repeatable.",
+        ),
+    ] = None,
 ) -> None:
     """Load a VCF file into PostgreSQL.
 
@@ -362,6 +426,28 @@ def load(
         console.print(f"[red]Error: VCF file not found: {vcf_path}[/red]")
         raise typer.Exit(1)
 
+    if genotype_storage not in ("rows", "packed"):
+        console.print(
+            f"[red]Error: Unknown genotype storage '{genotype_storage}'. "
+            "Choose rows or packed[/red]"
+        )
+        raise typer.Exit(1)
+
+    try:
+        annotation_mappings = [AnnotationMapping.parse(spec) for spec in annotate_on_load or []]
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    if ld_block_population:
+        ld_block_population = ld_block_population.upper()
+        if ld_block_population not in ("EUR", "AFR", "EAS", "SAS"):
+            console.print(
+                f"[red]Error: Invalid population '{ld_block_population}'. "
+                "Use EUR, AFR, EAS, or SAS[/red]"
+            )
+            raise typer.Exit(1)
+
     try:
         resolved_db_url = _resolve_database_url(
             db_url, quiet, host, port, database, user, db_password_env
@@ -401,6 +487,14 @@ def load(
             store_genotypes=store_genotypes,
             adj_filter=adj_filter,
             dosage_only=dosage_only,
+            genotype_storage=genotype_storage,
+            annotate_on_load=annotation_mappings or None,
+            annotation_cache_dir=annotation_cache_dir,
+            annotation_snapshots=annotation_snapshots or None,
+            ld_block_population=ld_block_population,
+            ld_block_build=ld_block_build,
+            flag_panel=flag_panel,
+            panel_mask_panels=panel_mask_panels or None,
         )
     else:
         tls_config = TLSConfig(require_tls=require_tls)
@@ -421,6 +515,14 @@ def load(
             store_genotypes=store_genotypes,
             adj_filter=adj_filter,
             dosage_only=dosage_only,
+            genotype_storage=genotype_storage,
+            annotate_on_load=annotation_mappings or None,
+            annotation_cache_dir=annotation_cache_dir,
+            annotation_snapshots=annotation_snapshots or None,
+            ld_block_population=ld_block_population,
+            ld_block_build=ld_block_build,
+            flag_panel=flag_panel,
+            panel_mask_panels=panel_mask_panels or None,
         )
 
     loader = VCFLoader(resolved_db_url, config)
@@ -471,6 +573,8 @@ def load(
                     )
                 else:
                     console.print(f"[green]✓[/green] Loaded {result['variants_loaded']:,} variants")
+                if "variants_annotated" in result:
+                    console.print(f"  Annotated on load: {result['variants_annotated']:,} variants")
                 console.print(f"  Batch ID: {result['load_batch_id']}")
                 console.print(f"  File SHA256: {result['file_hash']}")
             report_data = {
@@ -779,6 +883,14 @@ def load_annotation(
     human_genome: bool = typer.Option(
         True, "--human-genome/--no-human-genome", help="Use human chromosome enum type"
     ),
+    assume_unique: bool = typer.Option(
+        False,
+        "--assume-unique",
+        help="Skip deduplication for sources known to have one record per variant",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Worker processes for per-contig loading of indexed VCFs"
+    ),
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
 ) -> None:
     """Load an annotation VCF file as a reference database.
@@ -824,7 +936,9 @@ def load_annotation(
             schema_manager = SchemaManager(human_genome=human_genome)
             await schema_manager.create_schema(conn)
 
-            loader = AnnotationLoader(human_genome=human_genome)
+            loader = AnnotationLoader(
+                human_genome=human_genome, assume_unique=assume_unique, workers=workers
+            )
             result = await loader.load_annotation_source(
                 vcf_path=vcf_path,
                 source_name=name,
@@ -832,6 +946,8 @@ def load_annotation(
                 conn=conn,
                 version=version,
                 source_type=source_type,
+                db_url=resolved_db_url,
+                ssl=_get_ssl_param(),
             )
             return result
         finally:
@@ -899,9 +1015,25 @@ def list_annotations(
         raise typer.Exit(1) from None
 
 
+def _open_rsid_index(path: Path | None):
+    """Open an rsID index directory, or return None if no path was given."""
+    if path is None:
+        return None
+
+    from .references.rsid_index import RsidIndex
+
+    try:
+        return RsidIndex.open(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error: Cannot open rsID index {path}: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
 @app.command("import-gwas")
 def import_gwas(
-    tsv_path: Annotated[Path, typer.Argument(help="Path to GWAS-SSF format TSV file")],
+    tsv_path: Annotated[
+        Path, typer.Argument(help="Path to GWAS-SSF format TSV file (can be gzipped)")
+    ],
     study_accession: Annotated[
         str,
         typer.Option("--study-accession", "-a", help="GWAS Catalog accession (e.g., GCST90002357)"),
@@ -923,6 +1055,10 @@ def import_gwas(
     genome_build: Annotated[
         str, typer.Option("--genome-build", "-g", help="Reference genome build")
     ] = "GRCh38",
+    rsid_index_path: Annotated[
+        Path | None,
+        typer.Option("--rsid-index", help="rsID index (build-rsid-index) for rsID-only records"),
+    ] = None,
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
@@ -932,9 +1068,11 @@ def import_gwas(
     Creates study metadata record and imports per-variant summary statistics.
     Matches variants to existing database variants by chr:pos:ref:alt or rsID.
     Computes is_effect_allele_alt to track effect allele orientation vs VCF.
+    With --rsid-index, records still unmatched are placed through their rsID.
 
     Example:
         vcf-pg-loader import-gwas gwas.tsv -a GCST90002357 -t "Height" -n 253288
+        vcf-pg-loader import-gwas gwas.tsv -a GCST90002357 --rsid-index ./rsid_index
     """
     setup_logging(verbose, quiet)
 
@@ -942,6 +1080,8 @@ def import_gwas(
         console.print(f"[red]Error: TSV file not found: {tsv_path}[/red]")
         raise typer.Exit(1)
 
+    rsid_index = _open_rsid_index(rsid_index_path)
+
     try:
         resolved_db_url = _resolve_database_url(db_url, quiet)
     except CredentialValidationError as e:
@@ -973,6 +1113,7 @@ def import_gwas(
                 n_cases=n_cases,
                 n_controls=n_controls,
                 genome_build=genome_build,
+                rsid_index=rsid_index,
             )
 
             await gwas_schema.create_gwas_indexes(conn)
@@ -1056,9 +1197,107 @@ def list_studies(
         raise typer.Exit(1) from None
 
 
+@app.command("drop-study")
+def drop_study(
+    study_accession: Annotated[str, typer.Argument(help="GWAS Catalog accession of the study")],
+    force: bool = typer.Option(False, "--force", "-f", help="Skip confirmation prompt"),
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+) -> None:
+    """Delete a GWAS study and its summary statistics.
+
+    The study's gwas_summary_stats partition is dropped as a whole.
+    """
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    if not force:
+        confirm = typer.confirm(f"This will delete study {study_accession}. Are you sure?")
+        if not confirm:
+            console.print("Cancelled")
+            return
+
+    async def run_drop() -> bool:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            from .gwas import GWASSchemaManager
+
+            gwas_schema = GWASSchemaManager()
+            study = await gwas_schema.get_study_by_accession(conn, study_accession)
+            if study is None:
+                return False
+            await gwas_schema.drop_study(conn, study["study_id"])
+            return True
+        finally:
+            await conn.close()
+
+    try:
+        dropped = asyncio.run(run_drop())
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    if not dropped:
+        console.print(f"[red]Error: Study not found: {study_accession}[/red]")
+        raise typer.Exit(1)
+    if not quiet:
+        console.print(f"[green]✓[/green] Dropped study {study_accession}")
+
+
+@app.command("migrate-gwas-partitions")
+def migrate_gwas_partitions(
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+) -> None:
+    """Move an unpartitioned gwas_summary_stats table into per-study partitions.
+
+    Databases set up before per-study partitions have a plain
+    gwas_summary_stats table that imports and drop-study reject. This copies
+    each study's rows into its own partition of a new partitioned table and
+    drops the old one, in a single transaction. It does nothing if the table
+    is already partitioned.
+    """
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    async def run_migrate() -> int:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            from .gwas import GWASSchemaManager
+
+            return await GWASSchemaManager().migrate_stats_partitions(conn)
+        finally:
+            await conn.close()
+
+    try:
+        migrated = asyncio.run(run_migrate())
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    if not quiet:
+        console.print(f"[green]✓[/green] Migrated {migrated} studies to per-study partitions")
+
+
 @app.command("import-pgs")
 def import_pgs(
-    pgs_path: Annotated[Path, typer.Argument(help="Path to PGS Catalog scoring file")],
+    pgs_path: Annotated[
+        Path,
+        typer.Argument(
+            help="PGS Catalog scoring file (can be gzipped), or with --batch a directory "
+            "of scoring files or a manifest"
+        ),
+    ],
     pgs_id: Annotated[
         str | None,
         typer.Option("--pgs-id", "-i", help="Override PGS ID from file header"),
@@ -1067,6 +1306,22 @@ def import_pgs(
         bool,
         typer.Option("--validate-build", help="Validate genome build matches database"),
     ] = False,
+    rsid_index_path: Annotated[
+        Path | None,
+        typer.Option("--rsid-index", help="rsID index (build-rsid-index) for rsID-only records"),
+    ] = None,
+    batch: Annotated[
+        bool,
+        typer.Option("--batch", help="Import every scoring file of a directory or manifest"),
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option("--workers", "-w", help="Parser processes for --batch"),
+    ] = 4,
+    report: Annotated[
+        Path | None,
+        typer.Option("--report", help="Write the per-score --batch report to this TSV file"),
+    ] = None,
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
@@ -1075,14 +1330,22 @@ def import_pgs(
 
     Parses PGS Catalog format files with header metadata (###PGS CATALOG SCORING FILE)
     and imports per-variant weights. Matches variants to existing database variants
-    by chr:pos:ref:alt or rsID.
+    by chr:pos:ref:alt or rsID. With --rsid-index, rsID-only weights (and rsIDs
+    merged by dbSNP) are placed through a dbSNP rsID index.
 
     Supports advanced PRS features including interaction terms, haplotype effects,
     and dominance/recessive models.
 
+    With --batch, PGS_PATH is a directory of scoring files or a manifest
+    listing one per line (optionally followed by a tab and a PGS ID). Variant
+    lookups are built once, files are parsed in --workers processes, and all
+    weights are imported in one transaction, with a per-score report.
+
     Example:
         vcf-pg-loader import-pgs PGS000001.txt
         vcf-pg-loader import-pgs PGS000001.txt --validate-build
+        vcf-pg-loader import-pgs PGS000001.txt --rsid-index ./rsid_index
+        vcf-pg-loader import-pgs --batch ./pgs_trait_collection --report report.tsv
     """
     setup_logging(verbose, quiet)
 
@@ -1090,6 +1353,16 @@ def import_pgs(
         console.print(f"[red]Error: PGS file not found: {pgs_path}[/red]")
         raise typer.Exit(1)
 
+    if batch and pgs_id:
+        console.print("[red]Error: --pgs-id cannot be used with --batch; use a manifest[/red]")
+        raise typer.Exit(1)
+
+    rsid_index = _open_rsid_index(rsid_index_path)
+
+    if batch:
+        _import_pgs_batch(pgs_path, validate_build, rsid_index, workers, report, db_url, quiet)
+        return
+
     try:
         resolved_db_url = _resolve_database_url(db_url, quiet)
     except CredentialValidationError as e:
@@ -1112,6 +1385,7 @@ def import_pgs(
                 pgs_path=pgs_path,
                 pgs_id_override=pgs_id,
                 validate_build=validate_build,
+                rsid_index=rsid_index,
             )
 
             return result
@@ -1136,6 +1410,89 @@ def import_pgs(
         raise typer.Exit(1) from None
 
 
+def _import_pgs_batch(
+    source: Path,
+    validate_build: bool,
+    rsid_index,
+    workers: int,
+    report: Path | None,
+    db_url: str | None,
+    quiet: bool,
+) -> None:
+    """Import a directory or manifest of PGS scoring files and report per score."""
+    from .prs import PGSLoader, PRSSchemaManager, collect_scoring_files
+
+    try:
+        scoring_files = collect_scoring_files(source)
+    except OSError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if not scoring_files:
+        console.print(f"[red]Error: No scoring files found in {source}[/red]")
+        raise typer.Exit(1)
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    async def run_import() -> list:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            await PRSSchemaManager().create_prs_schema(conn)
+            return await PGSLoader().import_pgs_batch(
+                conn,
+                scoring_files,
+                workers=workers,
+                validate_build=validate_build,
+                rsid_index=rsid_index,
+            )
+        finally:
+            await conn.close()
+
+    try:
+        results = asyncio.run(run_import())
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    failed = [r for r in results if r["error"]]
+
+    if report is not None:
+        with open(report, "w") as f:
+            f.write("pgs_id\tpath\tweights_imported\tweights_matched\tweights_unmatched\terror\n")
+            for r in results:
+                f.write(
+                    f"{r['pgs_id'] or ''}\t{r['path']}\t{r['weights_imported']}\t"
+                    f"{r['weights_matched']}\t{r['weights_unmatched']}\t{r['error'] or ''}\n"
+                )
+
+    if not quiet:
+        console.print(
+            f"[green]✓[/green] Imported {len(results) - len(failed)} of {len(results)} PGS scores"
+        )
+        for r in results:
+            if r["error"]:
+                console.print(f"  [red]{r['pgs_id'] or r['path']}: {r['error']}[/red]")
+                continue
+            match_rate = (
+                r["weights_matched"] / r["weights_imported"] * 100 if r["weights_imported"] else 0
+            )
+            console.print(
+                f"  {r['pgs_id']}: {r['weights_imported']:,} weights, "
+                f"{r['weights_matched']:,} matched, {r['weights_unmatched']:,} unmatched "
+                f"({match_rate:.1f}%)"
+            )
+        if report is not None:
+            console.print(f"  Report: {report}")
+
+    if failed:
+        raise typer.Exit(1)
+
+
 @app.command("list-pgs")
 def list_pgs(
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
@@ -1190,6 +1547,153 @@ def list_pgs(
         raise typer.Exit(1) from None
 
 
+@app.command("score")
+def score(
+    pgs_ids: Annotated[list[str], typer.Argument(help="PGS IDs of imported weights to score")],
+    engine: Annotated[
+        str,
+        typer.Option(
+            "--engine",
+            "-e",
+            help="Scoring engine: sql (in-database) or numpy (chunked dosage matrices)",
+        ),
+    ] = "sql",
+    vcf_path: Annotated[
+        Path | None,
+        typer.Option("--vcf", help="Score samples in a VCF instead of stored genotypes (numpy)"),
+    ] = None,
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="Also write a sample x PGS score table (numpy)"),
+    ] = None,
+    chunk_size: Annotated[
+        int | None,
+        typer.Option("--chunk-size", help="Variants per dosage block (numpy)"),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            "-w",
+            help="Genotype partitions (sql) or block threads (numpy) run concurrently",
+        ),
+    ] = 8,
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+) -> None:
+    """Compute per-sample polygenic risk scores from stored dosages.
+
+    The sql engine joins each PGS's weights to genotype dosages on every
+    genotypes hash partition concurrently. The numpy engine streams
+    variants x samples dosage blocks into NumPy and scores all PGS IDs in one
+    pass, which scales better for scores with millions of weights; with --vcf
+    it reads dosages straight from a VCF. Weights are oriented to the effect
+    allele, missing dosages are taken from the GT hardcall and are otherwise
+    mean-imputed. Scores of stored genotypes are written to the prs_scores
+    table.
+
+    Example:
+        vcf-pg-loader score PGS000001
+        vcf-pg-loader score PGS000001 PGS000002 --engine numpy -o scores.tsv
+        vcf-pg-loader score PGS000001 --vcf cohort.vcf.gz -o scores.tsv
+    """
+    setup_logging(verbose, quiet)
+
+    if vcf_path is not None:
+        engine = "numpy"
+        if not vcf_path.exists():
+            console.print(f"[red]Error: VCF file not found: {vcf_path}[/red]")
+            raise typer.Exit(1)
+        if output is None:
+            console.print("[red]Error: --output is required when scoring a VCF[/red]")
+            raise typer.Exit(1)
+    if engine not in ("sql", "numpy"):
+        console.print(f"[red]Error: Unknown engine '{engine}'. Choose sql or numpy[/red]")
+        raise typer.Exit(1)
+    if output is not None and engine != "numpy":
+        console.print("[red]Error: --output requires --engine numpy[/red]")
+        raise typer.Exit(1)
+    if workers < 1:
+        console.print("[red]Error: --workers must be at least 1[/red]")
+        raise typer.Exit(1)
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .prs import (
+        PRSSchemaManager,
+        compute_prs,
+        load_weight_matrix,
+        score_genotypes,
+        score_vcf,
+        store_matrix_scores,
+    )
+
+    async def run_sql_score() -> list[str]:
+        pool = await asyncpg.create_pool(
+            resolved_db_url, min_size=1, max_size=workers, ssl=_get_ssl_param()
+        )
+        try:
+            async with pool.acquire() as conn:
+                await PRSSchemaManager().create_prs_scores_table(conn)
+            lines = []
+            for pgs_id in pgs_ids:
+                result = await compute_prs(pool, pgs_id)
+                lines.append(
+                    f"{result.pgs_id}: {result.samples_scored:,} samples, "
+                    f"{result.variants_used:,} variants used, "
+                    f"{result.variants_skipped:,} skipped"
+                )
+            return lines
+        finally:
+            await pool.close()
+
+    async def run_numpy_score() -> list[str]:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            weights = await load_weight_matrix(conn, pgs_ids)
+            if weights.n_variants == 0:
+                raise ValueError(f"No weights matched to stored variants for {', '.join(pgs_ids)}")
+
+            if vcf_path is not None:
+                result = await asyncio.to_thread(score_vcf, vcf_path, weights, chunk_size, workers)
+            else:
+                result = await score_genotypes(
+                    conn, weights, chunk_size=chunk_size, max_workers=workers
+                )
+                await PRSSchemaManager().create_prs_scores_table(conn)
+                await store_matrix_scores(conn, result)
+
+            if output is not None:
+                await asyncio.to_thread(result.write_tsv, output)
+
+            return [
+                f"{pgs_id}: {len(result.samples):,} samples, "
+                f"{int(result.variants_used[j]):,} variants used"
+                for j, pgs_id in enumerate(result.pgs_ids)
+            ]
+        finally:
+            await conn.close()
+
+    try:
+        lines = asyncio.run(run_sql_score() if engine == "sql" else run_numpy_score())
+        if not quiet:
+            console.print(f"[green]✓[/green] Scored {len(pgs_ids)} PGS ({engine} engine)")
+            for line in lines:
+                console.print(f"  {line}")
+            if output is not None:
+                console.print(f"  Output: {output}")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
 @app.command("import-frequencies")
 def import_frequencies(
     vcf_path: Annotated[Path, typer.Argument(help="Path to VCF file with population frequencies")],
@@ -1246,73 +1750,23 @@ def import_frequencies(
     if resolved_db_url is None:
         raise typer.Exit(1)
 
-    from .annotations import PopulationFreqLoader, PopulationFreqSchemaManager
+    from .annotations import FrequencyImporter, PopulationFreqSchemaManager
 
     async def run_import() -> dict:
-        import cyvcf2
-
         conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
         try:
             popfreq_schema = PopulationFreqSchemaManager()
             await popfreq_schema.create_population_frequencies_table(conn)
             await popfreq_schema.create_popfreq_indexes(conn)
 
-            variant_lookup = await _build_variant_lookup(conn)
-
-            loader = PopulationFreqLoader(batch_size=batch_size)
-            vcf = cyvcf2.VCF(str(vcf_path))
-
-            total_variants = 0
-            matched_variants = 0
-            frequencies_inserted = 0
-            batch = []
-
-            for variant in vcf:
-                total_variants += 1
-                chrom = variant.CHROM
-                if not chrom.startswith("chr"):
-                    chrom = f"chr{chrom}"
-
-                key = (chrom, variant.POS, variant.REF, variant.ALT[0] if variant.ALT else "")
-                variant_id = variant_lookup.get(key)
-
-                if variant_id is None:
-                    continue
-
-                matched_variants += 1
-                info_dict = _extract_info_dict(variant)
-                batch.append((variant_id, info_dict))
-
-                if len(batch) >= batch_size:
-                    result = await loader.import_batch_frequencies(
-                        conn=conn,
-                        batch=batch,
-                        source=source,
-                        subset=subset,
-                        prefix=prefix,
-                        update_popmax=update_popmax,
-                    )
-                    frequencies_inserted += result["frequencies_inserted"]
-                    batch = []
-
-            if batch:
-                result = await loader.import_batch_frequencies(
-                    conn=conn,
-                    batch=batch,
-                    source=source,
-                    subset=subset,
-                    prefix=prefix,
-                    update_popmax=update_popmax,
-                )
-                frequencies_inserted += result["frequencies_inserted"]
-
-            vcf.close()
-
-            return {
-                "total_variants": total_variants,
-                "matched_variants": matched_variants,
-                "frequencies_inserted": frequencies_inserted,
-            }
+            importer = FrequencyImporter(
+                source=source,
+                subset=subset,
+                prefix=prefix,
+                update_popmax=update_popmax,
+                batch_size=batch_size,
+            )
+            return await importer.import_vcf(conn, vcf_path)
         finally:
             await conn.close()
 
@@ -1332,6 +1786,7 @@ def import_frequencies(
             console.print(f"[green]✓[/green] Imported frequencies from {vcf_path.name}")
             console.print(f"  Source: {source}")
             console.print(f"  Variants processed: {result['total_variants']:,}")
+            console.print(f"  Alleles processed: {result['total_alleles']:,}")
             console.print(f"  Matched variants: {result['matched_variants']:,}")
             console.print(f"  Frequencies inserted: {result['frequencies_inserted']:,}")
     except Exception as e:
@@ -1339,27 +1794,6 @@ def import_frequencies(
         raise typer.Exit(1) from None
 
 
-async def _build_variant_lookup(conn: asyncpg.Connection) -> dict[tuple, int]:
-    """Build lookup dict mapping (chrom, pos, ref, alt) to variant_id."""
-    rows = await conn.fetch("""
-        SELECT variant_id, chrom, pos, ref, alt
-        FROM variants
-    """)
-    return {(row["chrom"], row["pos"], row["ref"], row["alt"]): row["variant_id"] for row in rows}
-
-
-def _extract_info_dict(variant) -> dict:
-    """Extract INFO fields from cyvcf2 variant as dictionary."""
-    info_dict = {}
-    for key in variant.INFO:
-        try:
-            value = variant.INFO.get(key)
-            info_dict[key] = value
-        except Exception:
-            pass
-    return info_dict
-
-
 @app.command("annotate")
 def annotate(
     batch_id: str = typer.Argument(..., help="Load batch ID of variants to annotate"),
@@ -1370,21 +1804,36 @@ def annotate(
         str | None, typer.Option("--filter", "-f", help="Filter expression (echtvar-style)")
     ] = None,
     output: Annotated[Path | None, typer.Option("--output", "-o", help="Output file path")] = None,
-    format: Annotated[str, typer.Option("--format", help="Output format (tsv, json)")] = "tsv",
+    format: Annotated[
+        str, typer.Option("--format", help="Output format (tsv, json, jsonl, parquet)")
+    ] = "tsv",
     limit: Annotated[
         int | None, typer.Option("--limit", "-l", help="Limit number of results")
     ] = None,
+    chrom: Annotated[
+        str | None,
+        typer.Option("--chrom", help="Only annotate variants on this chromosome"),
+    ] = None,
+    chunk_size: Annotated[
+        int, typer.Option("--chunk-size", help="Rows fetched and written per chunk")
+    ] = 10000,
+    explain: Annotated[
+        bool,
+        typer.Option("--explain", help="Print the generated SQL and query plan, then exit"),
+    ] = False,
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
 ) -> None:
     """Annotate loaded variants using reference databases.
 
+    Results are streamed from a server-side cursor and written incrementally.
+    Filter literals are bound as query parameters; use --explain to see the
+    SQL and plan that will run.
+
     Example:
         vcf-pg-loader annotate <batch-id> --source gnomad_v3 --filter "gnomad_af < 0.01"
     """
-    import csv
-    import json
-    import sys
+    from .export.results import open_result_writer
 
     if source is None or len(source) == 0:
         console.print("[red]Error: --source is required[/red]")
@@ -1398,6 +1847,14 @@ def annotate(
             console.print(f"[red]Error in filter expression: {'; '.join(syntax_errors)}[/red]")
             raise typer.Exit(1)
 
+    writer = None
+    if not explain:
+        try:
+            writer = open_result_writer(format, output)
+        except (ValueError, ImportError) as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1) from None
+
     try:
         resolved_db_url = _resolve_database_url(db_url, quiet)
     except CredentialValidationError as e:
@@ -1406,45 +1863,49 @@ def annotate(
     if resolved_db_url is None:
         raise typer.Exit(1)
 
-    async def run_annotate() -> list:
+    async def run_explain() -> str:
         conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
         try:
             annotator = VariantAnnotator(conn)
-            results = await annotator.annotate_variants(
+            return await annotator.explain(
                 sources=source,
                 load_batch_id=batch_id,
                 filter_expr=filter_expr,
                 limit=limit,
+                chrom=chrom,
             )
-            return results
         finally:
             await conn.close()
 
-    try:
-        results = asyncio.run(run_annotate())
-
-        if output:
-            out_file = open(output, "w")
-        else:
-            out_file = sys.stdout
-
+    if explain:
         try:
-            if format == "json":
-                json.dump(results, out_file, indent=2, default=str)
-                out_file.write("\n")
-            else:
-                if results:
-                    writer = csv.DictWriter(out_file, fieldnames=results[0].keys(), delimiter="\t")
-                    writer.writeheader()
-                    writer.writerows(results)
+            console.print(asyncio.run(run_explain()), markup=False, highlight=False)
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1) from None
+        return
 
-            if not quiet and output:
-                console.print(
-                    f"[green]✓[/green] Wrote {len(results)} annotated variants to {output}"
-                )
+    async def run_annotate() -> int:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            annotator = VariantAnnotator(conn)
+            return await annotator.write_annotations(
+                writer,
+                sources=source,
+                load_batch_id=batch_id,
+                filter_expr=filter_expr,
+                limit=limit,
+                chrom=chrom,
+                chunk_size=chunk_size,
+            )
         finally:
-            if output:
-                out_file.close()
+            await conn.close()
+
+    try:
+        written = asyncio.run(run_annotate())
+
+        if not quiet and output:
+            console.print(f"[green]✓[/green] Wrote {written} annotated variants to {output}")
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -1455,17 +1916,79 @@ def annotate(
 def annotation_query(
     sql: str = typer.Option(..., "--sql", help="SQL query to execute"),
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
-    format: Annotated[str, typer.Option("--format", help="Output format (tsv, json)")] = "tsv",
+    format: Annotated[
+        str, typer.Option("--format", help="Output format (tsv, json, jsonl, parquet)")
+    ] = "tsv",
+    output: Annotated[Path | None, typer.Option("--output", "-o", help="Output file path")] = None,
+    chunk_size: Annotated[
+        int, typer.Option("--chunk-size", help="Rows fetched and written per chunk")
+    ] = 10000,
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
 ) -> None:
     """Execute an ad-hoc SQL query against annotation tables.
 
+    Results are streamed from a server-side cursor and written incrementally.
+
     Example:
         vcf-pg-loader annotation-query --sql "SELECT * FROM anno_gnomad LIMIT 10"
     """
-    import csv
-    import json
-    import sys
+    from .export.results import open_result_writer, stream_query_results
+
+    try:
+        writer = open_result_writer(format, output)
+    except (ValueError, ImportError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    async def run_query() -> int:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            return await stream_query_results(conn, sql, writer=writer, chunk_size=chunk_size)
+        finally:
+            await conn.close()
+
+    try:
+        written = asyncio.run(run_query())
+
+        if not quiet and output:
+            console.print(f"[green]✓[/green] Wrote {written} rows to {output}")
+
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+@app.command("export-annotation")
+def export_annotation(
+    source: str = typer.Argument(..., help="Annotation source to export"),
+    output: Path = typer.Option(..., "--output", "-o", help="Snapshot directory to write"),
+    field: Annotated[
+        list[str] | None,
+        typer.Option("--field", help="Field to export (default: all fields). Repeatable."),
+    ] = None,
+    block_rows: Annotated[
+        int, typer.Option("--block-rows", help="Variants per compressed block")
+    ] = 65536,
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+) -> None:
+    """Export an annotation source as a compressed, position-sorted snapshot.
+
+    The snapshot can be copied to machines without database access and used
+    with annotate-vcf or load --annotation-snapshot.
+
+    Example:
+        vcf-pg-loader export-annotation gnomad_v3 --output gnomad_v3.snapshot
+    """
+    from .annotation_snapshot import export_annotation_snapshot
 
     try:
         resolved_db_url = _resolve_database_url(db_url, quiet)
@@ -1475,24 +1998,103 @@ def annotation_query(
     if resolved_db_url is None:
         raise typer.Exit(1)
 
-    async def run_query() -> list:
+    async def run_export() -> dict:
         conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
         try:
-            rows = await conn.fetch(sql)
-            return [dict(row) for row in rows]
+            return await export_annotation_snapshot(
+                conn, source, output, fields=field, block_rows=block_rows
+            )
+        finally:
+            await conn.close()
+
+    try:
+        result = asyncio.run(run_export())
+
+        if not quiet:
+            console.print(
+                f"[green]✓[/green] Exported {result['variant_count']:,} variants of "
+                f"{source} ({sum(result['blocks'].values())} blocks on "
+                f"{len(result['blocks'])} chromosomes) to {output}"
+            )
+
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+@app.command("annotate-vcf")
+def annotate_vcf(
+    vcf_path: Path = typer.Argument(..., help="VCF file to annotate"),
+    snapshot: Annotated[
+        list[Path] | None,
+        typer.Option(
+            "--snapshot", "-s", help="Exported annotation snapshot directory. Repeatable."
+        ),
+    ] = None,
+    output: Annotated[Path | None, typer.Option("--output", "-o", help="Output file path")] = None,
+    format: Annotated[
+        str, typer.Option("--format", help="Output format (tsv, json, jsonl, parquet)")
+    ] = "tsv",
+    batch_size: Annotated[
+        int, typer.Option("--batch-size", "-b", help="Variants looked up and written per batch")
+    ] = 10000,
+    human_genome: bool = typer.Option(
+        True, "--human-genome/--no-human-genome", help="Use human chromosome naming"
+    ),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+) -> None:
+    """Annotate a VCF from exported snapshots, without a database.
+
+    Every variant is written with the fields of each snapshot (empty where
+    the source has no value).
+
+    Example:
+        vcf-pg-loader annotate-vcf sample.vcf.gz --snapshot gnomad_v3.snapshot -o out.tsv
+    """
+    from .annotation_snapshot import AnnotationSnapshotFile, annotate_vcf_from_snapshots
+    from .export.results import ResultColumn, open_result_writer
+
+    if not snapshot:
+        console.print("[red]Error: --snapshot is required[/red]")
+        raise typer.Exit(1)
+
+    if not vcf_path.exists():
+        console.print(f"[red]Error: VCF file not found: {vcf_path}[/red]")
+        raise typer.Exit(1)
+
+    try:
+        snapshots = [AnnotationSnapshotFile(path) for path in snapshot]
+        writer = open_result_writer(format, output)
+    except (ValueError, ImportError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    field_types = {
+        name: "float8" if spec["kind"] == "float" else "text"
+        for s in snapshots
+        for name, spec in s.fields.items()
+    }
+
+    try:
+        names, batches = annotate_vcf_from_snapshots(
+            vcf_path, snapshots, batch_size=batch_size, human_genome=human_genome
+        )
+        writer.begin(
+            [
+                ResultColumn(name, "int8" if name == "pos" else field_types.get(name, "text"))
+                for name in names
+            ]
+        )
+        written = 0
+        try:
+            for rows in batches:
+                writer.write_rows(rows)
+                written += len(rows)
         finally:
-            await conn.close()
-
-    try:
-        results = asyncio.run(run_query())
+            writer.finish()
 
-        if format == "json":
-            print(json.dumps(results, indent=2, default=str))
-        else:
-            if results:
-                writer = csv.DictWriter(sys.stdout, fieldnames=results[0].keys(), delimiter="\t")
-                writer.writeheader()
-                writer.writerows(results)
+        if not quiet and output:
+            console.print(f"[green]✓[/green] Wrote {written} annotated variants to {output}")
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -1783,6 +2385,145 @@ def _load_ld_blocks(
         raise typer.Exit(1) from None
 
 
+def _load_bed_track(
+    file_path: Path | None,
+    track: str | None,
+    db_url: str | None,
+    quiet: bool,
+) -> None:
+    """Load a BED file as a named interval track."""
+    if file_path is None:
+        console.print("[red]Error: a BED file path is required for bed tracks[/red]")
+        raise typer.Exit(1)
+    if not file_path.exists():
+        console.print(f"[red]Error: BED file not found: {file_path}[/red]")
+        raise typer.Exit(1)
+
+    track = track or file_path.name.split(".")[0]
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .references import IntervalTrackLoader, ReferenceSchemaManager
+
+    async def run_load() -> dict:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            await ReferenceSchemaManager().create_interval_tracks_table(conn)
+            return await IntervalTrackLoader().load_bed(conn, file_path, track)
+        finally:
+            await conn.close()
+
+    try:
+        result = asyncio.run(run_load())
+        if not quiet:
+            console.print(f"[green]✓[/green] Loaded {result['intervals_loaded']:,} intervals")
+            console.print(f"  Track: {result['track']}")
+            console.print(f"  Chromosomes: {result['chromosomes']}")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+def _load_panel_file(
+    file_path: Path | None,
+    panel_name: str | None,
+    db_url: str | None,
+    quiet: bool,
+) -> None:
+    """Load a SNP list as a named reference panel."""
+    if file_path is None:
+        console.print("[red]Error: a panel file path is required for panel files[/red]")
+        raise typer.Exit(1)
+    if not file_path.exists():
+        console.print(f"[red]Error: Panel file not found: {file_path}[/red]")
+        raise typer.Exit(1)
+
+    panel_name = panel_name or file_path.name.split(".")[0]
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .references import ReferencePanelLoader, ReferenceSchemaManager
+
+    async def run_load() -> dict:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            ref_schema = ReferenceSchemaManager()
+            await ref_schema.create_reference_panels_table(conn)
+            await ref_schema.add_panel_mask_column(conn)
+            return await ReferencePanelLoader().load_panel(conn, file_path, panel_name)
+        finally:
+            await conn.close()
+
+    try:
+        result = asyncio.run(run_load())
+        if not quiet:
+            console.print(f"[green]✓[/green] Loaded {result['variants_loaded']:,} panel variants")
+            console.print(f"  Panel: {result['panel_name']}")
+            console.print(f"  Rows read: {result['rows_read']:,}")
+            if result["rows_skipped"]:
+                console.print(f"  Rows skipped: {result['rows_skipped']:,}")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+def _load_dbsnp_rsids(
+    file_path: Path | None,
+    merged: Path | None,
+    db_url: str | None,
+    quiet: bool,
+) -> None:
+    """Load dbSNP rsIDs (and rsID merge history) for rsID resolution."""
+    if file_path is None:
+        console.print("[red]Error: a dbSNP VCF path is required for dbsnp[/red]")
+        raise typer.Exit(1)
+    for path in (file_path, merged):
+        if path is not None and not path.exists():
+            console.print(f"[red]Error: File not found: {path}[/red]")
+            raise typer.Exit(1)
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .references import ReferenceSchemaManager, RsidTableLoader
+
+    async def run_load() -> dict:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            await ReferenceSchemaManager().create_rsid_tables(conn)
+            return await RsidTableLoader().load_dbsnp(conn, file_path, merged)
+        finally:
+            await conn.close()
+
+    try:
+        result = asyncio.run(run_load())
+        if not quiet:
+            console.print(f"[green]✓[/green] Loaded {result['rsids_loaded']:,} dbSNP rsID records")
+            if merged is not None:
+                console.print(f"  Merged rsIDs: {result['merges_loaded']:,}")
+            console.print("  Build an index with: vcf-pg-loader build-rsid-index --output DIR")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
 @app.command("download-reference")
 def download_reference(
     panel_type: Annotated[
@@ -1952,7 +2693,7 @@ def _download_ld_blocks(
 def load_reference(
     panel_type: Annotated[
         str,
-        typer.Argument(help="Reference panel type (hapmap3, ld-blocks)"),
+        typer.Argument(help="Reference panel type (hapmap3, ld-blocks, bed, panel, dbsnp)"),
     ],
     file_path: Annotated[
         Path | None,
@@ -1966,6 +2707,18 @@ def load_reference(
         str | None,
         typer.Option("--population", "-p", help="Population for LD blocks (EUR, AFR, EAS, SAS)"),
     ] = None,
+    track: Annotated[
+        str | None,
+        typer.Option("--track", "-t", help="Track name for bed files (default: file name)"),
+    ] = None,
+    panel_name: Annotated[
+        str | None,
+        typer.Option("--name", "-n", help="Panel name for panel files (default: file name)"),
+    ] = None,
+    merged: Annotated[
+        Path | None,
+        typer.Option("--merged", help="dbSNP merged rsID file (old and current rsID columns)"),
+    ] = None,
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
@@ -1978,6 +2731,13 @@ def load_reference(
     LD blocks from Berisa & Pickrell (2016) are used by PRS-CS and SBayesR
     to partition the genome into largely independent regions.
 
+    Any BED file (capture targets, low-complexity regions, segmental
+    duplications, gene bodies) can be loaded as a named interval track, and
+    any SNP list (TSV with a header, or PLINK .bim) as a named panel.
+
+    A dbSNP VCF (with an optional merged-rsID file) is loaded for resolving
+    rsID-only PGS and GWAS inputs; see build-rsid-index.
+
     If no file path is provided, looks for bundled reference data in the
     package data directory.
 
@@ -1986,16 +2746,32 @@ def load_reference(
         vcf-pg-loader load-reference hapmap3 /path/to/hapmap3.tsv --build grch37
         vcf-pg-loader load-reference ld-blocks --population EUR --build grch37
         vcf-pg-loader load-reference ld-blocks /path/to/blocks.bed --population EUR
+        vcf-pg-loader load-reference bed exome_targets.bed.gz --track exome_targets
+        vcf-pg-loader load-reference panel 1kg_snps.bim.gz --name 1000g_grch38
+        vcf-pg-loader load-reference dbsnp dbsnp156.vcf.gz --merged rsmerge.tsv.gz
     """
     setup_logging(verbose, quiet)
 
     panel_type_lower = panel_type.lower().replace("_", "-")
-    if panel_type_lower not in ("hapmap3", "ld-blocks"):
+    if panel_type_lower not in ("hapmap3", "ld-blocks", "bed", "panel", "dbsnp"):
         console.print(
-            f"[red]Error: Unknown panel type '{panel_type}'. Supported: hapmap3, ld-blocks[/red]"
+            f"[red]Error: Unknown panel type '{panel_type}'. "
+            "Supported: hapmap3, ld-blocks, bed, panel, dbsnp[/red]"
         )
         raise typer.Exit(1)
 
+    if panel_type_lower == "dbsnp":
+        _load_dbsnp_rsids(file_path, merged, db_url, quiet)
+        return
+
+    if panel_type_lower == "bed":
+        _load_bed_track(file_path, track, db_url, quiet)
+        return
+
+    if panel_type_lower == "panel":
+        _load_panel_file(file_path, panel_name, db_url, quiet)
+        return
+
     if panel_type_lower == "ld-blocks":
         _load_ld_blocks(file_path, build, population, db_url, quiet)
         return
@@ -2064,6 +2840,7 @@ def load_reference(
         try:
             ref_schema = ReferenceSchemaManager()
             await ref_schema.create_reference_panels_table(conn)
+            await ref_schema.add_panel_mask_column(conn)
 
             loader = HapMap3Loader()
             result = await loader.load_reference_panel(
@@ -2095,18 +2872,25 @@ def annotate_ld_blocks(
     ] = "EUR",
     build: Annotated[
         str | None,
-        typer.Option("--build", "-b", help="Optional genome build filter"),
+        typer.Option("--build", "-b", help="Genome build; required when several builds are loaded"),
     ] = None,
+    workers: Annotated[
+        int,
+        typer.Option("--workers", "-w", help="Chromosome partitions updated in parallel"),
+    ] = 4,
     db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ) -> None:
     """Annotate loaded variants with LD block assignments.
 
-    Assigns each variant to the LD block containing its position using
-    efficient range queries. LD blocks must be loaded first using:
+    Backfills ld_block_id one chromosome partition at a time, updating up to
+    --workers partitions in parallel. Only unassigned variants are updated.
+    LD blocks must be loaded first using:
         vcf-pg-loader load-reference ld-blocks --population EUR
 
+    New loads can assign blocks directly with 'load --ld-blocks EUR'.
+
     Example:
         vcf-pg-loader annotate-ld-blocks --population EUR
         vcf-pg-loader annotate-ld-blocks --population AFR --build grch37
@@ -2137,21 +2921,25 @@ def annotate_ld_blocks(
     from .references import LDBlockLoader, ReferenceSchemaManager
 
     async def run_annotate() -> int:
-        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        pool = await asyncpg.create_pool(
+            resolved_db_url, min_size=1, max_size=max(1, workers), ssl=_get_ssl_param()
+        )
         try:
-            ref_schema = ReferenceSchemaManager()
-            await ref_schema.add_ld_block_id_column(conn)
+            async with pool.acquire() as conn:
+                ref_schema = ReferenceSchemaManager()
+                await ref_schema.add_ld_block_id_column(conn)
 
             loader = LDBlockLoader()
             updated = await loader.assign_variants_to_blocks(
-                conn=conn,
+                conn=pool,
                 population=population,
                 build=build,
+                workers=workers,
             )
 
             return updated
         finally:
-            await conn.close()
+            await pool.close()
 
     try:
         updated = asyncio.run(run_annotate())
@@ -2164,6 +2952,56 @@ def annotate_ld_blocks(
         raise typer.Exit(1) from None
 
 
+@app.command("build-rsid-index")
+def build_rsid_index_command(
+    output: Annotated[
+        Path,
+        typer.Option("--output", "-o", help="Directory to write the index to"),
+    ],
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+) -> None:
+    """Build an on-disk rsID index from loaded dbSNP rsIDs.
+
+    The index is sorted by rsID and memory-mapped by import-pgs and
+    import-gwas (--rsid-index) to place rsID-only records, including rsIDs
+    that dbSNP has merged into another. dbSNP must be loaded first using:
+        vcf-pg-loader load-reference dbsnp dbsnp.vcf.gz --merged rsmerge.tsv.gz
+
+    Example:
+        vcf-pg-loader build-rsid-index --output ./rsid_index_grch38
+    """
+    setup_logging(verbose, quiet)
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .references.rsid_index import build_rsid_index
+
+    async def run_build() -> dict:
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            return await build_rsid_index(conn, output)
+        finally:
+            await conn.close()
+
+    try:
+        result = asyncio.run(run_build())
+        if not quiet:
+            console.print(f"[green]✓[/green] Built rsID index with {result['rows']:,} records")
+            console.print(f"  Path: {result['path']}")
+            console.print(f"  Chromosomes: {result['chromosomes']}")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
 @app.command()
 def doctor(
     check_container_security: bool = typer.Option(
@@ -7481,6 +8319,193 @@ def export_prsice2_cmd(
         raise typer.Exit(1) from None
 
 
+@export_app.command("batch")
+def export_batch_cmd(
+    study_ids: Annotated[
+        list[int], typer.Option("--study-id", "-s", help="GWAS study ID to export (repeatable)")
+    ],
+    output_dir: Annotated[
+        Path, typer.Option("--output-dir", "-o", help="Directory for output files")
+    ],
+    formats: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--format",
+            "-f",
+            help="Export format (repeatable): plink-score, prs-cs, ldpred2, prsice2 (default: all)",
+        ),
+    ] = None,
+    use_se: bool = typer.Option(
+        True, "--use-se/--use-p", help="PRS-CS: include SE (default) or P-value in last column"
+    ),
+    hapmap3_only: bool = typer.Option(False, "--hapmap3-only", help="Restrict to HapMap3 variants"),
+    min_info: Annotated[
+        float | None, typer.Option("--min-info", help="Minimum imputation INFO score")
+    ] = None,
+    min_maf: Annotated[float | None, typer.Option("--min-maf", help="Minimum MAF")] = None,
+    concurrency: Annotated[
+        int, typer.Option("--concurrency", "-j", help="Maximum concurrent exports")
+    ] = 4,
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+) -> None:
+    """Export several studies in several formats concurrently.
+
+    Every study is exported in every requested format over a shared
+    connection pool. The variant filter is evaluated once and shared by all
+    exports. Files are written as OUTPUT_DIR/study_<id>.<format>.txt.
+
+    Example:
+        vcf-pg-loader export batch -s 1 -s 2 -s 3 -o exports/
+        vcf-pg-loader export batch -s 1 -s 2 -f ldpred2 -f prs-cs -o exports/ --hapmap3-only
+    """
+    setup_logging(verbose, quiet)
+
+    from .export.batch import EXPORT_FORMATS, export_batch
+
+    selected_formats = formats or list(EXPORT_FORMATS)
+    unknown = [f for f in selected_formats if f not in EXPORT_FORMATS]
+    if unknown:
+        console.print(
+            f"[red]Error: Unknown format(s): {', '.join(unknown)}. "
+            f"Choose from: {', '.join(EXPORT_FORMATS)}[/red]"
+        )
+        raise typer.Exit(1)
+    if concurrency < 1:
+        console.print("[red]Error: --concurrency must be at least 1[/red]")
+        raise typer.Exit(1)
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .export.prs_formats import VariantFilter
+
+    async def run_export() -> list:
+        pool = await asyncpg.create_pool(
+            resolved_db_url, min_size=1, max_size=concurrency + 1, ssl=_get_ssl_param()
+        )
+        try:
+            variant_filter = VariantFilter(
+                hapmap3_only=hapmap3_only,
+                min_info=min_info,
+                min_maf=min_maf,
+            )
+            return await export_batch(
+                pool,
+                study_ids,
+                selected_formats,
+                output_dir,
+                variant_filter=variant_filter,
+                use_se=use_se,
+                max_concurrency=concurrency,
+            )
+        finally:
+            await pool.close()
+
+    try:
+        results = asyncio.run(run_export())
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+    failed = [r for r in results if not r.success]
+    if not quiet:
+        for r in results:
+            if r.success:
+                console.print(
+                    f"[green]✓[/green] Study {r.study_id} {r.export_format}: "
+                    f"{r.variants_exported:,} variants -> {r.output_path}"
+                )
+            else:
+                console.print(f"[red]✗[/red] Study {r.study_id} {r.export_format}: {r.error}")
+    if failed:
+        console.print(f"[red]Error: {len(failed)} of {len(results)} exports failed[/red]")
+        raise typer.Exit(1)
+
+
+@export_app.command("pgen")
+def export_pgen_cmd(
+    output_prefix: Annotated[
+        Path, typer.Option("--output", "-o", help="Output prefix for .pgen/.pvar/.psam")
+    ],
+    sample_ids: Annotated[
+        list[int] | None,
+        typer.Option("--sample-id", help="Sample ID to export (repeatable, default: all)"),
+    ] = None,
+    with_dosage: bool = typer.Option(
+        True, "--dosage/--hardcalls-only", help="Write a dosage track alongside hardcalls"
+    ),
+    chunk_size: Annotated[
+        int | None,
+        typer.Option("--chunk-size", help="Variants per chunk (default: sized to sample count)"),
+    ] = None,
+    hard_call_threshold: Annotated[
+        float,
+        typer.Option(
+            "--hard-call-threshold", help="Max dosage distance from an integer to derive a call"
+        ),
+    ] = 0.1,
+    db_url: Annotated[str | None, typer.Option("--db", "-d", help="PostgreSQL URL")] = None,
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Suppress non-error output"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+) -> None:
+    """Export stored genotypes as a PLINK 2 binary fileset.
+
+    Streams the genotypes table joined to variants in variant chunks and
+    writes PREFIX.pgen (hardcalls plus dosages), PREFIX.pvar and PREFIX.psam.
+    Requires genotypes loaded with 'load --store-genotypes'.
+
+    Example:
+        vcf-pg-loader export pgen --output cohort
+        vcf-pg-loader export pgen -o cohort --hardcalls-only --chunk-size 500
+    """
+    setup_logging(verbose, quiet)
+
+    try:
+        resolved_db_url = _resolve_database_url(db_url, quiet)
+    except CredentialValidationError as e:
+        console.print(f"[red]Security Error: {e}[/red]")
+        raise typer.Exit(1) from None
+    if resolved_db_url is None:
+        raise typer.Exit(1)
+
+    from .export.plink2 import export_pgen
+
+    async def run_export():
+        conn = await asyncpg.connect(resolved_db_url, ssl=_get_ssl_param())
+        try:
+            return await export_pgen(
+                conn,
+                output_prefix,
+                sample_ids=sample_ids or None,
+                with_dosage=with_dosage,
+                chunk_size=chunk_size,
+                hard_call_threshold=hard_call_threshold,
+            )
+        finally:
+            await conn.close()
+
+    try:
+        result = asyncio.run(run_export())
+        if not quiet:
+            console.print(
+                f"[green]✓[/green] Exported {result.variants_exported:,} variants x "
+                f"{result.samples_exported:,} samples"
+            )
+            console.print(f"  {result.pgen_path}")
+            console.print(f"  {result.pvar_path}")
+            console.print(f"  {result.psam_path}")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
 def main() -> None:
     """Entry point for the CLI."""
     app()
@@ -49,6 +49,8 @@ VARIANT_COLUMNS: list[str] = [
     "imputation_source",
     "in_hapmap3",
     "hapmap3_rsid",
+    "ld_block_id",
+    "panel_mask",
 ]
 
 VARIANT_COLUMNS_BASIC: list[str] = [
@@ -67,8 +69,11 @@ VARIANT_COLUMNS_BASIC: list[str] = [
     "hgvs_c",
     "hgvs_p",
     "af_gnomad",
+    "af_gnomad_popmax",
+    "af_1kg",
     "cadd_phred",
     "clinvar_sig",
+    "clinvar_review",
     "load_batch_id",
     "sample_id",
     "call_rate",
@@ -86,9 +91,20 @@ VARIANT_COLUMNS_BASIC: list[str] = [
     "imputation_source",
     "in_hapmap3",
     "hapmap3_rsid",
+    "ld_block_id",
+    "panel_mask",
 ]
 
 
+def without_panel_mask(columns: list[str]) -> list[str]:
+    """Drop panel_mask from a COPY column list for variants tables that predate it.
+
+    panel_mask is the last column in both lists, so records built by
+    get_record_values and get_record_values_full match with ``values[:-1]``.
+    """
+    return columns[:-1]
+
+
 def get_record_values(record: VariantRecord, load_batch_id: UUID) -> tuple:
     """Extract values from VariantRecord in VARIANT_COLUMNS_BASIC order.
 
@@ -110,8 +126,11 @@ def get_record_values(record: VariantRecord, load_batch_id: UUID) -> tuple:
         record.hgvs_c,
         record.hgvs_p,
         record.af_gnomad,
+        record.af_gnomad_popmax,
+        record.af_1kg,
         record.cadd_phred,
         record.clinvar_sig,
+        record.clinvar_review,
         load_batch_id,
         record.sample_id,
         record.call_rate,
@@ -129,6 +148,8 @@ def get_record_values(record: VariantRecord, load_batch_id: UUID) -> tuple:
         record.imputation_source,
         record.in_hapmap3,
         record.hapmap3_rsid,
+        record.ld_block_id,
+        record.panel_mask,
     )
 
 
@@ -185,4 +206,6 @@ def get_record_values_full(
         record.imputation_source,
         record.in_hapmap3,
         record.hapmap3_rsid,
+        record.ld_block_id,
+        record.panel_mask,
     )
@@ -4,8 +4,18 @@ from uuid import uuid4
 
 import asyncpg
 
-from .columns import VARIANT_COLUMNS, get_record_values_full
+from .columns import VARIANT_COLUMNS, get_record_values_full, without_panel_mask
 from .models import VariantRecord
+from .schema import has_panel_mask_column
+
+
+async def _copy_variants(conn: asyncpg.Connection, records: list[tuple]) -> None:
+    """COPY full variant records, leaving out panel_mask if the table predates it."""
+    columns = VARIANT_COLUMNS
+    if not await has_panel_mask_column(conn):
+        columns = without_panel_mask(columns)
+        records = [values[:-1] for values in records]
+    await conn.copy_records_to_table("variants", records=records, columns=columns)
 
 
 async def load_variants(
@@ -33,11 +43,7 @@ async def load_variants(
         for r in batch
     ]
 
-    await conn.copy_records_to_table(
-        "variants",
-        records=records,
-        columns=VARIANT_COLUMNS
-    )
+    await _copy_variants(conn, records)
 
     return len(batch)
 
@@ -69,10 +75,6 @@ async def load_variants_with_sample(
         for r in batch
     ]
 
-    await conn.copy_records_to_table(
-        "variants",
-        records=records,
-        columns=VARIANT_COLUMNS
-    )
+    await _copy_variants(conn, records)
 
     return len(batch)
@@ -1,5 +1,12 @@
-"""Export module for PRS tool input formats."""
+"""Export module for PRS tool input formats, PLINK 2 genotype filesets and query results."""
 
+from .batch import (
+    EXPORT_FORMATS,
+    BatchExportResult,
+    export_batch,
+    materialize_filtered_variants,
+)
+from .plink2 import PgenExportResult, export_pgen
 from .prs_formats import (
     VariantFilter,
     export_ldpred2,
@@ -7,6 +14,13 @@ from .prs_formats import (
     export_prs_cs,
     export_prsice2,
 )
+from .results import (
+    RESULT_FORMATS,
+    ResultColumn,
+    ResultWriter,
+    open_result_writer,
+    stream_query_results,
+)
 
 __all__ = [
     "VariantFilter",
@@ -14,4 +28,15 @@ __all__ = [
     "export_prs_cs",
     "export_ldpred2",
     "export_prsice2",
+    "EXPORT_FORMATS",
+    "BatchExportResult",
+    "export_batch",
+    "materialize_filtered_variants",
+    "PgenExportResult",
+    "export_pgen",
+    "RESULT_FORMATS",
+    "ResultColumn",
+    "ResultWriter",
+    "open_result_writer",
+    "stream_query_results",
 ]
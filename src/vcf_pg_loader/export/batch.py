@@ -0,0 +1,192 @@
+"""Concurrent multi-study export to PRS tool input formats.
+
+Runs every (study, format) pair on a shared connection pool. The
+``VariantFilter`` is evaluated once into an unlogged table that all
+exports join against, instead of re-filtering ``variants`` per pair.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import asyncpg
+
+from .prs_formats import (
+    VariantFilter,
+    _build_filter_clause,
+    export_ldpred2,
+    export_plink_score,
+    export_prs_cs,
+    export_prsice2,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("plink-score", "prs-cs", "ldpred2", "prsice2")
+
+FILTERED_TABLE_PREFIX = "export_filtered_variants_"
+
+
+@dataclass
+class BatchExportResult:
+    """Outcome of a single (study, format) export within a batch."""
+
+    study_id: int
+    export_format: str
+    output_path: Path
+    variants_exported: int = 0
+    error: str | None = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def batch_output_path(output_dir: Path, study_id: int, export_format: str) -> Path:
+    """Get the output file path for a study/format pair."""
+    return output_dir / f"study_{study_id}.{export_format}.txt"
+
+
+async def materialize_filtered_variants(
+    conn: asyncpg.Connection,
+    variant_filter: VariantFilter | None = None,
+) -> str:
+    """Materialize the filtered variant set into an unlogged table.
+
+    Temporary tables are only visible to the session that created them, so
+    the shared set is a uniquely named unlogged table that every pooled
+    connection can join. Callers must drop it with ``drop_filtered_variants``.
+
+    Args:
+        conn: Database connection
+        variant_filter: Optional variant filter
+
+    Returns:
+        Name of the created table
+    """
+    table_name = f"{FILTERED_TABLE_PREFIX}{uuid4().hex[:12]}"
+    filter_clause, filter_params = _build_filter_clause(variant_filter, param_start=1)
+
+    await conn.execute(
+        f"""
+        CREATE UNLOGGED TABLE {table_name} AS
+        SELECT v.variant_id, v.chrom, v.pos, v.rs_id
+        FROM variants v
+        WHERE TRUE {filter_clause}
+        """,
+        *filter_params,
+    )
+    await conn.execute(f"CREATE INDEX ON {table_name} (variant_id)")
+    await conn.execute(f"ANALYZE {table_name}")
+
+    logger.debug("Materialized filtered variant set into %s", table_name)
+    return table_name
+
+
+async def drop_filtered_variants(conn: asyncpg.Connection, table_name: str) -> None:
+    """Drop a table created by ``materialize_filtered_variants``."""
+    if not table_name.startswith(FILTERED_TABLE_PREFIX):
+        raise ValueError(f"Refusing to drop non-export table: {table_name}")
+    await conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+
+
+async def _export_one(
+    conn: asyncpg.Connection,
+    study_id: int,
+    export_format: str,
+    output_path: Path,
+    variant_table: str,
+    use_se: bool,
+) -> int:
+    if export_format == "plink-score":
+        return await export_plink_score(conn, study_id, output_path, variant_table=variant_table)
+    if export_format == "prs-cs":
+        return await export_prs_cs(
+            conn, study_id, output_path, use_se=use_se, variant_table=variant_table
+        )
+    if export_format == "ldpred2":
+        return await export_ldpred2(conn, study_id, output_path, variant_table=variant_table)
+    if export_format == "prsice2":
+        return await export_prsice2(conn, study_id, output_path, variant_table=variant_table)
+    raise ValueError(f"Unknown export format: {export_format}")
+
+
+async def export_batch(
+    pool: asyncpg.Pool,
+    study_ids: list[int],
+    formats: list[str],
+    output_dir: Path,
+    variant_filter: VariantFilter | None = None,
+    use_se: bool = True,
+    max_concurrency: int = 4,
+) -> list[BatchExportResult]:
+    """Export every study in every format concurrently.
+
+    Args:
+        pool: Database connection pool
+        study_ids: Study IDs to export
+        formats: Export formats (see ``EXPORT_FORMATS``)
+        output_dir: Directory for output files
+        variant_filter: Optional variant filter shared by all exports
+        use_se: PRS-CS only: include SE (True) or P-value (False)
+        max_concurrency: Maximum number of exports running at once
+
+    Returns:
+        One result per (study, format) pair, in input order
+    """
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(
+            f"Unknown export format(s): {', '.join(unknown)}. "
+            f"Choose from: {', '.join(EXPORT_FORMATS)}"
+        )
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    async with pool.acquire() as conn:
+        variant_table = await materialize_filtered_variants(conn, variant_filter)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(study_id: int, export_format: str) -> int:
+        output_path = batch_output_path(output_dir, study_id, export_format)
+        async with semaphore, pool.acquire() as conn:
+            return await _export_one(
+                conn, study_id, export_format, output_path, variant_table, use_se
+            )
+
+    jobs = [(study_id, export_format) for study_id in study_ids for export_format in formats]
+
+    try:
+        outcomes = await asyncio.gather(
+            *(run(study_id, export_format) for study_id, export_format in jobs),
+            return_exceptions=True,
+        )
+    finally:
+        async with pool.acquire() as conn:
+            await drop_filtered_variants(conn, variant_table)
+
+    results = []
+    for (study_id, export_format), outcome in zip(jobs, outcomes, strict=True):
+        result = BatchExportResult(
+            study_id=study_id,
+            export_format=export_format,
+            output_path=batch_output_path(output_dir, study_id, export_format),
+        )
+        if isinstance(outcome, BaseException):
+            logger.error("Export of study %d as %s failed: %s", study_id, export_format, outcome)
+            result.error = str(outcome)
+        else:
+            result.variants_exported = outcome
+        results.append(result)
+
+    logger.info(
+        "Batch export finished: %d/%d succeeded",
+        sum(1 for r in results if r.success),
+        len(results),
+    )
+    return results
@@ -0,0 +1,322 @@
+"""Export stored genotypes to PLINK 2 binary fileset (.pgen/.pvar/.psam).
+
+The .pgen is written in PLINK 2's fixed-width storage mode:
+
+- Mode 0x02: 2-bit hardcalls only, ceil(N/4) bytes per variant
+- Mode 0x03: 2-bit hardcalls followed by a 16-bit unphased ALT dosage for
+  every sample (value = dosage * 16384, 65535 = missing)
+
+Hardcall codes are 0 = hom-ref, 1 = het, 2 = hom-alt, 3 = missing, packed
+four samples per byte starting at the low bits. Variants are streamed from
+the database in chunks, converted to NumPy arrays and appended to the
+.pgen sequentially, so memory is bounded by chunk_size x sample count.
+"""
+
+import asyncio
+import logging
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+import asyncpg
+import numpy as np
+
+from ..genotypes.packed import (
+    HARDCALL_MISSING,
+    detect_genotype_storage,
+    fetch_packed_matrix,
+    gt_to_hardcall,
+    pack_hardcalls,
+)
+from .prs_formats import _normalize_chromosome
+
+logger = logging.getLogger(__name__)
+
+PGEN_MAGIC = b"\x6c\x1b"
+PGEN_MODE_HARDCALL = 0x02
+PGEN_MODE_DOSAGE = 0x03
+PGEN_HEADER_CONTROL = b"\x00"
+
+DOSAGE_SCALE = 16384
+DOSAGE_MISSING = 65535
+
+MAX_CHUNK_GENOTYPES = 2_000_000
+
+PSAM_SEX = {1: "1", 2: "2"}
+
+GENOTYPE_TABLES = {"rows": "genotypes", "packed": "genotypes_packed"}
+
+
+@dataclass
+class PgenExportResult:
+    """Summary of a PLINK 2 fileset export."""
+
+    pgen_path: Path
+    pvar_path: Path
+    psam_path: Path
+    variants_exported: int
+    samples_exported: int
+    with_dosage: bool
+
+
+def pgen_paths(output_prefix: Path) -> tuple[Path, Path, Path]:
+    """Get the .pgen, .pvar and .psam paths for an output prefix."""
+    prefix = str(output_prefix)
+    return Path(f"{prefix}.pgen"), Path(f"{prefix}.pvar"), Path(f"{prefix}.psam")
+
+
+def fill_missing_calls(
+    hardcalls: np.ndarray,
+    dosages: np.ndarray,
+    hard_call_threshold: float = 0.1,
+) -> None:
+    """Reconcile hardcall and dosage matrices in place.
+
+    Missing hardcalls are derived from dosages within ``hard_call_threshold``
+    of an integer (PLINK 2's --hard-call-threshold), and missing dosages are
+    taken from the hardcall.
+
+    Args:
+        hardcalls: uint8 matrix (variants x samples) of hardcall codes
+        dosages: float32 matrix (variants x samples), NaN where missing
+        hard_call_threshold: Maximum distance from an integer to call
+    """
+    has_dosage = ~np.isnan(dosages)
+    rounded = np.rint(np.where(has_dosage, dosages, 0.0))
+    callable_dosage = has_dosage & (np.abs(dosages - rounded) <= hard_call_threshold)
+    derive = (hardcalls == HARDCALL_MISSING) & callable_dosage
+    hardcalls[derive] = rounded[derive].astype(np.uint8)
+
+    from_call = ~has_dosage & (hardcalls != HARDCALL_MISSING)
+    dosages[from_call] = hardcalls[from_call]
+
+
+def encode_dosages(dosages: np.ndarray) -> np.ndarray:
+    """Encode float dosages as little-endian uint16 (65535 = missing)."""
+    encoded = np.full(dosages.shape, DOSAGE_MISSING, dtype="<u2")
+    present = ~np.isnan(dosages)
+    encoded[present] = np.rint(np.clip(dosages[present], 0.0, 2.0) * DOSAGE_SCALE)
+    return encoded
+
+
+def encode_pgen_records(hardcalls: np.ndarray, dosages: np.ndarray | None = None) -> bytes:
+    """Encode a chunk of variants as fixed-width .pgen records."""
+    packed = pack_hardcalls(hardcalls)
+    if dosages is None:
+        return packed.tobytes()
+    dosage_bytes = encode_dosages(dosages).view(np.uint8)
+    return np.concatenate([packed, dosage_bytes], axis=1).tobytes()
+
+
+def pgen_header(mode: int, n_variants: int, n_samples: int) -> bytes:
+    """Build the 12-byte fixed-width .pgen header.
+
+    Magic (2 bytes), storage mode (1), variant count (4), sample count (4)
+    and a zero header control byte.
+    """
+    return (
+        PGEN_MAGIC + bytes([mode]) + struct.pack("<II", n_variants, n_samples) + PGEN_HEADER_CONTROL
+    )
+
+
+async def fetch_genotyped_samples(
+    conn: asyncpg.Connection, sample_ids: list[int] | None, storage: str = "rows"
+) -> list[asyncpg.Record]:
+    """Fetch samples ordered by sample_id (default: all with stored genotypes)."""
+    if sample_ids is None:
+        stored_in = "genotypes" if storage == "rows" else "genotype_sample_slots"
+        return await conn.fetch(
+            f"""
+            SELECT sample_id, external_id, sex FROM samples
+            WHERE EXISTS (SELECT 1 FROM {stored_in} g WHERE g.sample_id = samples.sample_id)
+            ORDER BY sample_id
+            """
+        )
+    return await conn.fetch(
+        """
+        SELECT sample_id, external_id, sex FROM samples
+        WHERE sample_id = ANY($1::int[])
+        ORDER BY sample_id
+        """,
+        sample_ids,
+    )
+
+
+def build_genotype_chunk(
+    variant_ids: list[int],
+    rows: list[asyncpg.Record],
+    sample_index: dict[int, int],
+    hard_call_threshold: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build reconciled hardcall and dosage matrices for a chunk of variants.
+
+    Args:
+        variant_ids: Variant IDs defining the matrix rows
+        rows: Genotype rows with variant_id, sample_id, gt and dosage
+        sample_index: Mapping of sample_id to matrix column
+        hard_call_threshold: Dosage distance from an integer allowed when
+            deriving a missing hardcall
+
+    Returns:
+        Tuple of (hardcalls, dosages) matrices of shape (variants, samples)
+    """
+    variant_index = {variant_id: i for i, variant_id in enumerate(variant_ids)}
+    shape = (len(variant_ids), len(sample_index))
+    hardcalls = np.full(shape, HARDCALL_MISSING, dtype=np.uint8)
+    dosages = np.full(shape, np.nan, dtype=np.float32)
+
+    rows = [r for r in rows if r["sample_id"] in sample_index]
+    if rows:
+        row_idx = np.fromiter((variant_index[r["variant_id"]] for r in rows), np.intp, len(rows))
+        col_idx = np.fromiter((sample_index[r["sample_id"]] for r in rows), np.intp, len(rows))
+        hardcalls[row_idx, col_idx] = np.fromiter(
+            (gt_to_hardcall(r["gt"]) for r in rows), np.uint8, len(rows)
+        )
+        dosages[row_idx, col_idx] = np.fromiter(
+            (np.nan if r["dosage"] is None else r["dosage"] for r in rows),
+            np.float32,
+            len(rows),
+        )
+
+    fill_missing_calls(hardcalls, dosages, hard_call_threshold)
+    return hardcalls, dosages
+
+
+async def fetch_genotype_chunk(
+    conn: asyncpg.Connection,
+    variant_ids: list[int],
+    sample_index: dict[int, int],
+    hard_call_threshold: float,
+    storage: str = "rows",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fetch reconciled hardcall and dosage matrices from either genotype storage.
+
+    Args:
+        conn: Database connection
+        variant_ids: Variant IDs defining the matrix rows
+        sample_index: Mapping of sample_id to matrix column
+        hard_call_threshold: Dosage distance from an integer allowed when
+            deriving a missing hardcall
+        storage: Genotype storage mode (rows or packed)
+
+    Returns:
+        Tuple of (hardcalls, dosages) matrices of shape (variants, samples)
+    """
+    if storage == "packed":
+        hardcalls, dosages = await fetch_packed_matrix(conn, variant_ids, list(sample_index))
+        fill_missing_calls(hardcalls, dosages, hard_call_threshold)
+        return hardcalls, dosages
+
+    rows = await conn.fetch(
+        """
+        SELECT variant_id, sample_id, gt, dosage
+        FROM genotypes
+        WHERE variant_id = ANY($1::bigint[])
+        """,
+        variant_ids,
+    )
+    return build_genotype_chunk(variant_ids, rows, sample_index, hard_call_threshold)
+
+
+async def export_pgen(
+    conn: asyncpg.Connection,
+    output_prefix: Path,
+    sample_ids: list[int] | None = None,
+    with_dosage: bool = True,
+    chunk_size: int | None = None,
+    hard_call_threshold: float = 0.1,
+) -> PgenExportResult:
+    """Export stored genotypes as a PLINK 2 .pgen/.pvar/.psam fileset.
+
+    Genotypes are read from the genotypes table or, when they were loaded
+    with packed storage, from genotypes_packed.
+
+    Args:
+        conn: Database connection
+        output_prefix: Output path prefix (extensions are appended)
+        sample_ids: Samples to export (default: all samples with genotypes)
+        with_dosage: Write a dosage track alongside hardcalls
+        chunk_size: Variants per chunk held in memory (default: sized so a
+            chunk holds at most MAX_CHUNK_GENOTYPES genotypes)
+        hard_call_threshold: Dosage distance from an integer allowed when
+            deriving a missing hardcall
+
+    Returns:
+        PgenExportResult with output paths and counts
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    pgen_path, pvar_path, psam_path = pgen_paths(output_prefix)
+
+    storage = await detect_genotype_storage(conn)
+    samples = await fetch_genotyped_samples(conn, sample_ids, storage)
+    if not samples:
+        raise ValueError("No samples with stored genotypes to export")
+    sample_index = {s["sample_id"]: i for i, s in enumerate(samples)}
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_GENOTYPES // len(samples))
+
+    with open(psam_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("#IID\tSEX\n")
+        for s in samples:
+            f.write(f"{s['external_id']}\t{PSAM_SEX.get(s['sex'], 'NA')}\n")
+
+    mode = PGEN_MODE_DOSAGE if with_dosage else PGEN_MODE_HARDCALL
+    n_variants = 0
+
+    with (
+        open(pgen_path, "wb") as pgen,
+        open(pvar_path, "w", encoding="utf-8", newline="\n") as pvar,
+    ):
+        pgen.write(pgen_header(mode, 0, len(samples)))
+        pvar.write("#CHROM\tPOS\tID\tREF\tALT\n")
+
+        async with conn.transaction():
+            cursor = await conn.cursor(
+                f"""
+                SELECT v.variant_id, v.chrom, v.pos, v.rs_id, v.ref, v.alt
+                FROM variants v
+                WHERE EXISTS (
+                    SELECT 1 FROM {GENOTYPE_TABLES[storage]} g WHERE g.variant_id = v.variant_id
+                )
+                ORDER BY v.chrom, v.pos, v.variant_id
+                """
+            )
+            while True:
+                variants = await cursor.fetch(chunk_size)
+                if not variants:
+                    break
+
+                variant_ids = [v["variant_id"] for v in variants]
+                hardcalls, dosages = await fetch_genotype_chunk(
+                    conn, variant_ids, sample_index, hard_call_threshold, storage
+                )
+                records = encode_pgen_records(hardcalls, dosages if with_dosage else None)
+                await asyncio.to_thread(pgen.write, records)
+
+                pvar.writelines(
+                    f"{_normalize_chromosome(str(v['chrom']))}\t{v['pos']}\t"
+                    f"{v['rs_id'] or '.'}\t{v['ref']}\t{v['alt']}\n"
+                    for v in variants
+                )
+                n_variants += len(variants)
+                logger.debug("Wrote %d variants to %s", n_variants, pgen_path)
+
+        pgen.seek(0)
+        pgen.write(pgen_header(mode, n_variants, len(samples)))
+
+    logger.info(
+        "Exported %d variants x %d samples to PLINK 2 fileset: %s",
+        n_variants,
+        len(samples),
+        output_prefix,
+    )
+    return PgenExportResult(
+        pgen_path=pgen_path,
+        pvar_path=pvar_path,
+        psam_path=psam_path,
+        variants_exported=n_variants,
+        samples_exported=len(samples),
+        with_dosage=with_dosage,
+    )
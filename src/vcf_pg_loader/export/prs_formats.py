@@ -7,7 +7,9 @@ Supports:
 - PRSice-2 format (SNP, A1, A2, BETA, SE, P)
 """
 
+import asyncio
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -25,15 +27,21 @@ class VariantFilter:
     min_maf: float | None = None
 
 
-def _build_filter_clause(variant_filter: VariantFilter | None) -> tuple[str, list]:
+def _build_filter_clause(
+    variant_filter: VariantFilter | None, param_start: int = 2
+) -> tuple[str, list]:
     """Build SQL WHERE clause for variant filtering.
 
+    Args:
+        variant_filter: Optional variant filter
+        param_start: Index of the first positional parameter to emit
+
     Returns:
         Tuple of (WHERE clause string, parameter list)
     """
     conditions = []
     params: list = []
-    param_idx = 2
+    param_idx = param_start
 
     if variant_filter is None:
         return "", params
@@ -56,6 +64,35 @@ def _build_filter_clause(variant_filter: VariantFilter | None) -> tuple[str, lis
     return "", params
 
 
+def _variant_source(
+    variant_filter: VariantFilter | None, variant_table: str | None
+) -> tuple[str, str, list]:
+    """Resolve the relation joined as ``v`` and its filter clause.
+
+    When a pre-filtered variant table is supplied (see
+    ``materialize_filtered_variants``) the filter has already been applied,
+    so no clause or parameters are emitted.
+
+    Returns:
+        Tuple of (relation name, WHERE clause string, parameter list)
+    """
+    if variant_table is not None:
+        return variant_table, "", []
+    filter_clause, filter_params = _build_filter_clause(variant_filter)
+    return "variants", filter_clause, filter_params
+
+
+def _write_tsv(output_path: Path, header: str, lines: Iterable[str]) -> int:
+    """Write a header and tab-separated lines, returning the line count."""
+    count = 0
+    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(header + "\n")
+        for line in lines:
+            f.write(line + "\n")
+            count += 1
+    return count
+
+
 def _normalize_chromosome(chrom: str) -> str:
     """Normalize chromosome to numeric/letter format (no 'chr' prefix)."""
     if chrom.startswith("chr"):
@@ -93,6 +130,7 @@ async def export_plink_score(
     study_id: int,
     output_path: Path,
     variant_filter: VariantFilter | None = None,
+    variant_table: str | None = None,
 ) -> int:
     """Export GWAS summary statistics in PLINK 2.0 --score format.
 
@@ -105,11 +143,13 @@ async def export_plink_score(
         study_id: Study ID to export
         output_path: Path to output file
         variant_filter: Optional variant filter
+        variant_table: Optional pre-filtered variant table to join instead of
+            ``variants``; when given, ``variant_filter`` is ignored
 
     Returns:
         Number of variants exported
     """
-    filter_clause, filter_params = _build_filter_clause(variant_filter)
+    source, filter_clause, filter_params = _variant_source(variant_filter, variant_table)
 
     query = f"""
         SELECT
@@ -117,7 +157,7 @@ async def export_plink_score(
             g.effect_allele AS a1,
             g.beta
         FROM gwas_summary_stats g
-        JOIN variants v ON v.variant_id = g.variant_id
+        JOIN {source} v ON v.variant_id = g.variant_id
         WHERE g.study_id = $1
             AND v.rs_id IS NOT NULL
             AND g.beta IS NOT NULL
@@ -127,12 +167,8 @@ async def export_plink_score(
 
     rows = await conn.fetch(query, study_id, *filter_params)
 
-    count = 0
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write("SNP\tA1\tBETA\n")
-        for row in rows:
-            f.write(f"{row['snp']}\t{row['a1']}\t{row['beta']}\n")
-            count += 1
+    lines = (f"{row['snp']}\t{row['a1']}\t{row['beta']}" for row in rows)
+    count = await asyncio.to_thread(_write_tsv, output_path, "SNP\tA1\tBETA", lines)
 
     logger.info("Exported %d variants to PLINK score format: %s", count, output_path)
     return count
@@ -144,6 +180,7 @@ async def export_prs_cs(
     output_path: Path,
     use_se: bool = True,
     variant_filter: VariantFilter | None = None,
+    variant_table: str | None = None,
 ) -> int:
     """Export GWAS summary statistics in PRS-CS format.
 
@@ -161,11 +198,13 @@ async def export_prs_cs(
         output_path: Path to output file
         use_se: If True, include standard error; if False, include p-value
         variant_filter: Optional variant filter
+        variant_table: Optional pre-filtered variant table to join instead of
+            ``variants``; when given, ``variant_filter`` is ignored
 
     Returns:
         Number of variants exported
     """
-    filter_clause, filter_params = _build_filter_clause(variant_filter)
+    source, filter_clause, filter_params = _variant_source(variant_filter, variant_table)
 
     last_col = "g.standard_error AS last_val" if use_se else "g.p_value AS last_val"
 
@@ -177,7 +216,7 @@ async def export_prs_cs(
             g.beta,
             {last_col}
         FROM gwas_summary_stats g
-        JOIN variants v ON v.variant_id = g.variant_id
+        JOIN {source} v ON v.variant_id = g.variant_id
         WHERE g.study_id = $1
             AND v.rs_id IS NOT NULL
             AND g.beta IS NOT NULL
@@ -190,12 +229,10 @@ async def export_prs_cs(
 
     header = "SNP\tA1\tA2\tBETA\tSE" if use_se else "SNP\tA1\tA2\tBETA\tP"
 
-    count = 0
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(header + "\n")
-        for row in rows:
-            f.write(f"{row['snp']}\t{row['a1']}\t{row['a2']}\t{row['beta']}\t{row['last_val']}\n")
-            count += 1
+    lines = (
+        f"{row['snp']}\t{row['a1']}\t{row['a2']}\t{row['beta']}\t{row['last_val']}" for row in rows
+    )
+    count = await asyncio.to_thread(_write_tsv, output_path, header, lines)
 
     logger.info("Exported %d variants to PRS-CS format: %s", count, output_path)
     return count
@@ -206,6 +243,7 @@ async def export_ldpred2(
     study_id: int,
     output_path: Path,
     variant_filter: VariantFilter | None = None,
+    variant_table: str | None = None,
 ) -> int:
     """Export GWAS summary statistics in LDpred2 bigsnpr format.
 
@@ -221,12 +259,14 @@ async def export_ldpred2(
         study_id: Study ID to export
         output_path: Path to output file
         variant_filter: Optional variant filter
+        variant_table: Optional pre-filtered variant table to join instead of
+            ``variants``; when given, ``variant_filter`` is ignored
 
     Returns:
         Number of variants exported
     """
     n_eff = await _get_study_neff(conn, study_id)
-    filter_clause, filter_params = _build_filter_clause(variant_filter)
+    source, filter_clause, filter_params = _variant_source(variant_filter, variant_table)
 
     query = f"""
         SELECT
@@ -237,7 +277,7 @@ async def export_ldpred2(
             g.beta,
             g.standard_error AS beta_se
         FROM gwas_summary_stats g
-        JOIN variants v ON v.variant_id = g.variant_id
+        JOIN {source} v ON v.variant_id = g.variant_id
         WHERE g.study_id = $1
             AND g.beta IS NOT NULL
             AND g.standard_error IS NOT NULL
@@ -248,16 +288,14 @@ async def export_ldpred2(
 
     rows = await conn.fetch(query, study_id, *filter_params)
 
-    count = 0
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write("chr\tpos\ta0\ta1\tbeta\tbeta_se\tn_eff\n")
-        for row in rows:
-            chrom = _normalize_chromosome(str(row["chrom"]))
-            f.write(
-                f"{chrom}\t{row['pos']}\t{row['a0']}\t{row['a1']}\t"
-                f"{row['beta']}\t{row['beta_se']}\t{n_eff:.0f}\n"
-            )
-            count += 1
+    lines = (
+        f"{_normalize_chromosome(str(row['chrom']))}\t{row['pos']}\t{row['a0']}\t{row['a1']}\t"
+        f"{row['beta']}\t{row['beta_se']}\t{n_eff:.0f}"
+        for row in rows
+    )
+    count = await asyncio.to_thread(
+        _write_tsv, output_path, "chr\tpos\ta0\ta1\tbeta\tbeta_se\tn_eff", lines
+    )
 
     logger.info("Exported %d variants to LDpred2 format: %s", count, output_path)
     return count
@@ -268,6 +306,7 @@ async def export_prsice2(
     study_id: int,
     output_path: Path,
     variant_filter: VariantFilter | None = None,
+    variant_table: str | None = None,
 ) -> int:
     """Export GWAS summary statistics in PRSice-2 format.
 
@@ -280,11 +319,13 @@ async def export_prsice2(
         study_id: Study ID to export
         output_path: Path to output file
         variant_filter: Optional variant filter
+        variant_table: Optional pre-filtered variant table to join instead of
+            ``variants``; when given, ``variant_filter`` is ignored
 
     Returns:
         Number of variants exported
     """
-    filter_clause, filter_params = _build_filter_clause(variant_filter)
+    source, filter_clause, filter_params = _variant_source(variant_filter, variant_table)
 
     query = f"""
         SELECT
@@ -295,7 +336,7 @@ async def export_prsice2(
             g.standard_error AS se,
             g.p_value AS p
         FROM gwas_summary_stats g
-        JOIN variants v ON v.variant_id = g.variant_id
+        JOIN {source} v ON v.variant_id = g.variant_id
         WHERE g.study_id = $1
             AND v.rs_id IS NOT NULL
             AND g.beta IS NOT NULL
@@ -307,15 +348,11 @@ async def export_prsice2(
 
     rows = await conn.fetch(query, study_id, *filter_params)
 
-    count = 0
-    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write("SNP\tA1\tA2\tBETA\tSE\tP\n")
-        for row in rows:
-            f.write(
-                f"{row['snp']}\t{row['a1']}\t{row['a2']}\t"
-                f"{row['beta']}\t{row['se']}\t{row['p']}\n"
-            )
-            count += 1
+    lines = (
+        f"{row['snp']}\t{row['a1']}\t{row['a2']}\t{row['beta']}\t{row['se']}\t{row['p']}"
+        for row in rows
+    )
+    count = await asyncio.to_thread(_write_tsv, output_path, "SNP\tA1\tA2\tBETA\tSE\tP", lines)
 
     logger.info("Exported %d variants to PRSice-2 format: %s", count, output_path)
     return count
@@ -0,0 +1,276 @@
+"""Streaming writers for query and annotation results.
+
+Rows are read from a server-side cursor in fixed-size chunks and written
+incrementally as TSV, JSON, JSON lines or Parquet, so result size is bounded
+by the chunk size rather than the full result set.
+"""
+
+import csv
+import json
+import logging
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, TextIO
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+RESULT_FORMATS = ("tsv", "json", "jsonl", "parquet")
+
+_ARROW_INTEGER_TYPES = {"int2": "int16", "int4": "int32", "int8": "int64", "oid": "int64"}
+_ARROW_FLOAT_TYPES = {"float4": "float32", "float8": "float64", "numeric": "float64"}
+
+
+@dataclass
+class ResultColumn:
+    """Name and PostgreSQL type of a result column."""
+
+    name: str
+    pg_type: str
+
+
+class ResultWriter(ABC):
+    """Abstract base class for incremental result writers.
+
+    Subclasses implement ``write_rows`` (called per chunk) and may extend
+    ``begin`` (called once with the result columns) and ``finish``. Rows are
+    asyncpg Records or plain tuples in column order.
+    """
+
+    def begin(self, columns: list[ResultColumn]) -> None:
+        self.columns = columns
+
+    @abstractmethod
+    def write_rows(self, rows: list[asyncpg.Record]) -> None:
+        """Write one chunk of rows."""
+        pass
+
+    def finish(self) -> None:  # noqa: B027 - optional hook, not abstract
+        """Called once after the last chunk."""
+
+
+class _TextResultWriter(ResultWriter):
+    """Writer for text formats; writes to a file or stdout."""
+
+    def __init__(self, output: Path | None = None):
+        self.output = output
+        self._out: TextIO | None = None
+
+    def begin(self, columns: list[ResultColumn]) -> None:
+        super().begin(columns)
+        self._out = open(self.output, "w", newline="") if self.output else sys.stdout
+
+    def finish(self) -> None:
+        if self.output and self._out is not None:
+            self._out.close()
+        elif self._out is not None:
+            self._out.flush()
+
+
+class TSVResultWriter(_TextResultWriter):
+    """Tab-separated values with a header row."""
+
+    def begin(self, columns: list[ResultColumn]) -> None:
+        super().begin(columns)
+        self._writer = csv.writer(self._out, delimiter="\t")
+        if columns:
+            self._writer.writerow([c.name for c in columns])
+
+    def write_rows(self, rows: list[asyncpg.Record]) -> None:
+        self._writer.writerows(rows)
+
+
+class _JSONResultWriter(_TextResultWriter):
+    """Base for JSON formats; serializes each row as an object."""
+
+    def begin(self, columns: list[ResultColumn]) -> None:
+        super().begin(columns)
+        self._names = [c.name for c in columns]
+
+    def _dumps(self, row) -> str:
+        return json.dumps(dict(zip(self._names, row, strict=True)), default=str)
+
+
+class JSONLinesResultWriter(_JSONResultWriter):
+    """One JSON object per line."""
+
+    def write_rows(self, rows: list[asyncpg.Record]) -> None:
+        for row in rows:
+            self._out.write(self._dumps(row))
+            self._out.write("\n")
+
+
+class JSONResultWriter(_JSONResultWriter):
+    """A single JSON array, written one element at a time."""
+
+    def begin(self, columns: list[ResultColumn]) -> None:
+        super().begin(columns)
+        self._separator = "[\n  "
+
+    def write_rows(self, rows: list[asyncpg.Record]) -> None:
+        for row in rows:
+            self._out.write(self._separator)
+            self._out.write(self._dumps(row))
+            self._separator = ",\n  "
+
+    def finish(self) -> None:
+        if self._out is not None:
+            self._out.write("[]\n" if self._separator.startswith("[") else "\n]\n")
+        super().finish()
+
+
+class ParquetResultWriter(ResultWriter):
+    """Parquet file written as one row group per chunk.
+
+    Column types come from the PostgreSQL result description, so chunks that
+    are entirely NULL in a column still share one schema. Integer, float and
+    boolean columns keep their types; everything else is written as strings.
+    """
+
+    def __init__(self, output: Path):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Parquet output requires pyarrow. Install with: pip install pyarrow"
+            ) from e
+
+        self.output = output
+        self._writer = None
+
+    def begin(self, columns: list[ResultColumn]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().begin(columns)
+        fields = []
+        self._converters = []
+        for column in columns:
+            arrow_type, converter = _arrow_type(pa, column.pg_type)
+            fields.append(pa.field(column.name, arrow_type))
+            self._converters.append(converter)
+        self._schema = pa.schema(fields)
+        self._writer = pq.ParquetWriter(str(self.output), self._schema)
+
+    def write_rows(self, rows: list[asyncpg.Record]) -> None:
+        import pyarrow as pa
+
+        arrays = [
+            pa.array([convert(row[i]) for row in rows], type=field.type)
+            for i, (field, convert) in enumerate(zip(self._schema, self._converters, strict=True))
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def finish(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _arrow_type(pa, pg_type: str):
+    """Map a PostgreSQL type name to an Arrow type and a value converter."""
+    if pg_type in _ARROW_INTEGER_TYPES:
+        return getattr(pa, _ARROW_INTEGER_TYPES[pg_type])(), _identity
+    if pg_type in _ARROW_FLOAT_TYPES:
+        converter = _to_float if pg_type == "numeric" else _identity
+        return getattr(pa, _ARROW_FLOAT_TYPES[pg_type])(), converter
+    if pg_type == "bool":
+        return pa.bool_(), _identity
+    return pa.string(), _to_string
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _to_float(value: Decimal | None) -> float | None:
+    return None if value is None else float(value)
+
+
+def _to_string(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, dict | list):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def open_result_writer(format: str, output: Path | None = None) -> ResultWriter:
+    """Create a writer for one of ``RESULT_FORMATS``.
+
+    Args:
+        format: Output format
+        output: Output file; text formats write to stdout when omitted
+
+    Returns:
+        A ResultWriter ready for ``stream_query_results``
+
+    Raises:
+        ValueError: If the format is unknown, or Parquet has no output file
+    """
+    if format not in RESULT_FORMATS:
+        raise ValueError(
+            f"Unknown output format: {format}. Choose from: {', '.join(RESULT_FORMATS)}"
+        )
+    if format == "parquet":
+        if output is None:
+            raise ValueError("Parquet output requires an output file")
+        return ParquetResultWriter(output)
+    if format == "json":
+        return JSONResultWriter(output)
+    if format == "jsonl":
+        return JSONLinesResultWriter(output)
+    return TSVResultWriter(output)
+
+
+async def stream_query_results(
+    conn: asyncpg.Connection,
+    query: str,
+    *params,
+    writer: ResultWriter,
+    chunk_size: int = 10000,
+    settings: dict[str, str] | None = None,
+) -> int:
+    """Run a query through a server-side cursor and write it chunk by chunk.
+
+    Statements that return no rows are executed and give an empty result.
+
+    Args:
+        conn: Database connection
+        query: SQL query
+        *params: Query parameters
+        writer: Destination writer
+        chunk_size: Rows fetched and written per round trip
+        settings: Planner settings applied with SET LOCAL for the query
+
+    Returns:
+        Number of rows written
+    """
+    total = 0
+    async with conn.transaction():
+        for name, value in (settings or {}).items():
+            await conn.execute(f"SET LOCAL {name} = {value}")
+
+        stmt = await conn.prepare(query)
+        attributes = stmt.get_attributes()
+        if not attributes:
+            # A statement without a result (UPDATE, CREATE, ...) cannot be
+            # opened as a cursor, so it is executed once instead
+            await conn.execute(query, *params)
+        writer.begin([ResultColumn(a.name, a.type.name) for a in attributes])
+
+        try:
+            if attributes:
+                cursor = await stmt.cursor(*params)
+                while rows := await cursor.fetch(chunk_size):
+                    writer.write_rows(rows)
+                    total += len(rows)
+        finally:
+            writer.finish()
+
+    logger.debug(f"Streamed {total} rows in chunks of {chunk_size}")
+    return total
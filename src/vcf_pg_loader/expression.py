@@ -5,9 +5,15 @@ Converts expressions like:
 
 To SQL WHERE clauses like:
     gnomad_af < 0.01 AND clinvar_sig = 'Pathogenic'
+
+Expressions are tokenized and parsed into a small syntax tree, which can be
+rendered with inline literals (``parse``) or compiled to parameterized SQL
+whose literals are bound as ``$n`` query parameters (``compile``), so the same
+statement text, and its cached plan, is reused across thresholds.
 """
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
 
 @dataclass
@@ -17,15 +23,302 @@ class ParseError:
     position: int | None = None
 
 
+class ExpressionSyntaxError(ValueError):
+    """Raised when a filter expression cannot be tokenized or parsed."""
+
+    def __init__(self, message: str, position: int | None = None):
+        super().__init__(message)
+        self.position = position
+
+
+@dataclass(frozen=True)
+class Token:
+    """A lexical token of a filter expression."""
+    kind: str
+    text: str
+    position: int
+
+
+@dataclass(frozen=True)
+class Field:
+    """Reference to an annotation field."""
+    name: str
+
+
+@dataclass(frozen=True)
+class Literal:
+    """A string, numeric or boolean constant."""
+    value: Any
+    text: str
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Binary comparison; ``op`` is the SQL operator."""
+    left: Field | Literal
+    op: str
+    right: Field | Literal
+
+
+@dataclass(frozen=True)
+class NullCheck:
+    """``field IS NULL`` or ``field IS NOT NULL``."""
+    field: Field
+    negated: bool = False
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    """``AND``/``OR`` over two or more operands."""
+    op: str
+    operands: tuple
+
+
+@dataclass(frozen=True)
+class Not:
+    """Logical negation."""
+    operand: Any
+
+
+Expression = Comparison | NullCheck | BoolOp | Not
+
+
+@dataclass
+class FilterConjunct:
+    """One top-level AND term of a compiled filter.
+
+    Attributes:
+        node: Syntax tree of the term
+        sql: Parameterized SQL for the term
+        fields: Fields the term references
+        strict_fields: Fields that must be non-NULL for the term to be true
+    """
+    node: Expression
+    sql: str
+    fields: set[str]
+    strict_fields: set[str]
+
+
+@dataclass
+class CompiledFilter:
+    """A filter expression compiled to parameterized SQL."""
+    conjuncts: list[FilterConjunct] = field(default_factory=list)
+    params: list[Any] = field(default_factory=list)
+
+    @property
+    def sql(self) -> str:
+        """The full WHERE clause (without the WHERE keyword)."""
+        if not self.conjuncts:
+            return "TRUE"
+        return " AND ".join(c.sql for c in self.conjuncts)
+
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>\s+)
+    |(?P<number>-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)
+    |(?P<string>'[^']*'|"[^"]*")
+    |(?P<op><=|>=|==|!=|<>|=|<|>)
+    |(?P<and>&&)
+    |(?P<or>\|\|)
+    |(?P<not>!)
+    |(?P<lparen>\()
+    |(?P<rparen>\))
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"AND", "OR", "NOT", "IS", "NULL", "TRUE", "FALSE"}
+
+_NEGATED_OPS = {"=": "<>", "<>": "=", "<": ">=", "<=": ">", ">": "<=", ">=": "<"}
+_MIRRORED_OPS = {"=": "=", "<>": "<>", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+def tokenize(expr: str) -> list[Token]:
+    """Split an expression into tokens, ending with an ``eof`` token.
+
+    Raises:
+        ExpressionSyntaxError: On an unclosed string or unexpected character
+    """
+    tokens = []
+    pos = 0
+    while pos < len(expr):
+        match = _TOKEN_PATTERN.match(expr, pos)
+        if match is None:
+            if expr[pos] in ('"', "'"):
+                raise ExpressionSyntaxError("Unclosed string literal", pos)
+            raise ExpressionSyntaxError(f"Unexpected character '{expr[pos]}'", pos)
+
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "word" and text.upper() in _KEYWORDS:
+            kind = text.lower()
+        if kind != "space":
+            tokens.append(Token(kind, text, pos))
+        pos = match.end()
+
+    tokens.append(Token("eof", "", len(expr)))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser over a token list.
+
+    Grammar::
+
+        or_expr   := and_expr (('||' | OR) and_expr)*
+        and_expr  := unary (('&&' | AND) unary)*
+        unary     := ('!' | NOT) unary | '(' or_expr ')' | predicate
+        predicate := operand (IS [NOT] NULL | comparison_op operand)
+    """
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.index = 0
+
+    @property
+    def current(self) -> Token:
+        return self.tokens[self.index]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def parse(self) -> Expression:
+        node = self.or_expr()
+        if self.current.kind == "rparen":
+            raise ExpressionSyntaxError("Unbalanced parentheses", self.current.position)
+        if self.current.kind != "eof":
+            raise ExpressionSyntaxError(
+                f"Unexpected '{self.current.text}'", self.current.position
+            )
+        return node
+
+    def or_expr(self) -> Expression:
+        operands = [self.and_expr()]
+        while self.current.kind == "or":
+            self.advance()
+            operands.append(self.and_expr())
+        return operands[0] if len(operands) == 1 else BoolOp("OR", tuple(operands))
+
+    def and_expr(self) -> Expression:
+        operands = [self.unary()]
+        while self.current.kind == "and":
+            self.advance()
+            operands.append(self.unary())
+        return operands[0] if len(operands) == 1 else BoolOp("AND", tuple(operands))
+
+    def unary(self) -> Expression:
+        if self.current.kind == "not":
+            self.advance()
+            return Not(self.unary())
+        if self.current.kind == "lparen":
+            self.advance()
+            node = self.or_expr()
+            if self.current.kind != "rparen":
+                raise ExpressionSyntaxError("Unbalanced parentheses", self.current.position)
+            self.advance()
+            return node
+        return self.predicate()
+
+    def predicate(self) -> Expression:
+        start = self.current
+        left = self.operand()
+
+        if self.current.kind == "is":
+            self.advance()
+            negated = self.current.kind == "not"
+            if negated:
+                self.advance()
+            if self.current.kind != "null":
+                raise ExpressionSyntaxError("Expected NULL after IS", self.current.position)
+            self.advance()
+            if not isinstance(left, Field):
+                raise ExpressionSyntaxError("IS NULL requires a field", start.position)
+            return NullCheck(left, negated)
+
+        if self.current.kind != "op":
+            raise ExpressionSyntaxError(
+                f"Expected a comparison after '{start.text}'", self.current.position
+            )
+        op = self.advance().text
+        op = {"==": "=", "!=": "<>"}.get(op, op)
+        right = self.operand()
+
+        if isinstance(left, Literal) and isinstance(right, Literal):
+            raise ExpressionSyntaxError("Comparison requires a field", start.position)
+        if isinstance(left, Literal):
+            return Comparison(right, _MIRRORED_OPS[op], left)
+        return Comparison(left, op, right)
+
+    def operand(self) -> Field | Literal:
+        token = self.advance()
+        if token.kind == "word":
+            return Field(token.text)
+        if token.kind == "number":
+            is_float = any(c in token.text for c in ".eE")
+            return Literal(float(token.text) if is_float else int(token.text), token.text)
+        if token.kind == "string":
+            return Literal(token.text[1:-1], token.text)
+        if token.kind in ("true", "false"):
+            return Literal(token.kind == "true", token.kind.upper())
+        if token.kind == "eof":
+            raise ExpressionSyntaxError("Unexpected end of expression", token.position)
+        if token.kind == "rparen":
+            raise ExpressionSyntaxError("Unbalanced parentheses", token.position)
+        raise ExpressionSyntaxError(f"Unexpected '{token.text}'", token.position)
+
+
+def _fields(node: Any) -> set[str]:
+    if isinstance(node, Field):
+        return {node.name}
+    if isinstance(node, Literal):
+        return set()
+    if isinstance(node, Comparison):
+        return _fields(node.left) | _fields(node.right)
+    if isinstance(node, NullCheck):
+        return {node.field.name}
+    if isinstance(node, Not):
+        return _fields(node.operand)
+    return set().union(*(_fields(o) for o in node.operands))
+
+
+def _strict_fields(node: Expression) -> set[str]:
+    """Fields that must be non-NULL for ``node`` to evaluate to true."""
+    if isinstance(node, Comparison):
+        return _fields(node)
+    if isinstance(node, NullCheck):
+        return {node.field.name} if node.negated else set()
+    if isinstance(node, Not):
+        inner = node.operand
+        if isinstance(inner, Comparison):
+            return _fields(inner)
+        if isinstance(inner, NullCheck) and not inner.negated:
+            return {inner.field.name}
+        return set()
+    if node.op == "AND":
+        return set().union(*(_strict_fields(o) for o in node.operands))
+    return set.intersection(*(_strict_fields(o) for o in node.operands))
+
+
+def _conjuncts(node: Expression) -> list[Expression]:
+    if isinstance(node, BoolOp) and node.op == "AND":
+        return [c for operand in node.operands for c in _conjuncts(operand)]
+    return [node]
+
+
 class FilterExpressionParser:
     """Parse echtvar-style filter expressions to SQL WHERE clauses.
 
     Supported syntax:
     - Comparisons: <, <=, >, >=, ==, !=
-    - Boolean operators: && (AND), || (OR)
+    - Boolean operators: && (AND), || (OR), ! (NOT), and parentheses
     - NULL handling: IS NULL, IS NOT NULL
     - String literals: 'value' or "value"
-    - Numeric literals: 0.01, 100, -5
+    - Numeric literals: 0.01, 100, -5, 1e-3
+    - Boolean literals: TRUE, FALSE
 
     Examples:
         gnomad_af < 0.01
@@ -33,22 +326,16 @@ class FilterExpressionParser:
         gnomad_af < 0.01 || gnomad_af IS NULL
     """
 
-    OPERATOR_MAP = {
-        "&&": "AND",
-        "||": "OR",
-        "==": "=",
-        "!=": "<>",
-    }
+    def parse_tree(self, expr: str) -> Expression:
+        """Parse an expression into its syntax tree.
 
-    COMPARISON_OPS = {"<", "<=", ">", ">=", "==", "!=", "=", "<>"}
-
-    KEYWORD_PATTERN = re.compile(
-        r"\b(IS\s+NULL|IS\s+NOT\s+NULL)\b",
-        re.IGNORECASE,
-    )
+        Raises:
+            ExpressionSyntaxError: If the expression is malformed
+        """
+        return _Parser(tokenize(expr)).parse()
 
     def parse(self, expr: str, available_fields: set[str]) -> str:
-        """Parse an expression to SQL.
+        """Parse an expression to SQL with inline literals.
 
         Args:
             expr: The filter expression in echtvar syntax
@@ -63,18 +350,86 @@ class FilterExpressionParser:
         if not expr or not expr.strip():
             return "TRUE"
 
-        errors = self.validate(expr, available_fields)
-        if errors:
-            raise ValueError(f"Invalid expression: {'; '.join(errors)}")
+        node = self._checked_tree(expr, available_fields)
+        return " AND ".join(self.render(c) for c in _conjuncts(node))
+
+    def compile(
+        self,
+        expr: str,
+        columns: dict[str, str],
+        param_offset: int = 0,
+    ) -> CompiledFilter:
+        """Compile an expression to parameterized SQL.
+
+        Literals become ``$n`` placeholders numbered after ``param_offset``.
+        Decimal literals are cast to double precision so they compare with
+        integer columns too; other placeholders take the type of the column
+        they are compared with, which keeps the predicate indexable.
+
+        Args:
+            expr: The filter expression in echtvar syntax
+            columns: Valid field names mapped to the (qualified) column SQL
+            param_offset: Number of parameters already used by the query
 
-        sql = expr
+        Returns:
+            CompiledFilter with one entry per top-level AND term
 
-        for echtvar_op, sql_op in self.OPERATOR_MAP.items():
-            sql = sql.replace(echtvar_op, f" {sql_op} ")
+        Raises:
+            ValueError: If the expression is invalid
+        """
+        compiled = CompiledFilter()
+        if not expr or not expr.strip():
+            return compiled
+
+        node = self._checked_tree(expr, set(columns))
+        for conjunct in _conjuncts(node):
+            sql = self.render(conjunct, columns, compiled.params, param_offset)
+            compiled.conjuncts.append(
+                FilterConjunct(conjunct, sql, _fields(conjunct), _strict_fields(conjunct))
+            )
+        return compiled
+
+    def render(
+        self,
+        node: Any,
+        columns: dict[str, str] | None = None,
+        params: list | None = None,
+        param_offset: int = 0,
+    ) -> str:
+        """Render a syntax tree as SQL.
 
-        sql = re.sub(r"\s+", " ", sql).strip()
+        Args:
+            node: Syntax tree (or subtree)
+            columns: Optional field name to column SQL mapping
+            params: When given, literals are appended here and rendered as
+                placeholders; otherwise they are rendered inline
+            param_offset: Number of parameters preceding ``params``
 
-        return sql
+        Returns:
+            SQL text
+        """
+        def visit(n: Any) -> str:
+            if isinstance(n, Field):
+                return columns[n.name] if columns else n.name
+            if isinstance(n, Literal):
+                if params is None:
+                    return self._inline_literal(n)
+                params.append(n.value)
+                placeholder = f"${param_offset + len(params)}"
+                return f"{placeholder}::float8" if isinstance(n.value, float) else placeholder
+            if isinstance(n, Comparison):
+                return f"{visit(n.left)} {n.op} {visit(n.right)}"
+            if isinstance(n, NullCheck):
+                return f"{visit(n.field)} IS {'NOT ' if n.negated else ''}NULL"
+            if isinstance(n, Not):
+                if isinstance(n.operand, Comparison):
+                    return visit(
+                        Comparison(n.operand.left, _NEGATED_OPS[n.operand.op], n.operand.right)
+                    )
+                return f"NOT ({visit(n.operand)})"
+            return "(" + f" {n.op} ".join(visit(o) for o in n.operands) + ")"
+
+        return visit(node)
 
     def validate(self, expr: str, available_fields: set[str]) -> list[str]:
         """Validate a filter expression.
@@ -86,131 +441,19 @@ class FilterExpressionParser:
         Returns:
             List of error messages (empty if valid)
         """
-        errors = []
-
         if not expr or not expr.strip():
-            return errors
-
-        tokens = self._tokenize(expr)
-
-        for token in tokens:
-            if self._is_identifier(token):
-                if token.upper() not in ("IS", "NULL", "NOT", "AND", "OR", "TRUE", "FALSE"):
-                    if token not in available_fields:
-                        errors.append(f"Unknown field: '{token}'")
-
-        paren_depth = 0
-        for char in expr:
-            if char == "(":
-                paren_depth += 1
-            elif char == ")":
-                paren_depth -= 1
-            if paren_depth < 0:
-                errors.append("Unbalanced parentheses")
-                break
-
-        if paren_depth != 0:
-            errors.append("Unbalanced parentheses")
-
-        in_string = False
-        string_char = None
-        for char in expr:
-            if char in ('"', "'") and not in_string:
-                in_string = True
-                string_char = char
-            elif char == string_char and in_string:
-                in_string = False
-                string_char = None
-
-        if in_string:
-            errors.append("Unclosed string literal")
-
-        return errors
-
-    def _tokenize(self, expr: str) -> list[str]:
-        """Tokenize an expression into individual tokens."""
-        tokens = []
-        current = ""
-        in_string = False
-        string_char = None
-
-        i = 0
-        while i < len(expr):
-            char = expr[i]
-
-            if char in ('"', "'") and not in_string:
-                if current:
-                    tokens.append(current)
-                    current = ""
-                in_string = True
-                string_char = char
-                current += char
-            elif char == string_char and in_string:
-                current += char
-                tokens.append(current)
-                current = ""
-                in_string = False
-                string_char = None
-            elif in_string:
-                current += char
-            elif char in " \t\n":
-                if current:
-                    tokens.append(current)
-                    current = ""
-            elif char in "()":
-                if current:
-                    tokens.append(current)
-                    current = ""
-                tokens.append(char)
-            elif char in "<>=!":
-                if current:
-                    tokens.append(current)
-                    current = ""
-                op = char
-                if i + 1 < len(expr) and expr[i + 1] in "=":
-                    op += expr[i + 1]
-                    i += 1
-                tokens.append(op)
-            elif char == "&" and i + 1 < len(expr) and expr[i + 1] == "&":
-                if current:
-                    tokens.append(current)
-                    current = ""
-                tokens.append("&&")
-                i += 1
-            elif char == "|" and i + 1 < len(expr) and expr[i + 1] == "|":
-                if current:
-                    tokens.append(current)
-                    current = ""
-                tokens.append("||")
-                i += 1
-            else:
-                current += char
-
-            i += 1
-
-        if current:
-            tokens.append(current)
-
-        return tokens
-
-    def _is_identifier(self, token: str) -> bool:
-        """Check if a token is an identifier (field name or keyword)."""
-        if not token:
-            return False
-
-        if token[0] in ('"', "'"):
-            return False
+            return []
 
         try:
-            float(token)
-            return False
-        except ValueError:
-            pass
+            node = self.parse_tree(expr)
+        except ExpressionSyntaxError as e:
+            return [str(e)]
 
-        if token in self.COMPARISON_OPS or token in ("&&", "||", "(", ")"):
-            return False
-
-        return token.replace("_", "").isalnum()
+        return [
+            f"Unknown field: '{name}'"
+            for name in sorted(_fields(node))
+            if name not in available_fields
+        ]
 
     def extract_fields(self, expr: str) -> set[str]:
         """Extract field names from an expression.
@@ -221,15 +464,21 @@ class FilterExpressionParser:
         Returns:
             Set of field names used in the expression
         """
-        if not expr:
+        if not expr or not expr.strip():
             return set()
 
-        tokens = self._tokenize(expr)
-        fields = set()
+        return _fields(self.parse_tree(expr))
 
-        for token in tokens:
-            if self._is_identifier(token):
-                if token.upper() not in ("IS", "NULL", "NOT", "AND", "OR", "TRUE", "FALSE"):
-                    fields.add(token)
-
-        return fields
+    def _checked_tree(self, expr: str, available_fields: set[str]) -> Expression:
+        errors = self.validate(expr, available_fields)
+        if errors:
+            raise ValueError(f"Invalid expression: {'; '.join(errors)}")
+        return self.parse_tree(expr)
+
+    @staticmethod
+    def _inline_literal(literal: Literal) -> str:
+        if isinstance(literal.value, str):
+            return "'" + literal.value.replace("'", "''") + "'"
+        if isinstance(literal.value, bool):
+            return "TRUE" if literal.value else "FALSE"
+        return literal.text
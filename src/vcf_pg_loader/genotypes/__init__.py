@@ -10,15 +10,30 @@ from .genotype_loader import (
     parse_genotype_fields,
     validate_dosage,
 )
-from .schema import GenotypesSchemaManager
+from .packed import (
+    PackedGenotypeLoader,
+    assign_sample_slots,
+    decode_sample_block,
+    detect_genotype_storage,
+    encode_sample_block,
+    fetch_packed_matrix,
+)
+from .schema import GenotypesSchemaManager, PackedGenotypesSchemaManager
 
 __all__ = [
     "GenotypesSchemaManager",
     "GenotypeLoader",
     "GenotypeRecord",
+    "PackedGenotypeLoader",
+    "PackedGenotypesSchemaManager",
+    "assign_sample_slots",
     "compute_allele_balance",
+    "decode_sample_block",
+    "detect_genotype_storage",
     "dosage_from_gp",
+    "encode_sample_block",
     "evaluate_adj_filter",
+    "fetch_packed_matrix",
     "get_partition_number",
     "parse_genotype_fields",
     "validate_dosage",
@@ -0,0 +1,505 @@
+"""Compact genotype storage with packed per-variant sample blocks.
+
+Instead of one ``genotypes`` row per (variant, sample), the packed mode stores
+one ``genotypes_packed`` row per variant per block of up to
+SAMPLE_BLOCK_SIZE samples:
+
+- ``calls``: 2-bit hard calls, four samples per byte starting at the low bits
+  (0 = hom-ref, 1 = het, 2 = hom-alt, 3 = missing), the same layout as a
+  PLINK 2 .pgen record
+- ``dosages``: one byte per sample, ``round(dosage * 100)`` (255 = missing),
+  or NULL when no sample in the block has a dosage
+
+Each sample is assigned a fixed (sample_block, slot) position in
+``genotype_sample_slots``. Samples first seen in a load fill the last partly
+used block before new blocks are started, so a series of single-sample loads
+shares one row per variant. A load merges its slots into the existing block
+rows, holding a transaction-level advisory lock per block so that concurrent
+loads into the same block do not overwrite each other's slots.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Literal
+
+import asyncpg
+import numpy as np
+from cyvcf2 import VCF
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_BLOCK_SIZE = 4096
+
+HARDCALL_MISSING = 3
+DOSAGE_UINT8_SCALE = 100
+DOSAGE_UINT8_MISSING = 255
+
+GT_HARDCALLS = {
+    "0/0": 0,
+    "0|0": 0,
+    "0/1": 1,
+    "1/0": 1,
+    "0|1": 1,
+    "1|0": 1,
+    "1/1": 2,
+    "1|1": 2,
+}
+
+
+def gt_to_hardcall(gt: str | None) -> int:
+    """Convert a stored GT string to a 2-bit hard call code."""
+    if gt is None:
+        return HARDCALL_MISSING
+    return GT_HARDCALLS.get(gt, HARDCALL_MISSING)
+
+
+def pack_hardcalls(hardcalls: np.ndarray) -> np.ndarray:
+    """Pack a (variants x samples) hardcall matrix to 2 bits per sample.
+
+    Returns:
+        uint8 matrix of shape (variants, ceil(samples / 4))
+    """
+    n_variants, n_samples = hardcalls.shape
+    padded_samples = -(-n_samples // 4) * 4
+    padded = np.zeros((n_variants, padded_samples), dtype=np.uint8)
+    padded[:, :n_samples] = hardcalls
+    quads = padded.reshape(n_variants, -1, 4)
+    return quads[:, :, 0] | (quads[:, :, 1] << 2) | (quads[:, :, 2] << 4) | (quads[:, :, 3] << 6)
+
+
+def unpack_hardcalls(packed: bytes, n_samples: int) -> np.ndarray:
+    """Unpack 2-bit hard calls to a uint8 array of length n_samples."""
+    data = np.frombuffer(packed, dtype=np.uint8)
+    codes = np.stack([(data >> shift) & 0b11 for shift in (0, 2, 4, 6)], axis=1)
+    return codes.reshape(-1)[:n_samples].copy()
+
+
+def quantize_dosages(dosages: np.ndarray) -> np.ndarray:
+    """Quantize float dosages to uint8 hundredths (255 = missing)."""
+    encoded = np.full(dosages.shape, DOSAGE_UINT8_MISSING, dtype=np.uint8)
+    present = ~np.isnan(dosages)
+    encoded[present] = np.rint(np.clip(dosages[present], 0.0, 2.0) * DOSAGE_UINT8_SCALE)
+    return encoded
+
+
+def dequantize_dosages(packed: bytes) -> np.ndarray:
+    """Decode uint8 dosages to float32, NaN where missing."""
+    data = np.frombuffer(packed, dtype=np.uint8)
+    dosages = data.astype(np.float32) / DOSAGE_UINT8_SCALE
+    dosages[data == DOSAGE_UINT8_MISSING] = np.nan
+    return dosages
+
+
+def encode_sample_block(
+    hardcalls: np.ndarray, dosages: np.ndarray | None = None
+) -> tuple[bytes, bytes | None]:
+    """Encode one variant's sample block as (calls, dosages) bytea values.
+
+    Args:
+        hardcalls: uint8 hard call codes, one per slot
+        dosages: float dosages, one per slot, NaN where missing
+
+    Returns:
+        Tuple of packed calls and quantized dosages (None if all missing)
+    """
+    calls = pack_hardcalls(hardcalls.reshape(1, -1)).tobytes()
+    if dosages is None or np.isnan(dosages).all():
+        return calls, None
+    return calls, quantize_dosages(dosages).tobytes()
+
+
+def decode_sample_block(
+    calls: bytes, dosages: bytes | None, n_samples: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Decode a stored sample block to hard call and dosage arrays."""
+    hardcalls = unpack_hardcalls(calls, n_samples)
+    if dosages is None:
+        return hardcalls, np.full(n_samples, np.nan, dtype=np.float32)
+    return hardcalls, dequantize_dosages(dosages)[:n_samples]
+
+
+def alleles_to_hardcalls(alleles: np.ndarray) -> np.ndarray:
+    """Convert a (samples x ploidy) allele index array to hard calls.
+
+    Calls with a missing allele or an allele other than REF/first ALT are
+    stored as missing.
+    """
+    if alleles.shape[1] < 2:
+        return np.full(len(alleles), HARDCALL_MISSING, dtype=np.uint8)
+    diploid = alleles[:, :2]
+    callable_ = ((diploid == 0) | (diploid == 1)).all(axis=1)
+    return np.where(callable_, diploid.sum(axis=1), HARDCALL_MISSING).astype(np.uint8)
+
+
+def adj_failures(
+    hardcalls: np.ndarray,
+    gq: np.ndarray | None,
+    dp: np.ndarray | None,
+    ad: np.ndarray | None,
+) -> np.ndarray:
+    """Vectorized gnomAD ADJ filter; returns a mask of failing samples.
+
+    Missing values (negative in cyvcf2 arrays) pass, matching
+    evaluate_adj_filter.
+    """
+    fails = np.zeros(len(hardcalls), dtype=bool)
+    if gq is not None:
+        values = gq[:, 0]
+        fails |= (values >= 0) & (values < 20)
+    if dp is not None:
+        values = dp[:, 0]
+        fails |= (values >= 0) & (values < 10)
+    if ad is not None and ad.shape[1] >= 2:
+        depths = np.where(ad >= 0, ad, 0).astype(np.float64)
+        total = depths.sum(axis=1)
+        alt = depths[:, 1:].sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            balance = np.where(total > 0, alt / total, np.nan)
+        fails |= (hardcalls == 1) & (balance < 0.2)
+    return fails
+
+
+class PackedGenotypeLoader:
+    """Loads genotypes from VCF files into packed per-variant sample blocks."""
+
+    def __init__(
+        self,
+        adj_filter: bool = False,
+        dosage_only: bool = False,
+        batch_size: int = 1000,
+    ):
+        """Initialize packed genotype loader.
+
+        Args:
+            adj_filter: Store genotypes failing ADJ criteria as missing
+            dosage_only: Store only dosages; hard calls are all missing
+            batch_size: Number of packed rows per batch insert
+        """
+        self.adj_filter = adj_filter
+        self.dosage_only = dosage_only
+        self.batch_size = batch_size
+
+    async def load_from_vcf(
+        self,
+        conn: asyncpg.Connection,
+        vcf_path: Path,
+        variant_id_start: int = 1,
+        sample_id_map: dict[str, int] | None = None,
+    ) -> dict[str, Any]:
+        """Load genotypes from a VCF file as packed sample blocks.
+
+        Args:
+            conn: Database connection
+            vcf_path: Path to VCF file
+            variant_id_start: Starting variant_id
+            sample_id_map: Optional mapping from sample names to sample_ids
+
+        Returns:
+            Statistics about loaded genotypes
+        """
+        vcf = VCF(str(vcf_path))
+        try:
+            samples = vcf.samples
+            if sample_id_map is None:
+                sample_id_map = await self._get_sample_id_map(conn, samples)
+
+            vcf_columns = [i for i, name in enumerate(samples) if name in sample_id_map]
+            slots = await assign_sample_slots(
+                conn, [sample_id_map[samples[i]] for i in vcf_columns]
+            )
+            layout = _block_layout(vcf_columns, slots)
+
+            rows: list[tuple[int, int, np.ndarray, np.ndarray, np.ndarray]] = []
+            variant_id = variant_id_start
+            total_loaded = 0
+            total_skipped = 0
+
+            for variant in vcf:
+                hardcalls = alleles_to_hardcalls(variant.genotype.array()[:, :-1])
+                dosages = self._dosages(variant, len(samples))
+
+                if self.adj_filter:
+                    fails = adj_failures(
+                        hardcalls,
+                        self._safe_format(variant, "GQ"),
+                        self._safe_format(variant, "DP"),
+                        self._safe_format(variant, "AD"),
+                    )
+                    total_skipped += int(fails[vcf_columns].sum())
+                    hardcalls[fails] = HARDCALL_MISSING
+                    dosages[fails] = np.nan
+
+                if self.dosage_only:
+                    hardcalls[:] = HARDCALL_MISSING
+
+                for sample_block, columns, block_slots in layout:
+                    rows.append(
+                        (
+                            variant_id,
+                            sample_block,
+                            block_slots,
+                            hardcalls[columns],
+                            dosages[columns],
+                        )
+                    )
+
+                if len(rows) >= self.batch_size:
+                    await self._write_batch(conn, rows)
+                    rows = []
+
+                total_loaded += len(vcf_columns)
+                variant_id += 1
+
+            if rows:
+                await self._write_batch(conn, rows)
+        finally:
+            vcf.close()
+
+        return {
+            "genotypes_loaded": total_loaded - total_skipped,
+            "genotypes_skipped": total_skipped,
+            "variants_processed": variant_id - variant_id_start,
+            "samples_processed": len(samples),
+        }
+
+    def _dosages(self, variant, n_samples: int) -> np.ndarray:
+        """Get first-ALT dosages from DS, else GP, NaN where missing."""
+        dosages = np.full(n_samples, np.nan, dtype=np.float32)
+        ds = self._safe_format(variant, "DS")
+        if ds is not None:
+            values = ds[:, 0].astype(np.float32)
+            valid = (values >= 0) & (values <= 2)
+            dosages[valid] = values[valid]
+        gp = self._safe_format(variant, "GP")
+        if gp is not None and gp.shape[1] == 3:
+            from_gp = (gp[:, 1] + 2 * gp[:, 2]).astype(np.float32)
+            fill = np.isnan(dosages) & (gp >= 0).all(axis=1)
+            dosages[fill] = from_gp[fill]
+        return dosages
+
+    def _safe_format(self, variant, field: str) -> np.ndarray | None:
+        """Safely get FORMAT field array."""
+        try:
+            return variant.format(field)
+        except KeyError:
+            return None
+
+    async def _get_sample_id_map(
+        self, conn: asyncpg.Connection, sample_names: list[str]
+    ) -> dict[str, int]:
+        """Get mapping from sample names to sample_ids."""
+        rows = await conn.fetch(
+            """
+            SELECT external_id, sample_id FROM samples
+            WHERE external_id = ANY($1)
+            """,
+            sample_names,
+        )
+        return {r["external_id"]: r["sample_id"] for r in rows}
+
+    async def _write_batch(
+        self,
+        conn: asyncpg.Connection,
+        rows: list[tuple[int, int, np.ndarray, np.ndarray, np.ndarray]],
+    ) -> None:
+        """Merge a batch of per-block sample values into genotypes_packed.
+
+        Args:
+            conn: Database connection
+            rows: Tuples of (variant_id, sample_block, slots, hardcalls, dosages)
+                with the values of this load's samples in each block
+        """
+        async with conn.transaction():
+            for sample_block in sorted({r[1] for r in rows}):
+                await conn.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext('genotypes_packed'), $1)",
+                    sample_block,
+                )
+            existing = await conn.fetch(
+                """
+                SELECT p.variant_id, p.sample_block, p.n_samples, p.calls, p.dosages
+                FROM genotypes_packed p
+                JOIN unnest($1::bigint[], $2::int[]) AS k(variant_id, sample_block)
+                    USING (variant_id, sample_block)
+                """,
+                [r[0] for r in rows],
+                [r[1] for r in rows],
+            )
+            stored = {(r["variant_id"], r["sample_block"]): r for r in existing}
+
+            records = []
+            for variant_id, sample_block, slots, hardcalls, dosages in rows:
+                width = int(slots.max()) + 1
+                previous = stored.get((variant_id, sample_block))
+                if previous is not None:
+                    width = max(width, previous["n_samples"])
+                block_calls = np.full(width, HARDCALL_MISSING, dtype=np.uint8)
+                block_dosages = np.full(width, np.nan, dtype=np.float32)
+                if previous is not None:
+                    n_stored = previous["n_samples"]
+                    block_calls[:n_stored], block_dosages[:n_stored] = decode_sample_block(
+                        previous["calls"], previous["dosages"], n_stored
+                    )
+                block_calls[slots] = hardcalls
+                block_dosages[slots] = dosages
+                calls, packed_dosages = encode_sample_block(block_calls, block_dosages)
+                records.append((variant_id, sample_block, width, calls, packed_dosages))
+
+            await conn.executemany(
+                """
+                INSERT INTO genotypes_packed (variant_id, sample_block, n_samples, calls, dosages)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (variant_id, sample_block) DO UPDATE SET
+                    n_samples = EXCLUDED.n_samples,
+                    calls = EXCLUDED.calls,
+                    dosages = EXCLUDED.dosages
+                """,
+                records,
+            )
+
+
+def _block_layout(
+    vcf_columns: list[int], slots: list[tuple[int, int]]
+) -> list[tuple[int, np.ndarray, np.ndarray]]:
+    """Group VCF sample columns by sample block.
+
+    Returns:
+        List of (sample_block, vcf columns, slots in block)
+    """
+    blocks: dict[int, list[tuple[int, int]]] = {}
+    for column, (sample_block, slot) in zip(vcf_columns, slots, strict=True):
+        blocks.setdefault(sample_block, []).append((column, slot))
+    layout = []
+    for sample_block, members in sorted(blocks.items()):
+        columns = np.array([c for c, _ in members], dtype=np.intp)
+        block_slots = np.array([s for _, s in members], dtype=np.intp)
+        layout.append((sample_block, columns, block_slots))
+    return layout
+
+
+async def assign_sample_slots(
+    conn: asyncpg.Connection, sample_ids: list[int]
+) -> list[tuple[int, int]]:
+    """Get (sample_block, slot) for each sample, assigning new samples to free slots.
+
+    New samples take the slots after the last assigned one, filling the last
+    partly used block before starting new blocks.
+
+    Args:
+        conn: Database connection
+        sample_ids: Sample IDs in the order they appear in the source
+
+    Returns:
+        List of (sample_block, slot) aligned with sample_ids
+    """
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE genotype_sample_slots IN SHARE ROW EXCLUSIVE MODE")
+        rows = await conn.fetch(
+            """
+            SELECT sample_id, sample_block, slot FROM genotype_sample_slots
+            WHERE sample_id = ANY($1::int[])
+            """,
+            sample_ids,
+        )
+        assigned = {r["sample_id"]: (r["sample_block"], r["slot"]) for r in rows}
+
+        new_ids = [s for s in dict.fromkeys(sample_ids) if s not in assigned]
+        if new_ids:
+            next_position = await conn.fetchval(
+                f"""
+                SELECT COALESCE(MAX(sample_block::bigint * {SAMPLE_BLOCK_SIZE} + slot) + 1, 0)
+                FROM genotype_sample_slots
+                """
+            )
+            new_slots = [
+                (sample_id, *divmod(next_position + i, SAMPLE_BLOCK_SIZE))
+                for i, sample_id in enumerate(new_ids)
+            ]
+            await conn.copy_records_to_table(
+                "genotype_sample_slots",
+                records=new_slots,
+                columns=["sample_id", "sample_block", "slot"],
+            )
+            assigned.update({s: (b, slot) for s, b, slot in new_slots})
+
+    return [assigned[s] for s in sample_ids]
+
+
+async def detect_genotype_storage(conn: asyncpg.Connection) -> Literal["rows", "packed"]:
+    """Get the storage mode of the stored genotypes.
+
+    Returns:
+        "packed" when only genotypes_packed holds genotypes, otherwise "rows"
+
+    Raises:
+        ValueError: If both genotypes and genotypes_packed hold genotypes
+    """
+    stored = []
+    for table, storage in (("genotypes", "rows"), ("genotypes_packed", "packed")):
+        if await conn.fetchval("SELECT to_regclass($1::text) IS NOT NULL", table):
+            if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table})"):
+                stored.append(storage)
+    if len(stored) > 1:
+        raise ValueError(
+            "Genotypes are stored both as rows (genotypes) and packed (genotypes_packed); "
+            "drop one of the two before reading them"
+        )
+    return "packed" if stored == ["packed"] else "rows"
+
+
+async def fetch_packed_matrix(
+    conn: asyncpg.Connection,
+    variant_ids: list[int],
+    sample_ids: list[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Read packed genotypes as (variants x samples) hardcall and dosage matrices.
+
+    Args:
+        conn: Database connection
+        variant_ids: Variant IDs defining the matrix rows
+        sample_ids: Sample IDs defining the matrix columns
+
+    Returns:
+        Tuple of (hardcalls, dosages); missing cells are HARDCALL_MISSING / NaN
+    """
+    shape = (len(variant_ids), len(sample_ids))
+    hardcalls = np.full(shape, HARDCALL_MISSING, dtype=np.uint8)
+    dosages = np.full(shape, np.nan, dtype=np.float32)
+
+    slot_rows = await conn.fetch(
+        """
+        SELECT sample_id, sample_block, slot FROM genotype_sample_slots
+        WHERE sample_id = ANY($1::int[])
+        """,
+        sample_ids,
+    )
+    column = {sample_id: i for i, sample_id in enumerate(sample_ids)}
+    blocks: dict[int, tuple[list[int], list[int]]] = {}
+    for r in slot_rows:
+        columns, slots = blocks.setdefault(r["sample_block"], ([], []))
+        columns.append(column[r["sample_id"]])
+        slots.append(r["slot"])
+    if not blocks:
+        return hardcalls, dosages
+
+    row_index = {variant_id: i for i, variant_id in enumerate(variant_ids)}
+    rows = await conn.fetch(
+        """
+        SELECT variant_id, sample_block, n_samples, calls, dosages
+        FROM genotypes_packed
+        WHERE variant_id = ANY($1::bigint[]) AND sample_block = ANY($2::int[])
+        ORDER BY variant_id, sample_block
+        """,
+        variant_ids,
+        list(blocks),
+    )
+    for r in rows:
+        columns, slots = blocks[r["sample_block"]]
+        slot_index = np.array(slots, dtype=np.intp)
+        in_block = slot_index < r["n_samples"]
+        block_calls, block_dosages = decode_sample_block(r["calls"], r["dosages"], r["n_samples"])
+        i = row_index[r["variant_id"]]
+        target = np.array(columns, dtype=np.intp)[in_block]
+        hardcalls[i, target] = block_calls[slot_index[in_block]]
+        dosages[i, target] = block_dosages[slot_index[in_block]]
+    return hardcalls, dosages
@@ -107,3 +107,114 @@ class GenotypesSchemaManager:
             FROM genotypes
         """)
         return dict(row) if row else {}
+
+
+class PackedGenotypesSchemaManager:
+    """Manages PostgreSQL schema for packed per-variant genotype blocks."""
+
+    async def create_packed_genotypes_schema(self, conn: asyncpg.Connection) -> None:
+        """Create packed genotype tables, accessor functions and cell view."""
+        await self.create_sample_slots_table(conn)
+        await self.create_packed_genotypes_table(conn)
+        await self.create_accessor_functions(conn)
+        await self.create_cells_view(conn)
+
+    async def create_sample_slots_table(self, conn: asyncpg.Connection) -> None:
+        """Create the table assigning each sample a fixed block and slot."""
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS genotype_sample_slots (
+                sample_id INTEGER PRIMARY KEY REFERENCES samples(sample_id),
+                sample_block INTEGER NOT NULL,
+                slot INTEGER NOT NULL,
+                UNIQUE (sample_block, slot)
+            )
+        """)
+
+    async def create_packed_genotypes_table(self, conn: asyncpg.Connection) -> None:
+        """Create the genotypes_packed table (one row per variant per sample block)."""
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS genotypes_packed (
+                variant_id BIGINT NOT NULL,
+                sample_block INTEGER NOT NULL,
+                n_samples INTEGER NOT NULL,
+                calls BYTEA NOT NULL,
+                dosages BYTEA,
+                PRIMARY KEY (variant_id, sample_block)
+            )
+        """)
+
+    async def create_accessor_functions(self, conn: asyncpg.Connection) -> None:
+        """Create SQL functions decoding a single sample from packed blocks."""
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION packed_call(calls BYTEA, slot INTEGER)
+            RETURNS SMALLINT
+            LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+            AS $$
+                SELECT NULLIF((get_byte(calls, slot / 4) >> ((slot % 4) * 2)) & 3, 3)::SMALLINT
+            $$
+        """)
+
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION packed_gt(calls BYTEA, slot INTEGER)
+            RETURNS TEXT
+            LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+            AS $$
+                SELECT CASE packed_call(calls, slot)
+                    WHEN 0 THEN '0/0'
+                    WHEN 1 THEN '0/1'
+                    WHEN 2 THEN '1/1'
+                END
+            $$
+        """)
+
+        await conn.execute("""
+            CREATE OR REPLACE FUNCTION packed_dosage(dosages BYTEA, slot INTEGER)
+            RETURNS REAL
+            LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+            AS $$
+                SELECT (NULLIF(get_byte(dosages, slot), 255) / 100.0)::REAL
+            $$
+        """)
+
+    async def create_cells_view(self, conn: asyncpg.Connection) -> None:
+        """Create a view exposing packed genotypes as (variant, sample) rows."""
+        await conn.execute("""
+            CREATE OR REPLACE VIEW genotypes_packed_cells AS
+            SELECT
+                p.variant_id,
+                s.sample_id,
+                packed_gt(p.calls, s.slot) AS gt,
+                packed_dosage(p.dosages, s.slot) AS dosage
+            FROM genotypes_packed p
+            JOIN genotype_sample_slots s
+                ON s.sample_block = p.sample_block AND s.slot < p.n_samples
+        """)
+
+    async def drop_packed_genotypes_schema(self, conn: asyncpg.Connection) -> None:
+        """Drop packed genotype tables, view and functions."""
+        await conn.execute("DROP VIEW IF EXISTS genotypes_packed_cells")
+        await conn.execute("DROP TABLE IF EXISTS genotypes_packed CASCADE")
+        await conn.execute("DROP TABLE IF EXISTS genotype_sample_slots CASCADE")
+        await conn.execute("DROP FUNCTION IF EXISTS packed_gt(BYTEA, INTEGER)")
+        await conn.execute("DROP FUNCTION IF EXISTS packed_call(BYTEA, INTEGER)")
+        await conn.execute("DROP FUNCTION IF EXISTS packed_dosage(BYTEA, INTEGER)")
+
+    async def verify_packed_genotypes_schema(self, conn: asyncpg.Connection) -> bool:
+        """Verify packed genotype tables exist."""
+        return await conn.fetchval("""
+            SELECT COUNT(*) = 2
+            FROM information_schema.tables
+            WHERE table_name IN ('genotypes_packed', 'genotype_sample_slots')
+        """)
+
+    async def get_packed_genotype_stats(self, conn: asyncpg.Connection) -> dict:
+        """Get packed genotype statistics including on-disk size."""
+        row = await conn.fetchrow("""
+            SELECT
+                COUNT(*) AS packed_rows,
+                COUNT(DISTINCT variant_id) AS unique_variants,
+                (SELECT COUNT(*) FROM genotype_sample_slots) AS unique_samples,
+                pg_total_relation_size('genotypes_packed') AS total_bytes
+            FROM genotypes_packed
+        """)
+        return dict(row) if row else {}
@@ -13,8 +13,10 @@ from .loader import (
 )
 from .models import GWASSummaryStatRecord, StudyRecord
 from .schema import GWASSchemaManager
+from .ssf_reader import GWASChunk
 
 __all__ = [
+    "GWASChunk",
     "GWASLoader",
     "GWASParseError",
     "GWASSchemaManager",
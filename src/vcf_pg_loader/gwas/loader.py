@@ -1,17 +1,27 @@
 """GWAS summary statistics loader following GWAS-SSF standard."""
 
-import csv
+import itertools
 import logging
 from collections.abc import Iterator
 from pathlib import Path
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
 
 import asyncpg
 
-from ..utils.variant_matching import build_variant_lookups
+from ..utils.variant_matching import build_variant_lookups, match_rsid_keys, match_variant_key
 from ..utils.variant_matching import match_variant as shared_match_variant
 from .models import GWASSummaryStatRecord, HarmonizationResult
 from .schema import GWASSchemaManager
+from .ssf_reader import (
+    DEFAULT_CHUNK_LINES,
+    GWASChunk,
+    GWASParseError,
+    iter_ssf_chunks,
+    open_ssf,
+)
+
+if TYPE_CHECKING:
+    from ..references.rsid_index import RsidIndex
 
 logger = logging.getLogger(__name__)
 
@@ -50,10 +60,21 @@ COLUMN_ALIASES = {
 }
 
 
-class GWASParseError(Exception):
-    """Error parsing GWAS-SSF file."""
-
-    pass
+GWAS_STATS_COLUMNS = [
+    "variant_id",
+    "study_id",
+    "effect_allele",
+    "other_allele",
+    "beta",
+    "odds_ratio",
+    "standard_error",
+    "p_value",
+    "effect_allele_frequency",
+    "n_total",
+    "n_cases",
+    "info_score",
+    "is_effect_allele_alt",
+]
 
 
 class GWASImportResult(TypedDict):
@@ -200,20 +221,37 @@ def match_variant(
     )
 
 
+def _rsid_variant_alleles(
+    variant_lookup: dict[tuple[str, int, str, str], int], rsid_lookup: dict[str, int]
+) -> dict[int, tuple[str, str]]:
+    """REF/ALT of each variant reachable through rsid_lookup, by variant_id."""
+    rsid_variant_ids = set(rsid_lookup.values())
+    return {
+        variant_id: (ref, alt)
+        for (_, _, ref, alt), variant_id in variant_lookup.items()
+        if variant_id in rsid_variant_ids
+    }
+
+
 class GWASSSFParser:
-    """Parser for GWAS-SSF format TSV files."""
+    """Parser for GWAS-SSF format TSV files (optionally gzipped).
+
+    Records are read in chunks of ``chunk_lines`` lines with columnar,
+    vectorized type conversion (see :mod:`.ssf_reader`), so memory use is
+    bounded by the chunk size rather than the file size.
+    """
 
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, chunk_lines: int = DEFAULT_CHUNK_LINES):
         self.path = path
+        self.chunk_lines = chunk_lines
         self.columns: list[str] = []
         self.column_indices: dict[str, int] = {}
         self._parse_header()
 
     def _parse_header(self) -> None:
         """Parse and validate TSV header."""
-        with open(self.path) as f:
-            reader = csv.reader(f, delimiter="\t")
-            header = next(reader)
+        with open_ssf(self.path) as f:
+            header = f.readline().rstrip("\r\n").split("\t")
 
         self.columns = []
         self.column_indices = {}
@@ -232,88 +270,14 @@ class GWASSSFParser:
         """Check if all required columns are present."""
         return REQUIRED_COLUMNS.issubset(set(self.columns))
 
+    def iter_chunks(self) -> Iterator[GWASChunk]:
+        """Iterate over the file in columnar chunks of up to ``chunk_lines`` rows."""
+        return iter_ssf_chunks(self.path, self.column_indices, len(self.columns), self.chunk_lines)
+
     def iter_records(self) -> Iterator[GWASSummaryStatRecord]:
         """Iterate over records in the file."""
-        with open(self.path) as f:
-            reader = csv.reader(f, delimiter="\t")
-            next(reader)
-
-            for line_num, row in enumerate(reader, start=2):
-                try:
-                    yield self._parse_row(row, line_num)
-                except ValueError as e:
-                    raise GWASParseError(f"Error parsing line {line_num}: {e}") from e
-
-    def _parse_row(self, row: list[str], line_num: int) -> GWASSummaryStatRecord:
-        """Parse a single row into a GWASSummaryStatRecord."""
-
-        def get_value(col: str) -> str | None:
-            if col not in self.column_indices:
-                return None
-            idx = self.column_indices[col]
-            if idx >= len(row):
-                return None
-            val = row[idx].strip()
-            return val if val else None
-
-        def get_float(col: str) -> float | None:
-            val = get_value(col)
-            if val is None or val == "":
-                return None
-            try:
-                return float(val)
-            except ValueError as e:
-                raise ValueError(f"Invalid float value '{val}' for column {col}") from e
-
-        def get_int(col: str) -> int | None:
-            val = get_value(col)
-            if val is None or val == "":
-                return None
-            try:
-                return int(float(val))
-            except ValueError as e:
-                raise ValueError(f"Invalid integer value '{val}' for column {col}") from e
-
-        chromosome = get_value("chromosome")
-        position_str = get_value("base_pair_location")
-        effect_allele = get_value("effect_allele")
-        other_allele = get_value("other_allele")
-        p_value_str = get_value("p_value")
-
-        if not chromosome:
-            raise ValueError("chromosome is required")
-        if not position_str:
-            raise ValueError("base_pair_location is required")
-        if not effect_allele:
-            raise ValueError("effect_allele is required")
-        if not p_value_str:
-            raise ValueError("p_value is required")
-
-        try:
-            position = int(position_str)
-        except ValueError as e:
-            raise ValueError(f"Invalid position value: {position_str}") from e
-
-        try:
-            p_value = float(p_value_str)
-        except ValueError as e:
-            raise ValueError(f"Invalid p_value: {p_value_str}") from e
-
-        return GWASSummaryStatRecord(
-            chromosome=chromosome,
-            position=position,
-            effect_allele=effect_allele,
-            other_allele=other_allele,
-            p_value=p_value,
-            rsid=get_value("rsid"),
-            beta=get_float("beta"),
-            odds_ratio=get_float("odds_ratio"),
-            standard_error=get_float("standard_error"),
-            effect_allele_frequency=get_float("effect_allele_frequency"),
-            n_total=get_int("n"),
-            n_cases=get_int("n_cases"),
-            info_score=get_float("info"),
-        )
+        for chunk in self.iter_chunks():
+            yield from chunk.records()
 
 
 class GWASLoader:
@@ -336,9 +300,14 @@ class GWASLoader:
         n_controls: int | None = None,
         genome_build: str = "GRCh38",
         analysis_software: str | None = None,
+        rsid_index: "RsidIndex | None" = None,
     ) -> GWASImportResult:
         """Import GWAS summary statistics from a TSV file.
 
+        Statistics are copied into a detached staging table that is indexed
+        and then swapped in as the study's partition, so re-importing a study
+        replaces its previous statistics atomically.
+
         Args:
             conn: Database connection
             tsv_path: Path to GWAS-SSF format TSV file
@@ -351,10 +320,18 @@ class GWASLoader:
             n_controls: Number of controls (for binary traits)
             genome_build: Reference genome build
             analysis_software: Software used for analysis
+            rsid_index: Optional dbSNP rsID index; records left unmatched by
+                position and by variants.rs_id are resolved through it,
+                one batch at a time
 
         Returns:
             GWASImportResult with import statistics
+
+        Raises:
+            RuntimeError: If gwas_summary_stats predates per-study partitions
         """
+        await self.schema_manager.check_stats_partitioned(conn)
+
         existing = await self.schema_manager.get_study_by_accession(conn, study_accession)
         if existing:
             study_id = existing["study_id"]
@@ -375,65 +352,36 @@ class GWASLoader:
             logger.info(f"Created study: {study_accession} (id={study_id})")
 
         variant_lookup, rsid_lookup = await self._build_variant_lookups(conn)
+        rsid_alleles = _rsid_variant_alleles(variant_lookup, rsid_lookup)
 
         parser = GWASSSFParser(tsv_path)
 
+        staging = await self.schema_manager.create_study_staging_table(conn, study_id)
         stats_imported = 0
         stats_matched = 0
-        stats_unmatched = 0
-        batch = []
-
-        for record in parser.iter_records():
-            variant_id = match_variant(
-                chromosome=record.chromosome,
-                position=record.position,
-                effect_allele=record.effect_allele,
-                other_allele=record.other_allele or "",
-                rsid=record.rsid,
-                variant_lookup=variant_lookup,
-                rsid_lookup=rsid_lookup,
-            )
 
-            is_effect_allele_alt = None
-            if variant_id is not None:
-                variant_info = await self._get_variant_info(conn, variant_id)
-                if variant_info:
-                    is_effect_allele_alt = compute_is_effect_allele_alt(
-                        effect_allele=record.effect_allele,
-                        other_allele=record.other_allele or "",
-                        ref=variant_info["ref"],
-                        alt=variant_info["alt"],
+        try:
+            for chunk in parser.iter_chunks():
+                for start in range(0, len(chunk), self.batch_size):
+                    batch = chunk.slice(start, start + self.batch_size)
+                    stats_matched += await self._copy_chunk(
+                        conn,
+                        study_id,
+                        batch,
+                        variant_lookup,
+                        rsid_lookup,
+                        rsid_alleles,
+                        rsid_index,
+                        staging,
                     )
-                stats_matched += 1
-            else:
-                stats_unmatched += 1
-
-            batch.append(
-                (
-                    variant_id,
-                    study_id,
-                    record.effect_allele,
-                    record.other_allele,
-                    record.beta,
-                    record.odds_ratio,
-                    record.standard_error,
-                    record.p_value,
-                    record.effect_allele_frequency,
-                    record.n_total,
-                    record.n_cases,
-                    record.info_score,
-                    is_effect_allele_alt,
-                )
-            )
+                    stats_imported += len(batch)
 
-            if len(batch) >= self.batch_size:
-                await self._insert_batch(conn, batch)
-                stats_imported += len(batch)
-                batch = []
+            await self.schema_manager.swap_study_partition(conn, study_id, staging)
+        except Exception:
+            await conn.execute(f"DROP TABLE IF EXISTS {staging}")
+            raise
 
-        if batch:
-            await self._insert_batch(conn, batch)
-            stats_imported += len(batch)
+        stats_unmatched = stats_imported - stats_matched
 
         logger.info(
             f"Imported {stats_imported} statistics for study {study_accession} "
@@ -456,36 +404,90 @@ class GWASLoader:
         """
         return await build_variant_lookups(conn)
 
-    async def _get_variant_info(self, conn: asyncpg.Connection, variant_id: int) -> dict | None:
-        """Get variant REF/ALT for harmonization."""
-        row = await conn.fetchrow(
-            "SELECT ref, alt FROM variants WHERE variant_id = $1",
-            variant_id,
-        )
-        return dict(row) if row else None
-
-    async def _insert_batch(self, conn: asyncpg.Connection, batch: list[tuple]) -> None:
-        """Insert a batch of summary statistics."""
-        await conn.executemany(
-            """
-            INSERT INTO gwas_summary_stats (
-                variant_id, study_id, effect_allele, other_allele,
-                beta, odds_ratio, standard_error, p_value,
-                effect_allele_frequency, n_total, n_cases, info_score,
-                is_effect_allele_alt
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-            ON CONFLICT (variant_id, study_id) DO UPDATE SET
-                effect_allele = EXCLUDED.effect_allele,
-                other_allele = EXCLUDED.other_allele,
-                beta = EXCLUDED.beta,
-                odds_ratio = EXCLUDED.odds_ratio,
-                standard_error = EXCLUDED.standard_error,
-                p_value = EXCLUDED.p_value,
-                effect_allele_frequency = EXCLUDED.effect_allele_frequency,
-                n_total = EXCLUDED.n_total,
-                n_cases = EXCLUDED.n_cases,
-                info_score = EXCLUDED.info_score,
-                is_effect_allele_alt = EXCLUDED.is_effect_allele_alt
-            """,
-            batch,
+    async def _copy_chunk(
+        self,
+        conn: asyncpg.Connection,
+        study_id: int,
+        chunk: GWASChunk,
+        variant_lookup: dict[tuple[str, int, str, str], int],
+        rsid_lookup: dict[str, int],
+        rsid_alleles: dict[int, tuple[str, str]],
+        rsid_index: "RsidIndex | None",
+        table: str,
+    ) -> int:
+        """Match a chunk of statistics to variants and copy it into ``table``.
+
+        Rows are matched by position and alleles, then by variants.rs_id, then
+        (if given) through the rsID index. REF/ALT for is_effect_allele_alt
+        come from the matched lookup key, and COPY rows are built straight
+        from the chunk's columns.
+
+        Returns:
+            Number of matched rows in the chunk
+        """
+        effect_alleles = chunk.effect_allele
+        other_alleles = chunk.other_allele
+        rsids = chunk.rsid
+
+        variant_ids: list[int | None] = []
+        alleles: list[tuple[str, str] | None] = []
+        for chrom, pos, ea, oa, rsid in zip(
+            chunk.chromosome,
+            chunk.column("position"),
+            effect_alleles,
+            other_alleles,
+            rsids,
+            strict=True,
+        ):
+            key = match_variant_key(chrom, pos, ea, oa, variant_lookup)
+            if key is not None:
+                variant_ids.append(variant_lookup[key])
+                alleles.append((key[2], key[3]))
+            elif rsid and rsid in rsid_lookup:
+                variant_ids.append(rsid_lookup[rsid])
+                alleles.append(rsid_alleles.get(rsid_lookup[rsid]))
+            else:
+                variant_ids.append(None)
+                alleles.append(None)
+
+        if rsid_index is not None:
+            unmatched = [i for i, rsid in enumerate(rsids) if rsid and variant_ids[i] is None]
+            if unmatched:
+                keys = match_rsid_keys(
+                    rsid_index,
+                    [rsids[i] for i in unmatched],
+                    [effect_alleles[i] for i in unmatched],
+                    [other_alleles[i] for i in unmatched],
+                    variant_lookup,
+                )
+                for i, key in zip(unmatched, keys, strict=True):
+                    if key is not None:
+                        variant_ids[i] = variant_lookup[key]
+                        alleles[i] = (key[2], key[3])
+
+        is_effect_allele_alt = [
+            None if ref_alt is None else compute_is_effect_allele_alt(ea, oa or "", *ref_alt)
+            for ea, oa, ref_alt in zip(effect_alleles, other_alleles, alleles, strict=True)
+        ]
+
+        records = zip(
+            variant_ids,
+            itertools.repeat(study_id),
+            effect_alleles,
+            other_alleles,
+            chunk.column("beta"),
+            chunk.column("odds_ratio"),
+            chunk.column("standard_error"),
+            chunk.column("p_value"),
+            chunk.column("effect_allele_frequency"),
+            chunk.column("n_total"),
+            chunk.column("n_cases"),
+            chunk.column("info_score"),
+            is_effect_allele_alt,
         )
+        await self._insert_batch(conn, list(records), table)
+        return sum(variant_id is not None for variant_id in variant_ids)
+
+    async def _insert_batch(self, conn: asyncpg.Connection, batch: list[tuple], table: str) -> None:
+        """COPY a batch of summary statistics into ``table``."""
+        await conn.copy_records_to_table(table, records=batch, columns=GWAS_STATS_COLUMNS)
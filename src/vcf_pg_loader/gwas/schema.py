@@ -2,6 +2,23 @@
 
 import asyncpg
 
+DEFAULT_PARTITION = "gwas_summary_stats_default"
+
+# Name an unpartitioned gwas_summary_stats is moved to while it is migrated
+LEGACY_STATS_TABLE = "gwas_summary_stats_legacy"
+
+GWAS_INDEXES = {
+    "idx_gwas_pvalue": ("p_value", "p_value < 5e-8"),
+    "idx_gwas_study_id": ("study_id", None),
+    "idx_gwas_variant_id": ("variant_id", "variant_id IS NOT NULL"),
+    "idx_gwas_study_pvalue": ("study_id, p_value", None),
+}
+
+
+def study_partition_name(study_id: int) -> str:
+    """Name of the gwas_summary_stats partition holding one study."""
+    return f"gwas_summary_stats_s{int(study_id)}"
+
 
 class GWASSchemaManager:
     """Manages PostgreSQL schema for GWAS summary statistics tables."""
@@ -30,12 +47,19 @@ class GWASSchemaManager:
         """)
 
     async def create_gwas_summary_stats_table(self, conn: asyncpg.Connection) -> None:
-        """Create the GWAS summary statistics table per GWAS-SSF standard."""
+        """Create the GWAS summary statistics table per GWAS-SSF standard.
+
+        The table is list-partitioned by study_id. Imports swap in one
+        partition per study (see swap_study_partition), so queries filtered
+        to a study prune to its partition and dropping a study is a DROP
+        TABLE. Rows inserted for a study without its own partition land in
+        the default partition.
+        """
         await conn.execute("""
             CREATE TABLE IF NOT EXISTS gwas_summary_stats (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 variant_id BIGINT,
-                study_id INTEGER REFERENCES studies(study_id),
+                study_id INTEGER NOT NULL REFERENCES studies(study_id),
                 effect_allele VARCHAR(255) NOT NULL,
                 other_allele VARCHAR(255),
                 beta DOUBLE PRECISION,
@@ -47,33 +71,100 @@ class GWASSchemaManager:
                 n_cases INTEGER,
                 info_score DOUBLE PRECISION,
                 is_effect_allele_alt BOOLEAN,
+                PRIMARY KEY (study_id, id),
                 UNIQUE (variant_id, study_id)
-            )
+            ) PARTITION BY LIST (study_id)
+        """)
+
+        await self.check_stats_partitioned(conn)
+
+        await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION}
+            PARTITION OF gwas_summary_stats DEFAULT
         """)
 
     async def create_gwas_indexes(self, conn: asyncpg.Connection) -> None:
         """Create performance indexes for common GWAS query patterns."""
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_gwas_pvalue
-            ON gwas_summary_stats (p_value)
-            WHERE p_value < 5e-8
-        """)
+        for name, (columns, predicate) in GWAS_INDEXES.items():
+            where = f" WHERE {predicate}" if predicate else ""
+            await conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS {name}
+                ON gwas_summary_stats ({columns}){where}
+            """)
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_gwas_study_id
-            ON gwas_summary_stats (study_id)
-        """)
+    async def create_study_staging_table(self, conn: asyncpg.Connection, study_id: int) -> str:
+        """Create an empty, detached table for building a study's new partition.
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_gwas_variant_id
-            ON gwas_summary_stats (variant_id)
-            WHERE variant_id IS NOT NULL
+        The table is shaped like gwas_summary_stats and carries a CHECK
+        constraint matching the partition bound, so attaching it does not
+        need to scan it.
+
+        Returns:
+            Name of the staging table
+
+        Raises:
+            RuntimeError: If gwas_summary_stats is not partitioned
+        """
+        await self.check_stats_partitioned(conn)
+        staging = f"{study_partition_name(study_id)}_staging"
+        await conn.execute(f"DROP TABLE IF EXISTS {staging}")
+        await conn.execute(f"""
+            CREATE TABLE {staging} (
+                LIKE gwas_summary_stats INCLUDING DEFAULTS,
+                CHECK (study_id IS NOT NULL AND study_id = {int(study_id)})
+            )
         """)
+        return staging
 
-        await conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_gwas_study_pvalue
-            ON gwas_summary_stats (study_id, p_value)
+    async def swap_study_partition(
+        self, conn: asyncpg.Connection, study_id: int, staging: str
+    ) -> None:
+        """Index a loaded staging table and swap it in as the study's partition.
+
+        Duplicate variant_ids keep the last row loaded, as the previous
+        upsert did. Indexes matching those of gwas_summary_stats are built
+        before the swap, so ATTACH PARTITION adopts them instead of building
+        them under lock. The old partition (and any rows for the study in
+        the default partition) are replaced in a single transaction.
+        """
+        await conn.execute(f"""
+            DELETE FROM {staging} a USING {staging} b
+            WHERE a.variant_id = b.variant_id AND a.id < b.id
         """)
+        await conn.execute(f"""
+            ALTER TABLE {staging}
+                ADD PRIMARY KEY (study_id, id),
+                ADD UNIQUE (variant_id, study_id)
+        """)
+        existing = await conn.fetch(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'gwas_summary_stats'"
+        )
+        for name in {row["indexname"] for row in existing} & GWAS_INDEXES.keys():
+            columns, predicate = GWAS_INDEXES[name]
+            where = f" WHERE {predicate}" if predicate else ""
+            await conn.execute(f"CREATE INDEX ON {staging} ({columns}){where}")
+        await conn.execute(f"ANALYZE {staging}")
+
+        partition = study_partition_name(study_id)
+        async with conn.transaction():
+            await conn.execute(f"DROP TABLE IF EXISTS {partition}")
+            await conn.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE study_id = $1", study_id)
+            await conn.execute(f"ALTER TABLE {staging} RENAME TO {partition}")
+            await conn.execute(f"""
+                ALTER TABLE gwas_summary_stats
+                ATTACH PARTITION {partition} FOR VALUES IN ({int(study_id)})
+            """)
+
+    async def drop_study(self, conn: asyncpg.Connection, study_id: int) -> None:
+        """Delete a study and its summary statistics.
+
+        The study's partition is dropped rather than deleted row by row.
+        """
+        await self.check_stats_partitioned(conn)
+        async with conn.transaction():
+            await conn.execute(f"DROP TABLE IF EXISTS {study_partition_name(study_id)}")
+            await conn.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE study_id = $1", study_id)
+            await conn.execute("DELETE FROM studies WHERE study_id = $1", study_id)
 
     async def drop_gwas_schema(self, conn: asyncpg.Connection) -> None:
         """Drop GWAS schema tables."""
@@ -98,6 +189,120 @@ class GWASSchemaManager:
 
         return studies_exists and stats_exists
 
+    async def check_stats_partitioned(self, conn: asyncpg.Connection) -> None:
+        """Check that gwas_summary_stats, if it exists, is partitioned by study.
+
+        Databases set up before per-study partitions have a plain
+        gwas_summary_stats table, which the partition swap cannot attach to.
+
+        Raises:
+            RuntimeError: If gwas_summary_stats exists but is not partitioned
+        """
+        if await self._stats_unpartitioned(conn):
+            raise RuntimeError(
+                "gwas_summary_stats is an unpartitioned table from an older version; "
+                "run 'vcf-pg-loader migrate-gwas-partitions' to move its rows into "
+                "per-study partitions"
+            )
+
+    async def migrate_stats_partitions(self, conn: asyncpg.Connection) -> int:
+        """Move an unpartitioned gwas_summary_stats into per-study partitions.
+
+        The legacy table is renamed, a partitioned gwas_summary_stats is
+        created in its place, and each study's rows are copied into a staging
+        table and swapped in as its partition. Rows without a study_id cannot
+        be placed and are dropped with the legacy table. The
+        prs_candidate_variants view, which depends on the table, is
+        recreated. Everything runs in one transaction, and nothing is done if
+        the table is absent or already partitioned.
+
+        Returns:
+            Number of studies migrated
+        """
+        if not await self._stats_unpartitioned(conn):
+            return 0
+
+        async with conn.transaction():
+            has_prs_view = await conn.fetchval(
+                "SELECT to_regclass('prs_candidate_variants') IS NOT NULL"
+            )
+            await conn.execute(f"ALTER TABLE gwas_summary_stats RENAME TO {LEGACY_STATS_TABLE}")
+            # Free the index and constraint names the new table will use
+            for name in GWAS_INDEXES:
+                await conn.execute(f"DROP INDEX IF EXISTS {name}")
+            for row in await conn.fetch(
+                """
+                SELECT conname FROM pg_constraint
+                WHERE conrelid = $1::regclass AND contype IN ('p', 'u')
+                """,
+                LEGACY_STATS_TABLE,
+            ):
+                await conn.execute(
+                    f'ALTER TABLE {LEGACY_STATS_TABLE} DROP CONSTRAINT "{row["conname"]}"'
+                )
+
+            await self.create_gwas_summary_stats_table(conn)
+            await self.create_gwas_indexes(conn)
+
+            columns = ", ".join(
+                row["attname"]
+                for row in await conn.fetch(
+                    """
+                    SELECT a.attname FROM pg_attribute a
+                    JOIN pg_attribute p ON p.attname = a.attname
+                        AND p.attrelid = 'gwas_summary_stats'::regclass
+                        AND p.attnum > 0 AND NOT p.attisdropped
+                    WHERE a.attrelid = $1::regclass AND a.attnum > 0 AND NOT a.attisdropped
+                    ORDER BY a.attnum
+                    """,
+                    LEGACY_STATS_TABLE,
+                )
+            )
+            study_ids = [
+                row["study_id"]
+                for row in await conn.fetch(f"""
+                    SELECT DISTINCT study_id FROM {LEGACY_STATS_TABLE}
+                    WHERE study_id IS NOT NULL ORDER BY study_id
+                """)
+            ]
+            for study_id in study_ids:
+                staging = await self.create_study_staging_table(conn, study_id)
+                await conn.execute(
+                    f"""
+                    INSERT INTO {staging} ({columns})
+                    SELECT {columns} FROM {LEGACY_STATS_TABLE} WHERE study_id = $1
+                    """,
+                    study_id,
+                )
+                await self.swap_study_partition(conn, study_id, staging)
+
+            await conn.execute(f"""
+                SELECT setval(
+                    pg_get_serial_sequence('gwas_summary_stats', 'id'),
+                    COALESCE(MAX(id), 0) + 1,
+                    false
+                )
+                FROM {LEGACY_STATS_TABLE}
+            """)
+            await conn.execute(f"DROP TABLE {LEGACY_STATS_TABLE} CASCADE")
+
+            if has_prs_view:
+                from ..views.prs_views import PRSViewsManager
+
+                await PRSViewsManager().create_prs_candidate_variants_view(conn)
+
+        return len(study_ids)
+
+    async def _stats_unpartitioned(self, conn: asyncpg.Connection) -> bool:
+        """Whether gwas_summary_stats exists as a plain, unpartitioned table."""
+        return bool(
+            await conn.fetchval("""
+                SELECT NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = rel)
+                FROM to_regclass('gwas_summary_stats') AS rel
+                WHERE rel IS NOT NULL
+            """)
+        )
+
     async def get_study_by_accession(
         self, conn: asyncpg.Connection, study_accession: str
     ) -> dict | None:
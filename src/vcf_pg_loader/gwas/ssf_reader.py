@@ -0,0 +1,303 @@
+"""Chunked, columnar reader for GWAS-SSF summary statistics.
+
+Lines are read (and gunzipped) in a background thread in blocks of up to
+``chunk_lines`` lines. Each block is split into a token grid in one pass, and
+its numeric columns are converted to numpy arrays with vectorized casts.
+Missing values become NaN. Per-line work only happens on the error path,
+which locates the first offending line so it can be reported.
+"""
+
+import gzip
+import itertools
+import queue
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+
+from .models import GWASSummaryStatRecord
+
+DEFAULT_CHUNK_LINES = 100_000
+
+MISSING_VALUES = ("", "NA", "#NA", "NaN", "nan", ".")
+
+_FLOAT_COLUMNS = {
+    "beta": "beta",
+    "odds_ratio": "odds_ratio",
+    "standard_error": "standard_error",
+    "effect_allele_frequency": "effect_allele_frequency",
+    "info": "info_score",
+    "n": "n_total",
+    "n_cases": "n_cases",
+}
+
+
+class GWASParseError(Exception):
+    """Error parsing GWAS-SSF file."""
+
+    pass
+
+
+def open_ssf(path: Path) -> TextIO:
+    """Open a GWAS-SSF file as text, gunzipping ``.gz`` files."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path)
+
+
+def read_line_blocks(
+    path: Path, chunk_lines: int = DEFAULT_CHUNK_LINES, skip_lines: int = 1
+) -> Iterator[tuple[int, list[str]]]:
+    """Read blocks of lines in a background thread.
+
+    The thread reads at most two blocks ahead, so decompression overlaps
+    with processing of the previous block while memory stays bounded.
+
+    Args:
+        path: File to read (can be gzipped)
+        chunk_lines: Lines per block
+        skip_lines: Leading lines to skip (the header)
+
+    Yields:
+        (1-based line number of the block's first line, lines)
+    """
+    blocks: queue.Queue = queue.Queue(maxsize=2)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            with open_ssf(path) as f:
+                line_number = skip_lines + 1
+                lines_iter = itertools.islice(f, skip_lines, None)
+                while not stop.is_set():
+                    lines = list(itertools.islice(lines_iter, chunk_lines))
+                    if not lines:
+                        break
+                    blocks.put((line_number, lines))
+                    line_number += len(lines)
+        except BaseException as e:
+            blocks.put(e)
+            return
+        blocks.put(None)
+
+    reader = threading.Thread(target=produce, name="gwas-ssf-reader", daemon=True)
+    reader.start()
+    try:
+        while (item := blocks.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        while reader.is_alive():
+            try:
+                blocks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+@dataclass
+class GWASChunk:
+    """One block of summary statistics in columnar form.
+
+    Optional numeric columns are float64 arrays with NaN for missing values
+    (``n_total`` and ``n_cases`` included); optional text columns hold None.
+    """
+
+    line_numbers: np.ndarray
+    chromosome: list[str]
+    position: np.ndarray
+    effect_allele: list[str]
+    other_allele: list[str | None]
+    rsid: list[str | None]
+    p_value: np.ndarray
+    beta: np.ndarray
+    odds_ratio: np.ndarray
+    standard_error: np.ndarray
+    effect_allele_frequency: np.ndarray
+    info_score: np.ndarray
+    n_total: np.ndarray
+    n_cases: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.line_numbers)
+
+    def slice(self, start: int, stop: int) -> "GWASChunk":
+        """Rows ``start:stop`` of the chunk."""
+        return GWASChunk(**{f.name: getattr(self, f.name)[start:stop] for f in fields(self)})
+
+    def column(self, name: str) -> list:
+        """A column as a Python list, with None for missing values."""
+        values = getattr(self, name)
+        if not isinstance(values, np.ndarray):
+            return values
+        if values.dtype != np.float64:
+            return values.tolist()
+
+        missing = np.isnan(values)
+        if name in ("n_total", "n_cases"):
+            result = np.where(missing, 0, values).astype(np.int64).tolist()
+        else:
+            result = values.tolist()
+        for i in np.flatnonzero(missing):
+            result[i] = None
+        return result
+
+    def records(self) -> Iterator[GWASSummaryStatRecord]:
+        """The chunk's rows as GWASSummaryStatRecord objects."""
+        columns = {
+            name: self.column(name)
+            for name in (
+                "chromosome",
+                "position",
+                "effect_allele",
+                "other_allele",
+                "rsid",
+                "p_value",
+                "beta",
+                "odds_ratio",
+                "standard_error",
+                "effect_allele_frequency",
+                "info_score",
+                "n_total",
+                "n_cases",
+            )
+        }
+        for i in range(len(self)):
+            yield GWASSummaryStatRecord(**{name: values[i] for name, values in columns.items()})
+
+
+def _split_block(lines: list[str], n_columns: int) -> tuple[np.ndarray, np.ndarray]:
+    """Split lines into a (rows x n_columns) token grid, dropping blank lines.
+
+    Returns:
+        (grid, row indices of the kept lines within the block)
+    """
+    text = "".join(lines).replace("\r", "")
+    rows = text.split("\n")
+    if rows and rows[-1] == "":
+        rows.pop()
+
+    kept = np.arange(len(rows))
+    if not all(rows):
+        kept = np.flatnonzero([bool(row.strip()) for row in rows])
+        rows = [rows[i] for i in kept]
+
+    # Only reshape the joined tokens when every row has exactly n_columns;
+    # a short row and a long row elsewhere would still give the right total
+    # and shift every token between them
+    separators = n_columns - 1
+    if all(row.count("\t") == separators for row in rows):
+        tokens = "\t".join(rows).split("\t")
+        grid = np.array(tokens, dtype=object).reshape(len(rows), n_columns)
+    else:
+        # Ragged block: pad short rows (missing trailing values) per line
+        split_rows = [row.split("\t") for row in rows]
+        width = max(n_columns, max(map(len, split_rows), default=0))
+        grid = np.empty((len(rows), width), dtype=object)
+        for i, row in enumerate(split_rows):
+            grid[i, : len(row)] = row
+            grid[i, len(row) :] = ""
+    return grid, kept
+
+
+def _first_invalid(values: np.ndarray, convert) -> int:
+    for i, value in enumerate(values):
+        try:
+            convert(value)
+        except ValueError:
+            return i
+    return 0
+
+
+def parse_chunk(
+    first_line: int, lines: list[str], column_indices: dict[str, int], n_columns: int
+) -> GWASChunk:
+    """Convert a block of GWAS-SSF lines to a GWASChunk.
+
+    Args:
+        first_line: 1-based line number of ``lines[0]``
+        lines: Raw lines, with newlines
+        column_indices: Canonical column name to index (from the header)
+        n_columns: Number of header columns
+
+    Raises:
+        GWASParseError: For the first line with a missing required value or an
+            invalid number, as ``Error parsing line N: ...``
+    """
+    grid, kept = _split_block(lines, n_columns)
+    line_numbers = first_line + kept
+    n_rows = len(kept)
+    problems: list[tuple[int, str]] = []
+
+    def text(name: str) -> np.ndarray:
+        if name not in column_indices:
+            return np.full(n_rows, "", dtype=object)
+        return np.char.strip(grid[:, column_indices[name]].astype(str)).astype(object)
+
+    def required(name: str) -> np.ndarray:
+        values = text(name)
+        empty = np.flatnonzero(values == "")
+        if len(empty):
+            problems.append((int(empty[0]), f"{name} is required"))
+        return values
+
+    def convert(values: np.ndarray, dtype, message) -> np.ndarray:
+        # Casting object arrays calls float()/int() per element in C
+        try:
+            return values.astype(dtype)
+        except ValueError:
+            i = _first_invalid(values, float if dtype == np.float64 else int)
+            problems.append((i, message(values[i])))
+            return np.zeros(n_rows, dtype=dtype)
+
+    def optional_float(column: str) -> np.ndarray:
+        if column not in column_indices:
+            return np.full(n_rows, np.nan)
+        values = grid[:, column_indices[column]]
+        missing = np.isin(values, MISSING_VALUES)
+        if missing.any():
+            values = np.where(missing, "nan", values)
+        return convert(
+            values, np.float64, lambda v: f"Invalid float value '{v}' for column {column}"
+        )
+
+    chromosome = required("chromosome")
+    position_text = required("base_pair_location")
+    effect_allele = required("effect_allele")
+    p_value_text = required("p_value")
+
+    position = convert(position_text, np.int64, lambda v: f"Invalid position value: {v}")
+    p_value = convert(p_value_text, np.float64, lambda v: f"Invalid p_value: {v}")
+    floats = {attr: optional_float(column) for column, attr in _FLOAT_COLUMNS.items()}
+
+    if problems:
+        i, message = min(problems, key=lambda p: p[0])
+        raise GWASParseError(f"Error parsing line {line_numbers[i]}: {message}")
+
+    return GWASChunk(
+        line_numbers=line_numbers,
+        chromosome=chromosome.tolist(),
+        position=position,
+        effect_allele=effect_allele.tolist(),
+        other_allele=[v or None for v in text("other_allele").tolist()],
+        rsid=[v or None for v in text("rsid").tolist()],
+        p_value=p_value,
+        **floats,
+    )
+
+
+def iter_ssf_chunks(
+    path: Path,
+    column_indices: dict[str, int],
+    n_columns: int,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+) -> Iterator[GWASChunk]:
+    """Stream a GWAS-SSF file as GWASChunks of up to ``chunk_lines`` rows."""
+    for first_line, lines in read_line_blocks(path, chunk_lines):
+        chunk = parse_chunk(first_line, lines, column_indices, n_columns)
+        if len(chunk):
+            yield chunk
@@ -12,17 +12,22 @@ from uuid import UUID, uuid4
 
 import asyncpg
 
+from .annotation_snapshot import AnnotationMapping, LoadAnnotator
 from .audit import AuditEvent, AuditEventType, AuditLogger
 from .genotypes.genotype_loader import GenotypeLoader
+from .genotypes.packed import PackedGenotypeLoader
 from .models import VariantRecord
 from .parsers.imputation import ImputationConfig
 from .phi.header_sanitizer import PHIScanner, SanitizationConfig
-from .schema import SchemaManager
+from .references.hapmap3 import HAPMAP3_PANEL_PREFIX
+from .references.schema import ReferenceSchemaManager
+from .schema import SchemaManager, has_panel_mask_column
 from .tls import TLSConfig, TLSError, get_ssl_param_for_asyncpg, verify_tls_connection
 from .vcf_parser import VCFStreamingParser
 
 if TYPE_CHECKING:
-    pass
+    from .references.ld_blocks import LDBlockIndex
+    from .references.panel_mask import PanelMaskIndex
 
 logger = logging.getLogger(__name__)
 
@@ -115,9 +120,17 @@ class LoadConfig:
     imputation_source: str = "auto"
     flag_hapmap3: bool = False
     hapmap3_build: str = "grch38"
+    flag_panel: str | None = None
+    panel_mask_panels: list[str] | None = None
+    ld_block_population: str | None = None
+    ld_block_build: str | None = None
     store_genotypes: bool = False
     adj_filter: bool = False
     dosage_only: bool = False
+    genotype_storage: Literal["rows", "packed"] = "rows"
+    annotate_on_load: list[AnnotationMapping] | None = None
+    annotation_cache_dir: Path | None = None
+    annotation_snapshots: list[Path] | None = None
 
 
 class VCFLoader:
@@ -140,6 +153,10 @@ class VCFLoader:
         self._anonymizer = None
         self._sample_mappings: dict[str, UUID] = {}
         self._hapmap3_lookup: dict[tuple[str, int], list[dict]] | None = None
+        self._load_annotator: LoadAnnotator | None = None
+        self._ld_block_index: LDBlockIndex | None = None
+        self._panel_mask_index: PanelMaskIndex | None = None
+        self._has_panel_mask: bool | None = None
 
     async def connect(self) -> None:
         """Establish database connection pool with TLS."""
@@ -252,6 +269,7 @@ class VCFLoader:
                 )
 
         self.load_batch_id = uuid4()
+        self._has_panel_mask = None
 
         if self._audit_logger:
             await self._audit_logger.log_event(
@@ -347,8 +365,19 @@ class VCFLoader:
                 "enabled" if encryptor.is_available else "disabled",
             )
 
-        if self.config.flag_hapmap3:
-            await self._load_hapmap3_lookup()
+        hapmap3_panel = self._hapmap3_flag_panel()
+        if hapmap3_panel:
+            await self._load_hapmap3_lookup(hapmap3_panel)
+
+        mask_panels = self._panel_mask_panel_names()
+        if mask_panels:
+            await self._load_panel_mask_index(mask_panels)
+
+        if self.config.ld_block_population:
+            await self._load_ld_block_index()
+
+        if self.config.annotate_on_load:
+            await self._open_annotation_snapshots()
 
         try:
             if self.config.drop_indexes:
@@ -357,8 +386,14 @@ class VCFLoader:
 
             if self.config.store_genotypes:
                 async with self.pool.acquire() as conn:
-                    await self._schema_manager.create_genotypes_schema(conn)
-                self.logger.info("Created genotypes schema for sample-level storage")
+                    if self.config.genotype_storage == "packed":
+                        await self._schema_manager.create_packed_genotypes_schema(conn)
+                    else:
+                        await self._schema_manager.create_genotypes_schema(conn)
+                self.logger.info(
+                    "Created %s genotypes schema for sample-level storage",
+                    self.config.genotype_storage,
+                )
 
             await self._start_audit(
                 vcf_path,
@@ -397,11 +432,18 @@ class VCFLoader:
             genotypes_loaded = 0
             if self.config.store_genotypes and streaming_parser.samples:
                 self.logger.info("Loading genotypes for %d samples", len(streaming_parser.samples))
-                genotype_loader = GenotypeLoader(
-                    adj_filter=self.config.adj_filter,
-                    dosage_only=self.config.dosage_only,
-                    batch_size=self.config.batch_size,
-                )
+                if self.config.genotype_storage == "packed":
+                    genotype_loader = PackedGenotypeLoader(
+                        adj_filter=self.config.adj_filter,
+                        dosage_only=self.config.dosage_only,
+                        batch_size=self.config.batch_size,
+                    )
+                else:
+                    genotype_loader = GenotypeLoader(
+                        adj_filter=self.config.adj_filter,
+                        dosage_only=self.config.dosage_only,
+                        batch_size=self.config.batch_size,
+                    )
                 async with self.pool.acquire() as conn:
                     genotype_result = await genotype_loader.load_from_vcf(
                         conn,
@@ -465,6 +507,8 @@ class VCFLoader:
                 result["variants_skipped"] = skipped_count
             if genotypes_loaded > 0:
                 result["genotypes_loaded"] = genotypes_loaded
+            if self._load_annotator is not None:
+                result["variants_annotated"] = self._load_annotator.variants_annotated
 
             return result
 
@@ -499,7 +543,7 @@ class VCFLoader:
         if not batch:
             return
 
-        from .columns import VARIANT_COLUMNS_BASIC, get_record_values
+        from .columns import VARIANT_COLUMNS_BASIC, get_record_values, without_panel_mask
 
         if sample_id is not None:
             for record in batch:
@@ -508,12 +552,25 @@ class VCFLoader:
         if self._hapmap3_lookup is not None:
             self._flag_hapmap3_variants(batch)
 
+        if self._panel_mask_index is not None:
+            self._panel_mask_index.assign(batch)
+
+        if self._ld_block_index is not None:
+            self._ld_block_index.assign(batch)
+
+        if self._load_annotator is not None:
+            self._load_annotator.annotate(batch)
+
         records = [get_record_values(r, self.load_batch_id) for r in batch]
 
         async with self.pool.acquire() as conn:
-            await conn.copy_records_to_table(
-                "variants", records=records, columns=VARIANT_COLUMNS_BASIC
-            )
+            if self._has_panel_mask is None:
+                self._has_panel_mask = await has_panel_mask_column(conn)
+            columns = VARIANT_COLUMNS_BASIC
+            if not self._has_panel_mask:
+                columns = without_panel_mask(columns)
+                records = [values[:-1] for values in records]
+            await conn.copy_records_to_table("variants", records=records, columns=columns)
 
     async def _start_audit(
         self,
@@ -624,12 +681,40 @@ class VCFLoader:
 
         return sum(results)
 
-    async def _load_hapmap3_lookup(self) -> None:
-        """Load HapMap3 lookup table for variant flagging."""
-        from .references.hapmap3 import HapMap3Loader
+    def _hapmap3_flag_panel(self) -> str | None:
+        """Panel that sets in_hapmap3/hapmap3_rsid, or None if not flagging.
+
+        A HapMap3 ``flag_panel`` (``hapmap3_<build>``), otherwise the HapMap3
+        panel of ``hapmap3_build`` when ``flag_hapmap3`` is set.
+        """
+        flag_panel = self.config.flag_panel
+        if flag_panel and flag_panel.startswith(HAPMAP3_PANEL_PREFIX):
+            return flag_panel
+        if self.config.flag_hapmap3:
+            return f"{HAPMAP3_PANEL_PREFIX}{self.config.hapmap3_build.lower()}"
+        return None
 
-        panel_name = f"hapmap3_{self.config.hapmap3_build.lower()}"
-        loader = HapMap3Loader()
+    def _panel_mask_panel_names(self) -> list[str]:
+        """Panels whose panel_mask bits are set on load.
+
+        ``panel_mask_panels``, plus ``flag_panel`` when it is not a HapMap3
+        panel: other panels are flagged through their bit, not in_hapmap3.
+        """
+        panels = list(self.config.panel_mask_panels or [])
+        flag_panel = self.config.flag_panel
+        if (
+            flag_panel
+            and not flag_panel.startswith(HAPMAP3_PANEL_PREFIX)
+            and flag_panel not in panels
+        ):
+            panels.append(flag_panel)
+        return panels
+
+    async def _load_hapmap3_lookup(self, panel_name: str) -> None:
+        """Load a HapMap3 panel lookup table for in_hapmap3/hapmap3_rsid flagging."""
+        from .references.panels import ReferencePanelLoader
+
+        loader = ReferencePanelLoader()
 
         async with self.pool.acquire() as conn:
             panel_exists = await conn.fetchval(
@@ -639,20 +724,95 @@ class VCFLoader:
 
             if not panel_exists:
                 self.logger.warning(
-                    "HapMap3 reference panel '%s' not loaded. "
-                    "Run 'vcf-pg-loader load-reference hapmap3 --build %s' first. "
-                    "Skipping HapMap3 flagging.",
+                    "Reference panel '%s' not loaded. "
+                    "Load it with 'vcf-pg-loader load-reference' first. "
+                    "Skipping reference panel flagging.",
                     panel_name,
-                    self.config.hapmap3_build,
                 )
                 return
 
             self._hapmap3_lookup = await loader.build_lookup(conn, panel_name)
             self.logger.info(
-                "Loaded HapMap3 lookup with %d positions for variant flagging",
+                "Loaded %s lookup with %d positions for variant flagging",
+                panel_name,
                 len(self._hapmap3_lookup),
             )
 
+    async def _load_panel_mask_index(self, panel_names: list[str]) -> None:
+        """Load panels into one index for panel_mask assignment."""
+        from .references.panel_mask import PanelMaskIndex, assign_panel_bits
+
+        async with self.pool.acquire() as conn:
+            if not await ReferenceSchemaManager().has_panel_mask_column(conn):
+                raise ValueError(
+                    "variants has no panel_mask column; run 'vcf-pg-loader load-reference' "
+                    "to add it before loading with --panel or a non-HapMap3 --flag-panel"
+                )
+            loaded = {
+                row["panel_name"]
+                for row in await conn.fetch(
+                    "SELECT DISTINCT panel_name FROM reference_panels WHERE panel_name = ANY($1)",
+                    panel_names,
+                )
+            }
+            missing = [p for p in panel_names if p not in loaded]
+            if missing:
+                self.logger.warning(
+                    "Reference panels not loaded, skipped for panel_mask: %s", ", ".join(missing)
+                )
+            if not loaded:
+                return
+
+            await ReferenceSchemaManager().create_panel_bits_table(conn)
+            bits = await assign_panel_bits(conn, [p for p in panel_names if p in loaded])
+            self._panel_mask_index = await PanelMaskIndex.from_db(conn, bits)
+
+        self.logger.info(
+            "Loaded %d variants from %d panels for panel_mask assignment",
+            len(self._panel_mask_index),
+            len(bits),
+        )
+
+    async def _load_ld_block_index(self) -> None:
+        """Load the LD block interval index for block assignment before COPY."""
+        from .references.ld_blocks import LDBlockIndex
+
+        population = self.config.ld_block_population
+        async with self.pool.acquire() as conn:
+            table_exists = await conn.fetchval("SELECT to_regclass('ld_blocks') IS NOT NULL")
+            index = (
+                await LDBlockIndex.from_db(conn, population, self.config.ld_block_build)
+                if table_exists
+                else None
+            )
+
+        if not index:
+            self.logger.warning(
+                "No %s LD blocks loaded. "
+                "Run 'vcf-pg-loader load-reference ld-blocks --population %s' first. "
+                "Skipping LD block assignment.",
+                population,
+                population,
+            )
+            return
+
+        self._ld_block_index = index
+        self.logger.info("Loaded %d %s LD blocks for variant assignment", len(index), population)
+
+    async def _open_annotation_snapshots(self) -> None:
+        """Open local snapshots of the annotation sources used on load."""
+        async with self.pool.acquire() as conn:
+            self._load_annotator = await LoadAnnotator.create(
+                conn,
+                self.config.annotate_on_load,
+                cache_dir=self.config.annotation_cache_dir,
+                snapshot_files=self.config.annotation_snapshots,
+            )
+        self.logger.info(
+            "Annotating on load from %s",
+            ", ".join(sorted(self._load_annotator.snapshots)),
+        )
+
     def _flag_hapmap3_variants(self, batch: list[VariantRecord]) -> None:
         """Flag variants that are in the HapMap3 reference panel."""
         from .references.hapmap3 import match_hapmap3_variant
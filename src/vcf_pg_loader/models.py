@@ -71,6 +71,12 @@ class VariantRecord:
     in_hapmap3: bool = False
     hapmap3_rsid: str | None = None
 
+    # LD block annotation
+    ld_block_id: int | None = None
+
+    # Reference panel membership bitmask (bit numbers from panel_bits)
+    panel_mask: int = 0
+
     @property
     def variant_type(self) -> str:
         """Classify variant type based on REF and ALT alleles."""
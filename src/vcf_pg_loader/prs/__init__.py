@@ -1,6 +1,14 @@
-"""PGS Catalog PRS weights storage and import."""
+"""PGS Catalog PRS weights storage, import and scoring."""
 
-from .loader import PGSLoader
+from .loader import PGSLoader, collect_scoring_files
+from .matrix_scoring import (
+    MatrixScoringResult,
+    WeightMatrix,
+    load_weight_matrix,
+    score_genotypes,
+    score_vcf,
+    store_matrix_scores,
+)
 from .models import PGSMetadata, PRSWeight
 from .pgs_catalog import (
     GenomeBuildMismatchError,
@@ -12,17 +20,28 @@ from .pgs_catalog import (
     validate_genome_build,
 )
 from .schema import PRSSchemaManager
+from .scoring import PRSScoringResult, compute_prs, orient_weight
 
 __all__ = [
     "GenomeBuildMismatchError",
+    "MatrixScoringResult",
     "PGSCatalogParser",
     "PGSLoader",
     "PGSMetadata",
     "PGSParseError",
     "PRSSchemaManager",
+    "PRSScoringResult",
     "PRSWeight",
+    "WeightMatrix",
+    "collect_scoring_files",
+    "compute_prs",
     "harmonize_weight_allele",
     "is_strand_ambiguous",
+    "load_weight_matrix",
+    "orient_weight",
     "parse_pgs_header",
+    "score_genotypes",
+    "score_vcf",
+    "store_matrix_scores",
     "validate_genome_build",
 ]
@@ -1,21 +1,52 @@
 """PGS Catalog score loader for PostgreSQL."""
 
+import asyncio
+import itertools
 import logging
+import math
+import multiprocessing
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TypedDict
+from typing import TYPE_CHECKING, TypedDict
 
 import asyncpg
+import numpy as np
 
-from ..utils.variant_matching import build_variant_lookups
+from ..utils.variant_matching import build_variant_lookups, match_rsids
 from ..utils.variant_matching import match_variant as shared_match_variant
+from .models import PGSMetadata, PRSWeight
 from .pgs_catalog import (
     PGSCatalogParser,
+    PGSParseError,
     validate_genome_build,
 )
 from .schema import PRSSchemaManager
 
+if TYPE_CHECKING:
+    from ..references.rsid_index import RsidIndex
+
 logger = logging.getLogger(__name__)
 
+PRS_WEIGHT_COLUMNS = [
+    "variant_id",
+    "pgs_id",
+    "effect_allele",
+    "effect_weight",
+    "is_interaction",
+    "is_haplotype",
+    "is_dominant",
+    "is_recessive",
+    "allele_frequency",
+    "locus_name",
+    "chr_name",
+    "chr_position",
+    "rsid",
+    "other_allele",
+]
+
 
 class PGSImportResult(TypedDict):
     """Result of PGS import operation."""
@@ -26,6 +57,169 @@ class PGSImportResult(TypedDict):
     weights_unmatched: int
 
 
+class PGSBatchScoreResult(TypedDict):
+    """Per-score result of a batch PGS import."""
+
+    path: str
+    pgs_id: str | None
+    weights_imported: int
+    weights_matched: int
+    weights_unmatched: int
+    error: str | None
+
+
+SCORING_FILE_SUFFIXES = (".txt", ".tsv", ".txt.gz", ".tsv.gz")
+
+
+def collect_scoring_files(path: Path) -> list[tuple[Path, str | None]]:
+    """List the scoring files of a directory or manifest.
+
+    A directory contributes every ``.txt``/``.tsv`` file (optionally
+    gzipped), sorted by name. Any other file is read as a manifest with one
+    scoring file per line, optionally followed by a tab and a PGS ID
+    override; relative paths are resolved against the manifest's directory,
+    and blank lines and ``#`` comments are skipped.
+
+    Args:
+        path: Directory of scoring files, or manifest file
+
+    Returns:
+        (scoring file path, PGS ID override or None) for each file
+    """
+    if path.is_dir():
+        return [
+            (file, None)
+            for file in sorted(path.iterdir())
+            if file.is_file()
+            and not file.name.startswith(".")
+            and file.name.lower().endswith(SCORING_FILE_SUFFIXES)
+        ]
+
+    scoring_files = []
+    for line in path.read_text().splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.rstrip("\n").split("\t")
+        file = Path(fields[0].strip())
+        if not file.is_absolute():
+            file = path.parent / file
+        override = fields[1].strip() if len(fields) > 1 and fields[1].strip() else None
+        scoring_files.append((file, override))
+    return scoring_files
+
+
+@dataclass
+class _WeightColumns:
+    """One score's weights as compact typed columns.
+
+    Parser processes return these instead of PRSWeight lists, so a file is
+    pickled back as a few arrays and string lists. Missing positions are -1
+    and missing allele frequencies NaN; text columns hold None.
+    """
+
+    effect_allele: list[str]
+    effect_weight: np.ndarray
+    chromosome: list[str | None]
+    position: np.ndarray
+    rsid: list[str | None]
+    other_allele: list[str | None]
+    is_interaction: np.ndarray
+    is_haplotype: np.ndarray
+    is_dominant: np.ndarray
+    is_recessive: np.ndarray
+    allele_frequency: np.ndarray
+    locus_name: list[str | None]
+
+    @classmethod
+    def from_weights(cls, weights: Iterable[PRSWeight]) -> "_WeightColumns":
+        weights = list(weights)
+        n = len(weights)
+
+        def flags(name: str) -> np.ndarray:
+            return np.fromiter((getattr(w, name) for w in weights), np.bool_, n)
+
+        return cls(
+            effect_allele=[w.effect_allele for w in weights],
+            effect_weight=np.fromiter((w.effect_weight for w in weights), np.float64, n),
+            chromosome=[w.chromosome for w in weights],
+            position=np.fromiter(
+                (-1 if w.position is None else w.position for w in weights), np.int64, n
+            ),
+            rsid=[w.rsid for w in weights],
+            other_allele=[w.other_allele for w in weights],
+            is_interaction=flags("is_interaction"),
+            is_haplotype=flags("is_haplotype"),
+            is_dominant=flags("is_dominant"),
+            is_recessive=flags("is_recessive"),
+            allele_frequency=np.fromiter(
+                (np.nan if w.allele_frequency is None else w.allele_frequency for w in weights),
+                np.float64,
+                n,
+            ),
+            locus_name=[w.locus_name for w in weights],
+        )
+
+    def __len__(self) -> int:
+        return len(self.effect_allele)
+
+    def iter_batches(self, batch_size: int) -> Iterator[list[PRSWeight]]:
+        """Rebuild the weights in lists of at most ``batch_size``."""
+        for start in range(0, len(self), batch_size):
+            stop = start + batch_size
+            positions = self.position[start:stop].tolist()
+            frequencies = self.allele_frequency[start:stop].tolist()
+            yield [
+                PRSWeight(
+                    effect_allele=effect_allele,
+                    effect_weight=effect_weight,
+                    chromosome=chromosome,
+                    position=None if position < 0 else position,
+                    rsid=rsid,
+                    other_allele=other_allele,
+                    is_interaction=is_interaction,
+                    is_haplotype=is_haplotype,
+                    is_dominant=is_dominant,
+                    is_recessive=is_recessive,
+                    allele_frequency=None if math.isnan(frequency) else frequency,
+                    locus_name=locus_name,
+                )
+                for (
+                    effect_allele,
+                    effect_weight,
+                    chromosome,
+                    position,
+                    rsid,
+                    other_allele,
+                    is_interaction,
+                    is_haplotype,
+                    is_dominant,
+                    is_recessive,
+                    frequency,
+                    locus_name,
+                ) in zip(
+                    self.effect_allele[start:stop],
+                    self.effect_weight[start:stop].tolist(),
+                    self.chromosome[start:stop],
+                    positions,
+                    self.rsid[start:stop],
+                    self.other_allele[start:stop],
+                    self.is_interaction[start:stop].tolist(),
+                    self.is_haplotype[start:stop].tolist(),
+                    self.is_dominant[start:stop].tolist(),
+                    self.is_recessive[start:stop].tolist(),
+                    frequencies,
+                    self.locus_name[start:stop],
+                    strict=True,
+                )
+            ]
+
+
+def _parse_scoring_file(path: str) -> tuple[PGSMetadata, _WeightColumns]:
+    """Worker process entry point: parse one scoring file into columns."""
+    parser = PGSCatalogParser(Path(path))
+    return parser.metadata, _WeightColumns.from_weights(parser.iter_weights())
+
+
 class PGSLoader:
     """Load PGS Catalog scores into PostgreSQL."""
 
@@ -39,6 +233,7 @@ class PGSLoader:
         pgs_path: Path,
         pgs_id_override: str | None = None,
         validate_build: bool = False,
+        rsid_index: "RsidIndex | None" = None,
     ) -> PGSImportResult:
         """Import PGS Catalog scoring file.
 
@@ -47,6 +242,9 @@ class PGSLoader:
             pgs_path: Path to PGS Catalog format scoring file
             pgs_id_override: Override PGS ID from file header
             validate_build: Whether to validate genome build against database
+            rsid_index: Optional dbSNP rsID index; weights left unmatched by
+                position and by variants.rs_id are resolved through it,
+                one batch at a time
 
         Returns:
             PGSImportResult with import statistics
@@ -84,54 +282,15 @@ class PGSLoader:
 
         variant_lookup, rsid_lookup = await self._build_variant_lookups(conn)
 
-        weights_imported = 0
-        weights_matched = 0
-        weights_unmatched = 0
-        batch = []
-
-        for weight in parser.iter_weights():
-            variant_id = self._match_variant(
-                weight.chromosome,
-                weight.position,
-                weight.effect_allele,
-                weight.other_allele,
-                weight.rsid,
-                variant_lookup,
-                rsid_lookup,
-            )
-
-            if variant_id is not None:
-                weights_matched += 1
-            else:
-                weights_unmatched += 1
-
-            batch.append(
-                (
-                    variant_id,
-                    pgs_id,
-                    weight.effect_allele,
-                    weight.effect_weight,
-                    weight.is_interaction,
-                    weight.is_haplotype,
-                    weight.is_dominant,
-                    weight.is_recessive,
-                    weight.allele_frequency,
-                    weight.locus_name,
-                    weight.chromosome,
-                    weight.position,
-                    weight.rsid,
-                    weight.other_allele,
-                )
-            )
-
-            if len(batch) >= self.batch_size:
-                await self._insert_batch(conn, batch)
-                weights_imported += len(batch)
-                batch = []
-
-        if batch:
-            await self._insert_batch(conn, batch)
-            weights_imported += len(batch)
+        weights_imported, weights_matched = await self._copy_weights(
+            conn,
+            pgs_id,
+            parser.iter_batches(self.batch_size),
+            variant_lookup,
+            rsid_lookup,
+            rsid_index,
+        )
+        weights_unmatched = weights_imported - weights_matched
 
         logger.info(
             f"Imported {weights_imported} weights for PGS {pgs_id} "
@@ -145,6 +304,175 @@ class PGSLoader:
             weights_unmatched=weights_unmatched,
         )
 
+    async def import_pgs_batch(
+        self,
+        conn: asyncpg.Connection,
+        scoring_files: list[tuple[Path, str | None]],
+        workers: int = 4,
+        validate_build: bool = False,
+        rsid_index: "RsidIndex | None" = None,
+    ) -> list[PGSBatchScoreResult]:
+        """Import many PGS Catalog scoring files with one matching pass.
+
+        Variant lookups are built once. Files are parsed in a pool of
+        ``workers`` processes, at most ``workers`` files ahead of the one
+        being matched, and every score's weights are COPYed into one staging
+        table. The previous weights of all imported scores are then replaced
+        with one DELETE and one INSERT, in the same transaction.
+
+        A file that cannot be parsed (whatever the worker raised), repeats an
+        earlier PGS ID, or fails build validation is reported and skipped;
+        the others are imported.
+
+        Args:
+            conn: Database connection
+            scoring_files: (path, PGS ID override or None) of each file,
+                e.g. from :func:`collect_scoring_files`
+            workers: Number of parser processes
+            validate_build: Whether to validate genome builds against database
+            rsid_index: Optional dbSNP rsID index for rsID-only weights
+
+        Returns:
+            One PGSBatchScoreResult per file, in input order
+        """
+        db_build = await self._get_database_build(conn) if validate_build else None
+        variant_lookup, rsid_lookup = await self._build_variant_lookups(conn)
+
+        results: list[PGSBatchScoreResult] = []
+        imported_ids: list[str] = []
+        if not scoring_files:
+            return results
+
+        loop = asyncio.get_running_loop()
+        workers = max(1, min(workers, len(scoring_files)))
+        remaining = iter(scoring_files)
+        in_flight: deque = deque()
+
+        def submit(executor: ProcessPoolExecutor, n: int) -> None:
+            for path, override in itertools.islice(remaining, n):
+                future = loop.run_in_executor(executor, _parse_scoring_file, str(path))
+                in_flight.append((path, override, future))
+
+        async with conn.transaction():
+            await conn.execute("DROP TABLE IF EXISTS pg_temp.prs_weights_staging")
+            await conn.execute(f"""
+                CREATE TEMP TABLE prs_weights_staging ON COMMIT DROP AS
+                SELECT {", ".join(PRS_WEIGHT_COLUMNS)} FROM prs_weights WITH NO DATA
+            """)
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                submit(executor, workers)
+                while in_flight:
+                    path, override, future = in_flight.popleft()
+                    submit(executor, 1)
+
+                    result = PGSBatchScoreResult(
+                        path=str(path),
+                        pgs_id=override,
+                        weights_imported=0,
+                        weights_matched=0,
+                        weights_unmatched=0,
+                        error=None,
+                    )
+                    results.append(result)
+
+                    try:
+                        metadata, weights = await future
+                        result["pgs_id"] = pgs_id = override or metadata.pgs_id
+                        if pgs_id in imported_ids:
+                            raise PGSParseError(f"Duplicate PGS ID {pgs_id}")
+                        if db_build:
+                            validate_genome_build(metadata.genome_build, db_build)
+                    except Exception as e:
+                        # Any failure reading or validating a file only fails this score
+                        result["error"] = f"{type(e).__name__}: {e}"
+                        logger.warning(f"Skipping {path}: {result['error']}")
+                        continue
+
+                    await self.schema_manager.create_score(
+                        conn,
+                        pgs_id=pgs_id,
+                        trait_name=metadata.trait_name,
+                        trait_ontology_id=metadata.trait_ontology_id,
+                        publication_pmid=metadata.publication_pmid,
+                        n_variants=metadata.n_variants,
+                        genome_build=metadata.genome_build,
+                        weight_type=metadata.weight_type,
+                        reporting_ancestry=metadata.reporting_ancestry,
+                    )
+                    imported, matched = await self._copy_weights(
+                        conn,
+                        pgs_id,
+                        weights.iter_batches(self.batch_size),
+                        variant_lookup,
+                        rsid_lookup,
+                        rsid_index,
+                        table="prs_weights_staging",
+                    )
+                    result["weights_imported"] = imported
+                    result["weights_matched"] = matched
+                    result["weights_unmatched"] = imported - matched
+                    imported_ids.append(pgs_id)
+
+            await conn.execute(
+                "DELETE FROM prs_weights WHERE pgs_id = ANY($1::text[])", imported_ids
+            )
+            await conn.execute(f"""
+                INSERT INTO prs_weights ({", ".join(PRS_WEIGHT_COLUMNS)})
+                SELECT {", ".join(PRS_WEIGHT_COLUMNS)} FROM prs_weights_staging
+            """)
+
+        logger.info(
+            f"Imported {len(imported_ids)} of {len(scoring_files)} PGS scores "
+            f"({sum(r['weights_imported'] for r in results)} weights)"
+        )
+
+        return results
+
+    async def _copy_weights(
+        self,
+        conn: asyncpg.Connection,
+        pgs_id: str,
+        batches: Iterable[list[PRSWeight]],
+        variant_lookup: dict[tuple[str, int, str, str], int],
+        rsid_lookup: dict[str, int],
+        rsid_index: "RsidIndex | None",
+        table: str = "prs_weights",
+    ) -> tuple[int, int]:
+        """Match and COPY batches of one score's weights.
+
+        Returns:
+            (weights imported, weights matched)
+        """
+        weights_imported = 0
+        weights_matched = 0
+
+        for weights in batches:
+            pending = [
+                (
+                    weight,
+                    self._match_variant(
+                        weight.chromosome,
+                        weight.position,
+                        weight.effect_allele,
+                        weight.other_allele,
+                        weight.rsid,
+                        variant_lookup,
+                        rsid_lookup,
+                    ),
+                )
+                for weight in weights
+            ]
+            weights_matched += await self._flush_batch(
+                conn, pgs_id, pending, variant_lookup, rsid_index, table
+            )
+            weights_imported += len(pending)
+
+        return weights_imported, weights_matched
+
     async def _get_database_build(self, conn: asyncpg.Connection) -> str | None:
         """Get genome build from most recent load audit."""
         row = await conn.fetchrow("""
@@ -194,16 +522,63 @@ class PGSLoader:
             rsid_lookup=rsid_lookup,
         )
 
-    async def _insert_batch(self, conn: asyncpg.Connection, batch: list[tuple]) -> None:
-        """Insert a batch of PRS weights."""
-        await conn.executemany(
-            """
-            INSERT INTO prs_weights (
-                variant_id, pgs_id, effect_allele, effect_weight,
-                is_interaction, is_haplotype, is_dominant, is_recessive,
-                allele_frequency, locus_name, chr_name, chr_position,
-                rsid, other_allele
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-            """,
-            batch,
-        )
+    async def _flush_batch(
+        self,
+        conn: asyncpg.Connection,
+        pgs_id: str,
+        pending: list[tuple[PRSWeight, int | None]],
+        variant_lookup: dict[tuple[str, int, str, str], int],
+        rsid_index: "RsidIndex | None",
+        table: str = "prs_weights",
+    ) -> int:
+        """Resolve unmatched weights through the rsID index and insert the batch.
+
+        Returns:
+            Number of matched weights in the batch
+        """
+        variant_ids = [variant_id for _, variant_id in pending]
+
+        if rsid_index is not None:
+            unmatched = [
+                i
+                for i, (weight, variant_id) in enumerate(pending)
+                if variant_id is None and weight.rsid
+            ]
+            if unmatched:
+                resolved = match_rsids(
+                    rsid_index,
+                    [pending[i][0].rsid for i in unmatched],
+                    [pending[i][0].effect_allele for i in unmatched],
+                    [pending[i][0].other_allele for i in unmatched],
+                    variant_lookup,
+                )
+                for i, variant_id in zip(unmatched, resolved, strict=True):
+                    variant_ids[i] = variant_id
+
+        batch = [
+            (
+                variant_id,
+                pgs_id,
+                weight.effect_allele,
+                weight.effect_weight,
+                weight.is_interaction,
+                weight.is_haplotype,
+                weight.is_dominant,
+                weight.is_recessive,
+                weight.allele_frequency,
+                weight.locus_name,
+                weight.chromosome,
+                weight.position,
+                weight.rsid,
+                weight.other_allele,
+            )
+            for (weight, _), variant_id in zip(pending, variant_ids, strict=True)
+        ]
+        await self._insert_batch(conn, batch, table)
+        return sum(variant_id is not None for variant_id in variant_ids)
+
+    async def _insert_batch(
+        self, conn: asyncpg.Connection, batch: list[tuple], table: str = "prs_weights"
+    ) -> None:
+        """COPY a batch of PRS weights into prs_weights (or a staging table)."""
+        await conn.copy_records_to_table(table, records=batch, columns=PRS_WEIGHT_COLUMNS)
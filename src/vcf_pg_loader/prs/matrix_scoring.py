@@ -0,0 +1,422 @@
+"""Out-of-core PRS scoring with chunked NumPy dosage matrices.
+
+For scores with millions of weights over large cohorts, dosages are streamed
+in blocks of (variants x samples) from the genotypes table or directly from a
+VCF, and ``dosage_block.T @ weight_block`` is accumulated on a thread pool.
+Several PGS are scored in one pass by stacking their oriented weight vectors
+into a (variants x scores) matrix. Memory is bounded by the block size times
+the number of blocks in flight.
+
+Weights are oriented to ALT dosage exactly as in :mod:`.scoring`, and missing
+dosages are mean-imputed per variant from the block (which holds every
+sample), falling back to the scoring file's allele frequency.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import asyncpg
+import numpy as np
+
+from ..export.plink2 import MAX_CHUNK_GENOTYPES, fetch_genotype_chunk, fetch_genotyped_samples
+from ..genotypes.packed import detect_genotype_storage
+from ..utils.variant_matching import normalize_chromosome
+from .scoring import orient_weight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WeightMatrix:
+    """Oriented weights for one or more PGS stacked by variant."""
+
+    pgs_ids: list[str]
+    variant_ids: np.ndarray
+    keys: list[tuple[str, int, str, str]]
+    betas: np.ndarray
+    offsets: np.ndarray
+    fallback_means: np.ndarray
+    weights_skipped: int = 0
+
+    @property
+    def n_variants(self) -> int:
+        return len(self.variant_ids)
+
+
+@dataclass
+class MatrixScoringResult:
+    """Per-sample scores for each PGS from a matrix scoring run."""
+
+    pgs_ids: list[str]
+    samples: list[str]
+    scores: np.ndarray
+    n_imputed: np.ndarray
+    variants_used: np.ndarray
+    sample_ids: list[int] | None = None
+
+    def write_tsv(self, output_path: Path) -> None:
+        """Write scores as a sample x PGS tab-separated table."""
+        with open(output_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\t".join(["sample", *self.pgs_ids]) + "\n")
+            for sample, row in zip(self.samples, self.scores, strict=True):
+                f.write("\t".join([sample, *(f"{value:.6g}" for value in row)]) + "\n")
+
+
+def build_weight_matrix(rows: list[asyncpg.Record], pgs_ids: list[str]) -> WeightMatrix:
+    """Stack oriented weights for several PGS into a variants x scores matrix.
+
+    Args:
+        rows: Weight rows joined to variants (pgs_id, variant_id, effect_allele,
+            other_allele, effect_weight, allele_frequency, chrom, pos, ref, alt)
+        pgs_ids: PGS IDs defining the matrix columns
+
+    Returns:
+        WeightMatrix ordered by first appearance of each variant in rows
+    """
+    column = {pgs_id: i for i, pgs_id in enumerate(pgs_ids)}
+    row_index: dict[int, int] = {}
+    variant_ids: list[int] = []
+    keys: list[tuple[str, int, str, str]] = []
+    entries: list[tuple[int, int, float, float]] = []
+    fallback: dict[int, float] = {}
+    skipped = 0
+
+    for row in rows:
+        oriented = orient_weight(
+            row["effect_allele"],
+            row["effect_weight"],
+            row["other_allele"],
+            row["ref"],
+            row["alt"],
+            row["allele_frequency"],
+        )
+        if oriented is None:
+            skipped += 1
+            continue
+        beta, offset, fallback_mean = oriented
+
+        variant_id = row["variant_id"]
+        if variant_id not in row_index:
+            row_index[variant_id] = len(variant_ids)
+            variant_ids.append(variant_id)
+            keys.append(
+                (
+                    normalize_chromosome(str(row["chrom"])),
+                    row["pos"],
+                    row["ref"].upper(),
+                    row["alt"].upper(),
+                )
+            )
+        i = row_index[variant_id]
+        if fallback_mean is not None:
+            fallback.setdefault(i, fallback_mean)
+        entries.append((i, column[row["pgs_id"]], beta, offset))
+
+    betas = np.zeros((len(variant_ids), len(pgs_ids)), dtype=np.float64)
+    offsets = np.zeros_like(betas)
+    for i, j, beta, offset in entries:
+        betas[i, j] = beta
+        offsets[i, j] = offset
+
+    fallback_means = np.full(len(variant_ids), np.nan, dtype=np.float64)
+    for i, mean in fallback.items():
+        fallback_means[i] = mean
+
+    return WeightMatrix(
+        pgs_ids=list(pgs_ids),
+        variant_ids=np.array(variant_ids, dtype=np.int64),
+        keys=keys,
+        betas=betas,
+        offsets=offsets,
+        fallback_means=fallback_means,
+        weights_skipped=skipped,
+    )
+
+
+async def load_weight_matrix(conn: asyncpg.Connection, pgs_ids: list[str]) -> WeightMatrix:
+    """Load and orient matched weights for several PGS from the database."""
+    rows = await conn.fetch(
+        """
+        SELECT w.pgs_id, w.variant_id, w.effect_allele, w.other_allele,
+               w.effect_weight, w.allele_frequency, v.chrom, v.pos, v.ref, v.alt
+        FROM prs_weights w
+        JOIN variants v ON v.variant_id = w.variant_id
+        WHERE w.pgs_id = ANY($1::text[])
+        ORDER BY v.chrom, v.pos, w.variant_id
+        """,
+        pgs_ids,
+    )
+    return build_weight_matrix(rows, pgs_ids)
+
+
+def score_block(
+    betas: np.ndarray,
+    offsets: np.ndarray,
+    fallback_means: np.ndarray,
+    dosages: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score one dosage block against the matching rows of a weight matrix.
+
+    Missing dosages are replaced by the variant's mean over the
+    block's samples, or by ``fallback_means`` when no sample has a dosage.
+    Variants with neither are left out of the score.
+
+    Args:
+        betas: (variants x scores) ALT-dosage weights for the block rows
+        offsets: (variants x scores) constant terms for effect-REF weights
+        fallback_means: (variants,) mean ALT dosage to use when unobserved
+        dosages: (variants x samples) ALT dosages, NaN where missing
+
+    Returns:
+        Tuple of (scores, n_imputed, used) where scores and n_imputed are
+        (samples x scores) and used is the (variants,) mask of scored rows
+    """
+    missing = np.isnan(dosages)
+    observed = (~missing).sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        means = np.where(
+            observed > 0,
+            np.nansum(dosages, axis=1) / np.maximum(observed, 1),
+            fallback_means,
+        )
+    used = ~np.isnan(means)
+
+    block = np.where(missing, means[:, None], dosages)[used]
+    weights = betas[used]
+    scores = block.T @ weights + offsets[used].sum(axis=0)
+    n_imputed = missing[used].T.astype(np.int32) @ (weights != 0).astype(np.int32)
+    return scores, n_imputed, used
+
+
+class BlockScorer:
+    """Accumulate block scores on a thread pool with bounded blocks in flight."""
+
+    def __init__(self, weights: WeightMatrix, n_samples: int, max_workers: int = 4):
+        self.weights = weights
+        n_scores = len(weights.pgs_ids)
+        self.scores = np.zeros((n_samples, n_scores), dtype=np.float64)
+        self.n_imputed = np.zeros((n_samples, n_scores), dtype=np.int64)
+        self.used = np.zeros(weights.n_variants, dtype=bool)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending: deque[Future] = deque()
+        self._max_pending = max_workers * 2
+
+    def _score(self, rows: np.ndarray, dosages: np.ndarray) -> None:
+        scores, n_imputed, used = score_block(
+            self.weights.betas[rows],
+            self.weights.offsets[rows],
+            self.weights.fallback_means[rows],
+            dosages.astype(np.float64, copy=False),
+        )
+        with self._lock:
+            self.scores += scores
+            self.n_imputed += n_imputed
+            self.used[rows[used]] = True
+
+    def submit(self, rows: np.ndarray, dosages: np.ndarray) -> None:
+        """Queue a block, waiting for the oldest block when too many are in flight."""
+        while len(self._pending) >= self._max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._executor.submit(self._score, rows, dosages))
+
+    def finish(self) -> np.ndarray:
+        """Wait for all queued blocks and return variants used per score."""
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True)
+        return ((self.weights.betas != 0) & self.used[:, None]).sum(axis=0)
+
+
+def iter_vcf_blocks(
+    vcf_path: Path, weights: WeightMatrix, chunk_size: int
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Stream ALT dosage blocks for weighted variants from a VCF.
+
+    Records are matched to weight rows by chromosome, position, REF and ALT,
+    one ALT at a time for multi-allelic records. DS is used when the header
+    declares it and it has a value for the ALT, otherwise the dosage is the
+    count of ALT alleles in GT.
+
+    Yields:
+        Tuples of (weight row indices, dosages) with dosages shaped
+        (variants x samples) and NaN where missing
+    """
+    from cyvcf2 import VCF
+
+    key_index = {key: i for i, key in enumerate(weights.keys)}
+    vcf = VCF(str(vcf_path))
+    try:
+        has_ds = any(
+            h.type == "FORMAT" and h.info().get("ID") == "DS" for h in vcf.header_iter()
+        )
+        rows: list[int] = []
+        block: list[np.ndarray] = []
+        for variant in vcf:
+            chrom = normalize_chromosome(variant.CHROM)
+            ref = variant.REF.upper()
+            matches = [
+                (allele, key_index[(chrom, variant.POS, ref, alt.upper())])
+                for allele, alt in enumerate(variant.ALT, start=1)
+                if (chrom, variant.POS, ref, alt.upper()) in key_index
+            ]
+            if not matches:
+                continue
+
+            ds = variant.format("DS") if has_ds else None
+            alleles = variant.genotype.array()[:, :-1]
+            called = ~(alleles == -1).any(axis=1)
+            for allele, row in matches:
+                dosage = np.where(called, (alleles == allele).sum(axis=1), np.nan)
+                # A Number=1 DS on a multi-allelic record has no column for later ALTs
+                if ds is not None and ds.shape[1] >= allele:
+                    values = ds[:, allele - 1].astype(np.float64)
+                    valid = (values >= 0) & (values <= 2)
+                    dosage = np.where(valid, values, dosage)
+                rows.append(row)
+                block.append(dosage)
+
+            if len(rows) >= chunk_size:
+                yield np.array(rows, dtype=np.intp), np.vstack(block)
+                rows, block = [], []
+
+        if rows:
+            yield np.array(rows, dtype=np.intp), np.vstack(block)
+    finally:
+        vcf.close()
+
+
+def score_vcf(
+    vcf_path: Path,
+    weights: WeightMatrix,
+    chunk_size: int | None = None,
+    max_workers: int = 4,
+) -> MatrixScoringResult:
+    """Score every sample in a VCF for each PGS in a weight matrix.
+
+    Weighted variants absent from the VCF are not scored, matching PLINK's
+    --score behaviour.
+
+    Args:
+        vcf_path: VCF/BCF with GT and optionally DS for the scored variants
+        weights: Weight matrix from :func:`load_weight_matrix`
+        chunk_size: Variants per block (default: sized so a block holds at
+            most MAX_CHUNK_GENOTYPES dosages)
+        max_workers: Threads computing block products
+
+    Returns:
+        MatrixScoringResult keyed by VCF sample name
+    """
+    from cyvcf2 import VCF
+
+    vcf = VCF(str(vcf_path))
+    samples = list(vcf.samples)
+    vcf.close()
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_GENOTYPES // max(1, len(samples)))
+
+    scorer = BlockScorer(weights, len(samples), max_workers)
+    try:
+        for rows, dosages in iter_vcf_blocks(vcf_path, weights, chunk_size):
+            scorer.submit(rows, dosages)
+    finally:
+        variants_used = scorer.finish()
+
+    return MatrixScoringResult(
+        pgs_ids=weights.pgs_ids,
+        samples=samples,
+        scores=scorer.scores,
+        n_imputed=scorer.n_imputed,
+        variants_used=variants_used,
+    )
+
+
+async def score_genotypes(
+    conn: asyncpg.Connection,
+    weights: WeightMatrix,
+    sample_ids: list[int] | None = None,
+    chunk_size: int | None = None,
+    max_workers: int = 4,
+) -> MatrixScoringResult:
+    """Score stored genotypes for each PGS in a weight matrix.
+
+    Dosage blocks are fetched from the genotypes table (or genotypes_packed
+    for packed storage) while earlier blocks are multiplied on the thread
+    pool. Missing dosages are taken from the GT hardcall where possible
+    before mean imputation, as in :func:`.scoring.compute_prs`.
+
+    Args:
+        conn: Database connection
+        weights: Weight matrix from :func:`load_weight_matrix`
+        sample_ids: Samples to score (default: all samples with genotypes)
+        chunk_size: Variants per block (default: sized so a block holds at
+            most MAX_CHUNK_GENOTYPES dosages)
+        max_workers: Threads computing block products
+
+    Returns:
+        MatrixScoringResult keyed by sample external ID
+    """
+    storage = await detect_genotype_storage(conn)
+    samples = await fetch_genotyped_samples(conn, sample_ids, storage)
+    if not samples:
+        raise ValueError("No samples with stored genotypes to score")
+    sample_index = {s["sample_id"]: i for i, s in enumerate(samples)}
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_GENOTYPES // len(samples))
+
+    scorer = BlockScorer(weights, len(samples), max_workers)
+    try:
+        for start in range(0, weights.n_variants, chunk_size):
+            variant_ids = weights.variant_ids[start : start + chunk_size].tolist()
+            _, dosages = await fetch_genotype_chunk(conn, variant_ids, sample_index, 0.0, storage)
+            block_rows = np.arange(start, start + len(variant_ids), dtype=np.intp)
+            await asyncio.to_thread(scorer.submit, block_rows, dosages)
+    finally:
+        variants_used = await asyncio.to_thread(scorer.finish)
+
+    return MatrixScoringResult(
+        pgs_ids=weights.pgs_ids,
+        samples=[s["external_id"] for s in samples],
+        scores=scorer.scores,
+        n_imputed=scorer.n_imputed,
+        variants_used=variants_used,
+        sample_ids=[s["sample_id"] for s in samples],
+    )
+
+
+async def store_matrix_scores(conn: asyncpg.Connection, result: MatrixScoringResult) -> int:
+    """Replace prs_scores rows for each PGS with matrix scoring results.
+
+    Returns:
+        Number of score rows written
+    """
+    if result.sample_ids is None:
+        raise ValueError("Only scores of stored genotypes can be written to prs_scores")
+
+    records = [
+        (
+            pgs_id,
+            sample_id,
+            float(result.scores[i, j]),
+            int(result.variants_used[j]),
+            int(result.n_imputed[i, j]),
+        )
+        for j, pgs_id in enumerate(result.pgs_ids)
+        for i, sample_id in enumerate(result.sample_ids)
+    ]
+    async with conn.transaction():
+        await conn.execute("DELETE FROM prs_scores WHERE pgs_id = ANY($1::text[])", result.pgs_ids)
+        await conn.copy_records_to_table(
+            "prs_scores",
+            records=records,
+            columns=["pgs_id", "sample_id", "score", "n_variants", "n_imputed"],
+        )
+    return len(records)
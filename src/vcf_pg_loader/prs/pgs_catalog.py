@@ -1,7 +1,11 @@
 """PGS Catalog format parser and allele harmonization."""
 
+import gzip
+import io
+import itertools
 from collections.abc import Iterator
 from pathlib import Path
+from typing import TextIO
 
 from .models import HarmonizationResult, PGSMetadata, PRSWeight
 
@@ -201,10 +205,16 @@ def harmonize_weight_allele(weight: PRSWeight, ref: str, alt: str) -> Harmonizat
 
 
 class PGSCatalogParser:
-    """Parser for PGS Catalog scoring files."""
+    """Streaming parser for PGS Catalog scoring files.
+
+    Scoring files may be gzipped (``.gz``). Only the header is read on
+    construction; weights are read lazily, one line at a time, so memory use
+    does not depend on the number of variants in the file.
+    """
 
     def __init__(self, path: Path):
         self.path = path
+        self._content: str | None = None
         self._header_lines: list[str] = []
         self._data_start_line: int = 0
         self._columns: list[str] = []
@@ -217,33 +227,35 @@ class PGSCatalogParser:
         """Create parser from string content (for testing)."""
         parser = object.__new__(cls)
         parser.path = None
+        parser._content = content
         parser._header_lines = []
+        parser._data_start_line = 0
         parser._columns = []
         parser._column_indices = {}
         parser._metadata = None
-        parser._content = content
-        parser._parse_header_from_content(content)
+        parser._parse_header()
         return parser
 
+    def _open(self) -> TextIO:
+        """Open the scoring file (or test content) as a text stream."""
+        if self._content is not None:
+            return io.StringIO(self._content)
+        if str(self.path).endswith(".gz"):
+            return gzip.open(self.path, "rt")
+        return open(self.path)
+
     def _parse_header(self) -> None:
-        """Parse header from file."""
-        with open(self.path) as f:
-            content = f.read()
-        self._content = content
-        self._parse_header_from_content(content)
-
-    def _parse_header_from_content(self, content: str) -> None:
-        """Parse header from content string."""
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines):
-            if line.startswith("#"):
-                self._header_lines.append(line)
-            else:
-                self._data_start_line = i
-                if line.strip():
-                    self._parse_column_header(line)
-                break
+        """Read comment lines and the column header, stopping at the first weight."""
+        with self._open() as f:
+            for i, line in enumerate(f):
+                line = line.rstrip("\r\n")
+                if line.startswith("#"):
+                    self._header_lines.append(line)
+                else:
+                    self._data_start_line = i
+                    if line.strip():
+                        self._parse_column_header(line)
+                    break
 
         self._metadata = parse_pgs_header(self._header_lines)
 
@@ -269,18 +281,23 @@ class PGSCatalogParser:
 
     def iter_weights(self) -> Iterator[PRSWeight]:
         """Iterate over weight records in the file."""
-        lines = self._content.split("\n")
-        data_lines = lines[self._data_start_line + 1 :]
-
-        for line_num, line in enumerate(data_lines, start=self._data_start_line + 2):
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                yield self._parse_row(line.split("\t"), line_num)
-            except ValueError as e:
-                raise PGSParseError(f"Error parsing line {line_num}: {e}") from e
+        with self._open() as f:
+            data_lines = itertools.islice(f, self._data_start_line + 1, None)
+            for line_num, line in enumerate(data_lines, start=self._data_start_line + 2):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    yield self._parse_row(line.split("\t"), line_num)
+                except ValueError as e:
+                    raise PGSParseError(f"Error parsing line {line_num}: {e}") from e
+
+    def iter_batches(self, batch_size: int = 10000) -> Iterator[list[PRSWeight]]:
+        """Iterate over weight records in lists of at most ``batch_size``."""
+        weights = self.iter_weights()
+        while batch := list(itertools.islice(weights, batch_size)):
+            yield batch
 
     def _parse_row(self, row: list[str], line_num: int) -> PRSWeight:
         """Parse a single row into a PRSWeight."""
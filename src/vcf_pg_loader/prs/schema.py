@@ -10,6 +10,7 @@ class PRSSchemaManager:
         """Create complete PRS schema including scores and weights tables."""
         await self.create_pgs_scores_table(conn)
         await self.create_prs_weights_table(conn)
+        await self.create_prs_scores_table(conn)
         await self.create_prs_indexes(conn)
 
     async def create_pgs_scores_table(self, conn: asyncpg.Connection) -> None:
@@ -51,6 +52,20 @@ class PRSSchemaManager:
             )
         """)
 
+    async def create_prs_scores_table(self, conn: asyncpg.Connection) -> None:
+        """Create the prs_scores table of computed per-sample scores."""
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS prs_scores (
+                pgs_id VARCHAR(20) REFERENCES pgs_scores(pgs_id) ON DELETE CASCADE,
+                sample_id INTEGER NOT NULL,
+                score DOUBLE PRECISION NOT NULL,
+                n_variants INTEGER NOT NULL,
+                n_imputed INTEGER NOT NULL DEFAULT 0,
+                computed_at TIMESTAMPTZ DEFAULT NOW(),
+                PRIMARY KEY (pgs_id, sample_id)
+            )
+        """)
+
     async def create_prs_indexes(self, conn: asyncpg.Connection) -> None:
         """Create performance indexes for PRS queries."""
         await conn.execute("""
@@ -72,6 +87,7 @@ class PRSSchemaManager:
 
     async def drop_prs_schema(self, conn: asyncpg.Connection) -> None:
         """Drop PRS schema tables."""
+        await conn.execute("DROP TABLE IF EXISTS prs_scores CASCADE")
         await conn.execute("DROP TABLE IF EXISTS prs_weights CASCADE")
         await conn.execute("DROP TABLE IF EXISTS pgs_scores CASCADE")
 
@@ -0,0 +1,298 @@
+"""In-database polygenic risk scoring over stored genotype dosages.
+
+Scores are computed as a partition-parallel aggregation: the weights for a
+PGS are harmonized to each variant's REF/ALT once, then every
+``genotypes_pN`` hash partition is aggregated concurrently on its own pool
+connection. Each weight is expressed as ``beta * alt_dosage + offset`` so
+that effect-REF weights (``weight * (2 - alt_dosage)``) and effect-ALT
+weights share one SQL expression.
+
+A genotype's ALT dosage is its stored dosage or, when that is NULL, the ALT
+allele count of its GT hardcall, as in :mod:`.matrix_scoring`. Genotypes
+with neither are mean-imputed with the variant's cohort mean ALT dosage,
+falling back to ``2 * allele_frequency`` from the scoring file when no
+sample has a dosage. Imputation is folded into a per-sample correction so
+only observed genotypes are read:
+
+    score = sum(offset + beta * mean) + sum_observed(beta * (dosage - mean))
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import asyncpg
+
+from ..genotypes.packed import GT_HARDCALLS, detect_genotype_storage
+from ..genotypes.schema import GenotypesSchemaManager
+from .models import PRSWeight
+from .pgs_catalog import harmonize_weight_allele
+
+logger = logging.getLogger(__name__)
+
+ALT_DOSAGE_SQL = "COALESCE(g.dosage, CASE g.gt {} END)".format(
+    " ".join(f"WHEN '{gt}' THEN {count}" for gt, count in GT_HARDCALLS.items())
+)
+
+
+@dataclass
+class OrientedWeight:
+    """A PRS weight expressed on the ALT-allele dosage scale."""
+
+    variant_id: int
+    beta: float
+    offset: float
+    fallback_mean: float | None = None
+
+
+@dataclass
+class PRSScoringResult:
+    """Summary of a PRS scoring run."""
+
+    pgs_id: str
+    samples_scored: int
+    variants_used: int
+    variants_skipped: int
+
+
+def orient_weight(
+    effect_allele: str,
+    effect_weight: float,
+    other_allele: str | None,
+    ref: str,
+    alt: str,
+    allele_frequency: float | None = None,
+) -> tuple[float, float, float | None] | None:
+    """Orient a weight to the variant's ALT dosage.
+
+    Args:
+        effect_allele: Effect allele from the scoring file
+        effect_weight: Per-allele effect weight
+        other_allele: Other allele from the scoring file, if any
+        ref: Variant REF allele
+        alt: Variant ALT allele
+        allele_frequency: Effect allele frequency from the scoring file
+
+    Returns:
+        Tuple of (beta, offset, fallback_mean) such that the variant
+        contributes ``beta * alt_dosage + offset``, or None if the alleles
+        cannot be harmonized
+    """
+    harmonized = harmonize_weight_allele(
+        PRSWeight(
+            effect_allele=effect_allele,
+            effect_weight=effect_weight,
+            other_allele=other_allele,
+        ),
+        ref,
+        alt,
+    )
+    if not harmonized.is_match or harmonized.is_effect_allele_alt is None:
+        return None
+
+    fallback_mean = None
+    if harmonized.is_effect_allele_alt:
+        if allele_frequency is not None:
+            fallback_mean = 2.0 * allele_frequency
+        return effect_weight, 0.0, fallback_mean
+
+    if allele_frequency is not None:
+        fallback_mean = 2.0 - 2.0 * allele_frequency
+    return -effect_weight, 2.0 * effect_weight, fallback_mean
+
+
+def combine_mean_dosages(
+    partials: list[list[asyncpg.Record]],
+) -> dict[int, float]:
+    """Combine per-partition dosage sums and counts into cohort means.
+
+    Args:
+        partials: Rows of (variant_id, dosage_sum, dosage_count) per partition
+
+    Returns:
+        Mapping of variant_id to mean ALT dosage over samples with a dosage
+    """
+    sums: dict[int, float] = {}
+    counts: dict[int, int] = {}
+    for rows in partials:
+        for row in rows:
+            variant_id = row["variant_id"]
+            sums[variant_id] = sums.get(variant_id, 0.0) + row["dosage_sum"]
+            counts[variant_id] = counts.get(variant_id, 0) + row["dosage_count"]
+    return {v: sums[v] / counts[v] for v in sums if counts[v] > 0}
+
+
+async def _fetch_oriented_weights(
+    conn: asyncpg.Connection, pgs_id: str
+) -> tuple[list[OrientedWeight], int]:
+    rows = await conn.fetch(
+        """
+        SELECT w.variant_id, w.effect_allele, w.other_allele, w.effect_weight,
+               w.allele_frequency, v.ref, v.alt
+        FROM prs_weights w
+        JOIN variants v ON v.variant_id = w.variant_id
+        WHERE w.pgs_id = $1
+        ORDER BY w.variant_id
+        """,
+        pgs_id,
+    )
+    weights = []
+    skipped = 0
+    for row in rows:
+        oriented = orient_weight(
+            row["effect_allele"],
+            row["effect_weight"],
+            row["other_allele"],
+            row["ref"],
+            row["alt"],
+            row["allele_frequency"],
+        )
+        if oriented is None:
+            skipped += 1
+            continue
+        beta, offset, fallback_mean = oriented
+        weights.append(OrientedWeight(row["variant_id"], beta, offset, fallback_mean))
+    return weights, skipped
+
+
+async def _partition_dosage_sums(
+    pool: asyncpg.Pool, partition: str, variant_ids: list[int]
+) -> list[asyncpg.Record]:
+    async with pool.acquire() as conn:
+        return await conn.fetch(
+            f"""
+            SELECT g.variant_id,
+                   SUM({ALT_DOSAGE_SQL}) AS dosage_sum,
+                   COUNT({ALT_DOSAGE_SQL}) AS dosage_count
+            FROM {partition} g
+            WHERE g.variant_id = ANY($1::bigint[])
+            GROUP BY g.variant_id
+            """,
+            variant_ids,
+        )
+
+
+async def _partition_scores(
+    pool: asyncpg.Pool,
+    partition: str,
+    variant_ids: list[int],
+    betas: list[float],
+    means: list[float],
+) -> list[asyncpg.Record]:
+    async with pool.acquire() as conn:
+        return await conn.fetch(
+            f"""
+            SELECT s.sample_id,
+                   COALESCE(o.delta, 0) AS delta,
+                   COALESCE(o.n_observed, 0) AS n_observed
+            FROM (SELECT DISTINCT sample_id FROM {partition}) s
+            LEFT JOIN (
+                SELECT g.sample_id,
+                       SUM(w.beta * ({ALT_DOSAGE_SQL} - w.mean_dosage)) AS delta,
+                       COUNT(*) AS n_observed
+                FROM {partition} g
+                JOIN unnest($1::bigint[], $2::float8[], $3::float8[])
+                    AS w(variant_id, beta, mean_dosage)
+                    ON w.variant_id = g.variant_id
+                WHERE {ALT_DOSAGE_SQL} IS NOT NULL
+                GROUP BY g.sample_id
+            ) o ON o.sample_id = s.sample_id
+            """,
+            variant_ids,
+            betas,
+            means,
+        )
+
+
+async def compute_prs(pool: asyncpg.Pool, pgs_id: str) -> PRSScoringResult:
+    """Compute per-sample PRS for a PGS and store it in prs_scores.
+
+    Every sample with stored genotypes is scored. Weights not matched to a
+    stored variant are ignored; weights whose alleles cannot be harmonized
+    or that have neither an observed dosage nor an allele frequency are
+    counted as skipped.
+
+    Args:
+        pool: Connection pool; partitions are aggregated concurrently, one
+            connection each
+        pgs_id: PGS score ID with imported weights
+
+    Returns:
+        PRSScoringResult with scoring statistics
+
+    Raises:
+        ValueError: If the PGS has no weights matched to stored variants, or
+            genotypes were loaded with packed storage
+    """
+    async with pool.acquire() as conn:
+        if await detect_genotype_storage(conn) == "packed":
+            raise ValueError(
+                "Genotypes are stored packed (genotypes_packed), which the sql engine "
+                "cannot read; score them with the numpy engine (--engine numpy)"
+            )
+        oriented, skipped = await _fetch_oriented_weights(conn, pgs_id)
+    if not oriented:
+        raise ValueError(f"No weights matched to stored variants for PGS {pgs_id}")
+
+    partitions = [f"genotypes_p{i}" for i in range(GenotypesSchemaManager.NUM_PARTITIONS)]
+    variant_ids = [w.variant_id for w in oriented]
+
+    partials = await asyncio.gather(
+        *(_partition_dosage_sums(pool, p, variant_ids) for p in partitions)
+    )
+    cohort_means = combine_mean_dosages(partials)
+
+    used: list[OrientedWeight] = []
+    means: list[float] = []
+    for w in oriented:
+        mean = cohort_means.get(w.variant_id, w.fallback_mean)
+        if mean is None:
+            skipped += 1
+            continue
+        used.append(w)
+        means.append(mean)
+    if not used:
+        raise ValueError(f"No dosages or allele frequencies available for PGS {pgs_id}")
+
+    baseline = sum(w.offset + w.beta * mean for w, mean in zip(used, means, strict=True))
+    per_partition = await asyncio.gather(
+        *(
+            _partition_scores(pool, p, [w.variant_id for w in used], [w.beta for w in used], means)
+            for p in partitions
+        )
+    )
+
+    records = [
+        (
+            pgs_id,
+            row["sample_id"],
+            baseline + row["delta"],
+            len(used),
+            len(used) - row["n_observed"],
+        )
+        for rows in per_partition
+        for row in rows
+    ]
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("DELETE FROM prs_scores WHERE pgs_id = $1", pgs_id)
+            await conn.copy_records_to_table(
+                "prs_scores",
+                records=records,
+                columns=["pgs_id", "sample_id", "score", "n_variants", "n_imputed"],
+            )
+
+    logger.info(
+        "Scored %d samples for PGS %s using %d variants (%d skipped)",
+        len(records),
+        pgs_id,
+        len(used),
+        skipped,
+    )
+    return PRSScoringResult(
+        pgs_id=pgs_id,
+        samples_scored=len(records),
+        variants_used=len(used),
+        variants_skipped=skipped,
+    )
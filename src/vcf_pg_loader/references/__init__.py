@@ -1,13 +1,29 @@
 """Reference panel support for PRS analysis."""
 
 from .hapmap3 import HapMap3Loader, match_hapmap3_variant
-from .ld_blocks import LDBlockLoader, normalize_chrom_for_ld
+from .intervals import IntervalIndex, IntervalTrackLoader, read_bed
+from .ld_blocks import LDBlockIndex, LDBlockLoader, normalize_chrom_for_ld
+from .panel_mask import PanelMaskIndex, assign_panel_bits, panel_filter_sql
+from .panels import ReferencePanelLoader, resolve_panel_columns
+from .rsid_index import RsidIndex, RsidTableLoader, build_rsid_index
 from .schema import ReferenceSchemaManager
 
 __all__ = [
     "HapMap3Loader",
+    "IntervalIndex",
+    "IntervalTrackLoader",
+    "LDBlockIndex",
     "LDBlockLoader",
+    "PanelMaskIndex",
+    "ReferencePanelLoader",
     "ReferenceSchemaManager",
+    "RsidIndex",
+    "RsidTableLoader",
+    "assign_panel_bits",
+    "build_rsid_index",
     "match_hapmap3_variant",
     "normalize_chrom_for_ld",
+    "panel_filter_sql",
+    "read_bed",
+    "resolve_panel_columns",
 ]
@@ -4,16 +4,19 @@ HapMap3 SNPs (~1.1-1.3 million) are used by PRS-CS, LDpred2, and most
 Bayesian PRS methods because they have reliable LD estimates across populations.
 """
 
-import csv
-import gzip
 import logging
 from pathlib import Path
 from typing import TypedDict
 
 import asyncpg
 
+from .panels import ReferencePanelLoader
+
 logger = logging.getLogger(__name__)
 
+# Panels named hapmap3_<build> are HapMap3 panels (in_hapmap3/hapmap3_rsid)
+HAPMAP3_PANEL_PREFIX = "hapmap3_"
+
 
 class HapMap3LoadResult(TypedDict):
     """Result of HapMap3 reference panel loading."""
@@ -107,11 +110,11 @@ def match_hapmap3_variant(
     return None
 
 
-class HapMap3Loader:
+class HapMap3Loader(ReferencePanelLoader):
     """Load HapMap3 reference panel data into PostgreSQL."""
 
     def __init__(self, batch_size: int = 10000):
-        self.batch_size = batch_size
+        super().__init__(batch_size=batch_size)
 
     async def load_reference_panel(
         self,
@@ -132,71 +135,14 @@ class HapMap3Loader:
         Returns:
             HapMap3LoadResult with loading statistics
         """
-        panel_name = f"hapmap3_{build.lower()}"
-
-        await conn.execute(
-            "DELETE FROM reference_panels WHERE panel_name = $1",
-            panel_name,
-        )
-
-        variants_loaded = 0
-        batch = []
-
-        open_func = gzip.open if str(tsv_path).endswith(".gz") else open
-        mode = "rt" if str(tsv_path).endswith(".gz") else "r"
-
-        with open_func(tsv_path, mode) as f:
-            reader = csv.DictReader(f, delimiter="\t")
-
-            for row in reader:
-                batch.append(
-                    (
-                        panel_name,
-                        row.get("rsid"),
-                        normalize_chrom(row["chrom"]),
-                        int(row["position"]),
-                        row["a1"],
-                        row["a2"],
-                    )
-                )
-
-                if len(batch) >= self.batch_size:
-                    await self._insert_batch(conn, batch)
-                    variants_loaded += len(batch)
-                    batch = []
-
-            if batch:
-                await self._insert_batch(conn, batch)
-                variants_loaded += len(batch)
-
-        logger.info(
-            "Loaded %d HapMap3 variants for %s from %s",
-            variants_loaded,
-            panel_name,
-            tsv_path.name,
-        )
+        result = await self.load_panel(conn, tsv_path, f"{HAPMAP3_PANEL_PREFIX}{build.lower()}")
 
         return HapMap3LoadResult(
-            panel_name=panel_name,
-            variants_loaded=variants_loaded,
+            panel_name=result["panel_name"],
+            variants_loaded=result["variants_loaded"],
             build=build,
         )
 
-    async def _insert_batch(
-        self,
-        conn: asyncpg.Connection,
-        batch: list[tuple],
-    ) -> None:
-        """Insert a batch of reference panel entries."""
-        await conn.executemany(
-            """
-            INSERT INTO reference_panels (panel_name, rsid, chrom, position, a1, a2)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            ON CONFLICT (panel_name, chrom, position, a1, a2) DO NOTHING
-            """,
-            batch,
-        )
-
     async def build_lookup(
         self,
         conn: asyncpg.Connection,
@@ -211,31 +157,4 @@ class HapMap3Loader:
         Returns:
             Dict mapping (chrom, position) to list of reference entries
         """
-        rows = await conn.fetch(
-            """
-            SELECT rsid, chrom, position, a1, a2
-            FROM reference_panels
-            WHERE panel_name = $1
-            """,
-            panel_name,
-        )
-
-        lookup: dict[tuple[str, int], list[dict]] = {}
-        for row in rows:
-            key = (row["chrom"], row["position"])
-            entry = {
-                "rsid": row["rsid"],
-                "a1": row["a1"],
-                "a2": row["a2"],
-            }
-            if key not in lookup:
-                lookup[key] = []
-            lookup[key].append(entry)
-
-        logger.debug(
-            "Built HapMap3 lookup with %d positions from %s",
-            len(lookup),
-            panel_name,
-        )
-
-        return lookup
+        return await super().build_lookup(conn, panel_name)
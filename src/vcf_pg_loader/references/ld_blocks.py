@@ -10,13 +10,19 @@ Block definitions are population-specific (EUR, AFR, EAS, SAS) due to
 different LD patterns across ancestries.
 """
 
+import asyncio
 import csv
 import gzip
 import logging
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TypedDict
 
 import asyncpg
+import numpy as np
+
+from ..models import VariantRecord
+from ..schema import variant_chrom_labels
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,111 @@ def normalize_chrom_for_ld(chrom: str) -> str:
     return chrom
 
 
+def _normalize_build(build: str) -> str:
+    build_normalized = build.upper()
+    if build_normalized.startswith("GRCH"):
+        build_normalized = f"GRCh{build_normalized[4:]}"
+    return build_normalized
+
+
+@dataclass
+class LDBlockIndex:
+    """Sorted in-memory interval index of LD blocks, per chromosome.
+
+    Blocks are closed intervals ``[start, end]``. Where adjacent blocks share
+    a boundary position, the block starting there is assigned.
+
+    Attributes:
+        starts: Bare chromosome -> block start positions, ascending
+        ends: Bare chromosome -> block end positions, aligned with starts
+        block_ids: Bare chromosome -> block IDs, aligned with starts
+    """
+
+    starts: dict[str, np.ndarray] = field(default_factory=dict)
+    ends: dict[str, np.ndarray] = field(default_factory=dict)
+    block_ids: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    async def from_db(
+        cls,
+        conn: asyncpg.Connection,
+        population: str,
+        build: str | None = None,
+    ) -> "LDBlockIndex":
+        """Load the blocks of a population (and optionally a build) from ld_blocks.
+
+        Raises:
+            ValueError: If no build is given and blocks of several builds are
+                loaded for the population
+        """
+        population = population.upper()
+        if not build:
+            await _check_single_build(conn, population)
+
+        query = """
+            SELECT block_id, chrom, start_pos, end_pos FROM ld_blocks
+            WHERE population = $1
+        """
+        params: list = [population]
+        if build:
+            query += " AND genome_build = $2"
+            params.append(_normalize_build(build))
+        rows = await conn.fetch(query + " ORDER BY chrom, start_pos, block_id", *params)
+
+        index = cls()
+        by_chrom: dict[str, list] = {}
+        for row in rows:
+            by_chrom.setdefault(row["chrom"], []).append(row)
+        for chrom, chrom_rows in by_chrom.items():
+            index.starts[chrom] = np.array([r["start_pos"] for r in chrom_rows], dtype=np.int64)
+            index.ends[chrom] = np.array([r["end_pos"] for r in chrom_rows], dtype=np.int64)
+            index.block_ids[chrom] = np.array([r["block_id"] for r in chrom_rows], dtype=np.int64)
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(starts) for starts in self.starts.values())
+
+    def lookup(self, chrom: str, positions: np.ndarray) -> np.ndarray:
+        """Block ID containing each position, or -1.
+
+        Args:
+            chrom: Chromosome, with or without 'chr' prefix
+            positions: Variant positions
+
+        Returns:
+            Array of block IDs aligned with positions
+        """
+        chrom = normalize_chrom_for_ld(chrom)
+        result = np.full(len(positions), -1, dtype=np.int64)
+        if chrom not in self.starts:
+            return result
+
+        candidate = np.searchsorted(self.starts[chrom], positions, side="right") - 1
+        valid = candidate >= 0
+        valid[valid] = positions[valid] <= self.ends[chrom][candidate[valid]]
+        result[valid] = self.block_ids[chrom][candidate[valid]]
+        return result
+
+    def assign(self, batch: list[VariantRecord]) -> int:
+        """Set ld_block_id on each record of a batch that falls inside a block.
+
+        Returns:
+            Number of records assigned
+        """
+        by_chrom: dict[str, list[VariantRecord]] = {}
+        for record in batch:
+            by_chrom.setdefault(record.chrom, []).append(record)
+
+        assigned = 0
+        for chrom, records in by_chrom.items():
+            positions = np.fromiter((r.pos for r in records), np.int64, len(records))
+            for record, block_id in zip(records, self.lookup(chrom, positions), strict=True):
+                if block_id >= 0:
+                    record.ld_block_id = int(block_id)
+                    assigned += 1
+        return assigned
+
+
 class LDBlockLoader:
     """Load LD block definitions into PostgreSQL."""
 
@@ -67,9 +178,7 @@ class LDBlockLoader:
             LDBlockLoadResult with loading statistics
         """
         population = population.upper()
-        build_normalized = build.upper()
-        if build_normalized.startswith("GRCH"):
-            build_normalized = f"GRCh{build_normalized[4:]}"
+        build_normalized = _normalize_build(build)
 
         await conn.execute(
             """
@@ -150,70 +259,80 @@ class LDBlockLoader:
 
     async def assign_variants_to_blocks(
         self,
-        conn: asyncpg.Connection,
+        conn: asyncpg.Connection | asyncpg.Pool,
         population: str,
         build: str | None = None,
+        workers: int = 4,
     ) -> int:
-        """Assign variants to LD blocks using range queries.
+        """Backfill ld_block_id for stored variants, one chromosome at a time.
 
-        Uses efficient range query with GIST index to find blocks containing
-        each variant's position.
+        Each UPDATE names the chromosome's variants partition in its
+        predicate, so it scans one partition and touches only unassigned
+        variants inside a block. Given a pool, up to ``workers`` chromosomes
+        are updated concurrently. New loads can assign blocks before COPY
+        instead (``LoadConfig.ld_block_population``).
 
         Args:
-            conn: Database connection
+            conn: Database connection, or a pool to update chromosomes in parallel
             population: Population code (EUR, AFR, EAS, SAS)
-            build: Optional genome build filter
+            build: Genome build; optional when one build is loaded for population
+            workers: Concurrent chromosome updates when given a pool
 
         Returns:
             Number of variants updated
+
+        Raises:
+            ValueError: If no build is given and blocks of several builds are
+                loaded for the population
         """
         population = population.upper()
-
+        params: list = [population]
+        build_filter = ""
         if build:
-            build_normalized = build.upper()
-            if build_normalized.startswith("GRCH"):
-                build_normalized = f"GRCh{build_normalized[4:]}"
+            params.append(_normalize_build(build))
+            build_filter = "AND lb.genome_build = $4"
+
+        query = f"""
+            UPDATE variants v
+            SET ld_block_id = lb.block_id
+            FROM ld_blocks lb
+            WHERE v.chrom = ANY($1)
+              AND lb.chrom = $2
+              AND lb.population = $3
+              {build_filter}
+              AND int8range(lb.start_pos, lb.end_pos, '[]') @> v.pos
+              AND v.ld_block_id IS NULL
+        """
 
-            result = await conn.execute(
-                """
-                UPDATE variants v
-                SET ld_block_id = lb.block_id
-                FROM ld_blocks lb
-                WHERE lb.population = $1
-                  AND lb.genome_build = $2
-                  AND lb.chrom = CASE
-                      WHEN v.chrom::text LIKE 'chr%' THEN SUBSTRING(v.chrom::text FROM 4)
-                      ELSE v.chrom::text
-                  END
-                  AND int8range(lb.start_pos, lb.end_pos, '[]') @> v.pos
-                  AND v.ld_block_id IS NULL
-                """,
-                population,
-                build_normalized,
+        async def update_chrom(conn: asyncpg.Connection, chrom: str, labels: list[str]) -> int:
+            result = await conn.execute(query, labels, chrom, *params)
+            return int(result.split()[-1])
+
+        if isinstance(conn, asyncpg.Pool):
+            async with conn.acquire() as c:
+                chrom_labels = await _block_chrom_labels(c, population, build)
+            semaphore = asyncio.Semaphore(max(1, workers))
+
+            async def update_with_pool(chrom: str, labels: list[str]) -> int:
+                async with semaphore, conn.acquire() as c:
+                    return await update_chrom(c, chrom, labels)
+
+            counts = await asyncio.gather(
+                *(update_with_pool(chrom, labels) for chrom, labels in chrom_labels.items())
             )
         else:
-            result = await conn.execute(
-                """
-                UPDATE variants v
-                SET ld_block_id = lb.block_id
-                FROM ld_blocks lb
-                WHERE lb.population = $1
-                  AND lb.chrom = CASE
-                      WHEN v.chrom::text LIKE 'chr%' THEN SUBSTRING(v.chrom::text FROM 4)
-                      ELSE v.chrom::text
-                  END
-                  AND int8range(lb.start_pos, lb.end_pos, '[]') @> v.pos
-                  AND v.ld_block_id IS NULL
-                """,
-                population,
-            )
+            chrom_labels = await _block_chrom_labels(conn, population, build)
+            counts = [
+                await update_chrom(conn, chrom, labels) for chrom, labels in chrom_labels.items()
+            ]
 
-        updated = int(result.split()[-1])
+        updated = sum(counts)
 
         logger.info(
-            "Assigned %d variants to %s LD blocks",
+            "Assigned %d variants to %s LD blocks across %d chromosomes",
             updated,
             population,
+            len(chrom_labels),
         )
 
         return updated
@@ -266,3 +385,53 @@ class LDBlockLoader:
             """)
 
         return [dict(row) for row in rows]
+
+
+async def _check_single_build(conn: asyncpg.Connection, population: str) -> None:
+    """Raise ValueError if blocks of several genome builds are loaded for population."""
+    builds = [
+        row["genome_build"]
+        for row in await conn.fetch(
+            "SELECT DISTINCT genome_build FROM ld_blocks WHERE population = $1 ORDER BY 1",
+            population,
+        )
+    ]
+    if len(builds) > 1:
+        raise ValueError(
+            f"LD blocks of several genome builds are loaded for {population} "
+            f"({', '.join(str(b) for b in builds)}); specify the build"
+        )
+
+
+async def _block_chrom_labels(
+    conn: asyncpg.Connection, population: str, build: str | None
+) -> dict[str, list[str]]:
+    """Map each block chromosome to the variants.chrom values it covers.
+
+    Block chromosomes are bare ('1'); variants may store 'chr1' or '1'. When
+    variants.chrom is an enum, only its labels are returned.
+
+    Raises:
+        ValueError: If no build is given and blocks of several builds are
+            loaded for the population
+    """
+    if not build:
+        await _check_single_build(conn, population)
+
+    query = "SELECT DISTINCT chrom FROM ld_blocks WHERE population = $1"
+    params: list = [population]
+    if build:
+        query += " AND genome_build = $2"
+        params.append(_normalize_build(build))
+    block_chroms = [row["chrom"] for row in await conn.fetch(query, *params)]
+
+    enum_labels = await variant_chrom_labels(conn)
+
+    chrom_labels = {}
+    for chrom in sorted(block_chroms):
+        labels = [f"chr{chrom}", chrom]
+        if enum_labels:
+            labels = [label for label in labels if label in enum_labels]
+        if labels:
+            chrom_labels[chrom] = labels
+    return chrom_labels
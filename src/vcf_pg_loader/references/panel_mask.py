@@ -0,0 +1,239 @@
+"""Reference panel membership bitmasks.
+
+Each panel used for masking is assigned a bit (0-62) in the ``panel_bits``
+table, and ``variants.panel_mask`` holds the OR of the bits of every panel a
+variant belongs to. Masks are filled at load time in one pass over each batch
+against a compact, position-sorted index of all configured panels, and are
+queried through the GIN index on ``panel_mask_bits(panel_mask)``.
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+import asyncpg
+import numpy as np
+
+from ..models import VariantRecord
+from .hapmap3 import complement_allele, is_strand_ambiguous
+from .ld_blocks import normalize_chrom_for_ld
+
+logger = logging.getLogger(__name__)
+
+MAX_PANEL_BITS = 63
+
+
+def _allele_pair(a1: str, a2: str) -> str:
+    return "/".join(sorted((a1.upper(), a2.upper())))
+
+
+async def assign_panel_bits(conn: asyncpg.Connection, panel_names: list[str]) -> dict[str, int]:
+    """Bit number of each panel, allocating the lowest free bit to new panels.
+
+    Args:
+        conn: Database connection
+        panel_names: Panel names (as in reference_panels)
+
+    Returns:
+        Dict of panel name to bit number
+
+    Raises:
+        ValueError: If all 63 bits are already allocated
+    """
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE panel_bits IN SHARE ROW EXCLUSIVE MODE")
+        rows = await conn.fetch("SELECT panel_name, bit FROM panel_bits")
+        bits = {row["panel_name"]: row["bit"] for row in rows}
+        free = sorted(set(range(MAX_PANEL_BITS)) - set(bits.values()))
+
+        for name in panel_names:
+            if name in bits:
+                continue
+            if not free:
+                raise ValueError(
+                    f"Cannot assign a bit to panel '{name}': "
+                    f"all {MAX_PANEL_BITS} panel bits are in use"
+                )
+            bits[name] = free.pop(0)
+            await conn.execute(
+                "INSERT INTO panel_bits (panel_name, bit) VALUES ($1, $2)", name, bits[name]
+            )
+
+    return {name: bits[name] for name in panel_names}
+
+
+async def panel_filter_sql(
+    conn: asyncpg.Connection,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    column: str = "panel_mask",
+    first_param: int = 1,
+) -> tuple[str, list]:
+    """SQL predicate selecting variants in all ``include`` and no ``exclude`` panels.
+
+    The include test is a containment on ``panel_mask_bits(column)``, which
+    the GIN index answers; the exclude test is a bitwise recheck on the rows
+    it returns.
+
+    Example:
+        sql, params = await panel_filter_sql(conn, ["hapmap3_grch38"], ["array_v2"], "v.panel_mask")
+        await conn.fetch(f"SELECT v.* FROM variants v WHERE {sql}", *params)
+
+    Args:
+        conn: Database connection
+        include: Panels a variant must belong to
+        exclude: Panels a variant must not belong to
+        column: panel_mask column expression (e.g. ``v.panel_mask``)
+        first_param: Number of the first query parameter placeholder
+
+    Returns:
+        (predicate SQL, parameters)
+
+    Raises:
+        ValueError: If a panel has no assigned bit
+    """
+    include = include or []
+    exclude = exclude or []
+    rows = await conn.fetch(
+        "SELECT panel_name, bit FROM panel_bits WHERE panel_name = ANY($1)", include + exclude
+    )
+    bits = {row["panel_name"]: row["bit"] for row in rows}
+    unknown = [name for name in include + exclude if name not in bits]
+    if unknown:
+        raise ValueError(f"Panels without an assigned bit: {', '.join(unknown)}")
+
+    clauses = []
+    params: list = []
+    if include:
+        clauses.append(f"panel_mask_bits({column}) @> ${first_param + len(params)}::int[]")
+        params.append(sorted(bits[name] for name in include))
+    if exclude:
+        clauses.append(f"({column} & ${first_param + len(params)}::bigint) = 0")
+        params.append(sum(1 << bits[name] for name in set(exclude)))
+
+    return (" AND ".join(clauses) or "TRUE"), params
+
+
+@dataclass
+class _ChromPanelEntries:
+    """Panel variants of one chromosome, sorted by position.
+
+    Entries with the same position and allele pair are merged, their masks
+    OR-ed together. Allele pairs are stored as codes into
+    ``PanelMaskIndex.pair_codes``.
+    """
+
+    positions: np.ndarray
+    pairs: np.ndarray
+    masks: np.ndarray
+
+
+@dataclass
+class PanelMaskIndex:
+    """Compact index of several reference panels for one-pass mask assignment.
+
+    Alleles match in either order, and on the opposite strand for
+    non-ambiguous SNPs, as in ``match_hapmap3_variant``.
+    """
+
+    bits: dict[str, int] = field(default_factory=dict)
+    chromosomes: dict[str, _ChromPanelEntries] = field(default_factory=dict)
+    pair_codes: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    async def from_db(cls, conn: asyncpg.Connection, bits: dict[str, int]) -> "PanelMaskIndex":
+        """Build the index from reference_panels.
+
+        Entries are merged and sorted in the database and fetched as one set
+        of arrays per chromosome.
+
+        Args:
+            conn: Database connection
+            bits: Panel name to bit number (from assign_panel_bits)
+        """
+        rows = await conn.fetch(
+            """
+            WITH merged AS (
+                SELECT r.chrom, r.position,
+                       LEAST(upper(r.a1) COLLATE "C", upper(r.a2) COLLATE "C") || '/' ||
+                       GREATEST(upper(r.a1) COLLATE "C", upper(r.a2) COLLATE "C") AS pair,
+                       bit_or(1::bigint << b.bit) AS mask
+                FROM reference_panels r
+                JOIN unnest($1::text[], $2::int[]) AS b(panel_name, bit)
+                  ON b.panel_name = r.panel_name
+                GROUP BY 1, 2, 3
+            )
+            SELECT chrom,
+                   array_agg(position ORDER BY position) AS positions,
+                   array_agg(pair ORDER BY position) AS pairs,
+                   array_agg(mask ORDER BY position) AS masks
+            FROM merged
+            GROUP BY chrom
+            """,
+            list(bits),
+            list(bits.values()),
+        )
+
+        index = cls(bits=dict(bits))
+        for row in rows:
+            pairs = row["pairs"]
+            index.chromosomes[row["chrom"]] = _ChromPanelEntries(
+                positions=np.array(row["positions"], dtype=np.int64),
+                pairs=np.fromiter(
+                    (index.pair_codes.setdefault(p, len(index.pair_codes)) for p in pairs),
+                    np.int32,
+                    len(pairs),
+                ),
+                masks=np.array(row["masks"], dtype=np.int64),
+            )
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(entries.positions) for entries in self.chromosomes.values())
+
+    def _pair_code(self, a1: str, a2: str) -> int:
+        return self.pair_codes.get(_allele_pair(a1, a2), -1)
+
+    def assign(self, batch: list[VariantRecord]) -> int:
+        """OR the bits of every matching panel into each record's panel_mask.
+
+        Returns:
+            Number of records in at least one panel
+        """
+        by_chrom: dict[str, list[VariantRecord]] = {}
+        for record in batch:
+            by_chrom.setdefault(normalize_chrom_for_ld(record.chrom), []).append(record)
+
+        flagged = 0
+        for chrom, records in by_chrom.items():
+            entries = self.chromosomes.get(chrom)
+            if entries is None:
+                continue
+
+            positions = np.fromiter((r.pos for r in records), np.int64, len(records))
+            lo = np.searchsorted(entries.positions, positions, side="left")
+            hi = np.searchsorted(entries.positions, positions, side="right")
+            hits = np.flatnonzero(hi > lo)
+            if not len(hits):
+                continue
+
+            # Allele pair codes of each hit, as given and strand-flipped (-1: no match)
+            codes = np.empty(len(hits), dtype=np.int32)
+            flipped = np.full(len(hits), -1, dtype=np.int32)
+            for j, i in enumerate(hits):
+                ref, alt = records[i].ref.upper(), records[i].alt.upper()
+                codes[j] = self._pair_code(ref, alt)
+                if not is_strand_ambiguous(ref, alt):
+                    flipped[j] = self._pair_code(complement_allele(ref), complement_allele(alt))
+
+            lo, hi = lo[hits], hi[hits]
+            masks = np.zeros(len(hits), dtype=np.int64)
+            for offset in range(int((hi - lo).max())):
+                k = np.minimum(lo + offset, len(entries.positions) - 1)
+                pairs = entries.pairs[k]
+                match = (lo + offset < hi) & ((pairs == codes) | (pairs == flipped))
+                masks |= np.where(match, entries.masks[k], 0)
+
+            for j in np.flatnonzero(masks):
+                records[hits[j]].panel_mask |= int(masks[j])
+            flagged += int(np.count_nonzero(masks))
+        return flagged
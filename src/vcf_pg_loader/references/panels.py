@@ -0,0 +1,252 @@
+"""Generic reference panel ingestion (HapMap3, 1000G, UKB SNP lists, ...).
+
+Panel files are streamed (gzip-decompressed on the fly), split on their
+delimiter without csv.DictReader, COPYed into a staging table, and merged
+into ``reference_panels`` with one deduplicating INSERT. Any loaded panel can
+be used for load-time flagging by name (``LoadConfig.flag_panel``): HapMap3
+panels set in_hapmap3/hapmap3_rsid, other panels their panel_mask bit.
+"""
+
+import gzip
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TypedDict
+
+import asyncpg
+
+from .ld_blocks import normalize_chrom_for_ld
+
+logger = logging.getLogger(__name__)
+
+PANEL_COLUMNS = ["panel_name", "rsid", "chrom", "position", "a1", "a2"]
+
+PANEL_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "rsid": ("rsid", "rs_id", "snp", "id", "snpid", "marker", "variant_id"),
+    "chrom": ("chrom", "chr", "chromosome", "#chrom", "#chr"),
+    "position": ("position", "pos", "bp", "base_pair_location", "bp_hg19", "bp_hg38"),
+    # LDpred2 maps name their alleles a0/a1, so a0 is tried before a1
+    "a1": ("a0", "a1", "allele1", "ref"),
+    "a2": ("a2", "allele2", "alt", "a1"),
+}
+
+# PLINK .bim: chrom, rsid, centimorgans, position, a1, a2 (no header)
+_BIM_INDICES = {"chrom": 0, "rsid": 1, "position": 3, "a1": 4, "a2": 5}
+
+# reference_panels column widths
+_MAX_CHROM = 2
+_MAX_RSID = 20
+_MAX_ALLELE = 10
+
+
+class PanelLoadResult(TypedDict):
+    """Result of reference panel loading."""
+
+    panel_name: str
+    rows_read: int
+    rows_skipped: int
+    variants_loaded: int
+
+
+def resolve_panel_columns(header: list[str]) -> dict[str, int]:
+    """Map panel fields to column indices from a header row.
+
+    Args:
+        header: Header fields, matched case-insensitively against
+            PANEL_COLUMN_ALIASES
+
+    Returns:
+        Dict of field name to column index (rsid may be absent)
+
+    Raises:
+        ValueError: If chrom, position, a1 or a2 cannot be found
+    """
+    lowered = [h.strip().lower() for h in header]
+    indices = {}
+    for name, aliases in PANEL_COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                indices[name] = lowered.index(alias)
+                break
+
+    missing = [name for name in ("chrom", "position", "a1", "a2") if name not in indices]
+    if missing:
+        raise ValueError(f"Panel header is missing columns: {', '.join(missing)}")
+    return indices
+
+
+def read_panel_rows(
+    path: Path, panel_name: str, stats: dict[str, int]
+) -> Iterator[tuple[str, str | None, str, int, str, str]]:
+    """Stream reference_panels rows from a panel file.
+
+    Tab-delimited files with a header are read by column name; PLINK .bim
+    files by position; any other file is split on whitespace. Rows that are
+    missing columns, have a non-numeric position, or whose chromosome or
+    alleles do not fit reference_panels are skipped and counted in
+    ``stats["rows_skipped"]``. IDs too long for the rsid column
+    (e.g. ``chr:pos:ref:alt`` variant IDs) are stored as NULL.
+
+    Yields:
+        (panel_name, rsid, chrom, position, a1, a2)
+    """
+    is_bim = path.name.endswith((".bim", ".bim.gz"))
+    open_func = gzip.open if str(path).endswith(".gz") else open
+
+    with open_func(path, "rt") as f:
+        delimiter = None
+        if is_bim:
+            indices = _BIM_INDICES
+        else:
+            header_line = f.readline().rstrip("\n")
+            delimiter = "\t" if "\t" in header_line else None
+            indices = resolve_panel_columns(header_line.split(delimiter))
+
+        i_chrom = indices["chrom"]
+        i_pos = indices["position"]
+        i_a1 = indices["a1"]
+        i_a2 = indices["a2"]
+        i_rsid = indices.get("rsid")
+        n_fields = max(indices.values()) + 1
+
+        for line in f:
+            if not line.strip():
+                continue
+            stats["rows_read"] += 1
+            fields = line.rstrip("\n").split(delimiter)
+            if len(fields) < n_fields or not fields[i_pos].isdigit():
+                stats["rows_skipped"] += 1
+                continue
+
+            chrom = normalize_chrom_for_ld(fields[i_chrom])
+            a1 = fields[i_a1]
+            a2 = fields[i_a2]
+            rsid = fields[i_rsid] if i_rsid is not None else None
+            if rsid is not None and (rsid in ("", ".") or len(rsid) > _MAX_RSID):
+                rsid = None
+
+            if len(chrom) > _MAX_CHROM or len(a1) > _MAX_ALLELE or len(a2) > _MAX_ALLELE:
+                stats["rows_skipped"] += 1
+                continue
+
+            yield panel_name, rsid, chrom, int(fields[i_pos]), a1, a2
+
+
+class ReferencePanelLoader:
+    """Load reference SNP panels into the reference_panels table."""
+
+    def __init__(self, batch_size: int = 100000):
+        self.batch_size = batch_size
+
+    async def load_panel(
+        self,
+        conn: asyncpg.Connection,
+        path: Path,
+        panel_name: str,
+    ) -> PanelLoadResult:
+        """Replace a panel with the variants of a panel file.
+
+        Rows are COPYed into a staging table in batches of ``batch_size``,
+        then merged into reference_panels with duplicates of
+        (chrom, position, a1, a2) dropped. The load runs in one transaction,
+        so a failed load leaves the previous panel in place.
+
+        Args:
+            conn: Database connection
+            path: Panel file (TSV/whitespace with header, or PLINK .bim;
+                can be gzipped)
+            panel_name: Panel name (e.g. hapmap3_grch38, 1000g_grch38)
+
+        Returns:
+            PanelLoadResult with loading statistics
+        """
+        stats = {"rows_read": 0, "rows_skipped": 0}
+
+        async with conn.transaction():
+            await conn.execute("DROP TABLE IF EXISTS pg_temp.reference_panel_staging")
+            await conn.execute(f"""
+                CREATE TEMP TABLE reference_panel_staging ON COMMIT DROP AS
+                SELECT {", ".join(PANEL_COLUMNS)} FROM reference_panels WITH NO DATA
+            """)
+
+            batch = []
+            for row in read_panel_rows(path, panel_name, stats):
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    await self._copy_batch(conn, batch)
+                    batch = []
+            if batch:
+                await self._copy_batch(conn, batch)
+
+            await conn.execute("DELETE FROM reference_panels WHERE panel_name = $1", panel_name)
+            status = await conn.execute(f"""
+                INSERT INTO reference_panels ({", ".join(PANEL_COLUMNS)})
+                SELECT DISTINCT ON (chrom, position, a1, a2) {", ".join(PANEL_COLUMNS)}
+                FROM reference_panel_staging
+                ON CONFLICT (panel_name, chrom, position, a1, a2) DO NOTHING
+            """)
+        variants_loaded = int(status.split()[-1])
+
+        logger.info(
+            "Loaded %d variants for panel %s from %s (%d rows read, %d skipped)",
+            variants_loaded,
+            panel_name,
+            path.name,
+            stats["rows_read"],
+            stats["rows_skipped"],
+        )
+
+        return PanelLoadResult(
+            panel_name=panel_name,
+            rows_read=stats["rows_read"],
+            rows_skipped=stats["rows_skipped"],
+            variants_loaded=variants_loaded,
+        )
+
+    async def _copy_batch(self, conn: asyncpg.Connection, batch: list[tuple]) -> None:
+        await conn.copy_records_to_table(
+            "reference_panel_staging", records=batch, columns=PANEL_COLUMNS
+        )
+
+    async def build_lookup(
+        self,
+        conn: asyncpg.Connection,
+        panel_name: str,
+    ) -> dict[tuple[str, int], list[dict]]:
+        """Build in-memory lookup dictionary for fast variant matching.
+
+        Args:
+            conn: Database connection
+            panel_name: Reference panel name to load
+
+        Returns:
+            Dict mapping (chrom, position) to list of reference entries
+        """
+        rows = await conn.fetch(
+            """
+            SELECT rsid, chrom, position, a1, a2
+            FROM reference_panels
+            WHERE panel_name = $1
+            """,
+            panel_name,
+        )
+
+        lookup: dict[tuple[str, int], list[dict]] = {}
+        for row in rows:
+            key = (row["chrom"], row["position"])
+            entry = {
+                "rsid": row["rsid"],
+                "a1": row["a1"],
+                "a2": row["a2"],
+            }
+            if key not in lookup:
+                lookup[key] = []
+            lookup[key].append(entry)
+
+        logger.debug(
+            "Built reference panel lookup with %d positions from %s",
+            len(lookup),
+            panel_name,
+        )
+
+        return lookup
@@ -0,0 +1,448 @@
+"""dbSNP rsID resolution index.
+
+rsIDs from a dbSNP VCF are COPYed into ``dbsnp_rsids`` (one row per ALT),
+and merged rsIDs (old -> current, as in dbSNP's merge history) into
+``rsid_merges``. :func:`build_rsid_index` exports both as a compact on-disk
+index sorted by the rsID integer, in which merged rsIDs resolve to the
+coordinates of their current rsID. :class:`RsidIndex` memory-maps it and
+resolves batches of rsIDs with one binary search.
+"""
+
+import gzip
+import json
+import logging
+import shutil
+from collections.abc import Iterator, Sequence
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypedDict
+
+import asyncpg
+import numpy as np
+
+from .intervals import _concat_ranges
+from .ld_blocks import normalize_chrom_for_ld
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = "vcf-pg-loader-rsid-index"
+INDEX_FORMAT_VERSION = 1
+
+_RSID_COLUMNS = ["rsid", "chrom", "pos", "ref", "alt"]
+
+# Merge chains longer than this are not followed
+_MAX_MERGE_DEPTH = 32
+
+# Chromosome codes in the on-disk index are uint8
+_MAX_INDEX_CHROMS = 256
+
+# Column dtypes of the on-disk index, by .npy file name
+_INDEX_DTYPES = {
+    "rsids": np.int64,
+    "chroms": np.uint8,
+    "positions": np.int64,
+    "allele_offsets": np.int64,
+}
+
+_COPY_BUFFER_SIZE = 16 * 1024 * 1024
+
+_REFSEQ_CHROMS = {"23": "X", "24": "Y"}
+_REFSEQ_MITOCHONDRION = "NC_012920"
+
+
+class RsidLoadResult(TypedDict):
+    """Result of loading dbSNP rsIDs."""
+
+    rsids_loaded: int
+    merges_loaded: int
+
+
+class RsidIndexBuildResult(TypedDict):
+    """Result of building an on-disk rsID index."""
+
+    path: str
+    rows: int
+    chromosomes: int
+
+
+def parse_rsid(value: str | int | None) -> int | None:
+    """Integer of an rsID ('rs123', 'RS123' or '123'), or None if not an rsID."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    value = value.strip()
+    if value[:2].lower() == "rs":
+        value = value[2:]
+    return int(value) if value.isdigit() else None
+
+
+def normalize_dbsnp_chrom(contig: str) -> str | None:
+    """Bare chromosome name of a dbSNP contig, or None for non-primary contigs.
+
+    dbSNP VCFs name contigs by RefSeq accession: ``NC_000001.11`` is
+    chromosome 1, ``NC_000023`` X, ``NC_000024`` Y and ``NC_012920`` MT.
+    Unplaced and alternate contigs (``NT_``, ``NW_``) return None. Other
+    names have any 'chr' prefix removed.
+    """
+    if contig.startswith(("NT_", "NW_")):
+        return None
+    if contig.startswith("NC_"):
+        accession = contig.split(".", 1)[0]
+        if accession == _REFSEQ_MITOCHONDRION:
+            return "MT"
+        number = accession[3:].lstrip("0")
+        if not accession.startswith("NC_0000") or not number.isdigit():
+            return None
+        return _REFSEQ_CHROMS.get(number, number)
+    return normalize_chrom_for_ld(contig)
+
+
+def read_dbsnp_vcf(vcf_path: Path) -> Iterator[tuple[int, str, int, str, str]]:
+    """Stream (rsid, chrom, pos, ref, alt) rows from a dbSNP VCF.
+
+    Multi-allelic sites yield one row per ALT, and semicolon-separated IDs one
+    row per rsID. Non-rs IDs are skipped, as are records on non-primary
+    contigs (see :func:`normalize_dbsnp_chrom`).
+    """
+    open_func = gzip.open if str(vcf_path).endswith(".gz") else open
+    with open_func(vcf_path, "rt") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            fields = line.split("\t", 5)
+            if len(fields) < 5:
+                continue
+            chrom = normalize_dbsnp_chrom(fields[0])
+            if chrom is None:
+                continue
+            pos = int(fields[1])
+            for rsid in fields[2].split(";"):
+                rsid_int = parse_rsid(rsid)
+                if rsid_int is None:
+                    continue
+                for alt in fields[4].split(","):
+                    yield rsid_int, chrom, pos, fields[3], alt
+
+
+def read_rsid_merges(path: Path) -> Iterator[tuple[int, int]]:
+    """Stream (old_rsid, current_rsid) pairs from a two-column merge file.
+
+    Lines whose first two columns are not rsIDs (headers, comments) are skipped.
+    """
+    open_func = gzip.open if str(path).endswith(".gz") else open
+    with open_func(path, "rt") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 2:
+                continue
+            old, current = parse_rsid(fields[0]), parse_rsid(fields[1])
+            if old is not None and current is not None and old != current:
+                yield old, current
+
+
+class RsidTableLoader:
+    """Load dbSNP rsIDs and merge history into PostgreSQL."""
+
+    def __init__(self, batch_size: int = 100000):
+        self.batch_size = batch_size
+
+    async def load_dbsnp(
+        self,
+        conn: asyncpg.Connection,
+        vcf_path: Path,
+        merges_path: Path | None = None,
+    ) -> RsidLoadResult:
+        """Replace dbsnp_rsids (and rsid_merges, if given) from dbSNP files.
+
+        Args:
+            conn: Database connection
+            vcf_path: dbSNP VCF (can be gzipped)
+            merges_path: Optional old/current rsID merge file
+
+        Returns:
+            RsidLoadResult with loading statistics
+        """
+        async with conn.transaction():
+            await conn.execute("TRUNCATE dbsnp_rsids")
+            rsids_loaded = await self._copy_rows(
+                conn, "dbsnp_rsids", _RSID_COLUMNS, read_dbsnp_vcf(vcf_path)
+            )
+
+            merges_loaded = 0
+            if merges_path is not None:
+                await conn.execute("TRUNCATE rsid_merges")
+                merges_loaded = await self._copy_rows(
+                    conn,
+                    "rsid_merges",
+                    ["old_rsid", "current_rsid"],
+                    dict(read_rsid_merges(merges_path)).items(),
+                )
+
+        logger.info(
+            "Loaded %d dbSNP rsIDs from %s and %d merged rsIDs",
+            rsids_loaded,
+            vcf_path.name,
+            merges_loaded,
+        )
+
+        return RsidLoadResult(rsids_loaded=rsids_loaded, merges_loaded=merges_loaded)
+
+    async def _copy_rows(
+        self, conn: asyncpg.Connection, table: str, columns: list[str], rows
+    ) -> int:
+        copied = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                await conn.copy_records_to_table(table, records=batch, columns=columns)
+                copied += len(batch)
+                batch = []
+        if batch:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            copied += len(batch)
+        return copied
+
+
+async def build_rsid_index(
+    conn: asyncpg.Connection,
+    output: Path,
+    fetch_size: int = 1_000_000,
+) -> RsidIndexBuildResult:
+    """Export dbsnp_rsids and rsid_merges as an on-disk rsID index.
+
+    Merge chains are followed to the current rsID, whose rows are stored
+    again under every rsID merged into it. Chromosomes are normalized with
+    :func:`normalize_dbsnp_chrom`, and rows on non-primary contigs dropped.
+
+    Files written to ``output``:
+        manifest.json: format, rows and chromosome names
+        rsids.npy: rsID integers, ascending
+        chroms.npy: chromosome codes (uint8, indexes manifest chroms)
+        positions.npy: positions
+        allele_offsets.npy, alleles.bin: 'REF<TAB>ALT' of row i is
+            alleles[allele_offsets[i]:allele_offsets[i + 1]]
+
+    Args:
+        conn: Database connection
+        output: Output directory
+        fetch_size: Rows fetched per cursor round trip
+
+    Returns:
+        RsidIndexBuildResult with the index path and size
+
+    Raises:
+        ValueError: If there are more than 256 chromosomes
+    """
+    output.mkdir(parents=True, exist_ok=True)
+    chrom_codes: dict[str, int] = {}
+    # Stored chromosome name -> chrom_codes code, or None for skipped contigs
+    stored_codes: dict[str, int | None] = {}
+
+    def chrom_code(stored: str) -> int | None:
+        if stored not in stored_codes:
+            chrom = normalize_dbsnp_chrom(stored)
+            if chrom is not None and chrom not in chrom_codes:
+                if len(chrom_codes) >= _MAX_INDEX_CHROMS:
+                    raise ValueError(
+                        f"Too many chromosomes for the rsID index: more than {_MAX_INDEX_CHROMS}"
+                    )
+                chrom_codes[chrom] = len(chrom_codes)
+            stored_codes[stored] = None if chrom is None else chrom_codes[chrom]
+        return stored_codes[stored]
+
+    # Columns are appended to raw files chunk by chunk and wrapped as .npy at
+    # the end, so memory stays bounded by fetch_size rather than dbSNP's size
+    parts = {name: output / f"{name}.npy.part" for name in _INDEX_DTYPES}
+    n_rows = 0
+    allele_end = 0
+
+    with ExitStack() as stack:
+        files = {name: stack.enter_context(open(path, "wb")) for name, path in parts.items()}
+        alleles_file = stack.enter_context(open(output / "alleles.bin", "wb"))
+        files["allele_offsets"].write(np.zeros(1, dtype=np.int64).tobytes())
+
+        async with conn.transaction():
+            cursor = await conn.cursor(f"""
+                WITH RECURSIVE chain(old_rsid, current_rsid, depth) AS (
+                    SELECT old_rsid, current_rsid, 1 FROM rsid_merges
+                    UNION ALL
+                    SELECT c.old_rsid, m.current_rsid, c.depth + 1
+                    FROM chain c JOIN rsid_merges m ON m.old_rsid = c.current_rsid
+                    WHERE c.depth < {_MAX_MERGE_DEPTH}
+                ),
+                resolved AS (
+                    SELECT DISTINCT ON (old_rsid) old_rsid, current_rsid
+                    FROM chain ORDER BY old_rsid, depth DESC
+                )
+                SELECT rsid, chrom, pos, ref, alt FROM dbsnp_rsids
+                UNION ALL
+                SELECT r.old_rsid, d.chrom, d.pos, d.ref, d.alt
+                FROM resolved r JOIN dbsnp_rsids d ON d.rsid = r.current_rsid
+                ORDER BY 1, 2, 3, 4, 5
+            """)
+            while rows := await cursor.fetch(fetch_size):
+                codes = [chrom_code(row["chrom"]) for row in rows]
+                if None in codes:
+                    rows = [row for row, code in zip(rows, codes, strict=True) if code is not None]
+                    codes = [code for code in codes if code is not None]
+                encoded = [f"{row['ref']}\t{row['alt']}".encode() for row in rows]
+                alleles_file.write(b"".join(encoded))
+
+                lengths = np.fromiter(map(len, encoded), np.int64, len(encoded))
+                offsets = allele_end + np.cumsum(lengths)
+                if len(offsets):
+                    allele_end = int(offsets[-1])
+                n_rows += len(rows)
+
+                files["rsids"].write(
+                    np.fromiter((r["rsid"] for r in rows), np.int64, len(rows)).tobytes()
+                )
+                files["chroms"].write(np.array(codes, dtype=np.uint8).tobytes())
+                files["positions"].write(
+                    np.fromiter((r["pos"] for r in rows), np.int64, len(rows)).tobytes()
+                )
+                files["allele_offsets"].write(offsets.tobytes())
+
+    for name, path in parts.items():
+        _raw_to_npy(path, output / f"{name}.npy", _INDEX_DTYPES[name])
+
+    manifest = {
+        "format": INDEX_FORMAT,
+        "format_version": INDEX_FORMAT_VERSION,
+        "rows": n_rows,
+        "chroms": list(chrom_codes),
+    }
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    logger.info("Built rsID index with %d rows in %s", n_rows, output)
+
+    return RsidIndexBuildResult(path=str(output), rows=n_rows, chromosomes=len(chrom_codes))
+
+
+def _raw_to_npy(raw: Path, dest: Path, dtype: type) -> None:
+    """Write a raw little-endian array file as a 1-D .npy file and remove it."""
+    dtype = np.dtype(dtype)
+    header = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (raw.stat().st_size // dtype.itemsize,),
+    }
+    with open(raw, "rb") as src, open(dest, "wb") as out:
+        np.lib.format.write_array_header_1_0(out, header)
+        shutil.copyfileobj(src, out, _COPY_BUFFER_SIZE)
+    raw.unlink()
+
+
+@dataclass
+class RsidIndex:
+    """Memory-mapped rsID index written by build_rsid_index."""
+
+    path: Path
+    chroms: list[str]
+    rsids: np.ndarray
+    chrom_codes: np.ndarray
+    positions: np.ndarray
+    allele_offsets: np.ndarray
+    alleles: np.ndarray
+
+    @classmethod
+    def open(cls, path: Path) -> "RsidIndex":
+        """Open an index directory.
+
+        Raises:
+            ValueError: If the directory is not an rsID index of a known version
+        """
+        path = Path(path)
+        manifest = json.loads((path / "manifest.json").read_text())
+        if manifest.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{path} is not an rsID index")
+        if manifest.get("format_version") != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported rsID index version {manifest.get('format_version')} in {path}"
+            )
+
+        alleles_path = path / "alleles.bin"
+        alleles = (
+            np.memmap(alleles_path, dtype=np.uint8, mode="r")
+            if alleles_path.stat().st_size
+            else np.empty(0, dtype=np.uint8)
+        )
+        return cls(
+            path=path,
+            chroms=manifest["chroms"],
+            rsids=np.load(path / "rsids.npy", mmap_mode="r"),
+            chrom_codes=np.load(path / "chroms.npy", mmap_mode="r"),
+            positions=np.load(path / "positions.npy", mmap_mode="r"),
+            allele_offsets=np.load(path / "allele_offsets.npy", mmap_mode="r"),
+            alleles=alleles,
+        )
+
+    def __len__(self) -> int:
+        return len(self.rsids)
+
+    def resolve(self, rsids: Sequence[str | int | None]) -> tuple[np.ndarray, np.ndarray]:
+        """Index rows of each rsID.
+
+        Args:
+            rsids: rsIDs ('rs123' or integers); None and non-rs IDs match nothing
+
+        Returns:
+            (offsets, rows): the index rows of ``rsids[i]`` are
+            ``rows[offsets[i]:offsets[i + 1]]``, readable with :meth:`record`
+        """
+        keys = np.fromiter(
+            ((-1 if (k := parse_rsid(r)) is None else k) for r in rsids), np.int64, len(rsids)
+        )
+        lo = np.searchsorted(self.rsids, keys, side="left")
+        hi = np.searchsorted(self.rsids, keys, side="right")
+        counts = np.where(keys >= 0, hi - lo, 0)
+
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets, _concat_ranges(lo, counts)
+
+    def record(self, row: int) -> tuple[str, int, str, str]:
+        """(chrom, pos, ref, alt) of an index row; chrom has no 'chr' prefix."""
+        start, end = self.allele_offsets[row], self.allele_offsets[row + 1]
+        ref, alt = bytes(self.alleles[start:end]).decode().split("\t")
+        return self.chroms[self.chrom_codes[row]], int(self.positions[row]), ref, alt
+
+    def upper_alleles(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Uppercase REF and ALT of many index rows as bytes arrays.
+
+        Args:
+            rows: Index rows, e.g. from :meth:`resolve`
+
+        Returns:
+            (refs, alts): fixed-width ``S`` arrays aligned with ``rows``
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = np.asarray(self.allele_offsets)[rows]
+        lengths = np.asarray(self.allele_offsets)[rows + 1] - starts
+        blob = np.asarray(self.alleles)[_concat_ranges(starts, lengths)]
+        blob = np.where((blob >= ord("a")) & (blob <= ord("z")), blob - 32, blob)
+
+        # Each row is 'REF<TAB>ALT', so the tabs split the blob in row order
+        blob_starts = np.cumsum(lengths) - lengths
+        ref_lengths = np.flatnonzero(blob == ord("\t")) - blob_starts
+        refs = _fixed_width(blob, blob_starts, ref_lengths)
+        alts = _fixed_width(blob, blob_starts + ref_lengths + 1, lengths - ref_lengths - 1)
+        return refs, alts
+
+    def lookup(self, rsid: str | int) -> list[tuple[str, int, str, str]]:
+        """All (chrom, pos, ref, alt) records of one rsID."""
+        offsets, rows = self.resolve([rsid])
+        return [self.record(int(row)) for row in rows[offsets[0] : offsets[1]]]
+
+
+def _fixed_width(blob: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """``blob[starts[i]:starts[i] + lengths[i]]`` for every i, as an ``S`` array."""
+    width = max(int(lengths.max(initial=0)), 1)
+    matrix = np.zeros((len(starts), width), dtype=np.uint8)
+    owners = np.repeat(np.arange(len(starts)), lengths)
+    columns = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    matrix[owners, columns] = blob[_concat_ranges(starts, lengths)]
+    return matrix.view(f"S{width}").ravel()
@@ -2,6 +2,8 @@
 
 import asyncpg
 
+from ..schema import PANEL_MASK_BITS_FUNCTION, has_panel_mask_column
+
 
 class ReferenceSchemaManager:
     """Manages PostgreSQL schema for reference panel tables."""
@@ -80,6 +82,37 @@ class ReferenceSchemaManager:
         await conn.execute("DROP VIEW IF EXISTS variant_ld_block_summary CASCADE")
         await conn.execute("DROP TABLE IF EXISTS ld_blocks CASCADE")
 
+    async def create_interval_tracks_table(self, conn: asyncpg.Connection) -> None:
+        """Create the interval_tracks table for BED-style reference tracks.
+
+        Holds named interval sets such as exome capture targets, low-complexity
+        regions, segmental duplications and gene bodies. Coordinates are
+        1-based and closed.
+        """
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS interval_tracks (
+                interval_id BIGSERIAL PRIMARY KEY,
+                track VARCHAR(100) NOT NULL,
+                chrom VARCHAR(50) NOT NULL,
+                start_pos BIGINT NOT NULL,
+                end_pos BIGINT NOT NULL,
+                name TEXT,
+                score REAL,
+                CHECK (end_pos >= start_pos)
+            )
+        """)
+
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_interval_tracks_region
+            ON interval_tracks USING GIST (track, chrom, int8range(start_pos, end_pos, '[]'))
+        """)
+
+    async def drop_interval_tracks_table(self, conn: asyncpg.Connection) -> None:
+        """Drop interval_tracks table."""
+        await conn.execute("DROP TABLE IF EXISTS interval_tracks CASCADE")
+
     async def create_reference_panels_table(self, conn: asyncpg.Connection) -> None:
         """Create the reference_panels table for storing SNP reference sets.
 
@@ -115,6 +148,70 @@ class ReferenceSchemaManager:
         """Drop reference_panels table."""
         await conn.execute("DROP TABLE IF EXISTS reference_panels CASCADE")
 
+    async def create_panel_bits_table(self, conn: asyncpg.Connection) -> None:
+        """Create the panel_bits table mapping panels to variants.panel_mask bits."""
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS panel_bits (
+                panel_name VARCHAR(50) PRIMARY KEY,
+                bit SMALLINT NOT NULL UNIQUE CHECK (bit BETWEEN 0 AND 62),
+                assigned_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    async def has_panel_mask_column(self, conn: asyncpg.Connection) -> bool:
+        """Check whether variants has the panel_mask column."""
+        return await has_panel_mask_column(conn)
+
+    async def add_panel_mask_column(self, conn: asyncpg.Connection) -> None:
+        """Add panel_mask column and its GIN index to variants if not exists.
+
+        Databases created by SchemaManager.create_schema already have both;
+        this migrates variants tables created before panel_mask existed.
+        """
+        if not await self.has_panel_mask_column(conn):
+            await conn.execute(PANEL_MASK_BITS_FUNCTION)
+
+            await conn.execute("""
+                ALTER TABLE variants ADD COLUMN panel_mask BIGINT NOT NULL DEFAULT 0
+            """)
+
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_variants_panel_bits
+                ON variants USING GIN (panel_mask_bits(panel_mask))
+            """)
+
+    async def create_rsid_tables(self, conn: asyncpg.Connection) -> None:
+        """Create dbsnp_rsids and rsid_merges for rsID resolution.
+
+        dbsnp_rsids holds one row per rsID and ALT allele; rsid_merges maps
+        merged (retired) rsIDs to the rsID they were merged into.
+        """
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS dbsnp_rsids (
+                rsid BIGINT NOT NULL,
+                chrom VARCHAR(50) NOT NULL,
+                pos BIGINT NOT NULL,
+                ref TEXT NOT NULL,
+                alt TEXT NOT NULL
+            )
+        """)
+
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_dbsnp_rsids_rsid ON dbsnp_rsids(rsid)
+        """)
+
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS rsid_merges (
+                old_rsid BIGINT PRIMARY KEY,
+                current_rsid BIGINT NOT NULL
+            )
+        """)
+
+    async def drop_rsid_tables(self, conn: asyncpg.Connection) -> None:
+        """Drop dbsnp_rsids and rsid_merges tables."""
+        await conn.execute("DROP TABLE IF EXISTS dbsnp_rsids CASCADE")
+        await conn.execute("DROP TABLE IF EXISTS rsid_merges CASCADE")
+
     async def verify_reference_schema(self, conn: asyncpg.Connection) -> bool:
         """Verify reference_panels table exists."""
         exists = await conn.fetchval("""
@@ -5,7 +5,7 @@ import asyncpg
 from .audit.schema import AuditSchemaManager
 from .auth.schema import AuthSchemaManager
 from .data.schema import DisposalSchemaManager
-from .genotypes.schema import GenotypesSchemaManager
+from .genotypes.schema import GenotypesSchemaManager, PackedGenotypesSchemaManager
 from .partitions import enable_parallel_query, get_partition_stats, verify_partition_pruning
 from .phi.schema import PHISchemaManager
 from .security.schema import SecuritySchemaManager
@@ -40,6 +40,41 @@ HUMAN_CHROMOSOMES = [
     "chrM",
 ]
 
+PANEL_MASK_BITS_FUNCTION = """
+    CREATE OR REPLACE FUNCTION panel_mask_bits(mask BIGINT) RETURNS INTEGER[]
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+        SELECT COALESCE(array_agg(b ORDER BY b), '{}')
+        FROM generate_series(0, 62) AS b
+        WHERE (mask >> b) & 1 = 1
+    $$
+"""
+
+
+async def has_panel_mask_column(conn: asyncpg.Connection) -> bool:
+    """Check whether variants has the panel_mask column.
+
+    Tables created before panel_mask existed lack it until
+    'vcf-pg-loader load-reference' migrates them.
+    """
+    return await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT FROM information_schema.columns
+            WHERE table_schema = current_schema()
+                AND table_name = 'variants' AND column_name = 'panel_mask'
+        )
+    """)
+
+
+async def variant_chrom_labels(conn: asyncpg.Connection) -> set[str] | None:
+    """Labels of the variants.chrom enum, or None if chrom is not an enum."""
+    rows = await conn.fetch("""
+        SELECT e.enumlabel
+        FROM pg_attribute a
+        JOIN pg_enum e ON e.enumtypid = a.atttypid
+        WHERE a.attrelid = 'variants'::regclass AND a.attname = 'chrom'
+    """)
+    return {row["enumlabel"] for row in rows} or None
+
 
 class SchemaManager:
     """Manages PostgreSQL schema creation and maintenance."""
@@ -52,6 +87,7 @@ class SchemaManager:
         self._disposal_manager = DisposalSchemaManager()
         self._security_manager = SecuritySchemaManager()
         self._genotypes_manager = GenotypesSchemaManager()
+        self._packed_genotypes_manager = PackedGenotypesSchemaManager()
         self._prs_views_manager = PRSViewsManager()
 
     async def create_schema(
@@ -107,6 +143,8 @@ class SchemaManager:
         else:
             chrom_type = "TEXT"
 
+        await conn.execute(PANEL_MASK_BITS_FUNCTION)
+
         await conn.execute(f"""
             CREATE TABLE variants (
                 variant_id BIGINT GENERATED ALWAYS AS IDENTITY,
@@ -178,6 +216,9 @@ class SchemaManager:
                 -- LD block annotation (Berisa & Pickrell 2016)
                 ld_block_id INTEGER,
 
+                -- Reference panel membership, one bit per panel (see panel_bits)
+                panel_mask BIGINT NOT NULL DEFAULT 0,
+
                 -- Audit tracking
                 load_batch_id UUID NOT NULL,
                 created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
@@ -344,6 +385,12 @@ class SchemaManager:
             WHERE ld_block_id IS NOT NULL
         """)
 
+        if await has_panel_mask_column(conn):
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_variants_panel_bits
+                ON variants USING GIN (panel_mask_bits(panel_mask))
+            """)
+
     async def drop_indexes(self, conn: asyncpg.Connection) -> list[str]:
         """Drop non-primary key indexes and return their names."""
         indexes = await conn.fetch("""
@@ -480,6 +527,18 @@ class SchemaManager:
         """Get genotypes table statistics."""
         return await self._genotypes_manager.get_genotype_stats(conn)
 
+    async def create_packed_genotypes_schema(self, conn: asyncpg.Connection) -> None:
+        """Create packed genotype storage for compact sample-level genotypes.
+
+        Creates:
+        - genotypes_packed: one row per variant per sample block, with 2-bit
+          hard calls and uint8 dosages in BYTEA
+        - genotype_sample_slots: fixed (block, slot) position of each sample
+        - packed_call/packed_gt/packed_dosage accessor functions
+        - genotypes_packed_cells view of (variant, sample) rows
+        """
+        await self._packed_genotypes_manager.create_packed_genotypes_schema(conn)
+
     async def create_prs_views(self, conn: asyncpg.Connection) -> None:
         """Create PRS materialized views for optimized query patterns.
 
@@ -1,6 +1,13 @@
 """Variant matching utilities for GWAS and PRS data integration."""
 
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
 import asyncpg
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..references.rsid_index import RsidIndex
 
 
 def normalize_chromosome(chrom: str, add_chr: bool = False) -> str:
@@ -23,6 +30,46 @@ def normalize_chromosome(chrom: str, add_chr: bool = False) -> str:
         return chrom
 
 
+def match_variant_key(
+    chromosome: str,
+    position: int,
+    effect_allele: str,
+    other_allele: str | None,
+    variant_lookup: dict[tuple[str, int, str, str], int],
+) -> tuple[str, int, str, str] | None:
+    """Find the variant_lookup key of a variant by position and alleles.
+
+    Both allele orientations are tried. The returned key holds the stored
+    (bare) chromosome and the uppercase REF and ALT.
+
+    Args:
+        chromosome: Chromosome (with or without 'chr' prefix)
+        position: Genomic position
+        effect_allele: Effect allele from summary stats
+        other_allele: Other/reference allele
+        variant_lookup: Dict mapping (chrom, pos, ref, alt) to variant_id
+
+    Returns:
+        (chrom, pos, ref, alt) key if matched, None otherwise
+    """
+    if not other_allele:
+        return None
+
+    chrom_bare = normalize_chromosome(chromosome, add_chr=False)
+    ea = effect_allele.upper()
+    oa = other_allele.upper()
+
+    key = (chrom_bare, position, oa, ea)
+    if key in variant_lookup:
+        return key
+
+    key = (chrom_bare, position, ea, oa)
+    if key in variant_lookup:
+        return key
+
+    return None
+
+
 def match_variant(
     chromosome: str,
     position: int,
@@ -50,18 +97,9 @@ def match_variant(
     Returns:
         variant_id if matched, None otherwise
     """
-    chrom_bare = normalize_chromosome(chromosome, add_chr=False)
-    ea = effect_allele.upper()
-    oa = other_allele.upper() if other_allele else ""
-
-    if oa:
-        key1 = (chrom_bare, position, oa, ea)
-        if key1 in variant_lookup:
-            return variant_lookup[key1]
-
-        key2 = (chrom_bare, position, ea, oa)
-        if key2 in variant_lookup:
-            return variant_lookup[key2]
+    key = match_variant_key(chromosome, position, effect_allele, other_allele, variant_lookup)
+    if key is not None:
+        return variant_lookup[key]
 
     if rsid and rsid in rsid_lookup:
         return rsid_lookup[rsid]
@@ -69,6 +107,81 @@ def match_variant(
     return None
 
 
+def match_rsid_keys(
+    rsid_index: "RsidIndex",
+    rsids: Sequence[str | None],
+    effect_alleles: Sequence[str],
+    other_alleles: Sequence[str | None],
+    variant_lookup: dict[tuple[str, int, str, str], int],
+) -> list[tuple[str, int, str, str] | None]:
+    """Match variants by rsID through a dbSNP rsID index.
+
+    All rsIDs are resolved in one index call; each is then matched to the
+    first of its dbSNP records whose alleles agree with the given alleles
+    (in either orientation) and that exists in ``variant_lookup``. Without
+    an other allele, the effect allele only has to be REF or ALT.
+
+    Args:
+        rsid_index: Open rsID index
+        rsids: dbSNP rsIDs (None matches nothing)
+        effect_alleles: Effect allele of each rsID
+        other_alleles: Other allele of each rsID, if known
+        variant_lookup: Dict mapping (chrom, pos, ref, alt) to variant_id
+
+    Returns:
+        variant_lookup key or None for each rsID
+    """
+    matches: list[tuple[str, int, str, str] | None] = [None] * len(rsids)
+    offsets, rows = rsid_index.resolve(rsids)
+    if not len(rows):
+        return matches
+
+    # Compare every candidate's alleles at once; only allele matches reach
+    # the variant_lookup check, in index order so each rsID keeps its first
+    query = np.repeat(np.arange(len(rsids)), np.diff(offsets))
+    ea = np.array([a.upper().encode() for a in effect_alleles], dtype=bytes)[query]
+    oa = np.array([(a or "").upper().encode() for a in other_alleles], dtype=bytes)[query]
+    refs, alts = rsid_index.upper_alleles(rows)
+    allele_match = np.where(
+        oa != b"",
+        ((refs == ea) & (alts == oa)) | ((refs == oa) & (alts == ea)),
+        (refs == ea) | (alts == ea),
+    )
+
+    chroms = [normalize_chromosome(chrom) for chrom in rsid_index.chroms]
+    for i in np.flatnonzero(allele_match).tolist():
+        q = int(query[i])
+        if matches[q] is not None:
+            continue
+        row = int(rows[i])
+        key = (
+            chroms[rsid_index.chrom_codes[row]],
+            int(rsid_index.positions[row]),
+            refs[i].decode(),
+            alts[i].decode(),
+        )
+        if key in variant_lookup:
+            matches[q] = key
+
+    return matches
+
+
+def match_rsids(
+    rsid_index: "RsidIndex",
+    rsids: Sequence[str | None],
+    effect_alleles: Sequence[str],
+    other_alleles: Sequence[str | None],
+    variant_lookup: dict[tuple[str, int, str, str], int],
+) -> list[int | None]:
+    """Match variants by rsID through a dbSNP rsID index (see match_rsid_keys).
+
+    Returns:
+        variant_id or None for each rsID
+    """
+    keys = match_rsid_keys(rsid_index, rsids, effect_alleles, other_alleles, variant_lookup)
+    return [None if key is None else variant_lookup[key] for key in keys]
+
+
 async def build_variant_lookups(
     conn: asyncpg.Connection,
 ) -> tuple[dict[tuple[str, int, str, str], int], dict[str, int]]:
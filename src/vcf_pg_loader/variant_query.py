@@ -0,0 +1,244 @@
+"""Region, gene and rsID queries against the variants table.
+
+Every region query filters on ``chrom`` so PostgreSQL prunes to a single
+chromosome partition, and matches positions with ``pos_range &&`` so the
+GiST ``(chrom, pos_range)`` index is used. Statements are prepared once per
+connection and shared by every service on it, and rows are streamed through
+server-side cursors.
+"""
+
+import logging
+import weakref
+from collections.abc import AsyncIterator, Iterable
+from contextlib import aclosing
+
+import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+
+from .annotation_schema import validate_identifier
+
+logger = logging.getLogger(__name__)
+
+# Prepared statements by connection, then by SQL text
+_PREPARED: weakref.WeakKeyDictionary[asyncpg.Connection, dict[str, PreparedStatement]] = (
+    weakref.WeakKeyDictionary()
+)
+
+DEFAULT_QUERY_COLUMNS: list[str] = [
+    "variant_id",
+    "chrom",
+    "pos",
+    "end_pos",
+    "ref",
+    "alt",
+    "rs_id",
+    "gene",
+    "consequence",
+    "impact",
+    "af_gnomad",
+    "cadd_phred",
+    "clinvar_sig",
+]
+
+
+class VariantQueryService:
+    """Async query API over the variants table.
+
+    Coordinates are 1-based and closed: a region matches every variant whose
+    span overlaps ``[start, end]``. Methods are async generators that read
+    from a server-side cursor inside a transaction, so do not issue other
+    queries on the connection while iterating. The transaction ends when the
+    generator is exhausted or closed; when a caller may stop early, close it
+    with ``contextlib.aclosing`` so the connection is usable afterwards::
+
+        async with aclosing(service.region("chr17", 43044295, 43125483)) as rows:
+            async for row in rows:
+                if row["impact"] == "HIGH":
+                    break
+    """
+
+    def __init__(
+        self,
+        conn: asyncpg.Connection,
+        columns: list[str] | None = None,
+        prefetch: int = 1000,
+        normalize_chr_prefix: bool = True,
+    ):
+        """Create a query service bound to one connection.
+
+        Args:
+            conn: Database connection; prepared statements are cached per
+                connection and shared with other services on it
+            columns: variants columns to return (default DEFAULT_QUERY_COLUMNS)
+            prefetch: Rows fetched from the cursor per round trip
+            normalize_chr_prefix: Add a missing 'chr' prefix to chromosomes
+
+        Raises:
+            ValueError: If a column name is not a valid identifier
+        """
+        self.conn = conn
+        self.columns = columns or DEFAULT_QUERY_COLUMNS
+        for column in self.columns:
+            validate_identifier(column, "column name")
+        self.prefetch = prefetch
+        self.normalize_chr_prefix = normalize_chr_prefix
+
+    def _chrom(self, chrom: str) -> str:
+        if self.normalize_chr_prefix and not chrom.startswith("chr"):
+            return f"chr{chrom}"
+        return chrom
+
+    def _select(self, alias: str = "v") -> str:
+        return ", ".join(f"{alias}.{column}" for column in self.columns)
+
+    def _region_sql(self) -> str:
+        return f"""
+            SELECT {self._select()} FROM variants v
+            WHERE v.chrom = $1 AND v.pos_range && int8range($2, $3, '[]')
+            ORDER BY v.pos, v.ref, v.alt
+        """
+
+    async def _prepare(self, name: str, sql: str) -> PreparedStatement:
+        """Prepare ``sql`` once per connection and reuse it for later calls."""
+        statements = _PREPARED.setdefault(self.conn, {})
+        stmt = statements.get(sql)
+        if stmt is None:
+            stmt = await self.conn.prepare(sql)
+            statements[sql] = stmt
+            logger.debug(f"Prepared variant query '{name}'")
+        return stmt
+
+    async def _stream(self, name: str, sql: str, *args) -> AsyncIterator[asyncpg.Record]:
+        # Callers wrap this in aclosing() so closing them ends the transaction
+        # immediately rather than when the generator is garbage-collected
+        stmt = await self._prepare(name, sql)
+        async with self.conn.transaction():
+            async for row in stmt.cursor(*args, prefetch=self.prefetch):
+                yield row
+
+    async def region(self, chrom: str, start: int, end: int) -> AsyncIterator[asyncpg.Record]:
+        """Stream variants overlapping ``chrom:start-end``, ordered by position.
+
+        Args:
+            chrom: Chromosome (e.g. 'chr1', or '1' with prefix normalization)
+            start: Region start (1-based, inclusive)
+            end: Region end (inclusive)
+
+        Yields:
+            Variant records with the service's columns
+        """
+        async with aclosing(
+            self._stream("region", self._region_sql(), self._chrom(chrom), start, end)
+        ) as rows:
+            async for row in rows:
+                yield row
+
+    async def regions(
+        self, regions: Iterable[tuple[str, int, int]]
+    ) -> AsyncIterator[asyncpg.Record]:
+        """Stream variants overlapping any of several regions.
+
+        Regions are grouped by chromosome and each group runs as one query
+        that joins the region list (passed as arrays) to the variants
+        partition of that chromosome. Rows come back grouped by chromosome in
+        first-seen order, then by region and position.
+
+        Args:
+            regions: (chrom, start, end) tuples, 1-based and inclusive
+
+        Yields:
+            Variant records with a leading ``region_index`` column holding
+            the 0-based index of the matching region in ``regions``; a
+            variant overlapping several regions is returned once per region
+        """
+        by_chrom: dict[str, tuple[list[int], list[int], list[int]]] = {}
+        for i, (chrom, start, end) in enumerate(regions):
+            indices, starts, ends = by_chrom.setdefault(self._chrom(chrom), ([], [], []))
+            indices.append(i)
+            starts.append(start)
+            ends.append(end)
+
+        sql = f"""
+            SELECT r.region_index, {self._select()}
+            FROM unnest($2::int[], $3::bigint[], $4::bigint[])
+                AS r(region_index, start_pos, end_pos)
+            JOIN variants v
+              ON v.chrom = $1 AND v.pos_range && int8range(r.start_pos, r.end_pos, '[]')
+            ORDER BY r.region_index, v.pos, v.ref, v.alt
+        """
+        for chrom, (indices, starts, ends) in by_chrom.items():
+            async with aclosing(self._stream("regions", sql, chrom, indices, starts, ends)) as rows:
+                async for row in rows:
+                    yield row
+
+    async def gene(self, symbol: str, chrom: str | None = None) -> AsyncIterator[asyncpg.Record]:
+        """Stream variants annotated with a gene symbol, ordered by position.
+
+        Args:
+            symbol: Gene symbol as stored in variants.gene
+            chrom: The gene's chromosome. When given, only its partition is
+                scanned; otherwise the gene index of every partition is probed
+
+        Yields:
+            Variant records with the service's columns
+        """
+        if chrom is not None:
+            sql = f"""
+                SELECT {self._select()} FROM variants v
+                WHERE v.chrom = $1 AND v.gene = $2
+                ORDER BY v.pos, v.ref, v.alt
+            """
+            args = (self._chrom(chrom), symbol)
+            name = "gene_chrom"
+        else:
+            sql = f"""
+                SELECT {self._select()} FROM variants v
+                WHERE v.gene = $1
+                ORDER BY v.chrom, v.pos, v.ref, v.alt
+            """
+            args = (symbol,)
+            name = "gene"
+
+        async with aclosing(self._stream(name, sql, *args)) as rows:
+            async for row in rows:
+                yield row
+
+    async def rsid(
+        self, rsids: list[str], chrom: str | None = None
+    ) -> AsyncIterator[asyncpg.Record]:
+        """Stream variants with any of the given rsIDs.
+
+        Args:
+            rsids: rsIDs as stored in variants.rs_id (e.g. 'rs123')
+            chrom: Optional chromosome restricting the lookup to one partition
+
+        Yields:
+            Variant records with the service's columns
+        """
+        if chrom is not None:
+            sql = f"""
+                SELECT {self._select()} FROM variants v
+                WHERE v.chrom = $1 AND v.rs_id = ANY($2::text[])
+                ORDER BY v.pos, v.ref, v.alt
+            """
+            args = (self._chrom(chrom), rsids)
+            name = "rsid_chrom"
+        else:
+            sql = f"""
+                SELECT {self._select()} FROM variants v
+                WHERE v.rs_id = ANY($1::text[])
+                ORDER BY v.chrom, v.pos, v.ref, v.alt
+            """
+            args = (rsids,)
+            name = "rsid"
+
+        async with aclosing(self._stream(name, sql, *args)) as rows:
+            async for row in rows:
+                yield row
+
+    async def explain(self, chrom: str, start: int, end: int) -> str:
+        """Show the plan ``region`` runs for ``chrom:start-end``."""
+        rows = await self.conn.fetch(
+            f"EXPLAIN {self._region_sql()}", self._chrom(chrom), start, end
+        )
+        return "\n".join(row[0] for row in rows)
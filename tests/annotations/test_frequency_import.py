@@ -0,0 +1,148 @@
+"""Tests for streaming population frequency import."""
+
+import asyncpg
+import cyvcf2
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+from vcf_pg_loader.annotations.frequency_import import FrequencyImporter, GnomadFieldMap
+
+GNOMAD_VCF = """##fileformat=VCFv4.2
+##INFO=<ID=AC_afr,Number=A,Type=Integer,Description="Alt allele count, AFR">
+##INFO=<ID=AN_afr,Number=1,Type=Integer,Description="Total alleles, AFR">
+##INFO=<ID=AF_afr,Number=A,Type=Float,Description="Alt allele frequency, AFR">
+##INFO=<ID=AF_nfe,Number=A,Type=Float,Description="Alt allele frequency, NFE">
+##INFO=<ID=AF_fin,Number=A,Type=Float,Description="Alt allele frequency, FIN">
+##INFO=<ID=nhomalt_afr,Number=A,Type=Integer,Description="Homozygous alt count, AFR">
+##contig=<ID=chr1,length=248956422>
+##contig=<ID=chr2,length=242193529>
+##contig=<ID=chrUn_KI270742v1,length=186739>
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO
+chr1\t100\t.\tA\tG,T\t.\tPASS\tAC_afr=4,1;AN_afr=100;AF_afr=0.04,0.01;AF_nfe=0.02,0.3;nhomalt_afr=1,0
+chr1\t150\t.\tC\tG\t.\tPASS\tAF_afr=0.5
+chr1\t200\t.\tG\tC\t.\tPASS\tAF_nfe=0.001;AF_fin=0.2
+chr2\t50\t.\tT\tTA\t.\tPASS\tAC_afr=2;AN_afr=50;AF_afr=0.04
+chrUn_KI270742v1\t10\t.\tA\tC\t.\tPASS\tAF_afr=0.1
+"""
+
+
+class TestGnomadFieldMap:
+    """Test resolving frequency fields from the header."""
+
+    def test_resolves_keys_and_splits_alleles(self, tmp_path):
+        vcf_path = tmp_path / "gnomad.vcf"
+        vcf_path.write_text(GNOMAD_VCF)
+        vcf = cyvcf2.VCF(str(vcf_path))
+
+        field_map = GnomadFieldMap.from_header(vcf)
+        alleles = field_map.extract(next(iter(vcf)))
+
+        assert set(field_map.keys) == {"AFR", "NFE", "FIN"}
+        assert field_map.keys["AFR"]["hom_count"] == "nhomalt_afr"
+        assert alleles[0]["AFR"].ac == 4
+        assert alleles[1]["AFR"].ac == 1
+        assert alleles[1]["AFR"].an == 100
+        assert alleles[1]["AFR"].af == pytest.approx(0.01)
+        assert alleles[1]["NFE"].af == pytest.approx(0.3)
+        assert "FIN" not in alleles[0]
+        vcf.close()
+
+    def test_empty_without_frequency_fields(self, tmp_path):
+        vcf_path = tmp_path / "plain.vcf"
+        vcf_path.write_text(
+            "##fileformat=VCFv4.2\n##contig=<ID=chr1>\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        )
+
+        assert not GnomadFieldMap.from_header(cyvcf2.VCF(str(vcf_path)))
+
+
+@pytest.fixture
+def postgres_container():
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def freq_conn(postgres_container):
+    from vcf_pg_loader.annotations.schema import PopulationFreqSchemaManager
+    from vcf_pg_loader.schema import SchemaManager
+
+    conn = await asyncpg.connect(
+        host=postgres_container.get_container_host_ip(),
+        port=int(postgres_container.get_exposed_port(5432)),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+    )
+    await SchemaManager().create_schema(conn)
+    await PopulationFreqSchemaManager().create_population_frequencies_table(conn)
+    await conn.execute("""
+        INSERT INTO variants (chrom, pos_range, pos, ref, alt, load_batch_id)
+        VALUES ('chr1', '[100, 101)', 100, 'A', 'G', gen_random_uuid()),
+               ('chr1', '[100, 101)', 100, 'A', 'T', gen_random_uuid()),
+               ('chr1', '[200, 201)', 200, 'G', 'C', gen_random_uuid()),
+               ('chr2', '[50, 51)', 50, 'T', 'TA', gen_random_uuid())
+    """)
+    yield conn
+    await conn.close()
+
+
+@pytest.mark.integration
+class TestFrequencyImporter:
+    """Test streaming frequencies into population_frequencies."""
+
+    @pytest.mark.asyncio
+    async def test_imports_every_alt_allele(self, freq_conn, tmp_path):
+        vcf_path = tmp_path / "gnomad.vcf"
+        vcf_path.write_text(GNOMAD_VCF)
+
+        result = await FrequencyImporter("gnomAD_v4", batch_size=2).import_vcf(freq_conn, vcf_path)
+
+        assert result["total_variants"] == 5
+        assert result["total_alleles"] == 6
+        assert result["matched_variants"] == 4
+        assert result["frequencies_inserted"] == 7
+        assert result["popmax_updated"] == 4
+
+        rows = await freq_conn.fetch("""
+            SELECT v.chrom::text, v.pos, v.alt, f.population, f.af, f.hom_count
+            FROM population_frequencies f JOIN variants v USING (variant_id)
+        """)
+        freqs = {(r["chrom"], r["pos"], r["alt"], r["population"]): r for r in rows}
+        assert freqs[("chr1", 100, "T", "AFR")]["af"] == pytest.approx(0.01)
+        assert freqs[("chr1", 100, "T", "AFR")]["hom_count"] == 0
+        assert freqs[("chr1", 100, "G", "NFE")]["af"] == pytest.approx(0.02)
+
+        popmax = {
+            r["alt"]: (r["gnomad_popmax_af"], r["gnomad_popmax_pop"])
+            for r in await freq_conn.fetch(
+                "SELECT alt, gnomad_popmax_af, gnomad_popmax_pop FROM variants"
+            )
+        }
+        assert popmax["T"] == (pytest.approx(0.3), "NFE")
+        assert popmax["C"] == (pytest.approx(0.001), "NFE")
+
+    @pytest.mark.asyncio
+    async def test_reimport_updates_in_place(self, freq_conn, tmp_path):
+        vcf_path = tmp_path / "gnomad.vcf"
+        vcf_path.write_text(GNOMAD_VCF)
+        importer = FrequencyImporter("gnomAD_v4", update_popmax=False)
+
+        await importer.import_vcf(freq_conn, vcf_path)
+        result = await importer.import_vcf(freq_conn, vcf_path)
+
+        assert result["frequencies_inserted"] == 7
+        assert result["popmax_updated"] == 0
+        assert await freq_conn.fetchval("SELECT COUNT(*) FROM population_frequencies") == 7
+
+    @pytest.mark.asyncio
+    async def test_rejects_vcf_without_frequency_fields(self, freq_conn, tmp_path):
+        vcf_path = tmp_path / "plain.vcf"
+        vcf_path.write_text(
+            "##fileformat=VCFv4.2\n##contig=<ID=chr1>\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+        )
+
+        with pytest.raises(ValueError, match="No population frequency fields"):
+            await FrequencyImporter("gnomAD_v4").import_vcf(freq_conn, vcf_path)
@@ -438,6 +438,48 @@ class TestPopulationFreqLoader:
             assert row["gnomad_popmax_af"] == pytest.approx(0.04, rel=1e-6)
             assert row["gnomad_popmax_pop"] == "AFR"
 
+    @pytest.mark.asyncio
+    async def test_batch_popmax_updated_per_chromosome(self, db_pool):
+        from vcf_pg_loader.annotations.population_freq import PopulationFreqLoader
+        from vcf_pg_loader.annotations.schema import PopulationFreqSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn)
+            await PopulationFreqSchemaManager().create_population_frequencies_table(conn)
+
+            await conn.execute("""
+                INSERT INTO variants (chrom, pos_range, pos, ref, alt, load_batch_id)
+                VALUES ('chr1', '[100, 101)', 100, 'A', 'G', gen_random_uuid()),
+                       ('chr2', '[200, 201)', 200, 'C', 'T', gen_random_uuid()),
+                       ('chrX', '[300, 301)', 300, 'G', 'A', gen_random_uuid())
+            """)
+            ids = {
+                r["chrom"]: r["variant_id"]
+                for r in await conn.fetch("SELECT chrom::text, variant_id FROM variants")
+            }
+
+            result = await PopulationFreqLoader().import_batch_frequencies(
+                conn=conn,
+                batch=[
+                    (ids["chr1"], GNOMAD_INFO_COMPLETE, "chr1"),
+                    (ids["chr2"], GNOMAD_INFO_BOTTLENECKED_HIGH, "chr2"),
+                    (ids["chrX"], GNOMAD_INFO_COMPLETE),
+                ],
+                source="gnomAD_v3",
+                update_popmax=True,
+            )
+
+            rows = await conn.fetch(
+                "SELECT chrom::text, gnomad_popmax_af, gnomad_popmax_pop FROM variants"
+            )
+            popmax = {r["chrom"]: (r["gnomad_popmax_af"], r["gnomad_popmax_pop"]) for r in rows}
+
+        assert result["popmax_updated"] == 3
+        assert popmax["chr1"] == (pytest.approx(0.04, rel=1e-6), "AFR")
+        assert popmax["chr2"] == (pytest.approx(0.0005, rel=1e-6), "AFR")
+        assert popmax["chrX"] == (pytest.approx(0.04, rel=1e-6), "AFR")
+
     @pytest.mark.asyncio
     async def test_query_by_population(self, db_pool):
         from vcf_pg_loader.annotations.population_freq import PopulationFreqLoader
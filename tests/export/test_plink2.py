@@ -0,0 +1,272 @@
+"""Tests for PLINK 2 .pgen/.pvar/.psam export of stored genotypes."""
+
+import struct
+import uuid
+
+import numpy as np
+import pytest
+
+from vcf_pg_loader.export.plink2 import (
+    DOSAGE_MISSING,
+    HARDCALL_MISSING,
+    PGEN_MODE_DOSAGE,
+    PGEN_MODE_HARDCALL,
+    encode_dosages,
+    encode_pgen_records,
+    fill_missing_calls,
+    gt_to_hardcall,
+    pack_hardcalls,
+    pgen_header,
+)
+
+
+def decode_hardcalls(packed: bytes, n_samples: int) -> list[int]:
+    codes = []
+    for byte in packed:
+        for shift in (0, 2, 4, 6):
+            codes.append((byte >> shift) & 0b11)
+    return codes[:n_samples]
+
+
+class TestHardcallEncoding:
+    """Test GT string to hardcall conversion and 2-bit packing."""
+
+    @pytest.mark.parametrize(
+        "gt,expected",
+        [("0/0", 0), ("0|0", 0), ("0/1", 1), ("1|0", 1), ("1/1", 2), ("1|1", 2)],
+    )
+    def test_gt_to_hardcall(self, gt, expected):
+        assert gt_to_hardcall(gt) == expected
+
+    @pytest.mark.parametrize("gt", ["./.", ".", "1/2", None])
+    def test_unrepresentable_gt_is_missing(self, gt):
+        assert gt_to_hardcall(gt) == HARDCALL_MISSING
+
+    def test_pack_four_samples_per_byte_low_bits_first(self):
+        hardcalls = np.array([[0, 1, 2, 3]], dtype=np.uint8)
+
+        packed = pack_hardcalls(hardcalls)
+
+        assert packed.shape == (1, 1)
+        assert packed[0, 0] == 0b11_10_01_00
+
+    def test_pack_pads_partial_byte_with_zero(self):
+        hardcalls = np.array([[2, 1, 3, 0, 1]], dtype=np.uint8)
+
+        packed = pack_hardcalls(hardcalls)
+
+        assert packed.shape == (1, 2)
+        assert decode_hardcalls(packed[0].tobytes(), 5) == [2, 1, 3, 0, 1]
+        assert packed[0, 1] == 0b01
+
+
+class TestDosageEncoding:
+    """Test dosage quantization and hardcall reconciliation."""
+
+    def test_dosage_scaled_to_16384_per_allele(self):
+        dosages = np.array([[0.0, 1.0, 2.0, 0.5]], dtype=np.float32)
+
+        encoded = encode_dosages(dosages)
+
+        assert encoded.tolist() == [[0, 16384, 32768, 8192]]
+
+    def test_missing_dosage_encoded_as_65535(self):
+        encoded = encode_dosages(np.array([[np.nan]], dtype=np.float32))
+
+        assert encoded[0, 0] == DOSAGE_MISSING
+
+    def test_hardcall_derived_from_dosage_within_threshold(self):
+        hardcalls = np.full((1, 3), HARDCALL_MISSING, dtype=np.uint8)
+        dosages = np.array([[0.05, 1.5, 1.92]], dtype=np.float32)
+
+        fill_missing_calls(hardcalls, dosages, hard_call_threshold=0.1)
+
+        assert hardcalls.tolist() == [[0, HARDCALL_MISSING, 2]]
+
+    def test_dosage_derived_from_hardcall(self):
+        hardcalls = np.array([[0, 1, 2, HARDCALL_MISSING]], dtype=np.uint8)
+        dosages = np.full((1, 4), np.nan, dtype=np.float32)
+
+        fill_missing_calls(hardcalls, dosages)
+
+        assert dosages[0, :3].tolist() == [0.0, 1.0, 2.0]
+        assert np.isnan(dosages[0, 3])
+
+
+class TestPgenRecords:
+    """Test fixed-width .pgen header and record layout."""
+
+    def test_header_layout(self):
+        header = pgen_header(PGEN_MODE_DOSAGE, 7, 3)
+
+        assert len(header) == 12
+        assert header[:3] == b"\x6c\x1b\x03"
+        assert struct.unpack("<II", header[3:11]) == (7, 3)
+        assert header[11] == 0
+
+    def test_hardcall_only_record_width(self):
+        hardcalls = np.zeros((2, 5), dtype=np.uint8)
+
+        records = encode_pgen_records(hardcalls)
+
+        assert len(records) == 2 * 2
+
+    def test_dosage_record_width_and_layout(self):
+        hardcalls = np.array([[0, 1, 2]], dtype=np.uint8)
+        dosages = np.array([[0.0, 1.0, 2.0]], dtype=np.float32)
+
+        records = encode_pgen_records(hardcalls, dosages)
+
+        assert len(records) == 1 + 3 * 2
+        assert decode_hardcalls(records[:1], 3) == [0, 1, 2]
+        assert struct.unpack("<3H", records[1:]) == (0, 16384, 32768)
+
+
+@pytest.fixture
+def postgres_container():
+    from testcontainers.postgres import PostgresContainer
+
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def db_with_genotypes(postgres_container):
+    import asyncpg
+
+    from vcf_pg_loader.schema import SchemaManager
+
+    pool = await asyncpg.create_pool(
+        host=postgres_container.get_container_host_ip(),
+        port=int(postgres_container.get_exposed_port(5432)),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+        min_size=1,
+        max_size=2,
+    )
+
+    async with pool.acquire() as conn:
+        schema_mgr = SchemaManager(human_genome=True)
+        await schema_mgr.create_schema(conn, skip_encryption=True, skip_emergency=True)
+        await schema_mgr.create_genotypes_schema(conn)
+
+        batch_id = uuid.uuid4()
+        variant_ids = []
+        for chrom, pos, ref, alt, rs_id in [
+            ("chr2", 500, "G", "A", None),
+            ("chr1", 100, "A", "G", "rs100"),
+            ("chr1", 200, "C", "T", "rs200"),
+        ]:
+            variant_ids.append(
+                await conn.fetchval(
+                    """
+                    INSERT INTO variants (chrom, pos, pos_range, ref, alt, rs_id, load_batch_id)
+                    VALUES ($1, $2::bigint, int8range($2::bigint, $2::bigint + 1), $3, $4, $5, $6)
+                    RETURNING variant_id
+                    """,
+                    chrom,
+                    pos,
+                    ref,
+                    alt,
+                    rs_id,
+                    batch_id,
+                )
+            )
+
+        sample_ids = []
+        for external_id, sex in [("S1", 1), ("S2", 2), ("S3", 0)]:
+            sample_ids.append(
+                await conn.fetchval(
+                    "INSERT INTO samples (external_id, sex) VALUES ($1, $2) RETURNING sample_id",
+                    external_id,
+                    sex,
+                )
+            )
+
+        chr2_500, chr1_100, chr1_200 = variant_ids
+        s1, s2, s3 = sample_ids
+        await conn.executemany(
+            """
+            INSERT INTO genotypes (variant_id, sample_id, gt, dosage)
+            VALUES ($1, $2, $3, $4)
+            """,
+            [
+                (chr1_100, s1, "0/1", 0.9),
+                (chr1_100, s2, "1/1", None),
+                (chr1_100, s3, ".", 0.02),
+                (chr1_200, s1, "0|0", 0.0),
+                (chr1_200, s2, "0|1", 1.0),
+                (chr2_500, s1, "1/1", 2.0),
+            ],
+        )
+
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.integration
+class TestPgenExport:
+    """Test exporting stored genotypes to a PLINK 2 fileset."""
+
+    async def test_writes_fileset(self, db_with_genotypes, tmp_path):
+        from vcf_pg_loader.export.plink2 import export_pgen
+
+        async with db_with_genotypes.acquire() as conn:
+            result = await export_pgen(conn, tmp_path / "cohort", chunk_size=2)
+
+        assert result.variants_exported == 3
+        assert result.samples_exported == 3
+
+        pvar_lines = result.pvar_path.read_text().strip().split("\n")
+        assert pvar_lines == [
+            "#CHROM\tPOS\tID\tREF\tALT",
+            "1\t100\trs100\tA\tG",
+            "1\t200\trs200\tC\tT",
+            "2\t500\t.\tG\tA",
+        ]
+
+        psam_lines = result.psam_path.read_text().strip().split("\n")
+        assert psam_lines == ["#IID\tSEX", "S1\t1", "S2\t2", "S3\tNA"]
+
+    async def test_pgen_contents(self, db_with_genotypes, tmp_path):
+        from vcf_pg_loader.export.plink2 import export_pgen
+
+        async with db_with_genotypes.acquire() as conn:
+            result = await export_pgen(conn, tmp_path / "cohort", chunk_size=2)
+
+        data = result.pgen_path.read_bytes()
+        assert data[:3] == bytes([0x6C, 0x1B, PGEN_MODE_DOSAGE])
+        assert struct.unpack("<II", data[3:11]) == (3, 3)
+        assert data[11] == 0
+
+        record_width = 1 + 3 * 2
+        body = data[12:]
+        assert len(body) == 3 * record_width
+
+        records = [body[i : i + record_width] for i in range(0, len(body), record_width)]
+        assert decode_hardcalls(records[0][:1], 3) == [1, 2, 0]
+        assert struct.unpack("<3H", records[0][1:]) == (14746, 32768, 328)
+        assert decode_hardcalls(records[1][:1], 3) == [0, 1, HARDCALL_MISSING]
+        assert struct.unpack("<3H", records[1][1:])[2] == DOSAGE_MISSING
+        assert decode_hardcalls(records[2][:1], 3) == [2, HARDCALL_MISSING, HARDCALL_MISSING]
+
+    async def test_hardcalls_only(self, db_with_genotypes, tmp_path):
+        from vcf_pg_loader.export.plink2 import export_pgen
+
+        async with db_with_genotypes.acquire() as conn:
+            result = await export_pgen(conn, tmp_path / "cohort", with_dosage=False)
+
+        data = result.pgen_path.read_bytes()
+        assert data[2] == PGEN_MODE_HARDCALL
+        assert len(data) == 12 + 3 * 1
+
+    async def test_sample_subset(self, db_with_genotypes, tmp_path):
+        from vcf_pg_loader.export.plink2 import export_pgen
+
+        async with db_with_genotypes.acquire() as conn:
+            s2 = await conn.fetchval("SELECT sample_id FROM samples WHERE external_id = 'S2'")
+            result = await export_pgen(conn, tmp_path / "subset", sample_ids=[s2])
+
+        assert result.samples_exported == 1
+        assert result.psam_path.read_text().strip().split("\n")[1] == "S2\t2"
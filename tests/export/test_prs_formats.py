@@ -754,3 +754,72 @@ class TestErrorHandling:
 
             with pytest.raises(asyncpg.UndefinedTableError):
                 await export_plink_score(conn, 999, output_path)
+
+
+class TestBatchExport:
+    """Test concurrent multi-study batch export."""
+
+    async def test_exports_every_study_format_pair(self, db_with_gwas_data, tmp_path):
+        from vcf_pg_loader.export.batch import EXPORT_FORMATS, export_batch
+
+        pool, study_id = db_with_gwas_data
+
+        results = await export_batch(pool, [study_id], list(EXPORT_FORMATS), tmp_path)
+
+        assert len(results) == len(EXPORT_FORMATS)
+        assert all(r.success for r in results)
+        assert {r.export_format for r in results} == set(EXPORT_FORMATS)
+        for r in results:
+            assert r.output_path.exists()
+            assert r.variants_exported == 6
+
+    async def test_matches_single_export_output(self, db_with_gwas_data, tmp_path):
+        from vcf_pg_loader.export.batch import export_batch
+        from vcf_pg_loader.export.prs_formats import VariantFilter, export_ldpred2
+
+        pool, study_id = db_with_gwas_data
+        variant_filter = VariantFilter(hapmap3_only=True, min_maf=0.1)
+
+        single_path = tmp_path / "single.txt"
+        async with pool.acquire() as conn:
+            await export_ldpred2(conn, study_id, single_path, variant_filter)
+
+        results = await export_batch(
+            pool, [study_id], ["ldpred2"], tmp_path / "batch", variant_filter=variant_filter
+        )
+
+        assert results[0].output_path.read_text() == single_path.read_text()
+
+    async def test_filtered_table_dropped(self, db_with_gwas_data, tmp_path):
+        from vcf_pg_loader.export.batch import FILTERED_TABLE_PREFIX, export_batch
+
+        pool, study_id = db_with_gwas_data
+
+        await export_batch(pool, [study_id], ["plink-score"], tmp_path)
+
+        async with pool.acquire() as conn:
+            leftover = await conn.fetchval(
+                "SELECT COUNT(*) FROM pg_tables WHERE tablename LIKE $1",
+                f"{FILTERED_TABLE_PREFIX}%",
+            )
+        assert leftover == 0
+
+    async def test_results_in_input_order(self, db_with_gwas_data, tmp_path):
+        from vcf_pg_loader.export.batch import export_batch
+
+        pool, study_id = db_with_gwas_data
+
+        results = await export_batch(pool, [study_id, 99999], ["plink-score"], tmp_path)
+
+        assert [r.study_id for r in results] == [study_id, 99999]
+        assert results[0].variants_exported == 6
+        assert results[1].success
+        assert results[1].variants_exported == 0
+
+    async def test_unknown_format_rejected(self, db_with_gwas_data, tmp_path):
+        from vcf_pg_loader.export.batch import export_batch
+
+        pool, study_id = db_with_gwas_data
+
+        with pytest.raises(ValueError, match="Unknown export format"):
+            await export_batch(pool, [study_id], ["bolt-lmm"], tmp_path)
@@ -0,0 +1,159 @@
+"""Tests for streaming query result writers."""
+
+import json
+
+import asyncpg
+import pytest
+
+from vcf_pg_loader.export.results import (
+    JSONResultWriter,
+    ResultWriter,
+    TSVResultWriter,
+    open_result_writer,
+    stream_query_results,
+)
+
+
+class TestOpenResultWriter:
+    """Test writer selection and validation."""
+
+    def test_selects_writer_by_format(self, tmp_path):
+        assert isinstance(open_result_writer("tsv"), TSVResultWriter)
+        assert isinstance(open_result_writer("json", tmp_path / "out.json"), JSONResultWriter)
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError, match="Unknown output format"):
+            open_result_writer("xml")
+
+    def test_parquet_requires_output_file(self):
+        with pytest.raises(ValueError, match="requires an output file"):
+            open_result_writer("parquet")
+
+    def test_base_writer_is_abstract(self):
+        with pytest.raises(TypeError, match="write_rows"):
+            ResultWriter()
+
+
+@pytest.fixture
+def postgres_container():
+    from testcontainers.postgres import PostgresContainer
+
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def results_conn(postgres_container):
+    conn = await asyncpg.connect(
+        host=postgres_container.get_container_host_ip(),
+        port=int(postgres_container.get_exposed_port(5432)),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+    )
+    yield conn
+    await conn.close()
+
+
+QUERY = """
+    SELECT n AS pos, 'chr' || n AS chrom, CASE WHEN n % 2 = 0 THEN n / 10.0 END AS af
+    FROM generate_series(1, $1) AS n
+"""
+
+
+@pytest.mark.integration
+class TestStreamQueryResults:
+    """Test chunked streaming from a server-side cursor."""
+
+    @pytest.mark.asyncio
+    async def test_tsv_across_chunks(self, results_conn, tmp_path):
+        output = tmp_path / "out.tsv"
+
+        written = await stream_query_results(
+            results_conn, QUERY, 7, writer=open_result_writer("tsv", output), chunk_size=3
+        )
+
+        lines = output.read_text().splitlines()
+        assert written == 7
+        assert lines[0] == "pos\tchrom\taf"
+        assert lines[1] == "1\tchr1\t"
+        assert lines[2] == "2\tchr2\t0.20000000000000000000"
+        assert len(lines) == 8
+
+    @pytest.mark.asyncio
+    async def test_json_array(self, results_conn, tmp_path):
+        output = tmp_path / "out.json"
+
+        await stream_query_results(
+            results_conn, QUERY, 5, writer=open_result_writer("json", output), chunk_size=2
+        )
+
+        records = json.loads(output.read_text())
+        assert [r["pos"] for r in records] == [1, 2, 3, 4, 5]
+        assert records[0]["af"] is None
+
+    @pytest.mark.asyncio
+    async def test_empty_json_array(self, results_conn, tmp_path):
+        output = tmp_path / "out.json"
+
+        written = await stream_query_results(
+            results_conn, QUERY, 0, writer=open_result_writer("json", output)
+        )
+
+        assert written == 0
+        assert json.loads(output.read_text()) == []
+
+    @pytest.mark.asyncio
+    async def test_json_lines(self, results_conn, tmp_path):
+        output = tmp_path / "out.jsonl"
+
+        await stream_query_results(
+            results_conn, QUERY, 4, writer=open_result_writer("jsonl", output), chunk_size=3
+        )
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r["chrom"] for r in records] == ["chr1", "chr2", "chr3", "chr4"]
+
+    @pytest.mark.asyncio
+    async def test_parquet_keeps_column_types(self, results_conn, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        output = tmp_path / "out.parquet"
+
+        await stream_query_results(
+            results_conn, QUERY, 5, writer=open_result_writer("parquet", output), chunk_size=2
+        )
+
+        table = pq.read_table(output)
+        assert table.num_rows == 5
+        assert str(table.schema.field("pos").type) == "int32"
+        assert table.column("af").to_pylist()[:2] == [None, pytest.approx(0.2)]
+
+    @pytest.mark.asyncio
+    async def test_settings_scoped_to_query(self, results_conn, tmp_path):
+        output = tmp_path / "out.jsonl"
+
+        await stream_query_results(
+            results_conn,
+            "SELECT current_setting('work_mem') AS work_mem",
+            writer=open_result_writer("jsonl", output),
+            settings={"work_mem": "'8MB'"},
+        )
+
+        assert json.loads(output.read_text())["work_mem"] == "8MB"
+        assert await results_conn.fetchval("SHOW work_mem") != "8MB"
+
+    @pytest.mark.asyncio
+    async def test_statement_without_rows(self, results_conn, tmp_path):
+        await results_conn.execute("CREATE TEMP TABLE no_rows (n INTEGER)")
+        output = tmp_path / "out.json"
+
+        written = await stream_query_results(
+            results_conn,
+            "INSERT INTO no_rows SELECT generate_series(1, $1)",
+            3,
+            writer=open_result_writer("json", output),
+        )
+
+        assert written == 0
+        assert json.loads(output.read_text()) == []
+        assert await results_conn.fetchval("SELECT COUNT(*) FROM no_rows") == 3
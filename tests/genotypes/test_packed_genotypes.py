@@ -0,0 +1,269 @@
+"""Tests for compact packed genotype storage.
+
+Tests for:
+- 2-bit hard call and uint8 dosage encode/decode round trips
+- Sample block layout and ADJ masking
+- SQL accessor functions matching the Python decoder
+- Storage size against the row-per-genotype table
+"""
+
+import numpy as np
+import pytest
+
+from vcf_pg_loader.genotypes.packed import (
+    DOSAGE_UINT8_MISSING,
+    adj_failures,
+    alleles_to_hardcalls,
+    decode_sample_block,
+    dequantize_dosages,
+    encode_sample_block,
+    quantize_dosages,
+    unpack_hardcalls,
+)
+
+
+class TestPackedCodec:
+    """Test packed sample block encoding."""
+
+    def test_hardcall_round_trip(self):
+        hardcalls = np.array([0, 1, 2, 3, 2, 1, 0], dtype=np.uint8)
+
+        calls, _ = encode_sample_block(hardcalls)
+
+        assert len(calls) == 2
+        assert unpack_hardcalls(calls, 7).tolist() == hardcalls.tolist()
+
+    def test_dosage_quantized_to_hundredths(self):
+        encoded = quantize_dosages(np.array([0.0, 0.994, 1.5, 2.0, np.nan]))
+
+        assert encoded.tolist() == [0, 99, 150, 200, DOSAGE_UINT8_MISSING]
+
+    def test_dosage_round_trip_within_quantization(self):
+        dosages = np.array([0.0, 0.33, 1.0, 1.87, np.nan], dtype=np.float32)
+
+        decoded = dequantize_dosages(quantize_dosages(dosages).tobytes())
+
+        assert decoded[:4] == pytest.approx(dosages[:4], abs=0.006)
+        assert np.isnan(decoded[4])
+
+    def test_all_missing_dosages_not_stored(self):
+        hardcalls = np.zeros(5, dtype=np.uint8)
+
+        calls, dosages = encode_sample_block(hardcalls, np.full(5, np.nan))
+        decoded_calls, decoded_dosages = decode_sample_block(calls, dosages, 5)
+
+        assert dosages is None
+        assert decoded_calls.tolist() == [0] * 5
+        assert np.isnan(decoded_dosages).all()
+
+
+class TestVCFConversion:
+    """Test converting cyvcf2 arrays to packed inputs."""
+
+    def test_alleles_to_hardcalls(self):
+        alleles = np.array([[0, 0], [0, 1], [1, 0], [1, 1], [-1, -1], [0, 2]])
+
+        assert alleles_to_hardcalls(alleles).tolist() == [0, 1, 1, 2, 3, 3]
+
+    def test_adj_failures(self):
+        hardcalls = np.array([1, 1, 0, 1, 1], dtype=np.uint8)
+        gq = np.array([[30], [10], [30], [30], [-2147483648]])
+        dp = np.array([[20], [20], [5], [20], [20]])
+        ad = np.array([[10, 10], [10, 10], [5, 0], [19, 1], [-1, -1]])
+
+        fails = adj_failures(hardcalls, gq, dp, ad)
+
+        assert fails.tolist() == [False, True, True, True, False]
+
+
+def write_cohort_vcf(path, n_samples, n_variants, seed=0, first_sample=0):
+    rng = np.random.default_rng(seed)
+    gt_text = {0: "0/0", 1: "0/1", 2: "1/1"}
+    lines = [
+        "##fileformat=VCFv4.2",
+        "##contig=<ID=chr1,length=100000>",
+        '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">',
+        '##FORMAT=<ID=DS,Number=A,Type=Float,Description="ALT dosage">',
+        "\t".join(
+            ["#CHROM", "POS", "ID", "REF", "ALT", "QUAL", "FILTER", "INFO", "FORMAT"]
+            + [f"S{first_sample + i}" for i in range(n_samples)]
+        ),
+    ]
+    calls = rng.integers(0, 3, size=(n_variants, n_samples))
+    dosages = np.clip(calls + rng.uniform(-0.3, 0.3, size=calls.shape), 0, 2).round(3)
+    for v in range(n_variants):
+        cells = [f"{gt_text[c]}:{d}" for c, d in zip(calls[v], dosages[v], strict=True)]
+        lines.append("\t".join(["chr1", str(100 + v), ".", "A", "G", ".", "PASS", ".", "GT:DS"]))
+        lines[-1] += "\t" + "\t".join(cells)
+    path.write_text("\n".join(lines) + "\n")
+    return calls, dosages
+
+
+@pytest.fixture
+def postgres_container():
+    """Provide a PostgreSQL test container."""
+    from testcontainers.postgres import PostgresContainer
+
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def packed_db(postgres_container):
+    """Provide a connection with row and packed genotype schemas."""
+    import asyncpg
+
+    from vcf_pg_loader.genotypes.schema import (
+        GenotypesSchemaManager,
+        PackedGenotypesSchemaManager,
+    )
+    from vcf_pg_loader.schema import SchemaManager
+
+    conn = await asyncpg.connect(
+        host=postgres_container.get_container_host_ip(),
+        port=int(postgres_container.get_exposed_port(5432)),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+    )
+    await SchemaManager().create_schema(conn)
+    await GenotypesSchemaManager().create_genotypes_schema(conn)
+    await PackedGenotypesSchemaManager().create_packed_genotypes_schema(conn)
+
+    yield conn
+    await conn.close()
+
+
+async def insert_samples(conn, n_samples):
+    await conn.executemany(
+        "INSERT INTO samples (external_id) VALUES ($1)",
+        [(f"S{i}",) for i in range(n_samples)],
+    )
+    rows = await conn.fetch("SELECT sample_id FROM samples ORDER BY sample_id")
+    return [r["sample_id"] for r in rows]
+
+
+@pytest.mark.integration
+class TestPackedGenotypeStorage:
+    """Test loading and reading packed genotype blocks."""
+
+    @pytest.mark.asyncio
+    async def test_load_and_read_matrix(self, packed_db, tmp_path):
+        from vcf_pg_loader.genotypes.packed import PackedGenotypeLoader, fetch_packed_matrix
+
+        calls, dosages = write_cohort_vcf(tmp_path / "cohort.vcf", 10, 5)
+        sample_ids = await insert_samples(packed_db, 10)
+
+        result = await PackedGenotypeLoader().load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+
+        assert result["variants_processed"] == 5
+        assert result["genotypes_loaded"] == 50
+        assert await packed_db.fetchval("SELECT COUNT(*) FROM genotypes_packed") == 5
+
+        hardcalls, decoded = await fetch_packed_matrix(packed_db, [1, 2, 3, 4, 5], sample_ids)
+        assert hardcalls.tolist() == calls.tolist()
+        assert decoded == pytest.approx(dosages, abs=0.006)
+
+    @pytest.mark.asyncio
+    async def test_sql_accessors_match_decoder(self, packed_db, tmp_path):
+        from vcf_pg_loader.genotypes.packed import PackedGenotypeLoader
+
+        calls, dosages = write_cohort_vcf(tmp_path / "cohort.vcf", 9, 3)
+        sample_ids = await insert_samples(packed_db, 9)
+        await PackedGenotypeLoader().load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+
+        rows = await packed_db.fetch(
+            "SELECT variant_id, sample_id, gt, dosage FROM genotypes_packed_cells"
+        )
+
+        assert len(rows) == 27
+        gt_text = {0: "0/0", 1: "0/1", 2: "1/1"}
+        column = {sample_id: i for i, sample_id in enumerate(sample_ids)}
+        for r in rows:
+            v, s = r["variant_id"] - 1, column[r["sample_id"]]
+            assert r["gt"] == gt_text[calls[v, s]]
+            assert r["dosage"] == pytest.approx(dosages[v, s], abs=0.006)
+
+    @pytest.mark.asyncio
+    async def test_missing_call_is_null(self, packed_db):
+        value = await packed_db.fetchval("SELECT packed_call($1, 1)", bytes([0b1100 | 0b01]))
+        assert value is None
+        assert await packed_db.fetchval("SELECT packed_call($1, 0)", bytes([0b1101])) == 1
+        assert await packed_db.fetchval("SELECT packed_dosage($1, 0)", bytes([255])) is None
+
+    @pytest.mark.asyncio
+    async def test_reload_keeps_sample_slots(self, packed_db, tmp_path):
+        from vcf_pg_loader.genotypes.packed import PackedGenotypeLoader
+
+        write_cohort_vcf(tmp_path / "cohort.vcf", 6, 2)
+        await insert_samples(packed_db, 6)
+        loader = PackedGenotypeLoader()
+
+        await loader.load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+        slots = await packed_db.fetch("SELECT * FROM genotype_sample_slots ORDER BY sample_id")
+        await loader.load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+
+        assert (
+            await packed_db.fetch("SELECT * FROM genotype_sample_slots ORDER BY sample_id") == slots
+        )
+        assert await packed_db.fetchval("SELECT COUNT(*) FROM genotypes_packed") == 2
+
+    @pytest.mark.asyncio
+    async def test_single_sample_loads_share_block_rows(self, packed_db, tmp_path):
+        from vcf_pg_loader.genotypes.packed import PackedGenotypeLoader, fetch_packed_matrix
+
+        calls_a, dosages_a = write_cohort_vcf(tmp_path / "a.vcf", 1, 3, seed=1)
+        calls_b, dosages_b = write_cohort_vcf(tmp_path / "b.vcf", 1, 3, seed=2, first_sample=1)
+        sample_ids = await insert_samples(packed_db, 2)
+        loader = PackedGenotypeLoader()
+
+        await loader.load_from_vcf(packed_db, tmp_path / "a.vcf")
+        await loader.load_from_vcf(packed_db, tmp_path / "b.vcf")
+
+        assert await packed_db.fetchval("SELECT COUNT(*) FROM genotypes_packed") == 3
+        slots = await packed_db.fetch(
+            "SELECT sample_block, slot FROM genotype_sample_slots ORDER BY sample_id"
+        )
+        assert [tuple(r) for r in slots] == [(0, 0), (0, 1)]
+        hardcalls, decoded = await fetch_packed_matrix(packed_db, [1, 2, 3], sample_ids)
+        assert hardcalls.tolist() == np.hstack([calls_a, calls_b]).tolist()
+        assert decoded == pytest.approx(np.hstack([dosages_a, dosages_b]), abs=0.006)
+
+    @pytest.mark.asyncio
+    async def test_export_reader_uses_packed_storage(self, packed_db, tmp_path):
+        from vcf_pg_loader.export.plink2 import fetch_genotype_chunk, fetch_genotyped_samples
+        from vcf_pg_loader.genotypes.packed import PackedGenotypeLoader, detect_genotype_storage
+
+        calls, dosages = write_cohort_vcf(tmp_path / "cohort.vcf", 6, 4)
+        await insert_samples(packed_db, 6)
+        assert await detect_genotype_storage(packed_db) == "rows"
+        await PackedGenotypeLoader().load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+
+        assert await detect_genotype_storage(packed_db) == "packed"
+        samples = await fetch_genotyped_samples(packed_db, None, "packed")
+        sample_index = {s["sample_id"]: i for i, s in enumerate(samples)}
+        hardcalls, decoded = await fetch_genotype_chunk(
+            packed_db, [1, 2, 3, 4], sample_index, 0.1, "packed"
+        )
+
+        assert len(samples) == 6
+        assert hardcalls.tolist() == calls.tolist()
+        assert decoded == pytest.approx(dosages, abs=0.006)
+
+    @pytest.mark.asyncio
+    async def test_storage_shrinks_over_10x(self, packed_db, tmp_path):
+        from vcf_pg_loader.genotypes.genotype_loader import GenotypeLoader
+        from vcf_pg_loader.genotypes.packed import PackedGenotypeLoader
+
+        write_cohort_vcf(tmp_path / "cohort.vcf", 400, 40)
+        await insert_samples(packed_db, 400)
+
+        await GenotypeLoader().load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+        await PackedGenotypeLoader().load_from_vcf(packed_db, tmp_path / "cohort.vcf")
+
+        row_bytes = await packed_db.fetchval("""
+            SELECT SUM(pg_table_size(inhrelid)) FROM pg_inherits
+            WHERE inhparent = 'genotypes'::regclass
+        """)
+        packed_bytes = await packed_db.fetchval("SELECT pg_table_size('genotypes_packed')")
+        assert row_bytes > 10 * packed_bytes
@@ -0,0 +1,210 @@
+"""Tests for out-of-core PRS scoring with chunked NumPy dosage matrices."""
+
+import numpy as np
+import pytest
+
+from vcf_pg_loader.prs.matrix_scoring import (
+    BlockScorer,
+    build_weight_matrix,
+    iter_vcf_blocks,
+    score_block,
+    score_vcf,
+)
+
+
+def weight_row(pgs_id, variant_id, effect, other, weight, pos, ref, alt, af=None):
+    return {
+        "pgs_id": pgs_id,
+        "variant_id": variant_id,
+        "effect_allele": effect,
+        "other_allele": other,
+        "effect_weight": weight,
+        "allele_frequency": af,
+        "chrom": "chr1",
+        "pos": pos,
+        "ref": ref,
+        "alt": alt,
+    }
+
+
+@pytest.fixture
+def weights():
+    return build_weight_matrix(
+        [
+            weight_row("PGS_A", 1, "G", "A", 0.5, 100, "A", "G"),
+            weight_row("PGS_B", 1, "A", "G", 1.0, 100, "A", "G"),
+            weight_row("PGS_A", 2, "C", "T", -0.2, 200, "C", "T"),
+            weight_row("PGS_B", 3, "C", "G", 1.0, 300, "G", "C", af=0.1),
+            weight_row("PGS_B", 4, "T", "A", 9.0, 400, "A", "G"),
+        ],
+        ["PGS_A", "PGS_B"],
+    )
+
+
+class TestWeightMatrix:
+    """Test stacking oriented weights for several PGS."""
+
+    def test_shared_variant_has_one_row(self, weights):
+        assert weights.variant_ids.tolist() == [1, 2, 3]
+        assert weights.keys[0] == ("1", 100, "A", "G")
+
+    def test_columns_are_oriented_per_score(self, weights):
+        assert weights.betas[0].tolist() == [0.5, -1.0]
+        assert weights.offsets[0].tolist() == [0.0, 2.0]
+        assert weights.betas[2].tolist() == [0.0, 1.0]
+
+    def test_effect_ref_weight_column(self, weights):
+        assert weights.betas[1].tolist() == [0.2, 0.0]
+        assert weights.offsets[1].tolist() == [-0.4, 0.0]
+
+    def test_unharmonizable_weight_skipped(self, weights):
+        assert weights.weights_skipped == 1
+        assert np.isnan(weights.fallback_means[0])
+        assert weights.fallback_means[2] == pytest.approx(0.2)
+
+
+class TestScoreBlock:
+    """Test scoring a single dosage block."""
+
+    def test_matches_dense_product(self):
+        betas = np.array([[0.5], [1.0]])
+        offsets = np.zeros((2, 1))
+        dosages = np.array([[0.0, 1.0, 2.0], [1.0, 1.0, 0.0]])
+
+        scores, n_imputed, used = score_block(betas, offsets, np.full(2, np.nan), dosages)
+
+        assert scores[:, 0].tolist() == [1.0, 1.5, 1.0]
+        assert n_imputed.sum() == 0
+        assert used.all()
+
+    def test_missing_dosage_mean_imputed(self):
+        betas = np.array([[1.0]])
+        dosages = np.array([[0.0, np.nan, 2.0]])
+
+        scores, n_imputed, _ = score_block(betas, np.zeros((1, 1)), np.full(1, np.nan), dosages)
+
+        assert scores[:, 0].tolist() == [0.0, 1.0, 2.0]
+        assert n_imputed[:, 0].tolist() == [0, 1, 0]
+
+    def test_unobserved_variant_uses_fallback_or_is_dropped(self):
+        betas = np.array([[1.0], [-1.0]])
+        offsets = np.array([[0.0], [2.0]])
+        dosages = np.full((2, 2), np.nan)
+
+        scores, _, used = score_block(betas, offsets, np.array([0.4, np.nan]), dosages)
+
+        assert used.tolist() == [True, False]
+        assert scores[:, 0].tolist() == pytest.approx([0.4, 0.4])
+
+
+class TestBlockScorer:
+    """Test accumulating block scores across a thread pool."""
+
+    def test_blocks_sum_to_full_product(self, weights):
+        rng = np.random.default_rng(0)
+        dosages = rng.uniform(0, 2, size=(weights.n_variants, 5))
+
+        scorer = BlockScorer(weights, n_samples=5, max_workers=2)
+        for row in range(weights.n_variants):
+            rows = np.array([row])
+            scorer.submit(rows, dosages[rows])
+        variants_used = scorer.finish()
+
+        expected = dosages.T @ weights.betas + weights.offsets.sum(axis=0)
+        assert scorer.scores == pytest.approx(expected)
+        assert variants_used.tolist() == [2, 2]
+
+
+VCF_TEXT = """##fileformat=VCFv4.2
+##contig=<ID=chr1,length=1000>
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##FORMAT=<ID=DS,Number=A,Type=Float,Description="ALT dosage">
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2\tS3
+chr1\t100\t.\tA\tG\t.\tPASS\t.\tGT:DS\t0/1:0.9\t1/1:.\t./.:.
+chr1\t150\t.\tT\tC\t.\tPASS\t.\tGT:DS\t0/1:1\t0/1:1\t0/1:1
+chr1\t200\t.\tC\tT,A\t.\tPASS\t.\tGT:DS\t0/2:0,1\t0/1:1,0\t1/1:2,0
+"""
+
+
+class TestVCFScoring:
+    """Test streaming dosage blocks from a VCF."""
+
+    @pytest.fixture
+    def vcf_path(self, tmp_path):
+        path = tmp_path / "cohort.vcf"
+        path.write_text(VCF_TEXT)
+        return path
+
+    def test_blocks_match_weighted_alleles(self, vcf_path, weights):
+        blocks = list(iter_vcf_blocks(vcf_path, weights, chunk_size=10))
+
+        assert len(blocks) == 1
+        rows, dosages = blocks[0]
+        assert rows.tolist() == [0, 1]
+        assert dosages[0, :2].tolist() == pytest.approx([0.9, 2.0])
+        assert np.isnan(dosages[0, 2])
+        assert dosages[1].tolist() == [0.0, 1.0, 2.0]
+
+    def test_score_vcf(self, vcf_path, weights):
+        result = score_vcf(vcf_path, weights, chunk_size=1, max_workers=2)
+
+        assert result.samples == ["S1", "S2", "S3"]
+        mean_v1 = (0.9 + 2.0) / 2
+        expected_a = [
+            0.5 * 0.9 - 0.2 * 2.0,
+            0.5 * 2.0 - 0.2 * 1.0,
+            0.5 * mean_v1 - 0.2 * 0.0,
+        ]
+        assert result.scores[:, 0].tolist() == pytest.approx(expected_a)
+        assert result.n_imputed[:, 0].tolist() == [0, 0, 1]
+        assert result.variants_used.tolist() == [2, 1]
+
+    def test_write_tsv(self, vcf_path, weights, tmp_path):
+        result = score_vcf(vcf_path, weights)
+        output = tmp_path / "scores.tsv"
+
+        result.write_tsv(output)
+
+        lines = output.read_text().strip().split("\n")
+        assert lines[0] == "sample\tPGS_A\tPGS_B"
+        assert [line.split("\t")[0] for line in lines[1:]] == ["S1", "S2", "S3"]
+
+    def test_gt_only_vcf(self, weights, tmp_path):
+        path = tmp_path / "gt_only.vcf"
+        path.write_text(
+            "##fileformat=VCFv4.2\n"
+            "##contig=<ID=chr1,length=1000>\n"
+            '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2\tS3\n"
+            "chr1\t100\t.\tA\tG\t.\tPASS\t.\tGT\t0/1\t1/1\t./.\n"
+        )
+
+        rows, dosages = next(iter_vcf_blocks(path, weights, chunk_size=10))
+
+        assert rows.tolist() == [0]
+        assert dosages[0, :2].tolist() == [1.0, 2.0]
+        assert np.isnan(dosages[0, 2])
+
+    def test_number_one_ds_on_multiallelic_record(self, tmp_path):
+        weights = build_weight_matrix(
+            [
+                weight_row("PGS_A", 1, "T", "C", 1.0, 200, "C", "T"),
+                weight_row("PGS_A", 2, "A", "C", 1.0, 200, "C", "A"),
+            ],
+            ["PGS_A"],
+        )
+        path = tmp_path / "ds_one.vcf"
+        path.write_text(
+            "##fileformat=VCFv4.2\n"
+            "##contig=<ID=chr1,length=1000>\n"
+            '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">\n'
+            '##FORMAT=<ID=DS,Number=1,Type=Float,Description="ALT dosage">\n'
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2\tS3\n"
+            "chr1\t200\t.\tC\tT,A\t.\tPASS\t.\tGT:DS\t0/2:0.1\t0/1:0.9\t1/2:1.1\n"
+        )
+
+        rows, dosages = next(iter_vcf_blocks(path, weights, chunk_size=10))
+
+        assert rows.tolist() == [0, 1]
+        assert dosages[0].tolist() == pytest.approx([0.1, 0.9, 1.1])
+        assert dosages[1].tolist() == [1.0, 0.0, 1.0]
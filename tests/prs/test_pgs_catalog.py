@@ -9,6 +9,7 @@ Tests for:
 - Full import workflow with match statistics
 """
 
+import gzip
 from pathlib import Path
 
 import asyncpg
@@ -850,3 +851,158 @@ class TestPGSCatalogParserFromFile:
 
         assert parser.metadata.pgs_id == "PGS000002"
         assert parser.metadata.weight_type == "OR"
+
+    def test_parse_gzipped_file(self, tmp_path):
+        import gzip
+
+        from vcf_pg_loader.prs.pgs_catalog import PGSCatalogParser
+
+        plain_path = FIXTURES_DIR / "pgs_test_beta.txt"
+        gz_path = tmp_path / "pgs_test_beta.txt.gz"
+        gz_path.write_bytes(gzip.compress(plain_path.read_bytes()))
+
+        parser = PGSCatalogParser(gz_path)
+
+        assert parser.metadata.pgs_id == "PGS000001"
+        assert list(parser.iter_weights()) == list(PGSCatalogParser(plain_path).iter_weights())
+
+    def test_iter_batches(self):
+        from vcf_pg_loader.prs.pgs_catalog import PGSCatalogParser
+
+        parser = PGSCatalogParser(FIXTURES_DIR / "pgs_test_beta.txt")
+        weights = list(parser.iter_weights())
+
+        batches = list(parser.iter_batches(batch_size=4))
+
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert [w for batch in batches for w in batch] == weights
+
+    def test_worker_columns_round_trip(self):
+        """Weights returned by parser processes as columns rebuild unchanged."""
+        from vcf_pg_loader.prs.loader import _parse_scoring_file
+        from vcf_pg_loader.prs.models import PRSWeight
+        from vcf_pg_loader.prs.pgs_catalog import PGSCatalogParser
+
+        parser = PGSCatalogParser(FIXTURES_DIR / "pgs_test_beta.txt")
+        weights = list(parser.iter_weights())
+
+        metadata, columns = _parse_scoring_file(str(FIXTURES_DIR / "pgs_test_beta.txt"))
+
+        assert metadata.pgs_id == "PGS000001"
+        assert len(columns) == len(weights)
+        assert [w for batch in columns.iter_batches(4) for w in batch] == weights
+
+        sparse = [PRSWeight(effect_allele="A", effect_weight=0.5, rsid="rs1", is_dominant=True)]
+        columns = type(columns).from_weights(sparse)
+        assert list(columns.iter_batches(10)) == [sparse]
+
+
+class TestCollectScoringFiles:
+    """Test directory and manifest listing for batch import."""
+
+    def test_directory(self, tmp_path):
+        from vcf_pg_loader.prs.loader import collect_scoring_files
+
+        for name in ("PGS2.txt.gz", "PGS1.txt", "notes.md", ".hidden.txt"):
+            (tmp_path / name).write_text("")
+        (tmp_path / "subdir.txt").mkdir()
+
+        assert collect_scoring_files(tmp_path) == [
+            (tmp_path / "PGS1.txt", None),
+            (tmp_path / "PGS2.txt.gz", None),
+        ]
+
+    def test_manifest(self, tmp_path):
+        from vcf_pg_loader.prs.loader import collect_scoring_files
+
+        manifest = tmp_path / "manifest.tsv"
+        manifest.write_text("# trait collection\nscores/PGS1.txt\n\n/abs/PGS2.txt\tPGS_CUSTOM\n")
+
+        assert collect_scoring_files(manifest) == [
+            (tmp_path / "scores" / "PGS1.txt", None),
+            (Path("/abs/PGS2.txt"), "PGS_CUSTOM"),
+        ]
+
+
+@pytest.mark.integration
+class TestPGSBatchImport:
+    """Test multi-score import with a shared matching pass."""
+
+    @pytest.mark.asyncio
+    async def test_batch_import_reports_each_score(self, db_pool, db_url, tmp_path):
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+        from vcf_pg_loader.prs.loader import PGSLoader, collect_scoring_files
+        from vcf_pg_loader.prs.schema import PRSSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+        from vcf_pg_loader.tls import TLSConfig
+
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn)
+            await PRSSchemaManager().create_prs_schema(conn)
+
+        config = LoadConfig(
+            batch_size=100,
+            drop_indexes=False,
+            tls_config=TLSConfig(require_tls=False, verify_server=False),
+        )
+        async with VCFLoader(db_url, config) as vcf_loader:
+            await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        broken = tmp_path / "broken.txt"
+        broken.write_text("#genome_build=GRCh38\nrsID\teffect_allele\teffect_weight\n")
+        truncated = tmp_path / "truncated.txt.gz"
+        compressed = gzip.compress((FIXTURES_DIR / "pgs_test_or.txt").read_bytes())
+        truncated.write_bytes(compressed[:-10])
+        manifest = tmp_path / "manifest.tsv"
+        manifest.write_text(
+            f"{FIXTURES_DIR / 'pgs_test_beta.txt'}\n"
+            f"{FIXTURES_DIR / 'pgs_test_or.txt'}\n"
+            f"{broken}\n"
+            f"{FIXTURES_DIR / 'pgs_test_beta.txt'}\n"
+            f"{FIXTURES_DIR / 'pgs_test_beta.txt'}\tPGS_RENAMED\n"
+            f"{truncated}\n"
+        )
+
+        loader = PGSLoader(batch_size=3)
+        async with db_pool.acquire() as conn:
+            single = await loader.import_pgs(conn, FIXTURES_DIR / "pgs_test_beta.txt")
+
+            results = await loader.import_pgs_batch(
+                conn, collect_scoring_files(manifest), workers=2
+            )
+
+            assert [r["pgs_id"] for r in results] == [
+                "PGS000001",
+                "PGS000002",
+                None,
+                "PGS000001",
+                "PGS_RENAMED",
+                None,
+            ]
+            assert [r["error"] is None for r in results] == [
+                True,
+                True,
+                False,
+                False,
+                True,
+                False,
+            ]
+            assert "pgs_id" in results[2]["error"]
+            assert "Duplicate" in results[3]["error"]
+            assert results[5]["error"].startswith("EOFError")
+
+            beta = results[0]
+            assert beta["weights_imported"] == single["weights_imported"]
+            assert beta["weights_matched"] == single["weights_matched"] > 0
+            assert beta["weights_unmatched"] == single["weights_unmatched"]
+
+            counts = dict(
+                await conn.fetch(
+                    "SELECT pgs_id, COUNT(*) FROM prs_weights GROUP BY pgs_id ORDER BY pgs_id"
+                )
+            )
+            assert counts == {
+                "PGS000001": single["weights_imported"],
+                "PGS000002": results[1]["weights_imported"],
+                "PGS_RENAMED": single["weights_imported"],
+            }
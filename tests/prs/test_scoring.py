@@ -0,0 +1,268 @@
+"""Tests for in-database PRS scoring over stored dosages."""
+
+import uuid
+
+import asyncpg
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+from vcf_pg_loader.prs.scoring import combine_mean_dosages, orient_weight
+
+
+class TestWeightOrientation:
+    """Test orienting weights to the ALT dosage scale."""
+
+    def test_effect_allele_is_alt(self):
+        assert orient_weight("G", 0.5, "A", ref="A", alt="G") == (0.5, 0.0, None)
+
+    def test_effect_allele_is_ref(self):
+        beta, offset, _ = orient_weight("A", 0.5, "G", ref="A", alt="G")
+
+        assert beta == -0.5
+        assert offset == 1.0
+        for alt_dosage in (0.0, 1.0, 2.0):
+            assert beta * alt_dosage + offset == 0.5 * (2 - alt_dosage)
+
+    def test_strand_flipped_effect_allele(self):
+        assert orient_weight("C", 0.5, "T", ref="A", alt="G") == (0.5, 0.0, None)
+
+    def test_unharmonizable_alleles(self):
+        assert orient_weight("T", 0.5, "A", ref="A", alt="G") is None
+
+    def test_fallback_mean_from_effect_allele_frequency(self):
+        assert orient_weight("G", 1.0, "A", "A", "G", allele_frequency=0.25)[2] == 0.5
+        assert orient_weight("A", 1.0, "G", "A", "G", allele_frequency=0.25)[2] == 1.5
+
+
+class TestMeanDosages:
+    """Test combining per-partition dosage aggregates."""
+
+    def test_combines_partitions(self):
+        partials = [
+            [{"variant_id": 1, "dosage_sum": 1.0, "dosage_count": 2}],
+            [],
+            [
+                {"variant_id": 1, "dosage_sum": 2.0, "dosage_count": 1},
+                {"variant_id": 2, "dosage_sum": 0.5, "dosage_count": 1},
+            ],
+        ]
+
+        assert combine_mean_dosages(partials) == {1: 1.0, 2: 0.5}
+
+
+@pytest.fixture
+def postgres_container():
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def scoring_pool(postgres_container):
+    from vcf_pg_loader.prs.schema import PRSSchemaManager
+    from vcf_pg_loader.schema import SchemaManager
+
+    pool = await asyncpg.create_pool(
+        host=postgres_container.get_container_host_ip(),
+        port=int(postgres_container.get_exposed_port(5432)),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+        min_size=1,
+        max_size=4,
+    )
+
+    async with pool.acquire() as conn:
+        await SchemaManager(human_genome=True).create_schema(
+            conn, skip_encryption=True, skip_emergency=True
+        )
+        await SchemaManager(human_genome=True).create_genotypes_schema(conn)
+        prs_schema = PRSSchemaManager()
+        await prs_schema.create_prs_schema(conn)
+        await prs_schema.create_score(conn, pgs_id="PGS_TEST")
+
+        batch_id = uuid.uuid4()
+        variant_ids = []
+        for pos, ref, alt in [(100, "A", "G"), (200, "C", "T"), (300, "G", "C")]:
+            variant_ids.append(
+                await conn.fetchval(
+                    """
+                    INSERT INTO variants (chrom, pos, pos_range, ref, alt, load_batch_id)
+                    VALUES ('chr1', $1::bigint, int8range($1::bigint, $1::bigint + 1),
+                            $2, $3, $4)
+                    RETURNING variant_id
+                    """,
+                    pos,
+                    ref,
+                    alt,
+                    batch_id,
+                )
+            )
+        v1, v2, v3 = variant_ids
+
+        sample_ids = [
+            await conn.fetchval(
+                "INSERT INTO samples (external_id) VALUES ($1) RETURNING sample_id", name
+            )
+            for name in ("S1", "S2", "S3")
+        ]
+        s1, s2, s3 = sample_ids
+
+        await conn.executemany(
+            "INSERT INTO genotypes (variant_id, sample_id, gt, dosage) VALUES ($1, $2, $3, $4)",
+            [
+                (v1, s1, "0/1", 1.0),
+                (v1, s2, "1/1", 2.0),
+                (v1, s3, "0/0", 0.0),
+                (v2, s1, "0/0", 0.0),
+                (v2, s2, "./.", None),
+                (v2, s3, "0/1", 1.0),
+            ],
+        )
+
+        await conn.executemany(
+            """
+            INSERT INTO prs_weights (
+                variant_id, pgs_id, effect_allele, other_allele, effect_weight,
+                allele_frequency
+            ) VALUES ($1, 'PGS_TEST', $2, $3, $4, $5)
+            """,
+            [
+                (v1, "G", "A", 0.5, None),
+                (v2, "C", "T", -0.2, None),
+                (v3, "C", "G", 1.0, 0.1),
+                (None, "A", "T", 9.0, None),
+            ],
+        )
+
+    yield pool, dict(zip(("S1", "S2", "S3"), sample_ids, strict=True))
+    await pool.close()
+
+
+@pytest.mark.integration
+class TestComputePRS:
+    """Test partition-parallel PRS computation."""
+
+    @pytest.mark.asyncio
+    async def test_scores_all_samples(self, scoring_pool):
+        from vcf_pg_loader.prs.scoring import compute_prs
+
+        pool, samples = scoring_pool
+        result = await compute_prs(pool, "PGS_TEST")
+
+        assert result.samples_scored == 3
+        assert result.variants_used == 3
+        assert result.variants_skipped == 0
+
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT sample_id, score, n_variants, n_imputed FROM prs_scores "
+                "WHERE pgs_id = 'PGS_TEST'"
+            )
+        scores = {r["sample_id"]: r for r in rows}
+
+        # v1: effect=ALT, 0.5 * dosage
+        # v2: effect=REF, -0.2 * (2 - dosage); S2 imputed with mean ALT dosage 0.5
+        # v3: no dosages, imputed from frequency: 2 * 0.1 * 1.0
+        expected = {
+            "S1": 0.5 * 1.0 - 0.2 * 2.0 + 0.2,
+            "S2": 0.5 * 2.0 - 0.2 * 1.5 + 0.2,
+            "S3": 0.0 - 0.2 * 1.0 + 0.2,
+        }
+        for name, value in expected.items():
+            row = scores[samples[name]]
+            assert row["score"] == pytest.approx(value)
+            assert row["n_variants"] == 3
+
+        assert scores[samples["S1"]]["n_imputed"] == 1
+        assert scores[samples["S2"]]["n_imputed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rescoring_replaces_results(self, scoring_pool):
+        from vcf_pg_loader.prs.scoring import compute_prs
+
+        pool, _ = scoring_pool
+        await compute_prs(pool, "PGS_TEST")
+        await compute_prs(pool, "PGS_TEST")
+
+        async with pool.acquire() as conn:
+            count = await conn.fetchval("SELECT COUNT(*) FROM prs_scores")
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_pgs_raises(self, scoring_pool):
+        from vcf_pg_loader.prs.scoring import compute_prs
+
+        pool, _ = scoring_pool
+        with pytest.raises(ValueError, match="No weights matched"):
+            await compute_prs(pool, "PGS_MISSING")
+
+
+@pytest.mark.integration
+class TestMatrixScoringStoredGenotypes:
+    """Test NumPy block scoring of stored genotypes against the SQL engine."""
+
+    @pytest.mark.asyncio
+    async def test_matches_sql_engine(self, scoring_pool):
+        from vcf_pg_loader.prs.matrix_scoring import (
+            load_weight_matrix,
+            score_genotypes,
+            store_matrix_scores,
+        )
+        from vcf_pg_loader.prs.scoring import compute_prs
+
+        pool, _ = scoring_pool
+        await compute_prs(pool, "PGS_TEST")
+
+        async with pool.acquire() as conn:
+            sql_scores = {
+                r["sample_id"]: (r["score"], r["n_imputed"])
+                for r in await conn.fetch("SELECT * FROM prs_scores")
+            }
+
+            weights = await load_weight_matrix(conn, ["PGS_TEST"])
+            result = await score_genotypes(conn, weights, chunk_size=1, max_workers=2)
+            written = await store_matrix_scores(conn, result)
+
+            matrix_scores = {
+                r["sample_id"]: (r["score"], r["n_imputed"])
+                for r in await conn.fetch("SELECT * FROM prs_scores")
+            }
+
+        assert written == 3
+        assert result.variants_used.tolist() == [3]
+        assert matrix_scores.keys() == sql_scores.keys()
+        for sample_id, (score, n_imputed) in sql_scores.items():
+            assert matrix_scores[sample_id][0] == pytest.approx(score)
+            assert matrix_scores[sample_id][1] == n_imputed
+
+    @pytest.mark.asyncio
+    async def test_hardcall_only_genotypes_match_sql_engine(self, scoring_pool):
+        from vcf_pg_loader.prs.matrix_scoring import load_weight_matrix, score_genotypes
+        from vcf_pg_loader.prs.scoring import compute_prs
+
+        pool, samples = scoring_pool
+        async with pool.acquire() as conn:
+            await conn.execute("UPDATE genotypes SET dosage = NULL")
+
+        await compute_prs(pool, "PGS_TEST")
+
+        async with pool.acquire() as conn:
+            sql_scores = {
+                r["sample_id"]: (r["score"], r["n_imputed"])
+                for r in await conn.fetch("SELECT * FROM prs_scores")
+            }
+            weights = await load_weight_matrix(conn, ["PGS_TEST"])
+            result = await score_genotypes(conn, weights)
+
+        matrix_scores = {
+            sample_id: (result.scores[i, 0], result.n_imputed[i, 0])
+            for i, sample_id in enumerate(result.sample_ids)
+        }
+        assert matrix_scores.keys() == sql_scores.keys()
+        for sample_id, (score, n_imputed) in sql_scores.items():
+            assert matrix_scores[sample_id][0] == pytest.approx(score)
+            assert matrix_scores[sample_id][1] == n_imputed
+
+        # Scores follow the GT hardcalls rather than collapsing to the cohort mean
+        assert sql_scores[samples["S1"]][0] == pytest.approx(0.5 * 1.0 - 0.2 * 2.0 + 0.2)
+        assert sql_scores[samples["S2"]][0] == pytest.approx(0.5 * 2.0 - 0.2 * 1.5 + 0.2)
@@ -0,0 +1,134 @@
+"""Tests for BED interval tracks and the in-memory interval index."""
+
+from pathlib import Path
+
+import asyncpg
+import numpy as np
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+BED_PATH = FIXTURES_DIR / "intervals_example.bed"
+
+
+@pytest.fixture
+def postgres_container():
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def db_conn(postgres_container):
+    conn = await asyncpg.connect(
+        host=postgres_container.get_container_host_ip(),
+        port=postgres_container.get_exposed_port(5432),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+    )
+    yield conn
+    await conn.close()
+
+
+class TestReadBed:
+    def test_converts_to_one_based_closed(self):
+        from vcf_pg_loader.references.intervals import read_bed
+
+        intervals = list(read_bed(BED_PATH))
+
+        assert len(intervals) == 5
+        assert intervals[0] == ("1", 100, 200, "geneA", 10.0)
+        assert intervals[1] == ("1", 150, 300, "exon1", None)
+        assert intervals[3] == ("2", 1, 50, None, None)
+
+    def test_rejects_empty_interval(self, tmp_path):
+        from vcf_pg_loader.references.intervals import read_bed
+
+        bed = tmp_path / "empty.bed"
+        bed.write_text("chr1\t100\t100\n")
+
+        with pytest.raises(ValueError, match="empty interval"):
+            list(read_bed(bed))
+
+
+class TestIntervalIndex:
+    @pytest.fixture
+    def index(self):
+        from vcf_pg_loader.references.intervals import IntervalIndex
+
+        return IntervalIndex.from_bed(BED_PATH)
+
+    def test_overlapping_and_nested_intervals(self, index):
+        offsets, ids = index.lookup("chr1", np.array([99, 100, 150, 200, 201, 300, 301, 450]))
+
+        found = [ids[offsets[i] : offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+        assert found == [[], [0], [0, 1], [0, 1], [1], [1], [], [2]]
+
+    def test_chrom_prefix_insensitive(self, index):
+        assert index.overlaps("2", np.array([5, 15, 51])).tolist() == [True, True, False]
+        assert index.overlaps("chr2", np.array([15])).tolist() == [True]
+
+    def test_unknown_chrom(self, index):
+        offsets, ids = index.lookup("chrX", np.array([1, 2]))
+
+        assert offsets.tolist() == [0, 0, 0]
+        assert len(ids) == 0
+
+    def test_tag_batch(self, index):
+        from vcf_pg_loader.models import VariantRecord
+
+        batch = [
+            VariantRecord(
+                chrom=chrom, pos=pos, ref="A", alt="G", qual=None, filter=[], rs_id=None, info={}
+            )
+            for chrom, pos in [("chr1", 160), ("chr2", 15), ("chr1", 350), ("chr3", 1)]
+        ]
+
+        assert index.tag(batch) == [(0, 1), (3, 4), (), ()]
+
+    def test_matches_brute_force(self):
+        from vcf_pg_loader.references.intervals import IntervalIndex
+
+        rng = np.random.default_rng(7)
+        starts = rng.integers(1, 10000, 500)
+        ends = starts + rng.integers(0, 800, 500)
+        index = IntervalIndex.from_arrays(["chr1"] * 500, starts, ends, np.arange(500))
+
+        positions = rng.integers(1, 11000, 2000)
+        offsets, ids = index.lookup("chr1", positions)
+
+        for i, pos in enumerate(positions):
+            expected = np.flatnonzero((starts <= pos) & (ends >= pos))
+            assert sorted(ids[offsets[i] : offsets[i + 1]].tolist()) == expected.tolist()
+
+
+@pytest.mark.integration
+class TestIntervalTrackLoader:
+    @pytest.mark.asyncio
+    async def test_load_bed_and_build_index(self, db_conn):
+        from vcf_pg_loader.references.intervals import IntervalIndex, IntervalTrackLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+
+        await ReferenceSchemaManager().create_interval_tracks_table(db_conn)
+        loader = IntervalTrackLoader(batch_size=2)
+
+        result = await loader.load_bed(db_conn, BED_PATH, "example")
+        assert result == {"track": "example", "intervals_loaded": 5, "chromosomes": 2}
+
+        reloaded = await loader.load_bed(db_conn, BED_PATH, "example")
+        assert reloaded["intervals_loaded"] == 5
+        assert await loader.list_tracks(db_conn) == [
+            {"track": "example", "interval_count": 5, "chrom_count": 2}
+        ]
+
+        overlapping = await db_conn.fetch("""
+            SELECT interval_id FROM interval_tracks
+            WHERE track = 'example' AND chrom = '1'
+              AND int8range(start_pos, end_pos, '[]') @> 160::bigint
+            ORDER BY interval_id
+        """)
+        index = await IntervalIndex.from_db(db_conn, "example")
+        offsets, ids = index.lookup("chr1", np.array([160]))
+
+        assert len(index) == 5
+        assert sorted(ids.tolist()) == [row["interval_id"] for row in overlapping]
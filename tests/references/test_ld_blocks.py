@@ -634,6 +634,149 @@ class TestLDBlockPerformance:
             assert elapsed < 30.0, f"Assignment took {elapsed:.2f}s, expected <30s"
 
 
+@pytest.mark.integration
+class TestLDBlockAssignmentOnLoad:
+    """Test assigning LD blocks in memory before COPY, and the parallel backfill."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_assigned_during_load(self, db_pool, db_url):
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+        from vcf_pg_loader.references.ld_blocks import LDBlockLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+        from vcf_pg_loader.tls import TLSConfig
+
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn)
+            await ReferenceSchemaManager().create_ld_blocks_table(conn)
+            await LDBlockLoader().load_berisa_pickrell_blocks(
+                conn, FIXTURES_DIR / "ld_blocks_eur_grch37.bed", population="EUR", build="grch37"
+            )
+
+        config = LoadConfig(
+            batch_size=100,
+            drop_indexes=False,
+            ld_block_population="EUR",
+            tls_config=TLSConfig(require_tls=False, verify_server=False),
+        )
+        async with VCFLoader(db_url, config) as vcf_loader:
+            await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT v.pos, v.ld_block_id, lb.block_id
+                FROM variants v
+                JOIN ld_blocks lb
+                  ON lb.chrom = replace(v.chrom::text, 'chr', '')
+                 AND v.pos BETWEEN lb.start_pos AND lb.end_pos
+            """)
+
+        assert len(rows) == 10
+        for row in rows:
+            assert row["ld_block_id"] == row["block_id"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_with_pool_matches_connection(self, db_pool):
+        from vcf_pg_loader.references.ld_blocks import LDBlockLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+
+        loader = LDBlockLoader()
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn, skip_encryption=True, skip_emergency=True)
+            await ReferenceSchemaManager().create_ld_blocks_table(conn)
+            await loader.load_berisa_pickrell_blocks(
+                conn, FIXTURES_DIR / "ld_blocks_eur_grch37.bed", population="EUR", build="grch37"
+            )
+            await conn.executemany(
+                """
+                INSERT INTO variants (chrom, pos, pos_range, ref, alt, load_batch_id)
+                VALUES ($1, $2, $3, 'A', 'G', 'a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a11')
+                """,
+                [
+                    (chrom, pos, asyncpg.Range(pos, pos + 1))
+                    for chrom, pos in [
+                        ("chr1", 1000000),
+                        ("chr10", 100000),
+                        ("chr22", 16050075),
+                        ("chr2", 5000),
+                    ]
+                ],
+            )
+
+        updated = await loader.assign_variants_to_blocks(db_pool, population="EUR", workers=2)
+        assert updated == 3
+
+        async with db_pool.acquire() as conn:
+            assert await loader.assign_variants_to_blocks(conn, population="EUR") == 0
+            unassigned = await conn.fetchval(
+                "SELECT COUNT(*) FROM variants WHERE ld_block_id IS NULL"
+            )
+        assert unassigned == 1
+
+    @pytest.mark.asyncio
+    async def test_several_builds_require_build(self, db_pool):
+        from vcf_pg_loader.references.ld_blocks import LDBlockIndex, LDBlockLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+
+        loader = LDBlockLoader()
+        bed_path = FIXTURES_DIR / "ld_blocks_eur_grch37.bed"
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn, skip_encryption=True, skip_emergency=True)
+            await ReferenceSchemaManager().create_ld_blocks_table(conn)
+            await loader.load_berisa_pickrell_blocks(conn, bed_path, "EUR", build="grch37")
+            single = await LDBlockIndex.from_db(conn, "EUR")
+            await loader.load_berisa_pickrell_blocks(conn, bed_path, "EUR", build="grch38")
+
+            with pytest.raises(ValueError, match="GRCh37, GRCh38"):
+                await LDBlockIndex.from_db(conn, "EUR")
+            with pytest.raises(ValueError, match="specify the build"):
+                await loader.assign_variants_to_blocks(conn, population="EUR")
+
+            assert len(await LDBlockIndex.from_db(conn, "EUR", "grch38")) == len(single)
+
+
+class TestLDBlockIndex:
+    """Unit tests for the in-memory LD block interval index."""
+
+    @pytest.fixture
+    def index(self):
+        import numpy as np
+
+        from vcf_pg_loader.references.ld_blocks import LDBlockIndex
+
+        return LDBlockIndex(
+            starts={"1": np.array([10583, 1892607, 3582736])},
+            ends={"1": np.array([1892607, 3582736, 4380811])},
+            block_ids={"1": np.array([1, 2, 3])},
+        )
+
+    def test_lookup_boundaries(self, index):
+        import numpy as np
+
+        positions = np.array([10582, 10583, 1000000, 1892607, 4380811, 4380812])
+        assert index.lookup("chr1", positions).tolist() == [-1, 1, 1, 2, 3, -1]
+
+    def test_lookup_unknown_chrom(self, index):
+        import numpy as np
+
+        assert index.lookup("chr2", np.array([20000])).tolist() == [-1]
+
+    def test_assign_sets_block_ids(self, index):
+        from vcf_pg_loader.models import VariantRecord
+
+        batch = [
+            VariantRecord(
+                chrom=chrom, pos=pos, ref="A", alt="G", qual=None, filter=[], rs_id=None, info={}
+            )
+            for chrom, pos in [("chr1", 2000000), ("1", 500000), ("chr1", 5)]
+        ]
+
+        assert index.assign(batch) == 2
+        assert [r.ld_block_id for r in batch] == [2, 1, None]
+
+
 class TestLDBlockNormalization:
     """Unit tests for chromosome normalization."""
 
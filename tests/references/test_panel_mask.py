@@ -0,0 +1,187 @@
+"""Tests for multi-panel membership bitmasks."""
+
+from pathlib import Path
+
+import asyncpg
+import numpy as np
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.fixture
+def postgres_container():
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def db_pool(postgres_container):
+    pool = await asyncpg.create_pool(
+        host=postgres_container.get_container_host_ip(),
+        port=postgres_container.get_exposed_port(5432),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+        min_size=1,
+        max_size=4,
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+def db_url(postgres_container):
+    host = postgres_container.get_container_host_ip()
+    port = postgres_container.get_exposed_port(5432)
+    user = postgres_container.username
+    password = postgres_container.password
+    database = postgres_container.dbname
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+
+def _record(chrom, pos, ref, alt):
+    from vcf_pg_loader.models import VariantRecord
+
+    return VariantRecord(
+        chrom=chrom, pos=pos, ref=ref, alt=alt, qual=None, filter=[], rs_id=None, info={}
+    )
+
+
+class TestPanelMaskIndex:
+    @pytest.fixture
+    def index(self):
+        from vcf_pg_loader.references.panel_mask import PanelMaskIndex, _ChromPanelEntries
+
+        return PanelMaskIndex(
+            bits={"a": 0, "b": 1},
+            chromosomes={
+                "1": _ChromPanelEntries(
+                    positions=np.array([100, 200, 300]),
+                    pairs=np.array([0, 1, 2]),
+                    masks=np.array([0b11, 0b01, 0b10]),
+                )
+            },
+            pair_codes={"A/G": 0, "C/T": 1, "A/T": 2},
+        )
+
+    def test_matches_flipped_and_complemented_alleles(self, index):
+        batch = [
+            _record("chr1", 100, "G", "A"),
+            _record("chr1", 200, "G", "A"),
+            _record("chr1", 300, "A", "T"),
+            _record("chr1", 200, "C", "G"),
+            _record("chr2", 100, "A", "G"),
+        ]
+
+        assert index.assign(batch) == 3
+        assert [r.panel_mask for r in batch] == [0b11, 0b01, 0b10, 0, 0]
+
+    def test_ambiguous_snps_not_complemented(self, index):
+        batch = [_record("chr1", 300, "T", "A"), _record("chr1", 300, "C", "G")]
+
+        index.assign(batch)
+
+        assert [r.panel_mask for r in batch] == [0b10, 0]
+
+
+@pytest.mark.integration
+class TestPanelMaskLoading:
+    @pytest.mark.asyncio
+    async def test_masks_assigned_and_filtered(self, db_pool, db_url, tmp_path):
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+        from vcf_pg_loader.references.panel_mask import panel_filter_sql
+        from vcf_pg_loader.references.panels import ReferencePanelLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+        from vcf_pg_loader.tls import TLSConfig
+
+        array = tmp_path / "array.tsv"
+        array.write_text(
+            "rsid\tchrom\tposition\ta1\ta2\n"
+            "rs3094315\t1\t752566\tA\tG\n"
+            ".\t1\t850000\tA\tT\n"
+            ".\t10\t100000\tC\tA\n"
+        )
+        schema_manager = SchemaManager()
+        async with db_pool.acquire() as conn:
+            await schema_manager.create_schema(conn)
+            await schema_manager.create_indexes(conn)
+            # Schema from before panel_mask existed
+            await conn.execute("ALTER TABLE variants DROP COLUMN panel_mask")
+            await ReferenceSchemaManager().create_reference_panels_table(conn)
+            panel_loader = ReferencePanelLoader()
+            await panel_loader.load_panel(conn, FIXTURES_DIR / "hapmap3_test.tsv", "hapmap3")
+            await panel_loader.load_panel(conn, array, "array")
+
+        config = LoadConfig(
+            batch_size=100,
+            drop_indexes=False,
+            panel_mask_panels=["hapmap3", "array", "not_loaded"],
+            tls_config=TLSConfig(require_tls=False, verify_server=False),
+        )
+        async with VCFLoader(db_url, config) as vcf_loader:
+            with pytest.raises(ValueError, match="no panel_mask column"):
+                await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        async with db_pool.acquire() as conn:
+            await ReferenceSchemaManager().add_panel_mask_column(conn)
+        async with VCFLoader(db_url, config) as vcf_loader:
+            await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        async def count(include, exclude):
+            sql, params = await panel_filter_sql(conn, include, exclude)
+            return await conn.fetchval(f"SELECT COUNT(*) FROM variants WHERE {sql}", *params)
+
+        async with db_pool.acquire() as conn:
+            assert await count(["hapmap3"], None) == 7
+            assert await count(["array"], None) == 3
+            assert await count(["hapmap3", "array"], None) == 1
+            assert await count(["hapmap3"], ["array"]) == 6
+            assert await count(["array"], ["hapmap3"]) == 2
+
+            with pytest.raises(ValueError, match="not_loaded"):
+                await panel_filter_sql(conn, ["not_loaded"])
+
+            sql, params = await panel_filter_sql(conn, ["hapmap3"], ["array"])
+            await conn.execute("SET enable_seqscan = off")
+            plan = "\n".join(
+                row[0]
+                for row in await conn.fetch(f"EXPLAIN SELECT * FROM variants WHERE {sql}", *params)
+            )
+            assert "Bitmap Index Scan" in plan
+
+    @pytest.mark.asyncio
+    async def test_plain_load_without_panel_mask_column(self, db_pool, db_url):
+        from vcf_pg_loader.db_loader import load_variants
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+        from vcf_pg_loader.models import VariantRecord
+        from vcf_pg_loader.schema import SchemaManager
+        from vcf_pg_loader.tls import TLSConfig
+
+        schema_manager = SchemaManager()
+        async with db_pool.acquire() as conn:
+            await schema_manager.create_schema(conn)
+            await schema_manager.create_indexes(conn)
+            # Schema from before panel_mask existed
+            await conn.execute("ALTER TABLE variants DROP COLUMN panel_mask")
+
+        config = LoadConfig(
+            batch_size=100,
+            tls_config=TLSConfig(require_tls=False, verify_server=False),
+        )
+        async with VCFLoader(db_url, config) as vcf_loader:
+            result = await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        async with db_pool.acquire() as conn:
+            record = VariantRecord(
+                chrom="chr1", pos=100, ref="A", alt="G", qual=None, filter=[], rs_id=None, info={}
+            )
+            assert await load_variants(conn, [record]) == 1
+            assert await conn.fetchval("SELECT COUNT(*) FROM variants") == (
+                result["variants_loaded"] + 1
+            )
+            assert not await conn.fetchval(
+                "SELECT EXISTS (SELECT FROM pg_indexes WHERE indexname = 'idx_variants_panel_bits')"
+            )
@@ -0,0 +1,189 @@
+"""Tests for generic reference panel ingestion and panel-driven flagging."""
+
+import gzip
+from pathlib import Path
+
+import asyncpg
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.fixture
+def postgres_container():
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def db_pool(postgres_container):
+    pool = await asyncpg.create_pool(
+        host=postgres_container.get_container_host_ip(),
+        port=postgres_container.get_exposed_port(5432),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+        min_size=1,
+        max_size=4,
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+def db_url(postgres_container):
+    host = postgres_container.get_container_host_ip()
+    port = postgres_container.get_exposed_port(5432)
+    user = postgres_container.username
+    password = postgres_container.password
+    database = postgres_container.dbname
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+
+class TestPanelColumns:
+    def test_hapmap3_header(self):
+        from vcf_pg_loader.references.panels import resolve_panel_columns
+
+        indices = resolve_panel_columns(["rsid", "chrom", "position", "a1", "a2"])
+
+        assert indices == {"rsid": 0, "chrom": 1, "position": 2, "a1": 3, "a2": 4}
+
+    def test_ldpred2_map_header(self):
+        from vcf_pg_loader.references.panels import resolve_panel_columns
+
+        indices = resolve_panel_columns(["chr", "pos", "a0", "a1", "rsid"])
+
+        assert indices == {"rsid": 4, "chrom": 0, "position": 1, "a1": 2, "a2": 3}
+
+    def test_missing_columns(self):
+        from vcf_pg_loader.references.panels import resolve_panel_columns
+
+        with pytest.raises(ValueError, match="position"):
+            resolve_panel_columns(["SNP", "CHR", "A1", "A2"])
+
+    def test_read_gzipped_bim(self, tmp_path):
+        from vcf_pg_loader.references.panels import read_panel_rows
+
+        bim = tmp_path / "array.bim.gz"
+        with gzip.open(bim, "wt") as f:
+            f.write("1\trs3094315\t0\t752566\tG\tA\n")
+            f.write("chr1\t.\t0\t752721\tA\tG\n")
+            f.write("1\trs1\t0\t800000\tACGTACGTACGT\tA\n")
+            f.write("chrUn_gl000220\trs2\t0\t100\tC\tT\n")
+
+        stats = {"rows_read": 0, "rows_skipped": 0}
+        rows = list(read_panel_rows(bim, "array", stats))
+
+        assert rows == [
+            ("array", "rs3094315", "1", 752566, "G", "A"),
+            ("array", None, "1", 752721, "A", "G"),
+        ]
+        assert stats == {"rows_read": 4, "rows_skipped": 2}
+
+    def test_long_ids_stored_as_null_rsid(self, tmp_path):
+        from vcf_pg_loader.references.panels import read_panel_rows
+
+        panel = tmp_path / "ukb.tsv"
+        panel.write_text(
+            "variant_id\tchrom\tpos\tref\talt\n"
+            "1:752566:G:A_long_variant_id\t1\t752566\tG\tA\n"
+            "rs3131972\t1\t752721\tA\tG\n"
+        )
+
+        stats = {"rows_read": 0, "rows_skipped": 0}
+        rows = list(read_panel_rows(panel, "ukb", stats))
+
+        assert rows == [
+            ("ukb", None, "1", 752566, "G", "A"),
+            ("ukb", "rs3131972", "1", 752721, "A", "G"),
+        ]
+        assert stats == {"rows_read": 2, "rows_skipped": 0}
+
+    def test_short_and_malformed_rows_skipped(self, tmp_path):
+        from vcf_pg_loader.references.panels import read_panel_rows
+
+        panel = tmp_path / "map_ldref.txt"
+        panel.write_text(
+            "chr pos a0 a1 rsid\n"
+            "1 752566 G A rs3094315\n"
+            "1 752721 A G\n"
+            "1 NA A G rs3131972\n"
+            "\n"
+        )
+
+        stats = {"rows_read": 0, "rows_skipped": 0}
+        rows = list(read_panel_rows(panel, "ldpred2", stats))
+
+        assert rows == [("ldpred2", "rs3094315", "1", 752566, "G", "A")]
+        assert stats == {"rows_read": 3, "rows_skipped": 2}
+
+
+@pytest.mark.integration
+class TestReferencePanelLoader:
+    @pytest.mark.asyncio
+    async def test_load_panel_deduplicates_and_replaces(self, db_pool, tmp_path):
+        from vcf_pg_loader.references.panels import ReferencePanelLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+
+        panel = tmp_path / "custom.txt"
+        panel.write_text(
+            "SNP CHR BP A1 A2\n"
+            "rs3094315 1 752566 G A\n"
+            "rs3094315 1 752566 G A\n"
+            "rs3131972 1 752721 A G\n"
+        )
+        loader = ReferencePanelLoader(batch_size=2)
+
+        async with db_pool.acquire() as conn:
+            await ReferenceSchemaManager().create_reference_panels_table(conn)
+            result = await loader.load_panel(conn, panel, "custom")
+            assert result == {
+                "panel_name": "custom",
+                "rows_read": 3,
+                "rows_skipped": 0,
+                "variants_loaded": 2,
+            }
+
+            panel.write_text("SNP CHR BP A1 A2\nrs3131972 1 752721 A G\n")
+            await loader.load_panel(conn, panel, "custom")
+            count = await conn.fetchval(
+                "SELECT COUNT(*) FROM reference_panels WHERE panel_name = 'custom'"
+            )
+            assert count == 1
+
+    @pytest.mark.asyncio
+    async def test_flag_variants_with_named_panel(self, db_pool, db_url):
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+        from vcf_pg_loader.references.panels import ReferencePanelLoader
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+        from vcf_pg_loader.tls import TLSConfig
+
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn)
+            await ReferenceSchemaManager().create_reference_panels_table(conn)
+            await ReferencePanelLoader().load_panel(
+                conn, FIXTURES_DIR / "hapmap3_test.tsv", "array_content"
+            )
+
+        config = LoadConfig(
+            batch_size=100,
+            drop_indexes=False,
+            flag_panel="array_content",
+            tls_config=TLSConfig(require_tls=False, verify_server=False),
+        )
+        async with VCFLoader(db_url, config) as vcf_loader:
+            await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        async with db_pool.acquire() as conn:
+            bit = await conn.fetchval(
+                "SELECT bit FROM panel_bits WHERE panel_name = 'array_content'"
+            )
+            flagged = await conn.fetchval(
+                "SELECT COUNT(*) FROM variants WHERE panel_mask & (1::bigint << $1) <> 0", bit
+            )
+            in_hapmap3 = await conn.fetchval("SELECT COUNT(*) FROM variants WHERE in_hapmap3")
+
+        assert flagged > 0
+        assert in_hapmap3 == 0
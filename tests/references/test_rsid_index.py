@@ -0,0 +1,250 @@
+"""Tests for the dbSNP rsID resolution index."""
+
+from pathlib import Path
+
+import asyncpg
+import pytest
+from testcontainers.postgres import PostgresContainer
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+DBSNP_VCF = (
+    "##fileformat=VCFv4.2\n"
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+    "NC_000002.12\t1\trs1\tA\tC\t.\t.\t.\n"
+    "NC_000023.11\t5000\trs2\tG\tT\t.\t.\t.\n"
+    "NW_025791756.1\t10\trs3\tC\tG\t.\t.\t.\n"
+    "chr1\t752566\trs3094315\tG\tA\t.\t.\t.\n"
+    "chr1\t752721\trs5555;rs6666\tA\tG,T\t.\t.\t.\n"
+    "chr2\t1000\t.\tC\tT\t.\t.\t.\n"
+)
+
+
+@pytest.fixture
+def postgres_container():
+    with PostgresContainer("postgres:15") as postgres:
+        yield postgres
+
+
+@pytest.fixture
+async def db_pool(postgres_container):
+    pool = await asyncpg.create_pool(
+        host=postgres_container.get_container_host_ip(),
+        port=postgres_container.get_exposed_port(5432),
+        user=postgres_container.username,
+        password=postgres_container.password,
+        database=postgres_container.dbname,
+        min_size=1,
+        max_size=2,
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+def db_url(postgres_container):
+    host = postgres_container.get_container_host_ip()
+    port = postgres_container.get_exposed_port(5432)
+    user = postgres_container.username
+    password = postgres_container.password
+    database = postgres_container.dbname
+    return f"postgresql://{user}:{password}@{host}:{port}/{database}"
+
+
+@pytest.fixture
+def dbsnp_files(tmp_path):
+    vcf = tmp_path / "dbsnp.vcf"
+    vcf.write_text(DBSNP_VCF)
+    merges = tmp_path / "merged.tsv"
+    merges.write_text("old\tcurrent\nrs999\trs998\nrs998\trs3094315\nrs777\trs404\n")
+    return vcf, merges
+
+
+class TestParsing:
+    def test_parse_rsid(self):
+        from vcf_pg_loader.references.rsid_index import parse_rsid
+
+        assert parse_rsid("rs123") == 123
+        assert parse_rsid("RS7") == 7
+        assert parse_rsid("42") == 42
+        assert parse_rsid("1:1000:A:G") is None
+        assert parse_rsid(None) is None
+
+    def test_normalize_dbsnp_chrom(self):
+        from vcf_pg_loader.references.rsid_index import normalize_dbsnp_chrom
+
+        assert normalize_dbsnp_chrom("NC_000001.11") == "1"
+        assert normalize_dbsnp_chrom("NC_000022.11") == "22"
+        assert normalize_dbsnp_chrom("NC_000023.11") == "X"
+        assert normalize_dbsnp_chrom("NC_000024.10") == "Y"
+        assert normalize_dbsnp_chrom("NC_012920.1") == "MT"
+        assert normalize_dbsnp_chrom("NT_187361.1") is None
+        assert normalize_dbsnp_chrom("NW_025791756.1") is None
+        assert normalize_dbsnp_chrom("chr7") == "7"
+
+    def test_read_dbsnp_vcf_splits_alts_and_ids(self, dbsnp_files):
+        from vcf_pg_loader.references.rsid_index import read_dbsnp_vcf
+
+        rows = list(read_dbsnp_vcf(dbsnp_files[0]))
+
+        assert (3094315, "1", 752566, "G", "A") in rows
+        assert [r for r in rows if r[0] == 5555] == [
+            (5555, "1", 752721, "A", "G"),
+            (5555, "1", 752721, "A", "T"),
+        ]
+        assert sum(r[0] == 6666 for r in rows) == 2
+        assert all(r[2] != 1000 for r in rows)
+        assert (1, "2", 1, "A", "C") in rows
+        assert (2, "X", 5000, "G", "T") in rows
+        assert all(r[0] != 3 for r in rows)
+
+    def test_read_rsid_merges_skips_header(self, dbsnp_files):
+        from vcf_pg_loader.references.rsid_index import read_rsid_merges
+
+        assert list(read_rsid_merges(dbsnp_files[1])) == [(999, 998), (998, 3094315), (777, 404)]
+
+
+@pytest.mark.integration
+class TestRsidIndex:
+    @pytest.mark.asyncio
+    async def test_build_and_resolve(self, db_pool, dbsnp_files, tmp_path):
+        from vcf_pg_loader.references.rsid_index import (
+            RsidIndex,
+            RsidTableLoader,
+            build_rsid_index,
+        )
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+
+        async with db_pool.acquire() as conn:
+            await ReferenceSchemaManager().create_rsid_tables(conn)
+            result = await RsidTableLoader(batch_size=2).load_dbsnp(conn, *dbsnp_files)
+            assert result == {"rsids_loaded": 7, "merges_loaded": 3}
+
+            build = await build_rsid_index(conn, tmp_path / "index", fetch_size=2)
+
+        assert build["rows"] == 9
+        index = RsidIndex.open(tmp_path / "index")
+        assert len(index) == 9
+        assert list(index.rsids) == sorted(index.rsids)
+
+        assert index.lookup("rs999") == [("1", 752566, "G", "A")]
+        assert index.lookup(998) == [("1", 752566, "G", "A")]
+        assert index.lookup("rs5555") == [("1", 752721, "A", "G"), ("1", 752721, "A", "T")]
+        assert index.lookup("rs777") == []
+        assert index.lookup("rs2") == [("X", 5000, "G", "T")]
+
+        offsets, rows = index.resolve(["rs6666", None, "rs1", "not-an-rsid", "rs3094315"])
+        assert list(offsets) == [0, 2, 2, 3, 3, 4]
+        assert index.record(int(rows[2])) == ("2", 1, "A", "C")
+
+    @pytest.mark.asyncio
+    async def test_build_normalizes_stored_refseq_contigs(self, db_pool, tmp_path):
+        from vcf_pg_loader.references.rsid_index import RsidIndex, build_rsid_index
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+
+        async with db_pool.acquire() as conn:
+            await ReferenceSchemaManager().create_rsid_tables(conn)
+            await conn.execute("TRUNCATE dbsnp_rsids, rsid_merges")
+            await conn.execute(
+                """
+                INSERT INTO dbsnp_rsids VALUES
+                    (10, 'NC_000001.11', 100, 'A', 'G'),
+                    (11, 'NT_187361.1', 200, 'C', 'T'),
+                    (12, '1', 300, 'G', 'C')
+                """
+            )
+            build = await build_rsid_index(conn, tmp_path / "index")
+
+        assert build == {"path": str(tmp_path / "index"), "rows": 2, "chromosomes": 1}
+        index = RsidIndex.open(tmp_path / "index")
+        assert index.lookup("rs10") == [("1", 100, "A", "G")]
+        assert index.lookup("rs11") == []
+
+    @pytest.mark.asyncio
+    async def test_build_rejects_too_many_chromosomes(self, db_pool, tmp_path):
+        from vcf_pg_loader.references.rsid_index import build_rsid_index
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+
+        async with db_pool.acquire() as conn:
+            await ReferenceSchemaManager().create_rsid_tables(conn)
+            await conn.execute("TRUNCATE dbsnp_rsids, rsid_merges")
+            await conn.execute(
+                """
+                INSERT INTO dbsnp_rsids
+                SELECT i, 'contig' || i, 1, 'A', 'G' FROM generate_series(1, 257) AS i
+                """
+            )
+            with pytest.raises(ValueError, match="Too many chromosomes"):
+                await build_rsid_index(conn, tmp_path / "index")
+
+    def test_open_rejects_other_directories(self, tmp_path):
+        from vcf_pg_loader.references.rsid_index import RsidIndex
+
+        (tmp_path / "manifest.json").write_text('{"format": "something-else"}')
+
+        with pytest.raises(ValueError, match="not an rsID index"):
+            RsidIndex.open(tmp_path)
+
+
+@pytest.mark.integration
+class TestRsidOnlyImport:
+    @pytest.mark.asyncio
+    async def test_pgs_weights_resolved_through_index(self, db_pool, db_url, dbsnp_files, tmp_path):
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+        from vcf_pg_loader.prs import PGSLoader, PRSSchemaManager
+        from vcf_pg_loader.references.rsid_index import (
+            RsidIndex,
+            RsidTableLoader,
+            build_rsid_index,
+        )
+        from vcf_pg_loader.references.schema import ReferenceSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+        from vcf_pg_loader.tls import TLSConfig
+
+        pgs = tmp_path / "rsid_only.txt"
+        pgs.write_text(
+            "###PGS CATALOG SCORING FILE\n"
+            "#pgs_id=PGS999999\n"
+            "#genome_build=GRCh38\n"
+            "rsID\teffect_allele\tother_allele\teffect_weight\n"
+            "rs999\tA\tG\t0.1\n"
+            "rs5555\tg\ta\t0.2\n"
+            "rs6666\tC\tA\t0.3\n"
+            "rs404\tA\tG\t0.4\n"
+        )
+
+        async with db_pool.acquire() as conn:
+            await SchemaManager().create_schema(conn)
+            await PRSSchemaManager().create_prs_schema(conn)
+            await ReferenceSchemaManager().create_rsid_tables(conn)
+            await RsidTableLoader().load_dbsnp(conn, *dbsnp_files)
+            await build_rsid_index(conn, tmp_path / "index")
+
+        config = LoadConfig(
+            batch_size=100,
+            drop_indexes=False,
+            tls_config=TLSConfig(require_tls=False, verify_server=False),
+        )
+        async with VCFLoader(db_url, config) as vcf_loader:
+            await vcf_loader.load_vcf(FIXTURES_DIR / "hapmap3_overlap.vcf")
+
+        loader = PGSLoader(batch_size=3)
+        async with db_pool.acquire() as conn:
+            without_index = await loader.import_pgs(conn, pgs)
+            assert without_index["weights_matched"] == 0
+
+            result = await loader.import_pgs(
+                conn, pgs, rsid_index=RsidIndex.open(tmp_path / "index")
+            )
+            assert result["weights_imported"] == 4
+            assert result["weights_matched"] == 2
+
+            rows = await conn.fetch("""
+                SELECT w.rsid, v.pos FROM prs_weights w
+                JOIN variants v ON v.variant_id = w.variant_id
+                WHERE w.pgs_id = 'PGS999999' ORDER BY v.pos
+            """)
+            assert [(r["rsid"], r["pos"]) for r in rows] == [
+                ("rs999", 752566),
+                ("rs5555", 752721),
+            ]
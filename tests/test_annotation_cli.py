@@ -301,6 +301,53 @@ class TestAnnotateCommand:
 
         assert result.exit_code == 0, f"Failed: {result.output}"
 
+    @pytest.mark.integration
+    def test_annotate_explain(self, tmp_path, postgres_container):
+        import uuid
+
+        from vcf_pg_loader.cli import app
+
+        db_vcf, _ = generate_overlapping_variants(n_shared=10, n_query_only=0, n_db_only=10, seed=7)
+        db_vcf_path = write_annotation_vcf(tmp_path / "gnomad.vcf", db_vcf)
+        config_path = tmp_path / "gnomad.json"
+        config_path.write_text(json.dumps(get_gnomad_field_config()))
+
+        cli_url, env = get_db_cli_params(postgres_container.get_connection_url())
+        runner.invoke(
+            app,
+            [
+                "load-annotation",
+                str(db_vcf_path),
+                "--name",
+                "gnomad_explain_test",
+                "--config",
+                str(config_path),
+                "--db",
+                cli_url,
+            ],
+            env=env,
+        )
+
+        result = runner.invoke(
+            app,
+            [
+                "annotate",
+                str(uuid.uuid4()),
+                "--source",
+                "gnomad_explain_test",
+                "--filter",
+                "gnomad_af < 0.01",
+                "--explain",
+                "--db",
+                cli_url,
+            ],
+            env=env,
+        )
+
+        assert result.exit_code == 0, f"Failed: {result.output}"
+        assert "$2::float8" in result.output
+        assert "Parameters:" in result.output
+
     @pytest.mark.integration
     def test_annotate_output_formats(self, tmp_path, postgres_container):
         from vcf_pg_loader.cli import app
@@ -9,6 +9,8 @@ See tests/vendored/echtvar/ATTRIBUTION.md for full attribution.
 """
 
 import json
+from contextlib import aclosing
+from pathlib import Path
 
 import pytest
 
@@ -157,16 +159,37 @@ class TestAnnotationSchemaCreation:
 
         fields = load_field_config(config_path)
         manager = AnnotationSchemaManager()
-        await manager.create_annotation_source_table(db_conn, "gnomad_idx_test", fields)
+        await manager.create_annotation_source_table(
+            db_conn, "gnomad_idx_test", fields, primary_key=False
+        )
         await manager.create_variant_lookup_index(db_conn, "gnomad_idx_test")
 
         indexes = await db_conn.fetch("""
-            SELECT indexname FROM pg_indexes
+            SELECT indexdef FROM pg_indexes
             WHERE tablename = 'anno_gnomad_idx_test'
         """)
-        index_names = [r["indexname"] for r in indexes]
 
-        assert any("lookup" in name for name in index_names)
+        assert len(indexes) == 1
+        assert "(chrom, pos, ref, alt)" in indexes[0]["indexdef"]
+        assert await manager.has_primary_key(db_conn, "gnomad_idx_test")
+
+    async def test_annotation_table_partitioned_like_variants(self, db_conn):
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_schema import AnnotationSchemaManager
+
+        fields = [AnnotationFieldConfig(field="AF", alias="part_af", field_type="Float")]
+        await AnnotationSchemaManager().create_annotation_source_table(db_conn, "part_test", fields)
+
+        query = """
+            SELECT pg_get_expr(c.relpartbound, c.oid) AS bound
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = $1::regclass
+        """
+        anno_bounds = {r["bound"] for r in await db_conn.fetch(query, "anno_part_test")}
+        variant_bounds = {r["bound"] for r in await db_conn.fetch(query, "variants")}
+
+        assert len(anno_bounds) == 26
+        assert anno_bounds == variant_bounds
 
 
 @pytest.mark.integration
@@ -277,6 +300,169 @@ class TestAnnotationLoading:
         )
         assert row["version"] == "v3.1.2"
 
+    async def test_duplicate_records_keep_first_occurrence(self, db_conn, tmp_path):
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+
+        vcf_path = write_annotation_vcf(tmp_path / "dups.vcf", DUPLICATE_SITES_VCF)
+        fields = [AnnotationFieldConfig(field="AF", alias="dup_af", field_type="Float")]
+
+        loader = AnnotationLoader(batch_size=2)
+        result = await loader.load_annotation_source(
+            vcf_path=vcf_path,
+            source_name="dup_sites",
+            field_config=fields,
+            conn=db_conn,
+        )
+
+        assert result["variants_loaded"] == 3
+        rows = await db_conn.fetch("SELECT pos, alt, dup_af FROM anno_dup_sites ORDER BY pos, alt")
+        assert [(r["pos"], r["alt"], r["dup_af"]) for r in rows] == [
+            (100, "G", pytest.approx(0.1)),
+            (100, "T", pytest.approx(0.3)),
+            (200, "C", pytest.approx(0.4)),
+        ]
+        staging = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM pg_tables WHERE tablename LIKE 'staging\\_anno\\_dup\\_sites%'"
+        )
+        assert staging == 0
+
+    async def test_reload_keeps_registry_count(self, db_conn, tmp_path):
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+
+        vcf_path = write_annotation_vcf(tmp_path / "dups.vcf", DUPLICATE_SITES_VCF)
+        fields = [AnnotationFieldConfig(field="AF", alias="reload_af", field_type="Float")]
+
+        loader = AnnotationLoader()
+        await loader.load_annotation_source(vcf_path, "reload_sites", fields, db_conn)
+        result = await loader.load_annotation_source(vcf_path, "reload_sites", fields, db_conn)
+
+        assert result["variants_loaded"] == 0
+        count = await db_conn.fetchval(
+            "SELECT variant_count FROM annotation_sources WHERE name = 'reload_sites'"
+        )
+        assert count == 3
+
+    async def test_assume_unique_skips_dedupe(self, db_conn, tmp_path):
+        from vcf_pg_loader.annotation_config import load_field_config
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+
+        vcf_path = write_annotation_vcf(
+            tmp_path / "gnomad.vcf",
+            generate_gnomad_vcf_content(n_variants=50, seed=7),
+        )
+        config_path = tmp_path / "gnomad.json"
+        config_path.write_text(json.dumps(get_gnomad_field_config()))
+        fields = load_field_config(config_path)
+
+        loader = AnnotationLoader(assume_unique=True)
+        result = await loader.load_annotation_source(
+            vcf_path=vcf_path,
+            source_name="gnomad_unique",
+            field_config=fields,
+            conn=db_conn,
+        )
+
+        assert result["variants_loaded"] == 50
+        assert await db_conn.fetchval("SELECT COUNT(*) FROM anno_gnomad_unique") == 50
+
+
+DUPLICATE_SITES_VCF = """##fileformat=VCFv4.2
+##contig=<ID=chr1,length=1000>
+##INFO=<ID=AF,Number=A,Type=Float,Description="Allele frequency">
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO
+chr1\t100\t.\tA\tG\t.\tPASS\tAF=0.1
+chr1\t100\t.\tA\tG\t.\tPASS\tAF=0.2
+chr1\t100\t.\tA\tT\t.\tPASS\tAF=0.3
+chr1\t200\t.\tG\tC\t.\tPASS\tAF=0.4
+chr1\t200\t.\tG\tC\t.\tPASS\tAF=0.5
+"""
+
+
+MULTI_CONTIG_VCF = Path(__file__).parent / "fixtures" / "annotation_multi_contig.vcf.gz"
+
+
+class TestIndexedContigs:
+    """Test contig discovery for parallel annotation loading."""
+
+    def test_contigs_ordered_longest_first(self):
+        from vcf_pg_loader.annotation_loader import indexed_contigs
+
+        assert indexed_contigs(MULTI_CONTIG_VCF) == ["chr1", "chr2", "chrX", "chr21"]
+
+    def test_unindexed_vcf_has_no_contigs(self, tmp_path):
+        from vcf_pg_loader.annotation_loader import indexed_contigs
+
+        vcf_path = write_annotation_vcf(tmp_path / "dups.vcf", DUPLICATE_SITES_VCF)
+
+        assert indexed_contigs(vcf_path) == []
+
+
+@pytest.mark.integration
+class TestParallelAnnotationLoading:
+    """Test per-contig annotation loading across worker processes."""
+
+    @pytest.fixture
+    async def db(self, postgres_container):
+        import asyncpg
+
+        from vcf_pg_loader.schema import SchemaManager
+
+        db_url = fix_postgres_url(postgres_container.get_connection_url())
+        conn = await asyncpg.connect(db_url)
+        await SchemaManager(human_genome=True).create_schema(conn)
+        yield conn, db_url
+        await conn.close()
+
+    async def test_parallel_matches_sequential(self, db, caplog):
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+
+        conn, db_url = db
+        fields = [
+            AnnotationFieldConfig(field="AC", alias="mc_ac", field_type="Integer"),
+            AnnotationFieldConfig(field="AF", alias="mc_af", field_type="Float"),
+        ]
+
+        sequential = await AnnotationLoader().load_annotation_source(
+            MULTI_CONTIG_VCF, "multi_contig_seq", fields, conn
+        )
+        with caplog.at_level("INFO", logger="vcf_pg_loader.annotation_loader"):
+            parallel = await AnnotationLoader(workers=3, batch_size=7).load_annotation_source(
+                MULTI_CONTIG_VCF, "multi_contig_par", fields, conn, db_url=db_url
+            )
+
+        assert "Staged 100 records from 4 contigs" in caplog.text
+
+        assert sequential["variants_loaded"] == parallel["variants_loaded"] == 99
+        query = "SELECT chrom::text, pos, ref, alt, mc_ac, mc_af FROM {} ORDER BY 1, 2, 3, 4"
+        assert await conn.fetch(query.format("anno_multi_contig_par")) == await conn.fetch(
+            query.format("anno_multi_contig_seq")
+        )
+        duplicate_ac = await conn.fetchval(
+            "SELECT mc_ac FROM anno_multi_contig_par WHERE chrom = 'chr2' AND mc_ac = 999"
+        )
+        assert duplicate_ac is None
+
+    async def test_primary_key_built_after_load(self, db):
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+
+        conn, db_url = db
+        fields = [AnnotationFieldConfig(field="AF", alias="pk_af", field_type="Float")]
+        loader = AnnotationLoader(workers=2)
+
+        await loader.load_annotation_source(
+            MULTI_CONTIG_VCF, "multi_contig_pk", fields, conn, db_url=db_url
+        )
+        assert await loader.schema_manager.has_primary_key(conn, "multi_contig_pk")
+
+        reload = await loader.load_annotation_source(
+            MULTI_CONTIG_VCF, "multi_contig_pk", fields, conn, db_url=db_url
+        )
+        assert reload["variants_loaded"] == 0
+
 
 @pytest.mark.integration
 class TestAnnotationLookup:
@@ -370,6 +556,61 @@ class TestAnnotationLookup:
             if r.get("gnomad_af") is not None:
                 assert r["gnomad_af"] < 0.01
 
+    async def test_single_chromosome_scans_one_partition(self, db_with_annotations):
+        from vcf_pg_loader.annotator import VariantAnnotator
+
+        conn = db_with_annotations["conn"]
+        annotator = VariantAnnotator(conn)
+        query, params = await annotator._build_annotation_query(
+            sources=["gnomad_test"],
+            load_batch_id=None,
+            filter_expr=None,
+            available_fields=set(),
+            limit=None,
+            chrom="1",
+        )
+
+        async with conn.transaction():
+            await conn.execute("SET LOCAL enable_partitionwise_join = on")
+            plan = "\n".join(r[0] for r in await conn.fetch(f"EXPLAIN {query}", *params))
+
+        assert "anno_gnomad_test_1 " in plan
+        assert "anno_gnomad_test_2 " not in plan
+        assert "variants_2 " not in plan
+
+        results = await annotator.annotate_variants(sources=["gnomad_test"], chrom="1")
+        assert results
+        assert {r["chrom"] for r in results} == {"chr1"}
+
+    async def test_filter_literals_bound_as_parameters(self, db_with_annotations):
+        from vcf_pg_loader.annotator import VariantAnnotator
+
+        annotator = VariantAnnotator(db_with_annotations["conn"])
+        query, params = await annotator._build_annotation_query(
+            sources=["gnomad_test"],
+            load_batch_id=None,
+            filter_expr="gnomad_af < 0.01",
+            available_fields={"gnomad_af"},
+            limit=5,
+            chrom=None,
+        )
+
+        assert "0.01" not in query
+        assert "a0.gnomad_af < $1::float8" in query
+        assert params == [0.01, 5]
+
+    async def test_explain_reports_plan(self, db_with_annotations):
+        from vcf_pg_loader.annotator import VariantAnnotator
+
+        annotator = VariantAnnotator(db_with_annotations["conn"])
+        plan = await annotator.explain(
+            sources=["gnomad_test"], filter_expr="gnomad_af < 0.01", analyze=True
+        )
+
+        assert "Parameters: [0.01]" in plan
+        assert "JOIN anno_gnomad_test a0" in plan
+        assert "actual time" in plan
+
     async def test_annotate_with_missing_value_filter(self, db_with_annotations):
         from vcf_pg_loader.annotator import VariantAnnotator
 
@@ -425,6 +666,99 @@ class TestAnnotationChrPrefixHandling:
         annotator.normalize_chr_prefix = True
 
 
+@pytest.mark.integration
+class TestBatchAnnotation:
+    """Test COPY-backed batch annotation streamed through a cursor."""
+
+    @pytest.fixture
+    async def annotator(self, postgres_container, tmp_path):
+        import asyncpg
+
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+        from vcf_pg_loader.annotator import VariantAnnotator
+        from vcf_pg_loader.schema import SchemaManager
+
+        conn = await asyncpg.connect(fix_postgres_url(postgres_container.get_connection_url()))
+        await SchemaManager(human_genome=True).create_schema(conn)
+        vcf_path = write_annotation_vcf(tmp_path / "dups.vcf", DUPLICATE_SITES_VCF)
+        fields = [AnnotationFieldConfig(field="AF", alias="batch_af", field_type="Float")]
+        await AnnotationLoader().load_annotation_source(vcf_path, "batch_sites", fields, conn)
+
+        yield VariantAnnotator(conn)
+        await conn.close()
+
+    async def test_annotate_batch(self, annotator):
+        results = await annotator.annotate_batch(
+            [("chr1", 100, "A", "G"), ("1", 200, "G", "C"), ("chrUn_x", 5, "A", "C")],
+            sources=["batch_sites"],
+        )
+
+        by_pos = {(r["chrom"], r["pos"]): r["batch_af"] for r in results}
+        assert by_pos[("chr1", 100)] == pytest.approx(0.1)
+        assert by_pos[("1", 200)] == pytest.approx(0.4)
+        assert by_pos[("chrUn_x", 5)] is None
+
+    async def test_streams_from_generator_input(self, annotator):
+        def variants():
+            for i in range(5000):
+                yield ("chr1", 100 + (i % 2) * 100, "A", "G")
+
+        count = 0
+        async for row in annotator.iter_annotate_batch(
+            variants(), ["batch_sites"], filter_expr="batch_af < 0.2", prefetch=100
+        ):
+            assert row["pos"] == 100
+            count += 1
+
+        assert count == 2500
+
+    async def test_selective_source_joined_first(self, annotator, tmp_path):
+        from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+
+        vcf_path = write_annotation_vcf(tmp_path / "second.vcf", DUPLICATE_SITES_VCF)
+        fields = [AnnotationFieldConfig(field="AF", alias="second_af", field_type="Float")]
+        await AnnotationLoader().load_annotation_source(
+            vcf_path, "second_sites", fields, annotator.conn
+        )
+
+        params: list = []
+        sql_filter, join_order = await annotator._plan_filter(
+            "batch_af > 0 && second_af < 0.2",
+            ["batch_sites", "second_sites"],
+            {"batch_af", "second_af"},
+            params,
+        )
+
+        assert join_order == [(1, True), (0, True)]
+        assert sql_filter.index("a1.second_af") < sql_filter.index("a0.batch_af")
+        assert params == [0, 0.2]
+
+        results = await annotator.annotate_batch(
+            [("chr1", 100, "A", "G"), ("chr1", 200, "G", "C")],
+            sources=["batch_sites", "second_sites"],
+            filter_expr="batch_af > 0 && second_af < 0.2",
+        )
+        assert [(r["pos"], r["batch_af"]) for r in results] == [(100, pytest.approx(0.1))]
+
+    async def test_temp_tables_do_not_outlive_iteration(self, annotator):
+        conn = annotator.conn
+        stream = annotator.iter_annotate_batch([("chr1", 100, "A", "G")] * 10, ["batch_sites"])
+        async with aclosing(stream) as rows:
+            async for _ in rows:
+                break
+        assert not conn.is_in_transaction()
+
+        await annotator.annotate_batch([("chr1", 100, "A", "T")], ["batch_sites"])
+
+        leftover = await conn.fetchval(
+            "SELECT COUNT(*) FROM pg_class WHERE relname LIKE 'temp_annotate_%'"
+        )
+        assert leftover == 0
+        assert not conn.is_in_transaction()
+
+
 class TestExpressionParser:
     """Test filter expression parsing."""
 
@@ -476,6 +810,56 @@ class TestExpressionParser:
 
         assert "=" in sql
 
+    def test_compile_binds_literals_as_parameters(self):
+        from vcf_pg_loader.expression import FilterExpressionParser
+
+        parser = FilterExpressionParser()
+        compiled = parser.compile(
+            "gnomad_af < 0.01 && (clinvar_sig == 'gnomad_af' || gnomad_ac > 5)",
+            {
+                "gnomad_af": "a0.gnomad_af",
+                "gnomad_ac": "a0.gnomad_ac",
+                "clinvar_sig": "a1.clinvar_sig",
+            },
+            param_offset=2,
+        )
+
+        assert compiled.sql == (
+            "a0.gnomad_af < $3::float8 AND (a1.clinvar_sig = $4 OR a0.gnomad_ac > $5)"
+        )
+        assert compiled.params == [0.01, "gnomad_af", 5]
+
+    def test_compile_tracks_null_rejecting_fields(self):
+        from vcf_pg_loader.expression import FilterExpressionParser
+
+        parser = FilterExpressionParser()
+        compiled = parser.compile(
+            "gnomad_af < 0.01 && (clinvar_sig IS NULL || gnomad_af > 0)",
+            {"gnomad_af": "gnomad_af", "clinvar_sig": "clinvar_sig"},
+        )
+
+        assert [c.strict_fields for c in compiled.conjuncts] == [{"gnomad_af"}, set()]
+
+    def test_parse_negation_and_mirrored_comparison(self):
+        from vcf_pg_loader.expression import FilterExpressionParser
+
+        parser = FilterExpressionParser()
+
+        assert parser.parse("!(gnomad_af < 0.01)", {"gnomad_af"}) == "gnomad_af >= 0.01"
+        assert parser.parse("0.01 > gnomad_af", {"gnomad_af"}) == "gnomad_af < 0.01"
+
+    def test_validate_reports_syntax_errors(self):
+        from vcf_pg_loader.expression import FilterExpressionParser
+
+        parser = FilterExpressionParser()
+
+        assert parser.validate("(gnomad_af < 0.01", {"gnomad_af"}) == ["Unbalanced parentheses"]
+        assert parser.validate("clinvar_sig == 'Path", {"clinvar_sig"}) == [
+            "Unclosed string literal"
+        ]
+        with pytest.raises(ValueError, match="Expected a comparison"):
+            parser.parse("gnomad_af 0.01", {"gnomad_af"})
+
 
 def generate_matching_vcfs(n_variants: int, seed: int = 42) -> tuple[str, str]:
     """Generate annotation DB and query VCF with 100% overlap for benchmarking."""
@@ -0,0 +1,337 @@
+"""Tests for annotating variants from local annotation snapshots during load."""
+
+import pytest
+
+from vcf_pg_loader.annotation_snapshot import AnnotationMapping, allele_key
+from vcf_pg_loader.models import VariantRecord
+
+SOURCE_VCF = """##fileformat=VCFv4.2
+##INFO=<ID=AF,Number=A,Type=Float,Description="Allele frequency">
+##INFO=<ID=SIG,Number=1,Type=String,Description="Clinical significance">
+##contig=<ID=chr1,length=248956422>
+##contig=<ID=chr2,length=242193529>
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO
+chr1\t100\t.\tA\tG\t.\tPASS\tAF=0.1;SIG=Benign
+chr1\t100\t.\tA\tT\t.\tPASS\tAF=0.3
+chr1\t100\t.\tA\tC\t.\tPASS\tAF=0.6;SIG=Pathogenic
+chr1\t200\t.\tG\tC\t.\tPASS\tSIG=Pathogenic
+chr2\t50\t.\tT\tTA\t.\tPASS\tAF=0.004
+"""
+
+QUERY_VCF = """##fileformat=VCFv4.2
+##contig=<ID=chr1,length=248956422>
+##contig=<ID=chr2,length=242193529>
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO
+chr1\t100\t.\tA\tT\t30\tPASS\t.
+chr1\t150\t.\tC\tG\t30\tPASS\t.
+chr1\t200\t.\tG\tC\t30\tPASS\t.
+chr2\t50\t.\tT\tTA\t30\tPASS\t.
+"""
+
+
+def fix_postgres_url(url: str) -> str:
+    """Convert testcontainers URL to asyncpg-compatible format."""
+    url = url.replace("postgresql+psycopg2://", "postgresql://")
+    return url + ("&" if "?" in url else "?") + "sslmode=disable"
+
+
+def make_record(chrom: str, pos: int, ref: str, alt: str) -> VariantRecord:
+    return VariantRecord(
+        chrom=chrom, pos=pos, ref=ref, alt=alt, qual=None, filter=[], rs_id=None, info={}
+    )
+
+
+class TestAnnotationMapping:
+    """Test parsing column=source.field mappings."""
+
+    def test_parse(self):
+        mapping = AnnotationMapping.parse("af_gnomad=gnomad_v3.gnomad_af")
+
+        assert mapping == AnnotationMapping("af_gnomad", "gnomad_v3", "gnomad_af")
+
+    def test_rejects_unknown_column(self):
+        with pytest.raises(ValueError, match="Cannot annotate column 'gene'"):
+            AnnotationMapping.parse("gene=gnomad_v3.gnomad_af")
+
+    def test_rejects_malformed_spec(self):
+        with pytest.raises(ValueError, match="Expected column=source.field"):
+            AnnotationMapping.parse("af_gnomad=gnomad_v3")
+
+    def test_rejects_unsafe_source_name(self):
+        with pytest.raises(ValueError):
+            AnnotationMapping.parse("af_gnomad=gnomad;drop.af")
+
+
+@pytest.fixture
+async def snapshot_db(postgres_container, tmp_path):
+    import asyncpg
+
+    from vcf_pg_loader.annotation_config import AnnotationFieldConfig
+    from vcf_pg_loader.annotation_loader import AnnotationLoader
+    from vcf_pg_loader.schema import SchemaManager
+
+    db_url = fix_postgres_url(postgres_container.get_connection_url())
+    conn = await asyncpg.connect(db_url)
+    await SchemaManager(human_genome=True).create_schema(conn)
+
+    vcf_path = tmp_path / "source.vcf"
+    vcf_path.write_text(SOURCE_VCF)
+    fields = [
+        AnnotationFieldConfig(field="AF", alias="snap_af", field_type="Float"),
+        AnnotationFieldConfig(field="SIG", alias="snap_sig", field_type="String"),
+    ]
+    await AnnotationLoader().load_annotation_source(vcf_path, "snap_src", fields, conn)
+
+    yield {"conn": conn, "db_url": db_url, "vcf_path": vcf_path, "fields": fields}
+    await conn.close()
+
+
+@pytest.mark.integration
+class TestAnnotationSnapshot:
+    """Test building, caching and matching snapshots."""
+
+    async def test_allele_key_matches_sql(self, snapshot_db):
+        from vcf_pg_loader.annotation_snapshot import _ALLELE_KEY_SQL
+
+        key = await snapshot_db["conn"].fetchval(
+            f"SELECT {_ALLELE_KEY_SQL} FROM (SELECT 'T'::text AS ref, 'TA'::text AS alt) s"
+        )
+
+        assert key == allele_key("T", "TA")
+
+    async def test_match_by_position_and_alleles(self, snapshot_db, tmp_path):
+        import numpy as np
+
+        from vcf_pg_loader.annotation_snapshot import AnnotationSnapshot
+
+        snapshot = await AnnotationSnapshot.open(
+            snapshot_db["conn"], "snap_src", ["snap_af", "snap_sig"], tmp_path / "cache"
+        )
+        variants = [(100, "A", "C"), (100, "A", "G"), (150, "C", "G"), (200, "G", "C")]
+        rows = snapshot.match(
+            "chr1",
+            np.array([v[0] for v in variants]),
+            np.array([allele_key(v[1], v[2]) for v in variants]),
+        )
+
+        assert rows[2] == -1
+        found = rows[rows >= 0]
+        assert snapshot.values("chr1", "snap_af", found) == [
+            pytest.approx(0.6),
+            pytest.approx(0.1),
+            None,
+        ]
+        assert snapshot.values("chr1", "snap_sig", found) == ["Pathogenic", "Benign", "Pathogenic"]
+
+    async def test_cached_until_source_reloaded(self, snapshot_db, tmp_path, monkeypatch):
+        from vcf_pg_loader.annotation_loader import AnnotationLoader
+        from vcf_pg_loader.annotation_snapshot import AnnotationSnapshot
+
+        conn = snapshot_db["conn"]
+        cache_dir = tmp_path / "cache"
+        await AnnotationSnapshot.open(conn, "snap_src", ["snap_af"], cache_dir)
+
+        builds = []
+        original_build = AnnotationSnapshot._build.__func__
+
+        async def counting_build(cls, *args):
+            builds.append(args[1])
+            return await original_build(cls, *args)
+
+        monkeypatch.setattr(AnnotationSnapshot, "_build", classmethod(counting_build))
+
+        await AnnotationSnapshot.open(conn, "snap_src", ["snap_af"], cache_dir)
+        assert builds == []
+
+        snapshot = await AnnotationSnapshot.open(conn, "snap_src", ["snap_sig"], cache_dir)
+        assert builds == ["snap_src"]
+        assert set(snapshot.fields) == {"snap_af", "snap_sig"}
+
+        await AnnotationLoader().load_annotation_source(
+            snapshot_db["vcf_path"], "snap_src", snapshot_db["fields"], conn
+        )
+        await AnnotationSnapshot.open(conn, "snap_src", ["snap_af"], cache_dir)
+        assert builds == ["snap_src", "snap_src"]
+        assert len(list(cache_dir.iterdir())) == 1
+
+    async def test_unknown_field_rejected(self, snapshot_db, tmp_path):
+        from vcf_pg_loader.annotation_snapshot import AnnotationSnapshot
+
+        with pytest.raises(ValueError, match="Unknown field"):
+            await AnnotationSnapshot.open(snapshot_db["conn"], "snap_src", ["nope"], tmp_path)
+
+    async def test_load_annotator_fills_records(self, snapshot_db, tmp_path):
+        from vcf_pg_loader.annotation_snapshot import LoadAnnotator
+
+        annotator = await LoadAnnotator.create(
+            snapshot_db["conn"],
+            [
+                AnnotationMapping("af_gnomad", "snap_src", "snap_af"),
+                AnnotationMapping("clinvar_sig", "snap_src", "snap_sig"),
+            ],
+            cache_dir=tmp_path,
+        )
+        batch = [
+            make_record("chr1", 100, "A", "T"),
+            make_record("1", 200, "G", "C"),
+            make_record("chr1", 150, "C", "G"),
+            make_record("chr2", 50, "T", "TA"),
+        ]
+
+        assert annotator.annotate(batch) == 3
+        assert batch[0].af_gnomad == pytest.approx(0.3)
+        assert batch[0].clinvar_sig is None
+        assert batch[1].af_gnomad is None
+        assert batch[1].clinvar_sig == "Pathogenic"
+        assert batch[2].af_gnomad is None
+        assert batch[3].af_gnomad == pytest.approx(0.004)
+
+
+@pytest.mark.integration
+class TestAnnotateOnLoad:
+    """Test VCFLoader filling annotation columns before COPY."""
+
+    async def test_load_writes_annotations(self, snapshot_db, tmp_path):
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+
+        query_path = tmp_path / "query.vcf"
+        query_path.write_text(QUERY_VCF)
+        config = LoadConfig(
+            batch_size=2,
+            normalize=False,
+            annotate_on_load=[
+                AnnotationMapping("af_gnomad", "snap_src", "snap_af"),
+                AnnotationMapping("clinvar_sig", "snap_src", "snap_sig"),
+            ],
+            annotation_cache_dir=tmp_path / "cache",
+        )
+
+        loader = VCFLoader(db_url=snapshot_db["db_url"], config=config)
+        try:
+            result = await loader.load_vcf(query_path)
+        finally:
+            await loader.close()
+
+        assert result["variants_annotated"] == 3
+        rows = await snapshot_db["conn"].fetch(
+            "SELECT chrom::text, pos, af_gnomad, clinvar_sig FROM variants "
+            "WHERE load_batch_id = $1 ORDER BY chrom, pos",
+            loader.load_batch_id,
+        )
+        values = {(r["chrom"], r["pos"]): (r["af_gnomad"], r["clinvar_sig"]) for r in rows}
+        assert values[("chr1", 100)] == (pytest.approx(0.3), None)
+        assert values[("chr1", 150)] == (None, None)
+        assert values[("chr1", 200)] == (None, "Pathogenic")
+        assert values[("chr2", 50)][0] == pytest.approx(0.004)
+
+
+@pytest.mark.integration
+class TestExportedSnapshot:
+    """Test exporting sources to compressed snapshot files and annotating offline."""
+
+    async def test_round_trip_across_blocks(self, snapshot_db, tmp_path):
+        import numpy as np
+
+        from vcf_pg_loader.annotation_snapshot import (
+            AnnotationSnapshotFile,
+            export_annotation_snapshot,
+        )
+
+        output = tmp_path / "snap_src.snapshot"
+        result = await export_annotation_snapshot(
+            snapshot_db["conn"], "snap_src", output, block_rows=2
+        )
+
+        assert result["variant_count"] == 5
+        assert result["blocks"] == {"chr1": 2, "chr2": 1}
+
+        snapshot = AnnotationSnapshotFile(output, cache_blocks=1)
+        variants = [(100, "A", "C"), (100, "A", "G"), (150, "C", "G"), (200, "G", "C")]
+        rows = snapshot.match(
+            "chr1",
+            np.array([v[0] for v in variants]),
+            np.array([allele_key(v[1], v[2]) for v in variants]),
+        )
+
+        assert rows[2] == -1
+        found = rows[rows >= 0]
+        assert snapshot.values("chr1", "snap_af", found) == [
+            pytest.approx(0.6),
+            pytest.approx(0.1),
+            None,
+        ]
+        assert snapshot.values("chr1", "snap_sig", found) == ["Pathogenic", "Benign", "Pathogenic"]
+        assert snapshot.match("chr3", np.array([1]), np.array([0])).tolist() == [-1]
+
+    async def test_export_selected_fields(self, snapshot_db, tmp_path):
+        from vcf_pg_loader.annotation_snapshot import (
+            AnnotationSnapshotFile,
+            export_annotation_snapshot,
+        )
+
+        output = tmp_path / "af.snapshot"
+        await export_annotation_snapshot(snapshot_db["conn"], "snap_src", output, ["snap_af"])
+
+        assert list(AnnotationSnapshotFile(output).fields) == ["snap_af"]
+        with pytest.raises(ValueError, match="Unknown field"):
+            await export_annotation_snapshot(snapshot_db["conn"], "snap_src", output, ["nope"])
+
+    def test_rejects_non_snapshot_directory(self, tmp_path):
+        from vcf_pg_loader.annotation_snapshot import AnnotationSnapshotFile
+
+        with pytest.raises(ValueError, match="Not an exported annotation snapshot"):
+            AnnotationSnapshotFile(tmp_path)
+
+    async def test_annotate_vcf_cli(self, snapshot_db, tmp_path):
+        import csv
+
+        from typer.testing import CliRunner
+
+        from vcf_pg_loader.annotation_snapshot import export_annotation_snapshot
+        from vcf_pg_loader.cli import app
+
+        snapshot_path = tmp_path / "snap_src.snapshot"
+        await export_annotation_snapshot(
+            snapshot_db["conn"], "snap_src", snapshot_path, block_rows=2
+        )
+        query_path = tmp_path / "query.vcf"
+        query_path.write_text(QUERY_VCF)
+        output = tmp_path / "annotated.tsv"
+
+        result = CliRunner().invoke(
+            app,
+            ["annotate-vcf", str(query_path), "--snapshot", str(snapshot_path), "-o", str(output)],
+        )
+
+        assert result.exit_code == 0, result.output
+        with open(output) as f:
+            rows = list(csv.DictReader(f, delimiter="\t"))
+        assert [r["pos"] for r in rows] == ["100", "150", "200", "50"]
+        assert float(rows[0]["snap_af"]) == pytest.approx(0.3)
+        assert rows[1]["snap_af"] == ""
+        assert rows[2]["snap_sig"] == "Pathogenic"
+
+    async def test_load_from_exported_snapshot(self, snapshot_db, tmp_path):
+        from vcf_pg_loader.annotation_snapshot import export_annotation_snapshot
+        from vcf_pg_loader.loader import LoadConfig, VCFLoader
+
+        snapshot_path = tmp_path / "snap_src.snapshot"
+        await export_annotation_snapshot(snapshot_db["conn"], "snap_src", snapshot_path)
+        query_path = tmp_path / "query.vcf"
+        query_path.write_text(QUERY_VCF)
+        config = LoadConfig(
+            batch_size=2,
+            normalize=False,
+            annotate_on_load=[AnnotationMapping("af_gnomad", "snap_src", "snap_af")],
+            annotation_cache_dir=tmp_path / "cache",
+            annotation_snapshots=[snapshot_path],
+        )
+
+        loader = VCFLoader(db_url=snapshot_db["db_url"], config=config)
+        try:
+            result = await loader.load_vcf(query_path)
+        finally:
+            await loader.close()
+
+        assert result["variants_annotated"] == 3
+        assert not (tmp_path / "cache").exists()
@@ -46,6 +46,39 @@ class TestCLIHelp:
         assert result.exit_code == 0
         assert "--db" in result.stdout
 
+    def test_export_batch_help(self):
+        """Export batch command should accept repeatable studies and formats."""
+        result = runner.invoke(app, ["export", "batch", "--help"])
+        assert result.exit_code == 0
+        assert "--study-id" in result.stdout
+        assert "--format" in result.stdout
+        assert "--concurrency" in result.stdout
+
+    def test_export_batch_rejects_unknown_format(self):
+        """Export batch should reject unknown formats before connecting."""
+        result = runner.invoke(
+            app, ["export", "batch", "-s", "1", "-o", "/tmp/out", "-f", "bolt-lmm"]
+        )
+        assert result.exit_code == 1
+        assert "Unknown format" in result.stdout
+
+    def test_score_help(self):
+        """Score command should take a PGS ID and concurrency option."""
+        result = runner.invoke(app, ["score", "--help"])
+        assert result.exit_code == 0
+        assert "prs_scores" in result.stdout
+        assert "--workers" in result.stdout
+        assert "--engine" in result.stdout
+        assert "--vcf" in result.stdout
+
+    def test_score_vcf_requires_output(self, tmp_path):
+        """Scoring a VCF should require an output table before connecting."""
+        vcf_path = tmp_path / "cohort.vcf"
+        vcf_path.write_text("##fileformat=VCFv4.2\n")
+        result = runner.invoke(app, ["score", "PGS000001", "--vcf", str(vcf_path)])
+        assert result.exit_code == 1
+        assert "--output is required" in result.stdout
+
 
 class TestCLILoadCommand:
     """Tests for the load command."""
@@ -128,6 +161,13 @@ class TestCLILoadCommand:
         result = runner.invoke(app, ["load", "--help"])
         assert "--normalize" in result.stdout or "normalize" in result.stdout.lower()
 
+    def test_load_rejects_unknown_genotype_storage(self):
+        """Load should reject unknown genotype storage modes."""
+        vcf_path = FIXTURES_DIR / "with_annotations.vcf"
+        result = runner.invoke(app, ["load", str(vcf_path), "--genotype-storage", "columnar"])
+        assert result.exit_code == 1
+        assert "Unknown genotype storage" in result.stdout
+
     def test_load_keep_indexes_flag(self):
         """Load should support --keep-indexes flag."""
         result = runner.invoke(app, ["load", "--help"])
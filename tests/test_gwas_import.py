@@ -119,6 +119,80 @@ class TestGWASSSFParsing:
         finally:
             path.unlink()
 
+    def test_parse_gzipped_file(self, tmp_path):
+        """Parser should read gzip-compressed GWAS-SSF files."""
+        import gzip
+
+        from vcf_pg_loader.gwas.loader import GWASSSFParser
+
+        stats = make_basic_gwas_stats()
+        path = tmp_path / "sumstats.tsv.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(GWASSSFGenerator.generate(stats, include_optional=True))
+
+        records = list(GWASSSFParser(path).iter_records())
+        assert len(records) == len(stats)
+        assert records[0].position == stats[0].base_pair_location
+        assert records[0].beta == pytest.approx(stats[0].beta)
+
+    def test_iter_chunks_columnar(self, tmp_path):
+        """Chunks should hold numeric columns as arrays with NaN for missing values."""
+        import numpy as np
+
+        from vcf_pg_loader.gwas.loader import GWASSSFParser
+
+        path = tmp_path / "sumstats.tsv"
+        path.write_text(
+            "chromosome\tbase_pair_location\teffect_allele\tother_allele\tp_value\tbeta\tn\n"
+            "1\t100\tA\tG\t0.01\t0.5\t1000.0\n"
+            "1\t200\tC\tT\t1e-8\tNA\t\n"
+            "\n"
+            "2\t300\tG\tA\t0.5\t-0.1\t900\n"
+        )
+
+        chunks = list(GWASSSFParser(path, chunk_lines=2).iter_chunks())
+        assert [len(c) for c in chunks] == [2, 1]
+        assert list(chunks[1].line_numbers) == [5]
+        assert chunks[0].position.dtype == np.int64
+        assert np.isnan(chunks[0].beta[1])
+        assert chunks[0].column("n_total") == [1000, None]
+        assert chunks[1].column("odds_ratio") == [None]
+
+    def test_short_and_long_rows_in_one_chunk(self, tmp_path):
+        """A short row and a row with an extra field should not shift tokens."""
+        from vcf_pg_loader.gwas.loader import GWASSSFParser
+
+        path = tmp_path / "sumstats.tsv"
+        path.write_text(
+            "chromosome\tbase_pair_location\teffect_allele\tother_allele\tp_value\tbeta\n"
+            "1\t100\tA\tG\t0.01\n"
+            "1\t200\tC\tT\t0.02\t0.3\textra\n"
+            "1\t300\tG\tA\t0.03\t-0.1\n"
+        )
+
+        records = list(GWASSSFParser(path).iter_records())
+        assert [r.position for r in records] == [100, 200, 300]
+        assert [r.effect_allele for r in records] == ["A", "C", "G"]
+        assert records[0].beta is None
+        assert records[1].beta == pytest.approx(0.3)
+        assert records[2].p_value == pytest.approx(0.03)
+
+    def test_error_line_number_in_later_chunk(self, tmp_path):
+        """Errors should report the file line number across chunk boundaries."""
+        from vcf_pg_loader.gwas.loader import GWASParseError, GWASSSFParser
+
+        path = tmp_path / "sumstats.tsv"
+        rows = [f"1\t{i}\tA\tG\t0.1\t0.2" for i in range(1, 8)]
+        rows[5] = "1\t6\tA\tG\t0.1\tbad"
+        path.write_text(
+            "chromosome\tbase_pair_location\teffect_allele\tother_allele\tp_value\tbeta\n"
+            + "\n".join(rows)
+            + "\n"
+        )
+
+        with pytest.raises(GWASParseError, match="line 7: Invalid float value 'bad'"):
+            list(GWASSSFParser(path, chunk_lines=3).iter_records())
+
 
 class TestAlleleHarmonization:
     """Tests for allele harmonization logic."""
@@ -534,6 +608,78 @@ class TestGWASImportIntegration:
             vcf_path.unlink()
             gwas_path.unlink()
 
+    @pytest.mark.asyncio
+    async def test_effect_allele_orientation_from_matched_variant(self, test_db):
+        """is_effect_allele_alt comes from the position or rsID match."""
+        import uuid
+
+        from vcf_pg_loader.gwas.loader import GWASLoader
+        from vcf_pg_loader.gwas.schema import GWASSchemaManager
+        from vcf_pg_loader.schema import SchemaManager
+
+        await SchemaManager().create_schema(test_db)
+        await GWASSchemaManager().create_gwas_schema(test_db)
+        await test_db.executemany(
+            """
+            INSERT INTO variants (chrom, pos, pos_range, ref, alt, rs_id, load_batch_id)
+            VALUES ($1, $2::bigint, int8range($2::bigint, $2::bigint + 1), $3, $4, $5, $6)
+            """,
+            [
+                ("chr1", 12345, "A", "G", "rs12345", uuid.uuid4()),
+                ("chr2", 23456, "C", "T", "rs23456", uuid.uuid4()),
+            ],
+        )
+
+        stats = [
+            GWASSummaryStatistic(
+                chromosome="1",
+                base_pair_location=12345,
+                effect_allele="A",
+                other_allele="G",
+                p_value=1e-8,
+                beta=0.1,
+            ),
+            GWASSummaryStatistic(
+                chromosome="2",
+                base_pair_location=99999,
+                effect_allele="T",
+                other_allele="C",
+                p_value=1e-3,
+                beta=0.2,
+                rsid="rs23456",
+            ),
+            GWASSummaryStatistic(
+                chromosome="3",
+                base_pair_location=1000,
+                effect_allele="G",
+                other_allele="A",
+                p_value=0.5,
+                beta=0.3,
+            ),
+        ]
+        path = GWASSSFGenerator.generate_file(stats)
+
+        try:
+            result = await GWASLoader().import_gwas(
+                conn=test_db, tsv_path=path, study_accession="GCST_ORIENTATION"
+            )
+            rows = await test_db.fetch(
+                """
+                SELECT beta, variant_id IS NOT NULL AS matched, is_effect_allele_alt
+                FROM gwas_summary_stats WHERE study_id = $1 ORDER BY beta
+                """,
+                result["study_id"],
+            )
+        finally:
+            path.unlink()
+
+        assert result["stats_matched"] == 2
+        assert [(r["matched"], r["is_effect_allele_alt"]) for r in rows] == [
+            (True, False),
+            (True, True),
+            (False, None),
+        ]
+
     @pytest.mark.asyncio
     async def test_import_handles_binary_traits(self, test_db):
         """Should correctly import odds ratios for binary traits."""
@@ -605,6 +751,183 @@ class TestGWASImportIntegration:
             )
 
 
+@pytest.mark.integration
+class TestGWASStudyPartitions:
+    """Tests for per-study partitions of gwas_summary_stats."""
+
+    @pytest.mark.asyncio
+    async def test_import_attaches_study_partition(self, test_db):
+        """Import should swap in one partition per study, pruned by study_id filters."""
+        from vcf_pg_loader.gwas.loader import GWASLoader
+        from vcf_pg_loader.gwas.schema import GWASSchemaManager, study_partition_name
+
+        manager = GWASSchemaManager()
+        await manager.create_gwas_schema(test_db)
+        await manager.create_gwas_indexes(test_db)
+
+        path = GWASSSFGenerator.generate_file(make_basic_gwas_stats())
+        try:
+            result = await GWASLoader().import_gwas(
+                conn=test_db, tsv_path=path, study_accession="GCST_PARTITION"
+            )
+        finally:
+            path.unlink()
+
+        partition = study_partition_name(result["study_id"])
+        partitions = await test_db.fetch("""
+            SELECT inhrelid::regclass::text AS name FROM pg_inherits
+            WHERE inhparent = 'gwas_summary_stats'::regclass
+        """)
+        assert partition in {row["name"] for row in partitions}
+        assert await test_db.fetchval(f"SELECT COUNT(*) FROM {partition}") == 3
+
+        indexes = await test_db.fetch(
+            "SELECT indexname FROM pg_indexes WHERE tablename = $1", partition
+        )
+        assert len(indexes) == 6
+
+        plan = "\n".join(
+            row[0]
+            for row in await test_db.fetch(
+                f"EXPLAIN SELECT * FROM gwas_summary_stats WHERE study_id = {result['study_id']}"
+            )
+        )
+        assert partition in plan
+        assert "gwas_summary_stats_default" not in plan
+
+    @pytest.mark.asyncio
+    async def test_reimport_replaces_study_stats(self, test_db):
+        """Re-importing a study should replace its statistics, not merge them."""
+        from vcf_pg_loader.gwas.loader import GWASLoader
+        from vcf_pg_loader.gwas.schema import GWASSchemaManager
+
+        await GWASSchemaManager().create_gwas_schema(test_db)
+        loader = GWASLoader(batch_size=1)
+
+        first = GWASSSFGenerator.generate_file(make_basic_gwas_stats())
+        second = GWASSSFGenerator.generate_file(make_basic_gwas_stats()[:1])
+        try:
+            result = await loader.import_gwas(test_db, first, study_accession="GCST_REPLACE")
+            await loader.import_gwas(test_db, second, study_accession="GCST_REPLACE")
+        finally:
+            first.unlink()
+            second.unlink()
+
+        count = await test_db.fetchval(
+            "SELECT COUNT(*) FROM gwas_summary_stats WHERE study_id = $1", result["study_id"]
+        )
+        assert count == 1
+        leftovers = await test_db.fetchval(
+            "SELECT COUNT(*) FROM pg_class WHERE relname LIKE 'gwas_summary_stats_%_staging'"
+        )
+        assert leftovers == 0
+
+    @pytest.mark.asyncio
+    async def test_drop_study(self, test_db):
+        """Dropping a study should remove its partition, rows and study record."""
+        from vcf_pg_loader.gwas.loader import GWASLoader
+        from vcf_pg_loader.gwas.schema import GWASSchemaManager, study_partition_name
+
+        manager = GWASSchemaManager()
+        await manager.create_gwas_schema(test_db)
+
+        path = GWASSSFGenerator.generate_file(make_basic_gwas_stats())
+        try:
+            result = await GWASLoader().import_gwas(test_db, path, study_accession="GCST_DROP")
+        finally:
+            path.unlink()
+
+        await manager.drop_study(test_db, result["study_id"])
+
+        assert await manager.get_study_by_accession(test_db, "GCST_DROP") is None
+        assert await manager.get_stats_count(test_db, result["study_id"]) == 0
+        assert (
+            await test_db.fetchval(
+                "SELECT to_regclass($1)", study_partition_name(result["study_id"])
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_unpartitioned_legacy_table_rejected(self, test_db):
+        """A gwas_summary_stats table from before partitioning should get a clear error."""
+        from vcf_pg_loader.gwas.loader import GWASLoader
+        from vcf_pg_loader.gwas.schema import GWASSchemaManager
+
+        manager = GWASSchemaManager()
+        await manager.drop_gwas_schema(test_db)
+        await manager.create_studies_table(test_db)
+        await test_db.execute("""
+            CREATE TABLE gwas_summary_stats (
+                id SERIAL PRIMARY KEY,
+                variant_id BIGINT,
+                study_id INTEGER NOT NULL REFERENCES studies(study_id),
+                effect_allele VARCHAR(255) NOT NULL,
+                p_value DOUBLE PRECISION NOT NULL
+            )
+        """)
+
+        with pytest.raises(RuntimeError, match="unpartitioned"):
+            await manager.create_gwas_schema(test_db)
+
+        path = GWASSSFGenerator.generate_file(make_basic_gwas_stats())
+        try:
+            with pytest.raises(RuntimeError, match="migrate-gwas-partitions"):
+                await GWASLoader().import_gwas(test_db, path, study_accession="GCST_LEGACY")
+        finally:
+            path.unlink()
+
+        assert await manager.get_study_by_accession(test_db, "GCST_LEGACY") is None
+        await manager.drop_gwas_schema(test_db)
+
+    @pytest.mark.asyncio
+    async def test_migrate_legacy_table_to_partitions(self, test_db):
+        """Migrating a legacy table should keep each study's rows in its own partition."""
+        from vcf_pg_loader.gwas.loader import GWASLoader
+        from vcf_pg_loader.gwas.schema import GWASSchemaManager, study_partition_name
+
+        manager = GWASSchemaManager()
+        await manager.drop_gwas_schema(test_db)
+        await manager.create_studies_table(test_db)
+        await test_db.execute("""
+            CREATE TABLE gwas_summary_stats (
+                id SERIAL PRIMARY KEY,
+                variant_id BIGINT,
+                study_id INTEGER REFERENCES studies(study_id),
+                effect_allele VARCHAR(255) NOT NULL,
+                p_value DOUBLE PRECISION NOT NULL,
+                UNIQUE (variant_id, study_id)
+            )
+        """)
+        await test_db.execute(
+            "CREATE INDEX idx_gwas_pvalue ON gwas_summary_stats (p_value) WHERE p_value < 5e-8"
+        )
+        first = await manager.create_study(test_db, "GCST_OLD1")
+        second = await manager.create_study(test_db, "GCST_OLD2")
+        await test_db.executemany(
+            "INSERT INTO gwas_summary_stats (variant_id, study_id, effect_allele, p_value) "
+            "VALUES ($1, $2, $3, $4)",
+            [(1, first, "A", 1e-9), (2, first, "G", 0.5), (1, second, "T", 0.01), (3, None, "C", 0.2)],
+        )
+
+        assert await manager.migrate_stats_partitions(test_db) == 2
+        assert await manager.migrate_stats_partitions(test_db) == 0
+
+        for study_id, expected in ((first, 2), (second, 1)):
+            partition = study_partition_name(study_id)
+            assert await test_db.fetchval(f"SELECT COUNT(*) FROM {partition}") == expected
+        assert await test_db.fetchval("SELECT COUNT(*) FROM gwas_summary_stats") == 3
+        assert await test_db.fetchval("SELECT to_regclass('gwas_summary_stats_legacy')") is None
+
+        path = GWASSSFGenerator.generate_file(make_basic_gwas_stats())
+        try:
+            result = await GWASLoader().import_gwas(test_db, path, study_accession="GCST_NEW")
+        finally:
+            path.unlink()
+        assert await manager.get_stats_count(test_db, result["study_id"]) == 3
+        await manager.drop_gwas_schema(test_db)
+
+
 @pytest.mark.integration
 class TestGWASQueryPerformance:
     """Tests for GWAS query performance patterns."""
@@ -618,8 +941,8 @@ class TestGWASQueryPerformance:
         await manager.create_gwas_schema(test_db)
         await manager.create_gwas_indexes(test_db)
 
-        explain = await test_db.fetchrow("""
+        explain = await test_db.fetch("""
             EXPLAIN SELECT * FROM gwas_summary_stats WHERE p_value < 5e-8
         """)
-        plan = explain[0].lower()
+        plan = "\n".join(row[0] for row in explain).lower()
         assert "index" in plan or "seq scan" in plan
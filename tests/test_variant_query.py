@@ -0,0 +1,135 @@
+"""Tests for the region, gene and rsID query service."""
+
+import uuid
+
+import pytest
+
+VARIANTS = [
+    ("chr1", 100, "A", "G", "rs1", "GENE1"),
+    ("chr1", 150, "AT", "A", "rs2", "GENE1"),
+    ("chr1", 500, "C", "T", "rs3", "GENE2"),
+    ("chr2", 120, "G", "A", "rs4", "GENE3"),
+]
+
+
+@pytest.fixture
+async def query_db(test_db):
+    from vcf_pg_loader.schema import SchemaManager
+
+    await SchemaManager(human_genome=True).create_indexes(test_db)
+    batch_id = uuid.uuid4()
+    for chrom, pos, ref, alt, rs_id, gene in VARIANTS:
+        await test_db.execute(
+            """
+            INSERT INTO variants (chrom, pos, pos_range, ref, alt, rs_id, gene, load_batch_id)
+            VALUES ($1, $2::bigint, int8range($2::bigint, $2::bigint + length($3)), $3, $4,
+                    $5, $6, $7)
+            """,
+            chrom,
+            pos,
+            ref,
+            alt,
+            rs_id,
+            gene,
+            batch_id,
+        )
+    return test_db
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+class TestVariantQueryService:
+    def test_rejects_invalid_columns(self):
+        from vcf_pg_loader.variant_query import VariantQueryService
+
+        with pytest.raises(ValueError, match="column name"):
+            VariantQueryService(conn=None, columns=["pos; DROP TABLE variants"])
+
+
+@pytest.mark.integration
+class TestVariantQueryServiceIntegration:
+    @pytest.mark.asyncio
+    async def test_region_overlap(self, query_db):
+        from vcf_pg_loader.variant_query import VariantQueryService
+
+        service = VariantQueryService(query_db, prefetch=1)
+
+        rows = await collect(service.region("1", 101, 150))
+        assert [(r["pos"], r["ref"]) for r in rows] == [(150, "AT")]
+
+        rows = await collect(service.region("chr1", 151, 151))
+        assert [r["rs_id"] for r in rows] == ["rs2"]
+
+        rows = await collect(service.region("chr1", 1, 1000))
+        assert [r["rs_id"] for r in rows] == ["rs1", "rs2", "rs3"]
+
+    @pytest.mark.asyncio
+    async def test_region_statement_prepared_once(self, query_db):
+        from vcf_pg_loader.variant_query import _PREPARED, VariantQueryService
+
+        service = VariantQueryService(query_db)
+        await collect(service.region("chr1", 1, 200))
+        statements = dict(_PREPARED[query_db])
+        await collect(service.region("chr2", 1, 200))
+        await collect(VariantQueryService(query_db).region("chr1", 1, 200))
+        assert _PREPARED[query_db] == statements
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_closing_early_ends_transaction(self, query_db):
+        from contextlib import aclosing
+
+        from vcf_pg_loader.variant_query import VariantQueryService
+
+        service = VariantQueryService(query_db, prefetch=1)
+        async with aclosing(service.regions([("chr1", 1, 1000), ("chr2", 1, 1000)])) as rows:
+            async for _ in rows:
+                break
+
+        assert not query_db.is_in_transaction()
+        assert await query_db.fetchval("SELECT COUNT(*) FROM variants") == len(VARIANTS)
+
+    @pytest.mark.asyncio
+    async def test_region_plan_prunes_to_one_partition(self, query_db):
+        from vcf_pg_loader.variant_query import VariantQueryService
+
+        plan = await VariantQueryService(query_db).explain("chr1", 1, 1000)
+
+        assert "variants_1" in plan
+        assert "variants_2" not in plan
+        assert "variants_other" not in plan
+
+    @pytest.mark.asyncio
+    async def test_regions_batch(self, query_db):
+        from vcf_pg_loader.variant_query import VariantQueryService
+
+        service = VariantQueryService(query_db, columns=["chrom", "pos"])
+        rows = await collect(
+            service.regions([("chr1", 400, 600), ("chr2", 1, 1000), ("chr1", 90, 110)])
+        )
+
+        assert [(r["region_index"], r["chrom"], r["pos"]) for r in rows] == [
+            (0, "chr1", 500),
+            (2, "chr1", 100),
+            (1, "chr2", 120),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_gene_and_rsid(self, query_db):
+        from vcf_pg_loader.variant_query import VariantQueryService
+
+        service = VariantQueryService(query_db)
+
+        assert [r["pos"] for r in await collect(service.gene("GENE1"))] == [100, 150]
+        assert [r["pos"] for r in await collect(service.gene("GENE1", chrom="chr1"))] == [
+            100,
+            150,
+        ]
+        assert await collect(service.gene("GENE1", chrom="chr2")) == []
+
+        rows = await collect(service.rsid(["rs4", "rs1", "rs404"]))
+        assert [(r["chrom"], r["rs_id"]) for r in rows] == [("chr1", "rs1"), ("chr2", "rs4")]
+        rows = await collect(service.rsid(["rs4", "rs1"], chrom="2"))
+        assert [r["rs_id"] for r in rows] == ["rs4"]
@@ -121,3 +121,57 @@ class TestMatchVariant:
         )
 
         assert result == 1
+
+
+class TestMatchRsidKeys:
+    """Tests for matching variants through an rsID index."""
+
+    def make_index(self, records):
+        import numpy as np
+
+        from vcf_pg_loader.references.rsid_index import RsidIndex
+
+        chroms = sorted({r[1] for r in records})
+        encoded = [f"{ref}\t{alt}".encode() for _, _, _, ref, alt in records]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return RsidIndex(
+            path=None,
+            chroms=chroms,
+            rsids=np.array([r[0] for r in records], dtype=np.int64),
+            chrom_codes=np.array([chroms.index(r[1]) for r in records], dtype=np.uint8),
+            positions=np.array([r[2] for r in records], dtype=np.int64),
+            allele_offsets=offsets,
+            alleles=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        )
+
+    def test_first_allele_match_in_lookup(self):
+        from vcf_pg_loader.utils.variant_matching import match_rsid_keys
+
+        index = self.make_index(
+            [
+                (10, "1", 100, "A", "g"),
+                (10, "1", 100, "A", "T"),
+                (20, "2", 200, "CT", "C"),
+                (30, "X", 300, "G", "A"),
+            ]
+        )
+        lookup = {("1", 100, "A", "T"): 1, ("2", 200, "CT", "C"): 2, ("X", 300, "G", "A"): 3}
+
+        keys = match_rsid_keys(
+            index,
+            ["rs10", "rs10", "rs20", "rs30", "rs30", None, "rs99"],
+            ["t", "G", "C", "C", "A", "A", "A"],
+            ["A", None, "CT", None, None, "G", "G"],
+            lookup,
+        )
+
+        assert keys == [
+            ("1", 100, "A", "T"),
+            None,
+            ("2", 200, "CT", "C"),
+            None,
+            ("X", 300, "G", "A"),
+            None,
+            None,
+        ]